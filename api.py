@@ -13,21 +13,44 @@ API Docs:
 """
 
 import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
 import re
-import threading
+import socket
+import sys
+import time
 import uuid
-from datetime import datetime
+from contextlib import asynccontextmanager
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
 from urllib.parse import unquote
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 # Import pipeline
-from run_pipeline import run_pipeline, process_single_article
+from run_pipeline import PARTIAL_RESULTS_FILE, run_pipeline, process_single_article
+from shared.budget import Budget
+from shared.constants import (
+    API_ARTIFACT_CACHE_MB,
+    API_DEDUPE_WINDOW_MINUTES,
+    API_IDEMPOTENCY_WINDOW_HOURS,
+    API_MAX_CONCURRENT_JOBS,
+    API_MAX_QUEUED_JOBS,
+)
+from shared.database import OpenBlogDB
+from shared.http_cache import Artifact, ArtifactCache, is_not_modified, negotiate_encoding
+from shared.metrics import JOBS_TOTAL, REGISTRY, monitor_event_loop_lag
+from shared.progress import progress_listener
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # Pydantic Models for API
@@ -39,11 +62,25 @@ class JobStatus(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 # Valid export formats (whitelist for security)
 VALID_EXPORT_FORMATS = {"html", "markdown", "json", "csv", "xlsx", "pdf"}
 
+# Stage 1 context cache components that can be refreshed per request
+VALID_CONTEXT_COMPONENTS = {"company_context", "voice_persona", "sitemap", "legal_context", "all"}
+
+
+class BudgetRequest(BaseModel):
+    """Token/AI-call/time limits; optional steps are skipped when a budget runs low."""
+    max_tokens: Optional[int] = Field(default=None, ge=1, description="Max prompt+output tokens")
+    max_ai_calls: Optional[int] = Field(default=None, ge=1, description="Max Gemini calls")
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Max wall time in seconds")
+
+    def to_budget(self) -> Budget:
+        return Budget(max_tokens=self.max_tokens, max_ai_calls=self.max_ai_calls, max_seconds=self.max_seconds)
+
 
 class PipelineRequest(BaseModel):
     """Request model for starting a pipeline job."""
@@ -87,6 +124,26 @@ class PipelineRequest(BaseModel):
         default=["html", "json"],
         description="Export formats: html, markdown, json, csv, xlsx, pdf"
     )
+    budget: Optional[BudgetRequest] = Field(
+        default=None,
+        description="Limits for the whole job (images, 2nd Stage 3 iteration and Stage 4 content check are dropped first)"
+    )
+    article_budget: Optional[BudgetRequest] = Field(
+        default=None,
+        description="Limits applied to each article"
+    )
+    use_context_cache: bool = Field(
+        default=True,
+        description="Reuse cached Stage 1 context (company, voice, sitemap, legal) for this company"
+    )
+    refresh_context: List[str] = Field(
+        default=[],
+        description="Stage 1 cache components to recompute: company_context, voice_persona, sitemap, legal_context, all"
+    )
+    dedupe: bool = Field(
+        default=False,
+        description="Return an identical job submitted within the dedupe window instead of starting a new pipeline"
+    )
 
     @field_validator("keywords")
     @classmethod
@@ -99,6 +156,15 @@ class PipelineRequest(BaseModel):
             raise ValueError("Maximum 20 keywords allowed")
         return validated
 
+    @field_validator("refresh_context")
+    @classmethod
+    def validate_refresh_context(cls, v: List[str]) -> List[str]:
+        """Validate cache component names."""
+        invalid = set(v) - VALID_CONTEXT_COMPONENTS
+        if invalid:
+            raise ValueError(f"Invalid refresh_context: {invalid}. Valid: {VALID_CONTEXT_COMPONENTS}")
+        return v
+
     @field_validator("export_formats")
     @classmethod
     def validate_export_formats(cls, v: List[str]) -> List[str]:
@@ -121,6 +187,7 @@ class JobStatusResponse(BaseModel):
     """Response model for job status check."""
     job_id: str
     status: JobStatus
+    queue_position: Optional[int] = Field(None, description="1-based position in the job queue (while pending)")
     progress: Optional[Dict] = Field(None, description="Progress details")
     result: Optional[Dict] = Field(None, description="Pipeline result (when completed)")
     error: Optional[str] = Field(None, description="Error message (when failed)")
@@ -145,70 +212,350 @@ class HealthResponse(BaseModel):
     timestamp: str
 
 
+class EstimateRequest(BaseModel):
+    """Request model for a pre-run cost and latency estimate."""
+    num_articles: int = Field(
+        ...,
+        ge=1,
+        le=1000,
+        description="Number of keywords/articles in the planned batch",
+        json_schema_extra={"example": 100}
+    )
+    enable_legal_research: bool = Field(
+        default=False,
+        description="Legal mode (decision-centric Stage 2 + Stage 2.5 verification)"
+    )
+    skip_images: bool = Field(default=False, description="Images will not be generated")
+    max_parallel: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=100,
+        description="Planned concurrent articles (None = unlimited)"
+    )
+    decision_sections: int = Field(
+        default=8,
+        ge=4,
+        le=15,
+        description="Expected sections per decision-centric legal article"
+    )
+    stage3_iterations: int = Field(
+        default=2,
+        ge=1,
+        le=5,
+        description="Stage 3 self-critique iteration limit"
+    )
+
+
+class EstimateResponse(BaseModel):
+    """Predicted usage for a planned batch."""
+    articles: int
+    mode: str
+    stages: Dict[str, Dict] = Field(..., description="Per-stage totals and data source (history/default)")
+    totals: Dict = Field(..., description="ai_calls, tokens, images, wall_time_seconds")
+    assumptions: Dict
+
+
 # =============================================================================
-# In-Memory Job Store (replace with Redis/DB in production)
+# Job Store (SQLite, survives restarts)
 # =============================================================================
 
 class JobStore:
-    """Thread-safe in-memory job store."""
+    """
+    Persistent job store backed by the shared SQLite database.
+
+    Job metadata lives in an indexed `jobs` table; results are stored
+    compressed in `job_results` and only loaded by get_result(), so memory
+    use does not grow with job history.
 
-    def __init__(self):
-        self._jobs: Dict[str, dict] = {}
-        self._lock = threading.Lock()
+    Every job records its owner (host:pid of the server process running it).
+    The database is opened on first use, and recover_interrupted() (run at
+    server startup) only fails jobs whose owner process is gone, so several
+    server processes can share one database.
+    """
 
-    def create(self, job_id: str, request: PipelineRequest) -> dict:
+    def __init__(self, db: Optional[OpenBlogDB] = None):
+        self._db_instance = db
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def _db(self) -> OpenBlogDB:
+        if self._db_instance is None:
+            self._db_instance = OpenBlogDB()
+        return self._db_instance
+
+    def recover_interrupted(self) -> int:
+        """
+        Mark pending/running jobs of server processes that no longer run as failed.
+
+        Runs at startup, before this process takes any job. Owners on other
+        hosts are left alone (their liveness cannot be checked from here);
+        jobs without an owner predate owner tracking and are failed.
+
+        Returns:
+            Number of jobs marked failed
+        """
+        statuses = [JobStatus.PENDING.value, JobStatus.RUNNING.value]
+        dead = [owner for owner in self._db.job_owners_with_status(statuses) if not self._owner_alive(owner)]
+        interrupted = self._db.fail_jobs_with_status(statuses, error="Interrupted by server restart", owners=dead)
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted job(s) as failed")
+        return interrupted
+
+    def _owner_alive(self, owner: str) -> bool:
+        host, _, pid = owner.rpartition(":")
+        if not host or not pid.isdigit():
+            return False
+        if host != socket.gethostname():
+            return True
+        if int(pid) == os.getpid():
+            # Our pid, but this process has not run any job yet: a previous
+            # server with the same pid (e.g. pid 1 in a container)
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True  # Exists, owned by another user
+        return True
+
+    def create(
+        self,
+        job_id: str,
+        request: PipelineRequest,
+        keys: Optional[List[str]] = None,
+        fingerprint: str = "",
+    ) -> dict:
+        """Create a pending job; keys (idempotency key, fingerprint) map duplicates to it."""
+        now = datetime.utcnow().isoformat()
         job = {
             "job_id": job_id,
-            "status": JobStatus.PENDING,
-            "request": request.model_dump(),
+            "status": JobStatus.PENDING.value,
+            "request": request.model_dump(mode="json"),
             "progress": {"articles_completed": 0, "articles_total": len(request.keywords)},
-            "result": None,
             "error": None,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+            "owner": self.owner,
+            "created_at": now,
+            "updated_at": now,
         }
-        with self._lock:
-            self._jobs[job_id] = job
+        self._db.create_job(job)
+        if keys:
+            self._db.record_job_keys(job_id, keys, fingerprint, now)
         return job
 
+    def find_by_keys(self, keys: List[str], since: datetime) -> List[dict]:
+        """Jobs submitted with any of the keys since a time, newest first."""
+        return self._db.find_jobs_by_keys(keys, since.isoformat())
+
+    def expire_keys(self, before: datetime) -> int:
+        return self._db.delete_job_keys_before(before.isoformat())
+
     def get(self, job_id: str) -> Optional[dict]:
-        with self._lock:
-            return self._jobs.get(job_id)
+        """Job metadata without the result (see get_result)."""
+        return self._db.get_job(job_id)
+
+    def get_result(self, job_id: str) -> Optional[dict]:
+        """Load a job's full pipeline result from storage."""
+        return self._db.get_job_result(job_id)
 
     def update(self, job_id: str, **kwargs) -> Optional[dict]:
-        with self._lock:
-            if job_id in self._jobs:
-                self._jobs[job_id].update(kwargs)
-                self._jobs[job_id]["updated_at"] = datetime.utcnow().isoformat()
-                return self._jobs[job_id]
-        return None
+        if "status" in kwargs:
+            kwargs["status"] = JobStatus(kwargs["status"]).value
+        kwargs["updated_at"] = datetime.utcnow().isoformat()
+        if not self._db.update_job(job_id, kwargs):
+            return None
+        return self.get(job_id)
 
-    def list_all(self, limit: int = 50) -> List[dict]:
-        with self._lock:
-            jobs = sorted(
-                self._jobs.values(),
-                key=lambda x: x["created_at"],
-                reverse=True
-            )
-            return jobs[:limit]
+    def list_all(self, limit: int = 50, offset: int = 0, status: Optional[JobStatus] = None) -> List[dict]:
+        return self._db.list_jobs(limit=limit, offset=offset, status=status.value if status else None)
+
+    def count(self, status: Optional[JobStatus] = None) -> int:
+        return self._db.count_jobs(status=status.value if status else None)
 
     def delete(self, job_id: str) -> bool:
-        with self._lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-                return True
-        return False
+        return self._db.delete_job(job_id)
 
 
 # Global job store
 job_store = JobStore()
 
 
+# =============================================================================
+# Job Progress Events (in-memory, per process)
+# =============================================================================
+
+SSE_KEEPALIVE_SECONDS = 15.0
+# Minimum seconds between stored progress updates for article/stage starts
+PROGRESS_WRITE_INTERVAL = 1.0
+
+
+class JobEventBroker:
+    """
+    Fans out pipeline progress events of running jobs to SSE subscribers.
+
+    Events are numbered per job (SSE id) and the last `history` events are
+    kept, so late subscribers and reconnects with Last-Event-ID get a replay.
+    Event histories of finished jobs are dropped once more than
+    `keep_finished` jobs have finished.
+    """
+
+    def __init__(self, history: int = 500, keep_finished: int = 100):
+        self._history = history
+        self._keep_finished = keep_finished
+        self._events: Dict[str, Deque[dict]] = {}
+        self._next_id: Dict[str, int] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+
+    def open(self, job_id: str) -> None:
+        """Start collecting events for a job."""
+        self._events[job_id] = deque(maxlen=self._history)
+        self._next_id[job_id] = 1
+        self._subscribers[job_id] = set()
+
+    def knows(self, job_id: str) -> bool:
+        return job_id in self._events
+
+    def publish(self, job_id: str, event: dict) -> None:
+        """Number an event, keep it for replay and deliver it to subscribers."""
+        if job_id not in self._events or job_id in self._finished:
+            return
+        event = {"id": self._next_id[job_id], **event}
+        self._next_id[job_id] += 1
+        self._events[job_id].append(event)
+        for queue in self._subscribers[job_id]:
+            queue.put_nowait(event)
+
+    def close(self, job_id: str) -> None:
+        """Mark a job finished: subscribers get the remaining events, then end."""
+        if job_id not in self._events or job_id in self._finished:
+            return
+        self._finished[job_id] = None
+        for queue in self._subscribers[job_id]:
+            queue.put_nowait(None)
+        while len(self._finished) > self._keep_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._events.pop(old_id, None)
+            self._next_id.pop(old_id, None)
+            self._subscribers.pop(old_id, None)
+
+    async def subscribe(
+        self,
+        job_id: str,
+        after: int = 0,
+        keepalive: float = SSE_KEEPALIVE_SECONDS,
+    ) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield a job's events with id > after until the job finishes.
+
+        Yields None every `keepalive` seconds without events so callers can
+        send a heartbeat.
+        """
+        if job_id not in self._events:
+            return
+        queue: asyncio.Queue = asyncio.Queue()
+        subscribers = self._subscribers[job_id]
+        subscribers.add(queue)
+        try:
+            # Snapshot and registration happen without an await in between,
+            # so every event is delivered exactly once (replay or queue).
+            for event in list(self._events[job_id]):
+                if event["id"] > after:
+                    yield event
+            if job_id in self._finished:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                if event["id"] > after:
+                    yield event
+        finally:
+            subscribers.discard(queue)
+
+
+# Global event broker
+job_events = JobEventBroker()
+
+
+def _job_progress_listener(job_id: str, articles_total: int) -> Callable[[Dict[str, Any]], None]:
+    """
+    Build the progress callback for one job.
+
+    Every event is published to job_events; the stored job progress
+    (articles completed/failed, current stage per article, ETA) is written
+    when an article or Stage 1 finishes, and at most every
+    PROGRESS_WRITE_INTERVAL seconds for article and stage starts, so busy
+    jobs do not block the event loop with a SQLite write per event.
+    """
+    progress: Dict[str, Any] = {
+        "articles_total": articles_total,
+        "articles_completed": 0,
+        "articles_failed": 0,
+        "stage": "stage1",
+        "current_stages": {},
+        "eta_seconds": None,
+    }
+    articles_started_at: Optional[float] = None
+    last_write = 0.0
+
+    def on_event(event: Dict[str, Any]) -> None:
+        nonlocal articles_started_at, last_write
+        job_events.publish(job_id, event)
+
+        name = event["event"]
+        article = str(event.get("article")) if event.get("article") is not None else None
+        if name == "stage_completed" and event.get("stage") == "stage1":
+            progress["articles_total"] = event.get("articles_total", progress["articles_total"])
+            progress["stage"] = "stage0"
+        elif name == "article_started":
+            if articles_started_at is None:
+                articles_started_at = event["timestamp"]
+            progress["stage"] = "articles"
+            if time.monotonic() - last_write < PROGRESS_WRITE_INTERVAL:
+                return
+        elif name == "stage_started" and article is not None:
+            progress["current_stages"][article] = event["stage"]
+            if time.monotonic() - last_write < PROGRESS_WRITE_INTERVAL:
+                return
+        elif name in ("article_completed", "article_failed"):
+            progress["current_stages"].pop(article, None)
+            progress["articles_completed" if name == "article_completed" else "articles_failed"] += 1
+            done = progress["articles_completed"] + progress["articles_failed"]
+            remaining = max(progress["articles_total"] - done, 0)
+            if articles_started_at is not None:
+                # Throughput-based: parallel articles finish at the observed rate
+                elapsed = event["timestamp"] - articles_started_at
+                progress["eta_seconds"] = round(elapsed / done * remaining, 1)
+        else:
+            return
+        job_store.update(job_id, progress=progress)
+        last_write = time.monotonic()
+
+    return on_event
+
+
 # =============================================================================
 # FastAPI Application
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Recover jobs of stopped servers, then run the event loop lag monitor for the lifetime of the server."""
+    job_store.recover_interrupted()
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    try:
+        yield
+    finally:
+        lag_monitor.cancel()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="OpenBlog Neo API",
     description="""
 ## AI-Powered Blog Generation Pipeline
@@ -253,22 +600,28 @@ async def run_pipeline_job(job_id: str, request: PipelineRequest):
     """Background task to run the pipeline."""
     try:
         job_store.update(job_id, status=JobStatus.RUNNING)
+        job_events.publish(job_id, {"event": "job_status", "status": JobStatus.RUNNING.value, "timestamp": time.time()})
 
         # Create output directory
         output_dir = Path(f"output/api_jobs/{job_id}")
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Run pipeline
-        result = await run_pipeline(
-            keywords=request.keywords,
-            company_url=str(request.company_url),
-            language=request.language,
-            market=request.market,
-            skip_images=request.skip_images,
-            max_parallel=request.max_parallel,
-            output_dir=output_dir,
-            export_formats=request.export_formats,
-        )
+        with progress_listener(_job_progress_listener(job_id, len(request.keywords))):
+            result = await run_pipeline(
+                keywords=request.keywords,
+                company_url=str(request.company_url),
+                language=request.language,
+                market=request.market,
+                skip_images=request.skip_images,
+                max_parallel=request.max_parallel,
+                output_dir=output_dir,
+                export_formats=request.export_formats,
+                budget=request.budget.to_budget() if request.budget else None,
+                article_budget=request.article_budget.to_budget() if request.article_budget else None,
+                use_context_cache=request.use_context_cache,
+                refresh_context=request.refresh_context,
+            )
 
         job_store.update(
             job_id,
@@ -278,8 +631,32 @@ async def run_pipeline_job(job_id: str, request: PipelineRequest):
                 "articles_completed": result["articles_successful"],
                 "articles_total": result["articles_total"],
                 "articles_failed": result["articles_failed"],
+                "stage": "done",
+                "current_stages": {},
+                "eta_seconds": 0,
             }
         )
+        job_events.publish(job_id, {"event": "job_status", "status": JobStatus.COMPLETED.value, "timestamp": time.time()})
+        JOBS_TOTAL.inc(outcome="completed")
+
+    except asyncio.CancelledError:
+        # Articles finished before the cancellation were checkpointed by run_pipeline
+        partial = _load_partial_result(Path(f"output/api_jobs/{job_id}"))
+        fields = {"status": JobStatus.CANCELLED, "error": "Cancelled by request"}
+        if partial:
+            fields["result"] = partial
+            fields["progress"] = {
+                "articles_completed": partial["articles_successful"],
+                "articles_total": partial["articles_total"],
+                "articles_failed": 0,
+                "stage": "cancelled",
+                "current_stages": {},
+                "eta_seconds": None,
+            }
+        job_store.update(job_id, **fields)
+        job_events.publish(job_id, {"event": "job_status", "status": JobStatus.CANCELLED.value, "timestamp": time.time()})
+        JOBS_TOTAL.inc(outcome="cancelled")
+        raise
 
     except Exception as e:
         job_store.update(
@@ -287,6 +664,242 @@ async def run_pipeline_job(job_id: str, request: PipelineRequest):
             status=JobStatus.FAILED,
             error=str(e)
         )
+        job_events.publish(
+            job_id,
+            {"event": "job_status", "status": JobStatus.FAILED.value, "error": str(e), "timestamp": time.time()},
+        )
+        JOBS_TOTAL.inc(outcome="failed")
+    finally:
+        job_events.close(job_id)
+
+
+def _load_partial_result(output_dir: Path) -> Optional[dict]:
+    """Read the checkpoint run_pipeline writes when a job is cancelled mid-way."""
+    path = output_dir / PARTIAL_RESULTS_FILE
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read partial results {path}: {e}")
+        return None
+
+
+# =============================================================================
+# Duplicate Submissions (Idempotency-Key + request fingerprint)
+# =============================================================================
+
+# Statuses a fingerprint match may reuse (failed/cancelled jobs are retried)
+_REUSABLE_STATUSES = {JobStatus.PENDING.value, JobStatus.RUNNING.value, JobStatus.COMPLETED.value}
+# Statuses of jobs that are still queued or running somewhere
+_ACTIVE_STATUSES = {JobStatus.PENDING.value, JobStatus.RUNNING.value}
+
+
+def request_fingerprint(request: PipelineRequest) -> str:
+    """SHA-256 over everything that affects the output (keywords, company_url, language, options)."""
+    data = request.model_dump(mode="json", exclude={"dedupe"})
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _find_duplicate_job(
+    request: PipelineRequest,
+    idempotency_key: Optional[str],
+) -> Tuple[Optional[dict], str, List[str]]:
+    """
+    Look up the job a submission repeats.
+
+    An Idempotency-Key seen within API_IDEMPOTENCY_WINDOW_HOURS returns its
+    job whatever the job's status. Without a key match, an identical request
+    (fingerprint) within API_DEDUPE_WINDOW_MINUTES returns its job if the
+    request sets dedupe=true and the job has not failed or been cancelled.
+
+    Returns:
+        (existing job or None, fingerprint, keys to record for a new job)
+
+    Raises:
+        HTTPException: 422 if the Idempotency-Key was used for a different request
+    """
+    fingerprint = request_fingerprint(request)
+    now = datetime.utcnow()
+    keys = []
+
+    if idempotency_key:
+        key = f"key:{idempotency_key}"
+        keys.append(key)
+        for job in job_store.find_by_keys([key], since=now - timedelta(hours=API_IDEMPOTENCY_WINDOW_HOURS)):
+            if job["fingerprint"] != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used for a different request",
+                )
+            return job, fingerprint, keys
+
+    if request.dedupe:
+        key = f"fp:{fingerprint}"
+        keys.append(key)
+        for job in job_store.find_by_keys([key], since=now - timedelta(minutes=API_DEDUPE_WINDOW_MINUTES)):
+            if job["status"] in _REUSABLE_STATUSES:
+                return job, fingerprint, keys
+
+    # Keep the key table small: mappings older than both windows are useless
+    window = max(timedelta(hours=API_IDEMPOTENCY_WINDOW_HOURS), timedelta(minutes=API_DEDUPE_WINDOW_MINUTES))
+    job_store.expire_keys(before=now - window)
+    return None, fingerprint, keys
+
+
+# =============================================================================
+# Job Worker Pool (admission control)
+# =============================================================================
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no free slot."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobWorkerPool:
+    """
+    Runs API jobs on a fixed number of workers fed by a bounded FIFO queue.
+
+    At most max_workers pipelines run at once; up to max_queued further jobs
+    wait (status pending, with a queue position). Submissions beyond that are
+    rejected so the server never takes on more work than it can finish.
+
+    Workers are asyncio tasks started lazily on the running event loop and
+    restarted if the loop changes (e.g. test clients).
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[str, "PipelineRequest"], Awaitable[None]],
+        max_workers: int = API_MAX_CONCURRENT_JOBS,
+        max_queued: int = API_MAX_QUEUED_JOBS,
+    ):
+        """
+        Args:
+            runner: Coroutine function that runs one job (never raises)
+            max_workers: Jobs running at once
+            max_queued: Jobs allowed to wait for a worker
+        """
+        if max_workers < 1 or max_queued < 1:
+            raise ValueError(f"max_workers and max_queued must be at least 1, got {max_workers}, {max_queued}")
+        self._runner = runner
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._queue: Deque[Tuple[str, "PipelineRequest"]] = deque()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._durations: Deque[float] = deque(maxlen=20)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._available: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._queue) >= self.max_queued
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up (from recent job durations)."""
+        average = sum(self._durations) / len(self._durations) if self._durations else 300.0
+        # A slot frees when the next of max_workers running jobs finishes
+        return max(1, math.ceil(average / self.max_workers))
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based queue position of a pending job, None if not queued."""
+        for index, (queued_id, _) in enumerate(self._queue):
+            if queued_id == job_id:
+                return index + 1
+        return None
+
+    def submit(self, job_id: str, request: "PipelineRequest") -> int:
+        """
+        Queue a job.
+
+        Returns:
+            Queue position (1-based)
+
+        Raises:
+            QueueFullError: If max_queued jobs are already waiting
+        """
+        if self.is_full:
+            raise QueueFullError(self.retry_after())
+        self._ensure_workers()
+        self._queue.append((job_id, request))
+        self._available.release()
+        return len(self._queue)
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and not any(w.done() for w in self._workers):
+            return
+        for worker in self._workers:
+            worker.cancel()
+        self._loop = loop
+        self._available = asyncio.Semaphore(len(self._queue))
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.max_workers)
+        ]
+
+    async def cancel(self, job_id: str, timeout: float = 30.0) -> Optional[str]:
+        """
+        Cancel a queued or running job.
+
+        A queued job is removed from the queue. A running job's task is
+        cancelled and awaited (up to timeout) so the worker is free for the
+        next queued job when this returns.
+
+        Returns:
+            "queued" or "running" depending on where the job was, None if the
+            pool does not know the job
+        """
+        for entry in self._queue:
+            if entry[0] == job_id:
+                self._queue.remove(entry)
+                return "queued"
+        task = self._running.get(job_id)
+        if task is None:
+            return None
+        task.cancel()
+        await asyncio.wait({task}, timeout=timeout)
+        return "running"
+
+    async def _worker(self) -> None:
+        while True:
+            await self._available.acquire()
+            if not self._queue:
+                continue  # Job was cancelled while queued
+            job_id, request = self._queue.popleft()
+            start = time.monotonic()
+            # Own task per job, so cancelling a job leaves the worker running
+            task = asyncio.create_task(self._runner(job_id, request), name=f"job-{job_id}")
+            self._running[job_id] = task
+            try:
+                await asyncio.wait({task})
+                if not task.cancelled() and task.exception() is not None:
+                    e = task.exception()
+                    logger.error(f"Job worker: job {job_id} raised {type(e).__name__}: {e}")
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job_id, None)
+                self._durations.append(time.monotonic() - start)
+
+
+# Global worker pool
+job_pool = JobWorkerPool(run_pipeline_job)
+
+REGISTRY.gauge("openblog_jobs_queued", "API jobs waiting for a worker", callback=lambda: job_pool.queued)
+REGISTRY.gauge("openblog_jobs_running", "API jobs running on the worker pool", callback=lambda: job_pool.running)
 
 
 # =============================================================================
@@ -319,6 +932,23 @@ async def health():
     return await health_check()
 
 
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["Health"],
+    summary="Prometheus metrics",
+)
+async def metrics():
+    """
+    Process metrics in Prometheus text format.
+
+    Gemini latency/retries/timeouts by stage and model, Stage 4 URL check
+    latency and dead-URL counts, stage durations, job queue depth, articles
+    in flight, job outcomes and event loop lag.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
+
+
 @app.post(
     "/api/v1/jobs",
     response_model=JobResponse,
@@ -328,13 +958,23 @@ async def health():
 )
 async def create_job(
     request: PipelineRequest,
-    background_tasks: BackgroundTasks,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255),
 ):
     """
     Start a new blog generation pipeline job.
 
-    The job runs asynchronously in the background. Use the returned `job_id`
-    to check status via `GET /api/v1/jobs/{job_id}`.
+    Retries are safe: a request with a previously used `Idempotency-Key`, or
+    an identical request within the dedupe window when `dedupe` is true,
+    returns the existing job with `200` and `Idempotent-Replayed: true`
+    instead of starting another pipeline.
+
+    The job is queued and runs asynchronously on the job worker pool
+    (`API_MAX_CONCURRENT_JOBS` at once). Use the returned `job_id` to check
+    status and queue position via `GET /api/v1/jobs/{job_id}`.
+
+    When `API_MAX_QUEUED_JOBS` jobs are already waiting, the request is
+    rejected with `429 Too Many Requests` and a `Retry-After` header.
 
     **Example request:**
     ```json
@@ -348,20 +988,114 @@ async def create_job(
     }
     ```
     """
-    job_id = str(uuid.uuid4())
-    job = job_store.create(job_id, request)
-
-    # Start background task
-    background_tasks.add_task(run_pipeline_job, job_id, request)
+    existing, fingerprint, keys = _find_duplicate_job(request, idempotency_key)
+    if existing:
+        response.status_code = 200
+        response.headers["Idempotent-Replayed"] = "true"
+        return JobResponse(
+            job_id=existing["job_id"],
+            status=existing["status"],
+            message=f"Duplicate submission: returning existing job ({existing['status']}).",
+            created_at=existing["created_at"],
+        )
 
+    job, position = _submit_job(request, keys, fingerprint)
     return JobResponse(
-        job_id=job_id,
+        job_id=job["job_id"],
         status=JobStatus.PENDING,
-        message=f"Job created. Processing {len(request.keywords)} article(s).",
+        message=f"Job queued at position {position}. Processing {len(request.keywords)} article(s).",
         created_at=job["created_at"],
     )
 
 
+def _submit_job(request: PipelineRequest, keys: List[str], fingerprint: str) -> Tuple[dict, int]:
+    """
+    Create a job and queue it on the worker pool.
+
+    Returns:
+        (job, queue position)
+
+    Raises:
+        HTTPException: 429 with Retry-After if the job queue is full
+    """
+    if job_pool.is_full:
+        retry_after = job_pool.retry_after()
+        raise HTTPException(
+            status_code=429,
+            detail=f"Job queue is full ({job_pool.queued} waiting). Retry in {retry_after}s.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    job_id = str(uuid.uuid4())
+    job = job_store.create(job_id, request, keys=keys, fingerprint=fingerprint)
+    job_events.open(job_id)
+
+    position = job_pool.submit(job_id, request)
+    job_events.publish(
+        job_id,
+        {"event": "job_status", "status": JobStatus.PENDING.value, "queue_position": position, "timestamp": time.time()},
+    )
+    return job, position
+
+
+def _format_sse(event: dict) -> str:
+    """Format a progress event as a server-sent event."""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@app.get(
+    "/api/v1/jobs/{job_id}/events",
+    tags=["Jobs"],
+    summary="Stream job progress (server-sent events)",
+    response_class=StreamingResponse,
+)
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """
+    Stream progress events of a job as `text/event-stream`.
+
+    Events: `job_status`, `job_started`, `stage_started`, `stage_completed`,
+    `article_started`, `article_completed`, `article_failed`, `job_completed`,
+    `job_cancelled`.
+    Article events carry `article` (1-based index) and `keyword`; stage
+    events carry `stage` (stage1, stage0, stage2 ... stage5, export).
+
+    Past events are replayed on connect; reconnecting clients resume after
+    `Last-Event-ID`. The stream ends with the final `job_status` event. For
+    jobs that are not running in this server process, a single `job_status`
+    event with the stored status and progress is sent.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    if not job_events.knows(job_id):
+        snapshot = {
+            "id": 1,
+            "event": "job_status",
+            "status": job["status"],
+            "progress": job.get("progress"),
+            "error": job.get("error"),
+            "timestamp": time.time(),
+        }
+        return StreamingResponse(iter([_format_sse(snapshot)]), media_type="text/event-stream", headers=headers)
+
+    try:
+        after = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        after = 0
+
+    async def stream() -> AsyncIterator[str]:
+        async for event in job_events.subscribe(job_id, after=after):
+            yield _format_sse(event) if event is not None else ": keepalive\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+
 @app.get(
     "/api/v1/jobs",
     response_model=List[JobStatusResponse],
@@ -369,14 +1103,24 @@ async def create_job(
     summary="List all jobs",
 )
 async def list_jobs(
+    response: Response,
     limit: int = Query(default=50, ge=1, le=100, description="Max jobs to return"),
+    offset: int = Query(default=0, ge=0, description="Jobs to skip (pagination)"),
+    status: Optional[JobStatus] = Query(default=None, description="Only jobs with this status"),
 ):
-    """List all pipeline jobs, sorted by creation time (newest first)."""
-    jobs = job_store.list_all(limit=limit)
+    """
+    List pipeline jobs, sorted by creation time (newest first).
+
+    Paginate with `limit`/`offset`; the total number of matching jobs is
+    returned in the `X-Total-Count` header.
+    """
+    jobs = job_store.list_all(limit=limit, offset=offset, status=status)
+    response.headers["X-Total-Count"] = str(job_store.count(status=status))
     return [
         JobStatusResponse(
             job_id=job["job_id"],
             status=job["status"],
+            queue_position=job_pool.position(job["job_id"]),
             progress=job.get("progress"),
             result=None,  # Don't include full result in list view
             error=job.get("error"),
@@ -393,27 +1137,48 @@ async def list_jobs(
     tags=["Jobs"],
     summary="Get job status",
 )
-async def get_job(job_id: str):
+async def get_job(
+    job_id: str,
+    expand_urls: bool = Query(False, description="Return the Stage 1 sitemap as plain *_urls lists"),
+):
     """
     Get the status and result of a pipeline job.
 
-    Returns full result when job is completed.
+    Returns full result when job is completed. The Stage 1 sitemap in
+    `result.context` is compact (`url_origin`, `url_paths`, `url_labels`);
+    pass `expand_urls=true` for plain `blog_urls`, `tool_urls`, ... lists.
     """
     job = job_store.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
+    result = job_store.get_result(job_id) if job["has_result"] else None
     return JobStatusResponse(
         job_id=job["job_id"],
         status=job["status"],
+        queue_position=job_pool.position(job_id),
         progress=job.get("progress"),
-        result=job.get("result"),
+        result=_expand_sitemap_urls(result) if expand_urls else result,
         error=job.get("error"),
         created_at=job["created_at"],
         updated_at=job["updated_at"],
     )
 
 
+def _expand_sitemap_urls(result: Optional[dict]) -> Optional[dict]:
+    """Replace the compact sitemap in a job result's context with plain *_urls lists."""
+    sitemap = ((result or {}).get("context") or {}).get("sitemap")
+    if not sitemap:
+        return result
+    stage1_path = str(Path(__file__).parent / "stage1")
+    if stage1_path not in sys.path:
+        sys.path.insert(0, stage1_path)
+    from stage1_models import SitemapData
+
+    context = {**result["context"], "sitemap": SitemapData.model_validate(sitemap).model_dump()}
+    return {**result, "context": context}
+
+
 @app.delete(
     "/api/v1/jobs/{job_id}",
     status_code=204,
@@ -421,24 +1186,170 @@ async def get_job(job_id: str):
     summary="Delete a job",
 )
 async def delete_job(job_id: str):
-    """Delete a job and its results."""
+    """
+    Delete a job and its results. A queued or running job is cancelled first.
+
+    A pending or running job this process does not run (e.g. another
+    worker's) cannot be stopped here and returns `409 Conflict`.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if await job_pool.cancel(job_id) is None and job["status"] in _ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']} and not run by this process")
+    job_events.close(job_id)
+    _invalidate_job_caches(job_id)
     if not job_store.delete(job_id):
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     return None
 
 
+@app.post(
+    "/api/v1/jobs/{job_id}/cancel",
+    response_model=JobStatusResponse,
+    tags=["Jobs"],
+    summary="Cancel a job",
+)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job.
+
+    Running articles are stopped (including in-flight Gemini calls) and the
+    worker slot is released for the next queued job. Articles that finished
+    before the cancellation stay exported and are returned as the job result.
+    Cancelling a finished job, or one this process does not run, returns
+    `409 Conflict`.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job["status"] in (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} already {job['status']}")
+
+    where = await job_pool.cancel(job_id)
+    if where is None:
+        # Running elsewhere: recording CANCELLED would not stop it
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']} and not run by this process")
+    if where == "queued":
+        # Nothing ran, just record it
+        job_store.update(job_id, status=JobStatus.CANCELLED, error="Cancelled by request")
+        job_events.publish(job_id, {"event": "job_status", "status": JobStatus.CANCELLED.value, "timestamp": time.time()})
+        job_events.close(job_id)
+        JOBS_TOTAL.inc(outcome="cancelled")
+
+    return await get_job(job_id)
+
+
+# =============================================================================
+# Article Serving (in-memory LRU, conditional requests, pre-compressed variants)
+# =============================================================================
+
+# Media types of exported formats
+EXPORT_MEDIA_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "markdown": "text/markdown; charset=utf-8",
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_EXTENSIONS = {"markdown": "md"}
+
+# Served as whole bodies from the artifact cache; others stream from disk with range support
+CACHED_EXPORT_FORMATS = {"html", "markdown", "json", "csv"}
+
+# Completed jobs are immutable, so their files and article lists are cached
+# until evicted or the job is deleted
+artifact_cache = ArtifactCache(max_bytes=API_ARTIFACT_CACHE_MB * 1024 * 1024)
+ARTICLE_INDEX_CACHE_SIZE = 256
+_article_indexes: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+
+
+def _article_index(job_id: str) -> Dict[str, dict]:
+    """
+    Keyword -> {slug, exported_files, preview} for a completed job.
+
+    Built from the stored result once, so listing and serving articles does
+    not decompress the full pipeline result on every request.
+    """
+    index = _article_indexes.get(job_id)
+    if index is not None:
+        _article_indexes.move_to_end(job_id)
+        return index
+
+    result = job_store.get_result(job_id) or {}
+    index = {}
+    for article_result in result.get("results", []):
+        article = article_result.get("article") or {}
+        keyword = article_result.get("keyword", "")
+        index[keyword] = {
+            "slug": article_result.get("slug", keyword),
+            "exported_files": article_result.get("exported_files") or {},
+            "preview": {
+                "keyword": keyword,
+                "headline": article.get("Headline"),
+                "meta_description": article.get("Meta_Description"),
+                "word_count": article.get("Word_Count"),
+                "status": "completed" if article else "failed",
+            },
+        }
+    _article_indexes[job_id] = index
+    while len(_article_indexes) > ARTICLE_INDEX_CACHE_SIZE:
+        _article_indexes.popitem(last=False)
+    return index
+
+
+def _invalidate_job_caches(job_id: str) -> None:
+    _article_indexes.pop(job_id, None)
+    artifact_cache.invalidate(lambda key: key[0] == job_id)
+
+
+def _artifact_response(artifact: Artifact, request: Request) -> Response:
+    """Serve a cached artifact: negotiated encoding, validators, 304 when current."""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), artifact.variants)
+    headers = {
+        **artifact.headers,
+        "ETag": artifact.etag_for(encoding),
+        "Last-Modified": artifact.last_modified_http,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(
+        headers["ETag"],
+        artifact.last_modified,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    ):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=artifact.variants[encoding], media_type=artifact.media_type, headers=headers)
+
+
 @app.get(
     "/api/v1/jobs/{job_id}/articles",
     response_model=List[ArticlePreviewResponse],
     tags=["Articles"],
     summary="List articles for a job",
 )
-async def list_job_articles(job_id: str):
-    """Get a preview of all articles generated by a job."""
+async def list_job_articles(job_id: str, request: Request, response: Response):
+    """
+    Get a preview of all articles generated by a job.
+
+    Responses carry an `ETag` that changes whenever the job does; send it back
+    in `If-None-Match` to get `304 Not Modified` while nothing changed.
+    """
     job = job_store.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
+    version = f"{job_id}:{job['status']}:{job['updated_at']}"
+    etag = f'"{hashlib.sha1(version.encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(etag, 0, request.headers.get("if-none-match"), None):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
     if job["status"] != JobStatus.COMPLETED:
         return [
             ArticlePreviewResponse(
@@ -449,21 +1360,10 @@ async def list_job_articles(job_id: str):
             for kw in job["request"]["keywords"]
         ]
 
-    result = job.get("result", {})
-    articles = []
-
-    for article_result in result.get("results", []):
-        article = article_result.get("article", {})
-        articles.append(ArticlePreviewResponse(
-            job_id=job_id,
-            keyword=article_result.get("keyword", ""),
-            headline=article.get("Headline") if article else None,
-            meta_description=article.get("Meta_Description") if article else None,
-            word_count=article.get("Word_Count") if article else None,
-            status="completed" if article else "failed",
-        ))
-
-    return articles
+    return [
+        ArticlePreviewResponse(job_id=job_id, **entry["preview"])
+        for entry in _article_index(job_id).values()
+    ]
 
 
 def _sanitize_path_component(value: str) -> str:
@@ -476,19 +1376,27 @@ def _sanitize_path_component(value: str) -> str:
     return sanitized[:200]
 
 
-@app.get(
-    "/api/v1/jobs/{job_id}/articles/{keyword}/html",
-    tags=["Articles"],
-    summary="Get article HTML",
-)
-async def get_article_html(job_id: str, keyword: str):
-    """Get the rendered HTML for a specific article."""
+async def _serve_export(job_id: str, keyword: str, export_format: str, request: Request) -> Response:
+    """
+    Serve one exported file of an article.
+
+    Text formats come from the artifact cache (pre-compressed variants,
+    ETag/Last-Modified, 304). PDF/XLSX stream from disk with range support.
+    """
     # Validate job_id is a valid UUID to prevent injection
     try:
         uuid.UUID(job_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid job_id format")
 
+    # Sanitize keyword to prevent path traversal
+    safe_keyword = unquote(keyword)
+    cache_key = (job_id, safe_keyword, export_format)
+
+    artifact = artifact_cache.get(cache_key)
+    if artifact is not None:
+        return _artifact_response(artifact, request)
+
     job = job_store.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -496,29 +1404,109 @@ async def get_article_html(job_id: str, keyword: str):
     if job["status"] != JobStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Job not completed")
 
-    # Sanitize keyword to prevent path traversal
-    safe_keyword = unquote(keyword)
+    entry = _article_index(job_id).get(safe_keyword)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Article '{safe_keyword}' not found")
+
+    file_name = entry["exported_files"].get(export_format)
+    if not file_name:
+        raise HTTPException(status_code=404, detail=f"{export_format.upper()} file not found")
+
+    file_path = Path(file_name).resolve()
+    # Ensure file is within allowed output directory
+    allowed_base = Path("output").resolve()
+    if not str(file_path).startswith(str(allowed_base)):
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail=f"{export_format.upper()} file not found")
+
+    extension = EXPORT_EXTENSIONS.get(export_format, export_format)
+    filename = f"{_sanitize_path_component(entry['slug'] or keyword)}.{extension}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+
+    if export_format in CACHED_EXPORT_FORMATS:
+        artifact = await asyncio.to_thread(
+            Artifact.load,
+            file_path,
+            media_type,
+            {"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+        return _artifact_response(artifact_cache.put(cache_key, artifact), request)
+
+    # Large binaries: FileResponse handles Range/If-Range and sets ETag/Last-Modified
+    stat_result = await asyncio.to_thread(os.stat, file_path)
+    file_response = FileResponse(str(file_path), media_type=media_type, filename=filename, stat_result=stat_result)
+    if is_not_modified(
+        file_response.headers["etag"],
+        stat_result.st_mtime,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    ):
+        return Response(
+            status_code=304,
+            headers={k: file_response.headers[k] for k in ("etag", "last-modified")},
+        )
+    return file_response
 
-    result = job.get("result", {})
-    for article_result in result.get("results", []):
-        if article_result.get("keyword") == safe_keyword:
-            exported = article_result.get("exported_files", {})
-            html_path = exported.get("html")
-            if html_path:
-                file_path = Path(html_path).resolve()
-                # Ensure file is within allowed output directory
-                allowed_base = Path("output").resolve()
-                if not str(file_path).startswith(str(allowed_base)):
-                    raise HTTPException(status_code=403, detail="Access denied")
-                if file_path.exists():
-                    return FileResponse(
-                        str(file_path),
-                        media_type="text/html",
-                        filename=f"{_sanitize_path_component(article_result.get('slug', keyword))}.html"
-                    )
-            raise HTTPException(status_code=404, detail="HTML file not found")
-
-    raise HTTPException(status_code=404, detail=f"Article '{safe_keyword}' not found")
+
+@app.get(
+    "/api/v1/jobs/{job_id}/articles/{keyword}/html",
+    tags=["Articles"],
+    summary="Get article HTML",
+)
+async def get_article_html(job_id: str, keyword: str, request: Request):
+    """
+    Get the rendered HTML for a specific article.
+
+    Served gzip/brotli-encoded when the client accepts it, with `ETag` and
+    `Last-Modified` for conditional requests (`304 Not Modified`).
+    """
+    return await _serve_export(job_id, keyword, "html", request)
+
+
+@app.get(
+    "/api/v1/jobs/{job_id}/articles/{keyword}/files/{export_format}",
+    tags=["Articles"],
+    summary="Download an exported article file",
+)
+async def get_article_file(job_id: str, keyword: str, export_format: str, request: Request):
+    """
+    Download an article in one of the exported formats
+    (html, markdown, json, csv, xlsx, pdf).
+
+    PDF and XLSX downloads support `Range` requests, so large files can be
+    resumed or fetched in parts.
+    """
+    if export_format not in VALID_EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format. Valid: {sorted(VALID_EXPORT_FORMATS)}")
+    return await _serve_export(job_id, keyword, export_format, request)
+
+
+@app.post(
+    "/api/v1/estimate",
+    response_model=EstimateResponse,
+    tags=["Planning"],
+    summary="Estimate cost and latency of a batch",
+)
+async def estimate(request: EstimateRequest):
+    """
+    Predict AI calls, tokens, image generations and wall time before launching a batch.
+
+    Uses per-stage statistics recorded by previous runs; stages without
+    history fall back to built-in defaults (reported per stage as `source`).
+    """
+    from shared.cost_estimator import estimate_batch
+
+    result = await asyncio.to_thread(
+        estimate_batch,
+        num_articles=request.num_articles,
+        legal=request.enable_legal_research,
+        decision_sections=request.decision_sections,
+        stage3_iterations=request.stage3_iterations,
+        max_parallel=request.max_parallel,
+        skip_images=request.skip_images,
+    )
+    return EstimateResponse(**result)
 
 
 @app.post(
@@ -527,14 +1515,29 @@ async def get_article_html(job_id: str, keyword: str):
     summary="Generate article (synchronous)",
     response_class=JSONResponse,
 )
-async def generate_sync(request: PipelineRequest):
+async def generate_sync(
+    request: PipelineRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255),
+    expand_urls: bool = Query(False, description="Return the Stage 1 sitemap as plain *_urls lists"),
+):
     """
     Generate articles synchronously (blocking).
 
     **Warning:** This endpoint blocks until all articles are generated.
     For large batches, use the async job endpoint instead.
 
-    Returns the full pipeline result directly.
+    The call runs as a job on the job worker pool, so it waits for a free
+    worker, is rejected with `429` and `Retry-After` when the queue is full,
+    and is listed under `GET /api/v1/jobs`, where it can be cancelled like
+    any other job. Disconnecting cancels it as well.
+
+    Returns the full pipeline result directly. Each call is recorded as a job,
+    so a retry with the same `Idempotency-Key` (or, with `dedupe`, an
+    identical request within the dedupe window) returns the stored result,
+    or waits for the original call if it is still running, instead of
+    generating again. As with `GET /api/v1/jobs/{job_id}`, the Stage 1
+    sitemap is compact unless `expand_urls=true`.
     """
     if len(request.keywords) > 3:
         raise HTTPException(
@@ -542,21 +1545,43 @@ async def generate_sync(request: PipelineRequest):
             detail="Synchronous generation limited to 3 keywords. Use /api/v1/jobs for larger batches."
         )
 
-    output_dir = Path(f"output/api_sync/{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    result = await run_pipeline(
-        keywords=request.keywords,
-        company_url=str(request.company_url),
-        language=request.language,
-        market=request.market,
-        skip_images=request.skip_images,
-        max_parallel=request.max_parallel,
-        output_dir=output_dir,
-        export_formats=request.export_formats,
-    )
+    existing, fingerprint, keys = _find_duplicate_job(request, idempotency_key)
+    if existing:
+        response.headers["Idempotent-Replayed"] = "true"
+        if job_events.knows(existing["job_id"]):
+            # Original call (or async job) still running in this process
+            async for _ in job_events.subscribe(existing["job_id"]):
+                pass
+            existing = job_store.get(existing["job_id"]) or existing
+        if existing.get("has_result") and existing["status"] == JobStatus.COMPLETED.value:
+            result = job_store.get_result(existing["job_id"])
+            return _expand_sitemap_urls(result) if expand_urls else result
+        if existing["status"] == JobStatus.FAILED.value and idempotency_key:
+            raise HTTPException(status_code=500, detail=existing.get("error") or "Pipeline failed")
+        # Pending elsewhere, cancelled or failed without a key: generate again
+
+    job, _ = _submit_job(request, keys, fingerprint)
+    job_id = job["job_id"]
+    try:
+        async for _ in job_events.subscribe(job_id):
+            pass
+    except asyncio.CancelledError:
+        # Client disconnected: stop the job instead of finishing it for nobody
+        if await job_pool.cancel(job_id) == "queued":
+            job_store.update(job_id, status=JobStatus.CANCELLED, error="Client disconnected")
+            job_events.close(job_id)
+            JOBS_TOTAL.inc(outcome="cancelled")
+        raise
 
-    return result
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} was deleted")
+    if job["status"] == JobStatus.COMPLETED.value:
+        result = job_store.get_result(job_id)
+        return _expand_sitemap_urls(result) if expand_urls else result
+    if job["status"] == JobStatus.CANCELLED.value:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} was cancelled")
+    raise HTTPException(status_code=500, detail=job.get("error") or "Pipeline failed")
 
 
 # =============================================================================
@@ -14,6 +14,9 @@ Usage:
     # Use mock data (no Beck credentials needed)
     python -m beck_extract.beck_extract --titles "Kündigung" --mock
 
+    # Research 5 titles at once (parallel logged-in browser sessions)
+    python -m beck_extract.beck_extract --from-plan --pool-size 5
+
     # List stored resources
     python -m beck_extract.beck_extract --list
     python -m beck_extract.beck_extract --list --keyword "Kündigungsschutz"
@@ -37,6 +40,7 @@ load_dotenv(_PROJECT_ROOT / ".env")
 
 from shared.database import OpenBlogDB
 from beck_extract.beck_extractor import (
+    BECK_POOL_SIZE,
     extract_for_keywords,
     extract_from_content_plan,
 )
@@ -111,6 +115,10 @@ def main():
         "--mock", action="store_true",
         help="Use mock data (no Beck credentials needed)"
     )
+    parser.add_argument(
+        "--pool-size", type=int, default=BECK_POOL_SIZE,
+        help=f"Parallel Beck-Online browser sessions for live extraction (default: {BECK_POOL_SIZE})"
+    )
     parser.add_argument(
         "--keyword",
         help="Filter keyword for --list"
@@ -132,6 +140,7 @@ def main():
                 keywords=args.titles,
                 rechtsgebiet=args.rechtsgebiet,
                 use_mock=args.mock,
+                pool_size=args.pool_size,
             )
         )
     elif args.from_plan:
@@ -139,6 +148,7 @@ def main():
             extract_from_content_plan(
                 rechtsgebiet=args.rechtsgebiet,
                 use_mock=args.mock,
+                pool_size=args.pool_size,
             )
         )
     else:
@@ -7,9 +7,11 @@ and stores them in the SQLite database.
 This module wraps the existing research_via_beck_online() function and adds:
 - Persistent storage in SQLite
 - Per-keyword extraction (vs. per-batch in the pipeline)
+- Parallel live extraction over a pool of logged-in browser sessions
 - Content plan integration
 """
 
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -30,6 +32,7 @@ try:
     if str(_stage1_path) not in sys.path:
         sys.path.insert(0, str(_stage1_path))
 
+    from beck_session_pool import BeckSessionPool, BECK_POOL_SIZE
     from browser_agent import research_via_beck_online
     from legal_researcher import conduct_legal_research
 
@@ -37,6 +40,7 @@ try:
 except ImportError as e:
     logger.warning(f"Beck-Online browser agent not available: {e}")
     BECK_AVAILABLE = False
+    BECK_POOL_SIZE = 3
 
 
 async def extract_for_keyword(
@@ -44,6 +48,7 @@ async def extract_for_keyword(
     rechtsgebiet: Optional[str] = None,
     use_mock: bool = False,
     db: Optional[OpenBlogDB] = None,
+    pool: Optional["BeckSessionPool"] = None,
 ) -> Dict:
     """
     Extract Beck-Online resources for a single keyword and store in DB.
@@ -53,6 +58,7 @@ async def extract_for_keyword(
         rechtsgebiet: German legal area (auto-detected if None)
         use_mock: Use mock data instead of live Beck-Online
         db: Database instance (creates new one if None)
+        pool: Started session pool to research on (live mode only)
 
     Returns:
         Dict with keyword, rechtsgebiet, resources_count, resources, error
@@ -98,6 +104,7 @@ async def extract_for_keyword(
             legal_context = await research_via_beck_online(
                 keywords=[keyword],
                 rechtsgebiet=rechtsgebiet or "Arbeitsrecht",
+                pool=pool,
             )
 
         # Extract court decisions from LegalContext
@@ -137,47 +144,71 @@ async def extract_for_keywords(
     keywords: List[str],
     rechtsgebiet: Optional[str] = None,
     use_mock: bool = False,
+    pool_size: int = BECK_POOL_SIZE,
 ) -> Dict:
     """
-    Extract Beck-Online resources for multiple keywords sequentially.
+    Extract Beck-Online resources for multiple keywords.
 
-    Sequential to avoid overloading Beck-Online with concurrent browser sessions.
+    Live extraction runs up to pool_size keywords at once on a BeckSessionPool:
+    the sessions share one stored login and one page-load rate limit
+    (BECK_REQUESTS_PER_MINUTE), which keeps Beck-Online's captcha away without
+    fixed delays between keywords. Keywords with stored resources are skipped
+    before any browser is started.
 
     Args:
         keywords: List of article titles/keywords
         rechtsgebiet: German legal area (applied to all)
         use_mock: Use mock data
+        pool_size: Parallel browser sessions for live extraction
 
     Returns:
-        BeckExtractionOutput-compatible dict
+        BeckExtractionOutput-compatible dict (results in keyword order)
     """
     db = OpenBlogDB()
-    results = []
-    total_resources = 0
-    errors = []
+    pending = [kw for kw in keywords if not db.get_beck_resources(kw)]
 
-    for i, keyword in enumerate(keywords):
+    async def extract(i: int, keyword: str, pool: Optional["BeckSessionPool"] = None) -> Dict:
         logger.info(f"Extracting resources for ({i+1}/{len(keywords)}): {keyword}")
-        result = await extract_for_keyword(
+        return await extract_for_keyword(
             keyword=keyword,
             rechtsgebiet=rechtsgebiet,
             use_mock=use_mock,
             db=db,
+            pool=pool,
         )
-        results.append(result)
-        total_resources += result["resources_count"]
-        if result["error"]:
-            errors.append(f"{keyword}: {result['error']}")
-
-        # Rate limit: wait between keywords to avoid triggering Beck-Online captcha
-        if i < len(keywords) - 1 and not use_mock:
-            import asyncio
-            delay = 120  # 2 minutes between extractions
-            logger.info(f"Rate limiting: waiting {delay}s before next keyword...")
-            await asyncio.sleep(delay)
+
+    if use_mock or not BECK_AVAILABLE or not pending:
+        results = [await extract(i, keyword) for i, keyword in enumerate(keywords)]
+    else:
+        pool = BeckSessionPool(size=min(pool_size, len(pending)))
+        try:
+            await pool.start()
+        except Exception as e:
+            # No browser or login failed: every pending keyword fails the same way
+            logger.error(f"Beck-Online session pool failed to start: {type(e).__name__}: {e}")
+            results = [
+                await extract(i, keyword) if keyword not in pending else {
+                    "keyword": keyword,
+                    "rechtsgebiet": rechtsgebiet or "",
+                    "resources_count": 0,
+                    "resources": [],
+                    "error": str(e),
+                }
+                for i, keyword in enumerate(keywords)
+            ]
+        else:
+            try:
+                results = await asyncio.gather(
+                    *(extract(i, keyword, pool) for i, keyword in enumerate(keywords))
+                )
+            finally:
+                await pool.close()
+
+    total_resources = sum(r["resources_count"] for r in results)
+    errors = [f"{r['keyword']}: {r['error']}" for r in results if r["error"]]
 
     return {
-        "results": results,
+        "results": list(results),
         "total_resources": total_resources,
         "total_keywords": len(keywords),
         "errors": errors,
@@ -187,6 +218,7 @@ async def extract_for_keywords(
 async def extract_from_content_plan(
     rechtsgebiet: Optional[str] = None,
     use_mock: bool = False,
+    pool_size: int = BECK_POOL_SIZE,
 ) -> Dict:
     """
     Extract Beck-Online resources for all planned articles in content_plan table.
@@ -213,4 +245,6 @@ async def extract_from_content_plan(
             keywords.append(kw)
 
     logger.info(f"Found {len(keywords)} planned articles to extract resources for")
-    return await extract_for_keywords(keywords, rechtsgebiet=rechtsgebiet, use_mock=use_mock)
+    return await extract_for_keywords(
+        keywords, rechtsgebiet=rechtsgebiet, use_mock=use_mock, pool_size=pool_size
+    )
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+SitemapData Memory Benchmark - Compact URL storage vs. plain lists
+
+Generates classified sitemaps (50k and 500k URLs by default) and holds them
+two ways:
+
+- lists: the previous SitemapData layout, one Python str per URL in
+  per-category lists (reproduced here as LegacySitemapData)
+- compact: SitemapData (shared origin, front-coded paths, category bytes)
+
+Reports memory retained by the object (tracemalloc; the URL strings are
+created inside the measurement, as the crawler creates them), the size of
+the cache dump (compact_dump(), model_dump() for the list layout) as JSON
+and zlib-compressed (how the Stage 1 and sitemap caches store it), and the time to build the object and to iterate all URLs.
+
+Run: python benchmarks/bench_sitemap_data.py
+Run with custom sizes: python benchmarks/bench_sitemap_data.py --sizes 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from pydantic import BaseModel, Field
+
+_BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(_BASE_PATH / "stage1"))
+
+from stage1_models import URL_CATEGORIES, SitemapData  # noqa: E402
+
+DEFAULT_SIZES = [50_000, 500_000]
+
+# (category, section, share of URLs)
+LAYOUT = [
+    ("blog", "magazin", 0.45),
+    ("product", "produkte", 0.10),
+    ("service", "leistungen", 0.05),
+    ("resource", "ressourcen/whitepaper", 0.05),
+    ("docs", "hilfe", 0.05),
+    ("tool", "rechner", 0.05),
+    ("other", "de/standorte", 0.25),
+]
+
+
+class LegacySitemapData(BaseModel):
+    """SitemapData before the compact layout: one list of str per category."""
+    total_pages: int = 0
+    blog_urls: List[str] = Field(default_factory=list)
+    product_urls: List[str] = Field(default_factory=list)
+    service_urls: List[str] = Field(default_factory=list)
+    resource_urls: List[str] = Field(default_factory=list)
+    docs_urls: List[str] = Field(default_factory=list)
+    tool_urls: List[str] = Field(default_factory=list)
+    other_urls: List[str] = Field(default_factory=list)
+
+
+def make_groups(count: int) -> Dict[str, List[str]]:
+    """Classified URLs as the crawler produces them ({"blog_urls": [...], ...})."""
+    groups = {}
+    for category, section, share in LAYOUT:
+        groups[f"{category}_urls"] = [
+            f"https://www.example-publisher.de/{section}/beitrag-{i}-ueber-ein-wichtiges-thema"
+            for i in range(int(count * share))
+        ]
+    return groups
+
+
+def build_legacy(count: int) -> LegacySitemapData:
+    return LegacySitemapData(total_pages=count, **make_groups(count))
+
+
+def build_compact(count: int) -> SitemapData:
+    return SitemapData(total_pages=count, **make_groups(count))
+
+
+def measure(build: Callable[[int], BaseModel], count: int) -> Dict:
+    """Retained memory (separate tracemalloc run), build time, dump sizes, iteration time."""
+    gc.collect()
+    start = time.perf_counter()
+    data = build(count)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    urls = sum(1 for c in URL_CATEGORIES for _ in getattr(data, f"{c}_urls"))
+    iterate_seconds = time.perf_counter() - start
+
+    dumped = data.compact_dump() if isinstance(data, SitemapData) else data.model_dump()
+    dump = json.dumps(dumped).encode("utf-8")
+    del data
+
+    gc.collect()
+    tracemalloc.start()
+    data = build(count)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+
+    return {
+        "urls": urls,
+        "retained_mb": retained / (1024 * 1024),
+        "peak_mb": peak / (1024 * 1024),
+        "json_mb": len(dump) / (1024 * 1024),
+        "zlib_mb": len(zlib.compress(dump)) / (1024 * 1024),
+        "build_seconds": build_seconds,
+        "iterate_seconds": iterate_seconds,
+    }
+
+
+def run_size(count: int) -> List[Dict]:
+    """Benchmark one sitemap size and print a report."""
+    print(f"\n=== {count:,} URLs ===")
+    rows = []
+    for name, build in (("lists", build_legacy), ("compact", build_compact)):
+        row = measure(build, count)
+        row["case"] = name
+        rows.append(row)
+        print(f"  {name:<8} retained {row['retained_mb']:7.1f} MB (peak {row['peak_mb']:7.1f})  "
+              f"dump {row['json_mb']:6.1f} MB json / {row['zlib_mb']:5.1f} MB zlib  "
+              f"build {row['build_seconds']:5.2f}s  iterate {row['iterate_seconds']:5.2f}s")
+
+    lists, compact = rows
+    if lists["urls"] != compact["urls"]:
+        raise RuntimeError(f"compact holds {compact['urls']} URLs, lists {lists['urls']}")
+    print(f"  compact vs lists: {lists['retained_mb'] / compact['retained_mb']:.1f}x less memory, "
+          f"{lists['json_mb'] / compact['json_mb']:.1f}x smaller json, "
+          f"{lists['zlib_mb'] / compact['zlib_mb']:.1f}x smaller zlib")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SitemapData memory benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"URL counts to generate (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        run_size(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Sitemap Parser Benchmark - Streaming parser vs. full-tree parsing
+
+Generates synthetic sitemaps (50k and 500k URLs by default) and parses each
+one two ways:
+
+- tree: the previous approach, `ET.fromstring()` over the whole document and
+  `findall()` over the element tree
+- stream: `SitemapParser` fed in network-sized chunks (as the crawler does
+  with a streamed response), plain and gzipped
+
+Reports wall time and peak Python heap (tracemalloc, in a separate run).
+The document bytes are created before measuring, so neither side is charged
+for them (in the crawler, the streaming path never holds the full body).
+
+Run: python benchmarks/bench_sitemap_parser.py
+Run with custom sizes: python benchmarks/bench_sitemap_parser.py --sizes 10000 50000
+Skip the slow tree baseline: python benchmarks/bench_sitemap_parser.py --skip-tree
+"""
+
+import argparse
+import gc
+import gzip
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+_BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(_BASE_PATH / "stage1"))
+
+import xml.etree.ElementTree as ET  # noqa: E402
+
+from sitemap_crawler import SITEMAP_CHUNK_SIZE, SitemapParser, URLEntry  # noqa: E402
+
+DEFAULT_SIZES = [50_000, 500_000]
+SECTIONS = ["blog", "produkte", "ratgeber", "news", "service", "rechner"]
+
+
+def make_sitemap(count: int) -> bytes:
+    """Build a sitemap with count <url> entries carrying all optional fields."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    ]
+    for i in range(count):
+        section = SECTIONS[i % len(SECTIONS)]
+        parts.append(
+            f"<url><loc>https://www.example-publisher.de/{section}/artikel-{i}-ueber-ein-thema</loc>"
+            f"<lastmod>2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}</lastmod>"
+            f"<changefreq>weekly</changefreq><priority>0.{i % 9 + 1}</priority></url>\n"
+        )
+    parts.append("</urlset>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_tree(content: bytes) -> List[URLEntry]:
+    """Previous implementation: whole document into an element tree."""
+    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+    root = ET.fromstring(content)
+    entries = []
+    for url_elem in root.findall(".//sm:url", ns):
+        loc = url_elem.find("sm:loc", ns)
+        if loc is None or not loc.text:
+            continue
+        priority = url_elem.find("sm:priority", ns)
+        changefreq = url_elem.find("sm:changefreq", ns)
+        lastmod = url_elem.find("sm:lastmod", ns)
+        entries.append(URLEntry(
+            url=loc.text.strip(),
+            priority=float(priority.text) if priority is not None else None,
+            changefreq=changefreq.text.strip().lower() if changefreq is not None else None,
+            lastmod=lastmod.text.strip() if lastmod is not None else None,
+        ))
+    return entries
+
+
+def parse_stream(content: bytes) -> List[URLEntry]:
+    """Streaming implementation, fed chunk by chunk like a network response."""
+    parser = SitemapParser()
+    for offset in range(0, len(content), SITEMAP_CHUNK_SIZE):
+        parser.feed(content[offset:offset + SITEMAP_CHUNK_SIZE])
+    parser.close()
+    return parser.entries
+
+
+def measure(fn: Callable[[bytes], List[URLEntry]], content: bytes) -> Tuple[float, float, int]:
+    """
+    Run fn twice: once timed, once under tracemalloc (which slows it down).
+
+    Returns:
+        (seconds, peak heap MB, entries)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    count = len(fn(content))
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), count
+
+
+def run_size(count: int, skip_tree: bool) -> List[Dict]:
+    """Benchmark one sitemap size and print a report."""
+    plain = make_sitemap(count)
+    gzipped = gzip.compress(plain, compresslevel=6)
+    print(f"\n=== {count:,} URLs: {len(plain) / 1e6:.1f} MB xml, {len(gzipped) / 1e6:.1f} MB gzip ===")
+
+    cases = [] if skip_tree else [("tree", parse_tree, plain)]
+    cases += [("stream", parse_stream, plain), ("stream (gzip)", parse_stream, gzipped)]
+
+    rows = []
+    for name, fn, content in cases:
+        elapsed, peak_mb, parsed = measure(fn, content)
+        if parsed != count:
+            raise RuntimeError(f"{name} parsed {parsed} entries, expected {count}")
+        rows.append({"size": count, "case": name, "seconds": elapsed, "peak_mb": peak_mb})
+        print(f"  {name:<14} {elapsed:7.2f}s  peak heap {peak_mb:8.1f} MB  "
+              f"({count / elapsed:,.0f} URLs/s)")
+
+    if not skip_tree:
+        tree, stream = rows[0], rows[1]
+        print(f"  stream vs tree: {tree['peak_mb'] / stream['peak_mb']:.1f}x less memory, "
+              f"{tree['seconds'] / stream['seconds']:.1f}x speed")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming sitemap parser benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"URL counts to generate (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--skip-tree", action="store_true", help="Skip the full-tree baseline")
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        run_size(count, args.skip_tree)
+
+
+if __name__ == "__main__":
+    main()
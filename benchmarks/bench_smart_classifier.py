@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Smart Classifier Benchmark - URL classification scaling with sitemap size
+
+Generates synthetic sitemaps for a site without /blog/ URLs (the case the
+smart classifier exists for: long German slugs under language prefixes,
+calculators, location pages, legal pages) with a minority of pattern-matched
+blog URLs, and runs the crawler's full classification on each:
+
+- pattern pass: classify_url() per URL
+- smart pass: SmartClassifier URL structure, sitemap metadata and cluster
+  signals, then merging the new blogs into the pattern results
+
+Page sampling and AI discovery are disabled (sample size 0, no Gemini
+client), so only the CPU-bound scoring is measured. Reports wall time and
+microseconds per URL; linear scaling means the per-URL time stays flat as
+the sitemap grows.
+
+Run: python benchmarks/bench_smart_classifier.py
+Run with custom sizes: python benchmarks/bench_smart_classifier.py --sizes 1000 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+_BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(_BASE_PATH / "stage1"))
+
+from sitemap_crawler import SitemapCrawler, URLEntry  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Per-URL time at the largest size may be at most this multiple of the smallest
+MAX_PER_URL_GROWTH = 2.0
+
+WORDS = [
+    "wie", "viel", "haus", "kann", "ich", "mir", "leisten", "baufinanzierung",
+    "zinsen", "kredit", "eigenkapital", "tilgung", "grundbuch", "notar",
+    "kaufnebenkosten", "anschlussfinanzierung", "immobilie", "wohnung",
+]
+SECTIONS = ["ratgeber", "wissen", "finanzierung", "immobilien"]
+TOOLS = ["tilgungsrechner", "budgetrechner", "zinsrechner", "app", "login"]
+CITIES = ["stuttgart", "muenchen", "koeln", "leipzig", "monheim-am-rhein"]
+
+
+def make_sitemap(count: int, seed: int = 42) -> Dict[str, URLEntry]:
+    """Build count URLs with sitemap metadata; about 10% match /blog/."""
+    rng = random.Random(seed)
+    entries = {}
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.10:
+            path = f"de/blog/{'-'.join(rng.sample(WORDS, 5))}-{i}"
+        elif kind < 0.70:
+            path = f"de/{rng.choice(SECTIONS)}/{'-'.join(rng.sample(WORDS, rng.randint(2, 7)))}-{i}"
+        elif kind < 0.80:
+            path = f"de/{rng.choice(TOOLS)}-{i}"
+        elif kind < 0.95:
+            path = f"de/standorte/bayern/{rng.choice(CITIES)}-{i}"
+        else:
+            path = f"de/{rng.choice(['impressum', 'datenschutz', 'agb'])}/{i}"
+        url = f"https://www.example-lender.de/{path}"
+        entries[url] = URLEntry(
+            url=url,
+            priority=rng.choice([0.3, 0.5, 0.8]),
+            changefreq=rng.choice(["weekly", "monthly", "yearly"]),
+        )
+    return entries
+
+
+def classify(entries: Dict[str, URLEntry]):
+    """Run the crawler's classification (pattern pass + smart classifier)."""
+    crawler = SitemapCrawler(enable_ai_fallback=False, smart_classifier_sample_size=0)
+    crawler._url_metadata = entries
+    return asyncio.run(crawler._classify_urls_smart(list(entries)))
+
+
+def run_size(count: int) -> Dict:
+    """Benchmark one sitemap size and print a report."""
+    entries = make_sitemap(count)
+    gc.collect()
+    start = time.perf_counter()
+    result = classify(entries)
+    elapsed = time.perf_counter() - start
+
+    if not result.smart_classifier_used:
+        raise RuntimeError("smart classifier was not triggered")
+    per_url_us = elapsed / count * 1e6
+    print(f"  {count:>9,} URLs  {elapsed:7.2f}s  {per_url_us:6.1f} us/URL  "
+          f"({len(result.blog_urls):,} blog, {len(result.tool_urls):,} tool, "
+          f"{len(result.other_urls):,} other)")
+    return {"size": count, "seconds": elapsed, "per_url_us": per_url_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart classifier scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"URL counts to generate (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    args = parser.parse_args()
+
+    print("=== Sitemap URL classification ===")
+    rows = [run_size(count) for count in sorted(args.sizes)]
+
+    if len(rows) >= 2:
+        smallest, largest = rows[0], rows[-1]
+        growth = largest["per_url_us"] / smallest["per_url_us"]
+        verdict = "linear" if growth <= MAX_PER_URL_GROWTH else "SUPERLINEAR"
+        print(f"\nPer-URL time {smallest['size']:,} -> {largest['size']:,} URLs: "
+              f"{growth:.2f}x ({verdict}, budget {MAX_PER_URL_GROWTH:.1f}x)")
+        if growth > MAX_PER_URL_GROWTH:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Cold-start import cost of the CLI and the API
+
+Runs each entry point in a fresh interpreter with `-X importtime`, parses the
+per-module timings and checks the total against a budget:
+
+- cli: `python run_pipeline.py --help`
+- api: `python -c "import api"` (everything uvicorn does before serving)
+
+Stage modules, google-genai and the optional export/browser libraries must
+stay out of both paths; they are loaded on first use.
+
+Run: python benchmarks/bench_startup.py
+Run with custom budgets: python benchmarks/bench_startup.py --cli-budget 0.4 --api-budget 1.2
+Show more offenders: python benchmarks/bench_startup.py --top 25
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_BASE_PATH = Path(__file__).parent.parent
+
+# Budgets in seconds (median wall time over --runs fresh interpreters)
+DEFAULT_CLI_BUDGET = 0.5
+DEFAULT_API_BUDGET = 1.5
+
+# Modules that must never be imported at startup
+FORBIDDEN_AT_STARTUP = [
+    "google.genai",
+    "browser_use",
+    "openpyxl",
+    "docx",
+    "markdownify",
+    "PIL",
+]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+SCENARIOS = {
+    "cli": [str(_BASE_PATH / "run_pipeline.py"), "--help"],
+    "api": ["-c", "import api"],
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) tuples
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        depth = max(len(indent) - 1, 0) // 2
+        rows.append((module, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def run_scenario(args: List[str]) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """Run one scenario in a fresh interpreter; return (wall seconds, importtime rows)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=_BASE_PATH,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Scenario {args} exited with {proc.returncode}:\n{proc.stderr[-2000:]}")
+    return wall, parse_importtime(proc.stderr)
+
+
+def summarize(name: str, runs: int, budget: float, top: int) -> Dict:
+    """Benchmark one scenario and print a report."""
+    walls = []
+    rows: List[Tuple[str, int, int, int]] = []
+    for _ in range(runs):
+        wall, rows = run_scenario(SCENARIOS[name])
+        walls.append(wall)
+
+    median_wall = statistics.median(walls)
+    import_total = sum(cum for _, _, cum, depth in rows if depth == 0) / 1_000_000
+    loaded = {module for module, _, _, _ in rows}
+    forbidden = sorted(
+        m for m in FORBIDDEN_AT_STARTUP
+        if m in loaded or any(x.startswith(m + ".") for x in loaded)
+    )
+
+    print(f"\n=== {name}: {' '.join(SCENARIOS[name])} ===")
+    print(f"  wall (median of {runs}): {median_wall:.3f}s  budget: {budget:.3f}s")
+    print(f"  import time (top-level cumulative): {import_total:.3f}s, {len(rows)} modules")
+    print(f"  slowest top-level imports:")
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    for module, _, cumulative_us, _ in top_level[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+    if forbidden:
+        print(f"  [FAIL] heavy modules imported at startup: {', '.join(forbidden)}")
+
+    ok = median_wall <= budget and not forbidden
+    print(f"  [{'PASS' if ok else 'FAIL'}]")
+    return {"name": name, "wall": median_wall, "budget": budget, "forbidden": forbidden, "ok": ok}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for CLI and API")
+    parser.add_argument("--cli-budget", type=float, default=DEFAULT_CLI_BUDGET,
+                        help=f"Budget for `run_pipeline.py --help` in seconds (default: {DEFAULT_CLI_BUDGET})")
+    parser.add_argument("--api-budget", type=float, default=DEFAULT_API_BUDGET,
+                        help=f"Budget for `import api` in seconds (default: {DEFAULT_API_BUDGET})")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list (default: 10)")
+    parser.add_argument("--only", choices=sorted(SCENARIOS), help="Run a single scenario")
+    args = parser.parse_args()
+
+    budgets = {"cli": args.cli_budget, "api": args.api_budget}
+    names = [args.only] if args.only else list(SCENARIOS)
+    results = [summarize(name, args.runs, budgets[name], args.top) for name in names]
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    print("\n" + "=" * 50)
+    print(f"RESULTS: {len(results) - len(failed)} within budget, {len(failed)} over")
+    print("=" * 50)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,6 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from openpyxl import load_workbook
-
 from .plan_models import ContentPlanEntry
 
 logger = logging.getLogger(__name__)
@@ -112,6 +110,9 @@ def parse_content_plan(
     if not path.exists():
         raise FileNotFoundError(f"Content plan not found: {xlsx_path}")
 
+    # Imported here: openpyxl is only needed when a plan is actually parsed
+    from openpyxl import load_workbook
+
     wb = load_workbook(str(path), read_only=True, data_only=True)
 
     if sheet_name:
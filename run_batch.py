@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+OpenBlog Neo - Multi-Company Batch Runner
+
+Streams a JSONL file of pipeline jobs and runs them in one process, so
+stage modules, the google-genai connection pool and the Gemini limiter are
+shared by all jobs instead of being rebuilt per invocation.
+
+Input (one job per line, blank lines and lines starting with # are skipped):
+    {"company_url": "https://example.com", "keywords": ["kw 1", "kw 2"],
+     "options": {"language": "de", "market": "DE", "max_parallel": 2}}
+
+    options accepts the run_pipeline() keyword arguments: language, market,
+    skip_images, max_parallel, export_formats, enable_legal_research,
+    rechtsgebiet, use_mock_legal_data, legal_approach, extra_blog_urls,
+    budget, article_budget (budgets as {"max_tokens", "max_ai_calls", "max_seconds"}),
+    use_context_cache, refresh_context.
+    An optional "id" is copied to the result line.
+
+Output:
+    <output>/<line>_<domain>/            exported articles + pipeline_results.json
+    <output>/batch_results.jsonl         one summary line per job, in completion order
+
+Global limits:
+    --max-companies   jobs running at once
+    --max-articles    articles in flight across all jobs
+    --gemini-concurrency / --gemini-rpm   process-wide Gemini limits
+
+Repeat jobs for a company reuse its cached Stage 1 components (company
+context, voice persona, sitemap, legal research) from the persistent context
+cache, so only the first job per company pays for them.
+
+Usage:
+    python run_batch.py --input jobs.jsonl --output batch_results/
+    python run_batch.py -i jobs.jsonl -o out/ --max-companies 5 --max-articles 20 --gemini-rpm 120
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from run_pipeline import run_pipeline, _detect_rechtsgebiet
+from shared.budget import Budget
+
+# Stage modules use flat imports (same as run_pipeline's Stage 1 import)
+sys.path.insert(0, str(Path(__file__).parent / "stage1"))
+from context_cache import normalize_company_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_COMPANIES = 3
+DEFAULT_MAX_ARTICLES = 10
+
+# run_pipeline() arguments a job may set through "options"
+JOB_OPTIONS = {
+    "language",
+    "market",
+    "skip_images",
+    "max_parallel",
+    "export_formats",
+    "enable_legal_research",
+    "rechtsgebiet",
+    "use_mock_legal_data",
+    "legal_approach",
+    "extra_blog_urls",
+    "budget",
+    "article_budget",
+    "use_context_cache",
+    "refresh_context",
+}
+
+
+def iter_jobs(input_path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream jobs from a JSONL file.
+
+    Yields:
+        (line number, job dict). Unparseable lines are yielded as {"_error": ...}
+        so they still get a result line.
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be a JSON object")
+            except ValueError as e:
+                job = {"_error": f"Invalid JSON: {e}"}
+            yield line_number, job
+
+
+def build_pipeline_kwargs(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a job and convert it to run_pipeline() keyword arguments.
+
+    Raises:
+        ValueError: If required fields are missing or options are unknown
+    """
+    company_url = job.get("company_url")
+    keywords = job.get("keywords")
+    if not company_url or not isinstance(company_url, str):
+        raise ValueError("company_url is required")
+    if not keywords or not isinstance(keywords, list):
+        raise ValueError("keywords must be a non-empty list")
+
+    options = dict(job.get("options") or {})
+    unknown = set(options) - JOB_OPTIONS
+    if unknown:
+        raise ValueError(f"Unknown options: {sorted(unknown)}")
+
+    for key in ("budget", "article_budget"):
+        if options.get(key):
+            options[key] = Budget(**options[key])
+
+    if options.get("enable_legal_research") and not options.get("rechtsgebiet"):
+        options["rechtsgebiet"] = _detect_rechtsgebiet(keywords)
+
+    return {"keywords": keywords, "company_url": company_url, **options}
+
+
+class BatchRunner:
+    """Runs streamed jobs concurrently under global limits."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_companies: int = DEFAULT_MAX_COMPANIES,
+        max_articles: int = DEFAULT_MAX_ARTICLES,
+    ):
+        """
+        Args:
+            output_dir: Base directory for per-job output folders
+            max_companies: Jobs running at once
+            max_articles: Articles in flight across all jobs
+        """
+        self.output_dir = output_dir
+        self.max_companies = max_companies
+        self.max_articles = max_articles
+        self.completed = 0
+        self.failed = 0
+
+    async def run_job(
+        self,
+        line_number: int,
+        job: Dict[str, Any],
+        article_slots: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        """Run one job and return its result line (never raises)."""
+        start = time.monotonic()
+        line = {
+            "line": line_number,
+            "id": job.get("id"),
+            "company_url": job.get("company_url"),
+            "status": "failed",
+            "error": job.get("_error"),
+        }
+        if line["error"]:
+            return line
+
+        try:
+            kwargs = build_pipeline_kwargs(job)
+            domain = normalize_company_url(kwargs["company_url"]).split("/")[0]
+            job_dir = self.output_dir / f"{line_number:05d}_{domain}"
+
+            result = await run_pipeline(**kwargs, output_dir=job_dir, article_slots=article_slots)
+
+            job_dir.mkdir(parents=True, exist_ok=True)
+            results_file = job_dir / "pipeline_results.json"
+            with open(results_file, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+
+            line.update({
+                "status": "completed",
+                "job_id": result["job_id"],
+                "company": result["company"],
+                "articles_total": result["articles_total"],
+                "articles_successful": result["articles_successful"],
+                "articles_failed": result["articles_failed"],
+                "degradations": result["budget"]["degradations"],
+                "usage": result["budget"]["job"]["usage"],
+                "results_file": str(results_file),
+            })
+        except Exception as e:
+            logger.error(f"Job on line {line_number} failed: {type(e).__name__}: {e}")
+            logger.debug(f"Full exception for line {line_number}:", exc_info=True)
+            line["error"] = str(e)
+
+        line["duration_seconds"] = round(time.monotonic() - start, 1)
+        return line
+
+    async def run(self, input_path: Path, results_path: Path) -> Dict[str, int]:
+        """
+        Stream jobs from input_path and append one line per job to results_path.
+
+        At most max_companies jobs are read ahead, so memory stays flat for
+        arbitrarily long input files.
+
+        Returns:
+            Counts of completed and failed jobs
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        article_slots = asyncio.Semaphore(self.max_articles)
+        pending = set()
+
+        with open(results_path, "a", encoding="utf-8") as out:
+
+            def write(done) -> None:
+                for task in done:
+                    line = task.result()
+                    if line["status"] == "completed":
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    out.write(json.dumps(line, ensure_ascii=False) + "\n")
+                    out.flush()
+                    logger.info(
+                        f"[batch] line {line['line']} {line['status']} "
+                        f"({self.completed} completed, {self.failed} failed)"
+                    )
+
+            for line_number, job in iter_jobs(input_path):
+                if len(pending) >= self.max_companies:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    write(done)
+                pending.add(asyncio.create_task(self.run_job(line_number, job, article_slots)))
+
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                write(done)
+
+        return {"completed": self.completed, "failed": self.failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OpenBlog Neo - run many company jobs from a JSONL file"
+    )
+    parser.add_argument("--input", "-i", type=str, required=True, help="JSONL file with one job per line")
+    parser.add_argument("--output", "-o", type=str, required=True, help="Output directory")
+    parser.add_argument(
+        "--results",
+        type=str,
+        default=None,
+        help="Results JSONL file (default: <output>/batch_results.jsonl, appended)"
+    )
+    parser.add_argument(
+        "--max-companies",
+        type=int,
+        default=DEFAULT_MAX_COMPANIES,
+        help=f"Jobs running at once (default: {DEFAULT_MAX_COMPANIES})"
+    )
+    parser.add_argument(
+        "--max-articles",
+        type=int,
+        default=DEFAULT_MAX_ARTICLES,
+        help=f"Articles in flight across all jobs (default: {DEFAULT_MAX_ARTICLES})"
+    )
+    parser.add_argument(
+        "--gemini-concurrency",
+        type=int,
+        default=None,
+        help="Max Gemini calls in flight across all jobs (default: GEMINI_MAX_CONCURRENT or unlimited)"
+    )
+    parser.add_argument(
+        "--gemini-rpm",
+        type=float,
+        default=None,
+        help="Max Gemini calls per minute across all jobs (default: GEMINI_REQUESTS_PER_MINUTE or unlimited)"
+    )
+    args = parser.parse_args()
+
+    if args.max_companies < 1 or args.max_articles < 1:
+        parser.error("--max-companies and --max-articles must be at least 1")
+
+    if args.gemini_concurrency is not None or args.gemini_rpm is not None:
+        from shared.gemini_client import GEMINI_LIMITER, configure_gemini_limiter
+        configure_gemini_limiter(
+            max_concurrent=args.gemini_concurrency or GEMINI_LIMITER.max_concurrent,
+            per_minute=args.gemini_rpm or GEMINI_LIMITER.per_minute,
+        )
+
+    output_dir = Path(args.output)
+    results_path = Path(args.results) if args.results else output_dir / "batch_results.jsonl"
+
+    runner = BatchRunner(
+        output_dir=output_dir,
+        max_companies=args.max_companies,
+        max_articles=args.max_articles,
+    )
+    counts = asyncio.run(runner.run(Path(args.input), results_path))
+
+    logger.info(f"Batch complete: {counts['completed']} completed, {counts['failed']} failed")
+    logger.info(f"Results: {results_path}")
+    sys.exit(1 if counts["failed"] and not counts["completed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
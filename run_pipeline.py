@@ -38,22 +38,30 @@ Architecture:
 
 import asyncio
 import argparse
+import contextlib
 import copy
 import importlib.util
 import json
 import logging
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import Iterator, List, Optional
 
 from dotenv import load_dotenv
 
+from shared.budget import Budget, BudgetGuard, allow_optional, budget_scope
+from shared.metrics import ARTICLES_IN_FLIGHT, stage_timer
+from shared.progress import emit_progress
+from shared.usage_tracker import track_usage
+
 # Load .env from current directory
 load_dotenv(Path(__file__).parent / ".env")
 
 # =============================================================================
-# Module Loading - Done ONCE at import time for thread safety
+# Module Loading - Deferred until first use (see _get_stages)
 # =============================================================================
 
 _BASE_PATH = Path(__file__).parent
@@ -62,18 +70,8 @@ _BASE_PATH = Path(__file__).parent
 if str(_BASE_PATH) not in sys.path:
     sys.path.insert(0, str(_BASE_PATH))
 
-from shared.models import ArticleOutput
-from shared.html_renderer import HTMLRenderer
-from shared.article_exporter import ArticleExporter
-
-# Stage 0: Humanization Research (browser-use)
-try:
-    from stage0.humanization_agents import run_stage_0
-    from stage0.stage0_models import Stage0Output
-    STAGE0_AVAILABLE = True
-except ImportError:
-    STAGE0_AVAILABLE = False
-    Stage0Output = None
+# Stage 0: Humanization Research (httpx scrapers, loaded on first use)
+STAGE0_AVAILABLE = importlib.util.find_spec("httpx") is not None
 
 # Persistent storage for enrichment (Beck resources + webinar content)
 try:
@@ -194,45 +192,96 @@ def _load_module_from_path(module_name: str, file_path: Path):
     return module
 
 
-# Pre-load all stage modules at import time (thread-safe)
-# Stage 2
-_stage2_path = _BASE_PATH / "stage2"
-if str(_stage2_path) not in sys.path:
-    sys.path.insert(0, str(_stage2_path))
-from stage_2 import run_stage_2, Stage2Input, CompanyContext, VisualIdentity
-
-# Stage 3 - uniquely named models file, no collision risk
-_stage3_path = _BASE_PATH / "stage3"
-if str(_stage3_path) not in sys.path:
-    sys.path.insert(0, str(_stage3_path))
-_stage3_models = _load_module_from_path("stage3_models", _stage3_path / "stage3_models.py")
-Stage3Input = _stage3_models.Stage3Input
-_stage3_module = _load_module_from_path("stage_3_module", _stage3_path / "stage_3.py")
-run_stage_3 = _stage3_module.run_stage_3
-
-# Stage 4 - uniquely named models file, no collision risk
-_stage4_path = _BASE_PATH / "stage4"
-if str(_stage4_path) not in sys.path:
-    sys.path.insert(0, str(_stage4_path))
-_stage4_models = _load_module_from_path("stage4_models", _stage4_path / "stage4_models.py")
-Stage4Input = _stage4_models.Stage4Input
-_stage4_module = _load_module_from_path("stage_4_module", _stage4_path / "stage_4.py")
-run_stage_4 = _stage4_module.run_stage_4
-
-# Stage 5 - uniquely named models file, no collision risk
-_stage5_path = _BASE_PATH / "stage5"
-if str(_stage5_path) not in sys.path:
-    sys.path.insert(0, str(_stage5_path))
-_stage5_models = _load_module_from_path("stage5_models", _stage5_path / "stage5_models.py")
-_stage5_module = _load_module_from_path("stage_5_module", _stage5_path / "stage_5.py")
-run_stage_5 = _stage5_module.run_stage_5
-
-# Stage 2.5 - Legal Verification (optional, runs when legal_research_enabled)
-_stage25_path = _BASE_PATH / "stage2_5"
-if str(_stage25_path) not in sys.path:
-    sys.path.insert(0, str(_stage25_path))
-_stage25_module = _load_module_from_path("stage_2_5_module", _stage25_path / "stage_2_5.py")
-run_stage_25 = _stage25_module.run
+_stages: Optional[SimpleNamespace] = None
+_stages_lock = threading.Lock()
+
+
+def _load_stages() -> SimpleNamespace:
+    """
+    Import stage 2-5 modules and collect their entry points.
+
+    Stage modules pull in pydantic models, prompt files and the google-genai
+    import chain, so this is deferred until the first article is processed.
+    Call through _get_stages() - never directly.
+    """
+    # Stage 2
+    _stage2_path = _BASE_PATH / "stage2"
+    if str(_stage2_path) not in sys.path:
+        sys.path.insert(0, str(_stage2_path))
+    from stage_2 import run_stage_2, Stage2Input, CompanyContext, VisualIdentity
+
+    # Stage 3 - uniquely named models file, no collision risk
+    _stage3_path = _BASE_PATH / "stage3"
+    if str(_stage3_path) not in sys.path:
+        sys.path.insert(0, str(_stage3_path))
+    _load_module_from_path("stage3_models", _stage3_path / "stage3_models.py")
+    _stage3_module = _load_module_from_path("stage_3_module", _stage3_path / "stage_3.py")
+
+    # Stage 4 - uniquely named models file, no collision risk
+    _stage4_path = _BASE_PATH / "stage4"
+    if str(_stage4_path) not in sys.path:
+        sys.path.insert(0, str(_stage4_path))
+    _stage4_models = _load_module_from_path("stage4_models", _stage4_path / "stage4_models.py")
+    _stage4_module = _load_module_from_path("stage_4_module", _stage4_path / "stage_4.py")
+
+    # Stage 5 - uniquely named models file, no collision risk
+    _stage5_path = _BASE_PATH / "stage5"
+    if str(_stage5_path) not in sys.path:
+        sys.path.insert(0, str(_stage5_path))
+    _load_module_from_path("stage5_models", _stage5_path / "stage5_models.py")
+    _stage5_module = _load_module_from_path("stage_5_module", _stage5_path / "stage_5.py")
+
+    # Stage 2.5 - Legal Verification (optional, runs when legal_research_enabled)
+    _stage25_path = _BASE_PATH / "stage2_5"
+    if str(_stage25_path) not in sys.path:
+        sys.path.insert(0, str(_stage25_path))
+    _stage25_module = _load_module_from_path("stage_2_5_module", _stage25_path / "stage_2_5.py")
+
+    # Export helpers (renderer + exporter; heavy format libraries stay lazy inside)
+    from shared.html_renderer import HTMLRenderer
+    from shared.article_exporter import ArticleExporter
+
+    return SimpleNamespace(
+        run_stage_2=run_stage_2,
+        Stage2Input=Stage2Input,
+        CompanyContext=CompanyContext,
+        VisualIdentity=VisualIdentity,
+        run_stage_25=_stage25_module.run,
+        run_stage_3=_stage3_module.run_stage_3,
+        Stage4Input=_stage4_models.Stage4Input,
+        run_stage_4=_stage4_module.run_stage_4,
+        run_stage_5=_stage5_module.run_stage_5,
+        HTMLRenderer=HTMLRenderer,
+        ArticleExporter=ArticleExporter,
+    )
+
+
+def _get_stages() -> SimpleNamespace:
+    """
+    Return stage entry points, loading them once on first use.
+
+    Loading mutates sys.path and sys.modules, so it is guarded by a lock
+    (double-checked) to stay thread-safe when the API serves concurrent jobs.
+    """
+    global _stages
+    if _stages is None:
+        with _stages_lock:
+            if _stages is None:
+                _stages = _load_stages()
+    return _stages
+
+
+def _load_stage_0():
+    """Return Stage 0's run_stage_0, or None if it cannot be imported."""
+    if not STAGE0_AVAILABLE:
+        return None
+    try:
+        from stage0.humanization_agents import run_stage_0
+        return run_stage_0
+    except ImportError as e:
+        logger.warning(f"Stage 0 unavailable: {e}")
+        return None
+
 
 # Configure logging
 logging.basicConfig(
@@ -246,6 +295,29 @@ logger = logging.getLogger(__name__)
 # Pipeline Orchestration
 # =============================================================================
 
+@contextlib.contextmanager
+def _article_stage(result: dict, stage: str, article_index: Optional[int]) -> Iterator[None]:
+    """
+    Track one article stage: usage goes to result["usage"][stage], its
+    duration to the stage metrics, and stage_started/stage_completed
+    progress events are emitted around it.
+
+    A stage that raises gets no completion event; the article_failed event
+    emitted by process_single_article covers it.
+    """
+    emit_progress("stage_started", article=article_index, keyword=result["keyword"], stage=stage)
+    with stage_timer(stage), track_usage() as usage:
+        yield
+    result["usage"][stage] = usage.to_dict()
+    emit_progress(
+        "stage_completed",
+        article=article_index,
+        keyword=result["keyword"],
+        stage=stage,
+        duration_seconds=round(usage.elapsed_seconds, 1),
+    )
+
+
 async def process_single_article(
     context,
     article,
@@ -257,11 +329,13 @@ async def process_single_article(
     humanization_research: Optional[dict] = None,
     legal_approach: Optional[str] = None,
     rechtsgebiet: str = "",
+    article_budget: Optional[Budget] = None,
+    article_index: Optional[int] = None,
 ) -> dict:
     """
     Process one article through stages 2-5 sequentially.
 
-    Uses pre-loaded stage modules (loaded at import time for thread safety).
+    Stage modules are loaded on first call via _get_stages().
 
     Args:
         context: Stage1Output with company context, sitemap, etc.
@@ -271,11 +345,16 @@ async def process_single_article(
         export_formats: List of export formats (html, markdown, json, csv, xlsx, pdf)
         legal_research_enabled: Whether legal research was performed in Stage 1
         article_number: Folder number for output (e.g., 1 -> "001/")
+        article_budget: Token/AI-call/time limits for this article; optional
+                        steps are skipped (and listed in "degradations") when
+                        this or the job budget runs low
+        article_index: 1-based position in the job, reported in progress events
 
     Returns:
         Dict with article output and metadata
     """
     logger.info(f"  Processing article: {article.keyword}")
+    stages = _get_stages()
 
     result = {
         "keyword": article.keyword,
@@ -284,10 +363,19 @@ async def process_single_article(
         "article": None,
         "images": [],
         "reports": {},
+        "usage": {},
         "exported_files": {},
         "error": None,
     }
 
+    emit_progress("article_started", article=article_index, keyword=article.keyword)
+
+    article_scope = contextlib.ExitStack()
+    budget_guard = article_scope.enter_context(budget_scope(article_budget, scope="article"))
+    article_scope.enter_context(ARTICLES_IN_FLIGHT.track_inprogress())
+    # Live list: steps skipped because this article's or the job's budget ran low
+    result["degradations"] = budget_guard.degradations
+
     try:
         # -----------------------------------------
         # Stage 2: Blog Gen + Image Gen
@@ -351,21 +439,22 @@ async def process_single_article(
             except Exception as e:
                 logger.debug(f"    [Enrichment] DB lookup failed (non-fatal): {e}")
 
-        stage2_input = Stage2Input(
+        stage2_input = stages.Stage2Input(
             keyword=article.keyword,
-            company_context=CompanyContext(**company_ctx),
-            visual_identity=VisualIdentity(**visual_identity_data) if visual_identity_data else None,
+            company_context=stages.CompanyContext(**company_ctx),
+            visual_identity=stages.VisualIdentity(**visual_identity_data) if visual_identity_data else None,
             language=context.language,
             word_count=max(article.word_count or 2000, 4500) if rechtsgebiet else (article.word_count or 2000),
             job_id=context.job_id,
-            skip_images=skip_images,
+            skip_images=skip_images or not allow_optional("images"),
             legal_context=legal_context,
             humanization_research=humanization_research,
             legal_approach=legal_approach,
             webinar_content=webinar_content,
         )
 
-        stage2_output = await run_stage_2(stage2_input)
+        with _article_stage(result, "stage2", article_index):
+            stage2_output = await stages.run_stage_2(stage2_input)
         # Deep copy to prevent mutation side effects between stages
         article_dict = copy.deepcopy(stage2_output.article.model_dump())
         result["images"] = [img.model_dump() for img in stage2_output.images]
@@ -381,10 +470,11 @@ async def process_single_article(
         if legal_research_enabled and legal_context:
             logger.info(f"    [Stage 2.5] Legal verification...")
 
-            stage25_output = await run_stage_25({
-                "article": article_dict,
-                "legal_context": legal_context,
-            })
+            with _article_stage(result, "stage2_5", article_index):
+                stage25_output = await stages.run_stage_25({
+                    "article": article_dict,
+                    "legal_context": legal_context,
+                })
 
             # Deep copy to prevent mutation side effects
             article_dict = copy.deepcopy(stage25_output["article"])
@@ -428,18 +518,20 @@ async def process_single_article(
                 "first_person_usage": voice_data.get("first_person_usage", ""),
             }
 
-        stage3_output = await run_stage_3({
-            "article": article_dict,
-            "keyword": article.keyword,
-            "language": context.language,
-            "voice_context": voice_context,
-        })
+        with _article_stage(result, "stage3", article_index):
+            stage3_output = await stages.run_stage_3({
+                "article": article_dict,
+                "keyword": article.keyword,
+                "language": context.language,
+                "voice_context": voice_context,
+            })
 
         # Deep copy to prevent mutation side effects
         article_dict = copy.deepcopy(stage3_output["article"])
         result["reports"]["stage3"] = {
             "fixes_applied": stage3_output["fixes_applied"],
             "ai_calls": stage3_output["ai_calls"],
+            "budget_limited": stage3_output.get("budget_limited", False),
         }
         logger.info(f"    [Stage 3] ✓ Applied {stage3_output['fixes_applied']} fixes")
 
@@ -448,13 +540,15 @@ async def process_single_article(
         # -----------------------------------------
         logger.info(f"    [Stage 4] URL verification...")
 
-        stage4_input = Stage4Input(
+        stage4_input = stages.Stage4Input(
             article=article_dict,
             keyword=article.keyword,
             company_name=context.company_context.company_name,
+            verify_content=allow_optional("stage4_verification"),
         )
 
-        stage4_output = await run_stage_4(stage4_input)
+        with _article_stage(result, "stage4", article_index):
+            stage4_output = await stages.run_stage_4(stage4_input)
         # Deep copy to prevent mutation side effects
         article_dict = copy.deepcopy(stage4_output.article)
         result["reports"]["stage4"] = {
@@ -490,17 +584,18 @@ async def process_single_article(
         if len(resource_urls) > 20:
             logger.debug(f"    Truncating {len(resource_urls)} resource URLs to 20 for internal linking")
 
-        stage5_output = await run_stage_5({
-            "article": article_dict,
-            "current_href": article.href,
-            "company_url": context.company_context.company_url,
-            "batch_siblings": batch_siblings,
-            "sitemap_blog_urls": blog_urls[:50],
-            "sitemap_resource_urls": resource_urls[:20],
-            "sitemap_tool_urls": tool_urls[:10],
-            "sitemap_product_urls": product_urls[:10],
-            "sitemap_service_urls": service_urls[:5],
-        })
+        with _article_stage(result, "stage5", article_index):
+            stage5_output = await stages.run_stage_5({
+                "article": article_dict,
+                "current_href": article.href,
+                "company_url": context.company_context.company_url,
+                "batch_siblings": batch_siblings,
+                "sitemap_blog_urls": blog_urls[:50],
+                "sitemap_resource_urls": resource_urls[:20],
+                "sitemap_tool_urls": tool_urls[:10],
+                "sitemap_product_urls": product_urls[:10],
+                "sitemap_service_urls": service_urls[:5],
+            })
 
         # Deep copy to prevent mutation side effects
         article_dict = copy.deepcopy(stage5_output["article"])
@@ -537,9 +632,10 @@ async def process_single_article(
         # -----------------------------------------
         if output_dir:
             logger.info(f"    [Export] Exporting article...")
+            emit_progress("stage_started", article=article_index, keyword=article.keyword, stage="export")
 
             # Render HTML
-            html_content = HTMLRenderer.render(
+            html_content = stages.HTMLRenderer.render(
                 article=article_dict,
                 company_name=context.company_context.company_name,
                 company_url=context.company_context.company_url,
@@ -554,7 +650,7 @@ async def process_single_article(
             else:
                 folder_name = article.slug
             article_output_dir = output_dir / folder_name
-            exported = ArticleExporter.export_all(
+            exported = stages.ArticleExporter.export_all(
                 article=article_dict,
                 html_content=html_content,
                 output_dir=article_output_dir,
@@ -577,6 +673,8 @@ async def process_single_article(
                 result["exported_files"]["legal_sources"] = str(legal_log_path)
                 logger.info(f"    [Export] ✓ Exported legal sources log")
 
+            emit_progress("stage_completed", article=article_index, keyword=article.keyword, stage="export")
+
         result["article"] = article_dict
         logger.info(f"  ✓ Article complete: {article.keyword}")
 
@@ -587,10 +685,84 @@ async def process_single_article(
         # Log exception details at debug level (avoid exposing sensitive data in production logs)
         logger.debug(f"Full exception for {article.keyword}:", exc_info=True)
         result["error"] = str(e)
+    finally:
+        article_scope.close()
 
+    if result["error"]:
+        emit_progress("article_failed", article=article_index, keyword=article.keyword, error=result["error"])
+    else:
+        emit_progress("article_completed", article=article_index, keyword=article.keyword)
     return result
 
 
+def _collect_stage_samples(
+    mode: str,
+    stage1_usage: dict,
+    stage0_usages: List[dict],
+    results: List[dict],
+) -> List[dict]:
+    """
+    Build stage_stats samples from a finished run.
+
+    Only completed articles contribute Stage 2-5 samples, so failures
+    part-way through do not skew the averages downwards.
+    """
+    samples = [{"stage": "stage1", "mode": mode, **stage1_usage}]
+    samples.extend({"stage": "stage0", "mode": mode, **usage} for usage in stage0_usages)
+    for result in results:
+        if result.get("error"):
+            continue
+        for stage, usage in result.get("usage", {}).items():
+            samples.append({"stage": stage, "mode": mode, **usage})
+    return samples
+
+
+PARTIAL_RESULTS_FILE = "pipeline_partial.json"
+
+
+async def _checkpoint_cancelled_job(
+    article_tasks: List[asyncio.Task],
+    context,
+    output_dir: Optional[Path],
+    start_time: datetime,
+) -> dict:
+    """
+    Stop all article tasks of a cancelled job and save what was finished.
+
+    Articles that completed before the cancellation are already exported;
+    their results are written to output_dir/pipeline_partial.json so that the
+    caller (API, CLI) can still report them.
+
+    Returns:
+        The partial result dict
+    """
+    for task in article_tasks:
+        task.cancel()
+    await asyncio.wait(article_tasks)
+
+    completed = [
+        task.result() for task in article_tasks
+        if not task.cancelled() and task.exception() is None and not task.result().get("error")
+    ]
+    partial = {
+        "job_id": context.job_id,
+        "company": context.company_context.company_name,
+        "cancelled": True,
+        "duration_seconds": (datetime.now() - start_time).total_seconds(),
+        "articles_total": len(article_tasks),
+        "articles_successful": len(completed),
+        "results": completed,
+        "created_at": start_time.isoformat(),
+    }
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(output_dir / PARTIAL_RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump(partial, f, indent=2, default=str)
+    logger.warning(f"Pipeline cancelled: {len(completed)}/{len(article_tasks)} articles completed")
+    emit_progress("job_cancelled", articles_total=len(article_tasks), articles_successful=len(completed))
+    return partial
+
+
 async def run_pipeline(
     keywords: List[str],
     company_url: str,
@@ -605,6 +777,12 @@ async def run_pipeline(
     use_mock_legal_data: bool = True,
     legal_approach: Optional[str] = None,
     extra_blog_urls: Optional[List[str]] = None,
+    budget: Optional[Budget] = None,
+    article_budget: Optional[Budget] = None,
+    company_context: Optional[dict] = None,
+    article_slots: Optional[asyncio.Semaphore] = None,
+    use_context_cache: bool = True,
+    refresh_context: Optional[List[str]] = None,
 ) -> dict:
     """
     Run full pipeline: Stage 1 once, then Stages 2-5 for each article in parallel.
@@ -621,10 +799,62 @@ async def run_pipeline(
         enable_legal_research: Enable legal research in Stage 1 (for law firms)
         rechtsgebiet: German legal area (Arbeitsrecht, Mietrecht, etc.)
         use_mock_legal_data: Use mock legal data instead of Beck-Online
+        budget: Token/AI-call/time limits for the whole job
+        article_budget: Token/AI-call/time limits applied to each article
+        company_context: Known company context (skips OpenContext in Stage 1)
+        article_slots: Semaphore shared with other jobs to cap articles in flight
+        use_context_cache: Reuse cached Stage 1 components for this company
+        refresh_context: Stage 1 cache components to recompute ("all" for every one)
 
     Returns:
         Dict with pipeline results
     """
+    with budget_scope(budget, scope="job") as job_guard:
+        return await _run_pipeline(
+            job_guard,
+            keywords=keywords,
+            company_url=company_url,
+            language=language,
+            market=market,
+            skip_images=skip_images,
+            max_parallel=max_parallel,
+            output_dir=output_dir,
+            export_formats=export_formats,
+            enable_legal_research=enable_legal_research,
+            rechtsgebiet=rechtsgebiet,
+            use_mock_legal_data=use_mock_legal_data,
+            legal_approach=legal_approach,
+            extra_blog_urls=extra_blog_urls,
+            article_budget=article_budget,
+            company_context=company_context,
+            article_slots=article_slots,
+            use_context_cache=use_context_cache,
+            refresh_context=refresh_context,
+        )
+
+
+async def _run_pipeline(
+    job_guard: BudgetGuard,
+    keywords: List[str],
+    company_url: str,
+    language: str = "de",
+    market: str = "DE",
+    skip_images: bool = False,
+    max_parallel: Optional[int] = None,
+    output_dir: Optional[Path] = None,
+    export_formats: Optional[List[str]] = None,
+    enable_legal_research: bool = False,
+    rechtsgebiet: str = "Arbeitsrecht",
+    use_mock_legal_data: bool = True,
+    legal_approach: Optional[str] = None,
+    extra_blog_urls: Optional[List[str]] = None,
+    article_budget: Optional[Budget] = None,
+    company_context: Optional[dict] = None,
+    article_slots: Optional[asyncio.Semaphore] = None,
+    use_context_cache: bool = True,
+    refresh_context: Optional[List[str]] = None,
+) -> dict:
+    """Body of run_pipeline(), run inside the job's budget scope."""
     start_time = datetime.now()
     logger.info("=" * 60)
     logger.info("OpenBlog Neo Pipeline")
@@ -633,6 +863,7 @@ async def run_pipeline(
     logger.info(f"Company: {company_url}")
     logger.info(f"Language: {language}, Market: {market}")
     logger.info("=" * 60)
+    emit_progress("job_started", articles_total=len(keywords))
 
     # Import Stage 1
     sys.path.insert(0, str(Path(__file__).parent / "stage1"))
@@ -653,9 +884,21 @@ async def run_pipeline(
         rechtsgebiet=rechtsgebiet,
         use_mock_legal_data=use_mock_legal_data,
         extra_blog_urls=extra_blog_urls or [],
+        company_context=company_context,
+        use_context_cache=use_context_cache,
+        refresh_context=refresh_context or [],
     )
 
-    context = await run_stage_1(input_data)
+    emit_progress("stage_started", stage="stage1")
+    with stage_timer("stage1"), track_usage() as stage1_usage:
+        context = await run_stage_1(input_data)
+    emit_progress(
+        "stage_completed",
+        stage="stage1",
+        duration_seconds=round(stage1_usage.elapsed_seconds, 1),
+        articles_total=len(context.articles),
+        cached_components=list(getattr(context, "cached_components", []) or []),
+    )
 
     logger.info(f"  Company: {context.company_context.company_name}")
     logger.info(f"  Articles: {len(context.articles)}")
@@ -673,14 +916,19 @@ async def run_pipeline(
     # Stage 0: Humanization Research (runs once per keyword)
     # -----------------------------------------
     humanization_data = {}  # keyword -> Stage0Output dict
-    if STAGE0_AVAILABLE:
+    stage0_usages = []
+    run_stage_0 = _load_stage_0()
+    if run_stage_0:
         logger.info("\n[Stage 0] Humanization Research (PAA + Forums + Competitors)")
         for article in context.articles:
+            emit_progress("stage_started", keyword=article.keyword, stage="stage0")
             try:
-                stage0_output = await asyncio.wait_for(
-                    run_stage_0(article.keyword, language),
-                    timeout=120,  # 2 min max for Stage 0
-                )
+                with stage_timer("stage0"), track_usage() as stage0_usage:
+                    stage0_output = await asyncio.wait_for(
+                        run_stage_0(article.keyword, language),
+                        timeout=120,  # 2 min max for Stage 0
+                    )
+                stage0_usages.append(stage0_usage.to_dict())
                 humanization_data[article.keyword] = stage0_output.model_dump()
                 logger.info(
                     f"  {article.keyword}: {len(stage0_output.paa_questions)} PAA, "
@@ -688,11 +936,15 @@ async def run_pipeline(
                     f"{len(stage0_output.competitor_headings)} competitors"
                 )
             except BaseException as e:
-                # Catch BaseException to handle CancelledError, TimeoutError, etc.
+                # Catch BaseException to handle CancelledError, TimeoutError, etc.,
+                # but let cancellation of the job itself propagate
+                if isinstance(e, asyncio.CancelledError) and asyncio.current_task().cancelling():
+                    raise
                 logger.warning(f"  Stage 0 failed for {article.keyword} (non-fatal): {type(e).__name__}: {e}")
                 humanization_data[article.keyword] = {}
+            emit_progress("stage_completed", keyword=article.keyword, stage="stage0")
     else:
-        logger.info("\n[Stage 0] Skipped (browser-use not installed)")
+        logger.info("\n[Stage 0] Skipped (httpx not installed)")
 
     # -----------------------------------------
     # Stages 2-5: Per article (parallel)
@@ -715,24 +967,37 @@ async def run_pipeline(
             humanization_research=humanization_data.get(article.keyword),
             legal_approach=legal_approach,
             rechtsgebiet=rechtsgebiet,
+            article_budget=article_budget,
+            article_index=i + 1,
         )
         for i, article in enumerate(context.articles)
     ]
 
-    # Run with optional concurrency limit
+    # Run with optional concurrency limits: per job, then shared across jobs (batch runner)
     # Use return_exceptions=True to prevent one failed article from stopping all processing
+    limits = []
     if max_parallel and max_parallel > 0:
-        # Use semaphore to limit concurrency
-        semaphore = asyncio.Semaphore(max_parallel)
+        limits.append(asyncio.Semaphore(max_parallel))
+    if article_slots is not None:
+        limits.append(article_slots)
 
+    if limits:
         async def limited_task(task):
-            async with semaphore:
+            async with contextlib.AsyncExitStack() as stack:
+                for limit in limits:
+                    await stack.enter_async_context(limit)
                 return await task
 
-        results = await asyncio.gather(*[limited_task(t) for t in tasks], return_exceptions=True)
-    else:
-        # Unlimited parallelism
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [limited_task(t) for t in tasks]
+
+    # Job-scoped tasks: cancelling the job cancels every article, and the
+    # articles finished so far are checkpointed before the cancellation propagates
+    article_tasks = [asyncio.create_task(t) for t in tasks]
+    try:
+        results = await asyncio.gather(*article_tasks, return_exceptions=True)
+    except asyncio.CancelledError:
+        await _checkpoint_cancelled_job(article_tasks, context, output_dir, start_time)
+        raise
 
     # Handle any exceptions that were returned
     processed_results = []
@@ -763,7 +1028,26 @@ async def run_pipeline(
     logger.info("=" * 60)
     logger.info(f"Duration: {duration:.1f}s")
     logger.info(f"Articles: {successful} successful, {failed} failed")
+    degradations = sum(len(r.get("degradations", [])) for r in results)
+    if degradations:
+        logger.info(f"Budget: {degradations} optional steps skipped")
     logger.info("=" * 60)
+    emit_progress(
+        "job_completed",
+        articles_total=len(results),
+        articles_successful=successful,
+        articles_failed=failed,
+        duration_seconds=round(duration, 1),
+    )
+
+    # Record per-stage usage as history for the cost estimator (non-fatal)
+    if DB_AVAILABLE:
+        mode = "legal" if legal_research_enabled else "standard"
+        samples = _collect_stage_samples(mode, stage1_usage.to_dict(), stage0_usages, results)
+        try:
+            OpenBlogDB().record_stage_stats(samples, job_id=context.job_id)
+        except Exception as e:
+            logger.warning(f"Could not record stage statistics: {e}")
 
     return {
         "job_id": context.job_id,
@@ -774,8 +1058,13 @@ async def run_pipeline(
         "articles_total": len(results),
         "articles_successful": successful,
         "articles_failed": failed,
-        "context": context.model_dump(),
+        "context": context.compact_dump(),
         "results": results,
+        "budget": {
+            "job": job_guard.summary(),
+            "article": article_budget.to_dict() if article_budget else None,
+            "degradations": degradations,
+        },
         "created_at": start_time.isoformat(),
     }
 
@@ -839,6 +1128,16 @@ def _detect_rechtsgebiet(keywords: List[str]) -> str:
     return "Arbeitsrecht"
 
 
+def _budget_from_args(
+    max_tokens: Optional[int],
+    max_ai_calls: Optional[int],
+    max_seconds: Optional[float],
+) -> Optional[Budget]:
+    """Build a Budget from CLI flags (None if no limit was given)."""
+    budget = Budget(max_tokens=max_tokens, max_ai_calls=max_ai_calls, max_seconds=max_seconds)
+    return budget if budget.is_limited else None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="OpenBlog Neo - AI Blog Generation Pipeline"
@@ -932,8 +1231,89 @@ def main():
         help="Legal article generation approach: approach_a (direct paraphrasing) or approach_b (context synthesis)"
     )
 
+    cache_group = parser.add_argument_group("context cache")
+    cache_group.add_argument(
+        "--no-context-cache",
+        dest="use_context_cache",
+        action="store_false",
+        help="Ignore and do not update the Stage 1 context cache"
+    )
+    cache_group.add_argument(
+        "--refresh-context",
+        type=str,
+        nargs="+",
+        default=[],
+        choices=["company_context", "voice_persona", "sitemap", "legal_context", "all"],
+        help="Stage 1 cache components to recompute even if fresh"
+    )
+
+    budget_group = parser.add_argument_group(
+        "budgets",
+        "When a budget runs low, optional steps (images, 2nd Stage 3 iteration, "
+        "Stage 4 content verification) are skipped and listed in the report",
+    )
+    for prefix, scope in (("", "job"), ("article-", "article")):
+        budget_group.add_argument(
+            f"--{prefix}max-tokens",
+            type=int,
+            default=None,
+            help=f"Max prompt+output tokens per {scope}"
+        )
+        budget_group.add_argument(
+            f"--{prefix}max-ai-calls",
+            type=int,
+            default=None,
+            help=f"Max Gemini calls per {scope}"
+        )
+        budget_group.add_argument(
+            f"--{prefix}max-wall-time",
+            type=float,
+            default=None,
+            help=f"Max wall time per {scope} in seconds"
+        )
+
+    estimate_group = parser.add_argument_group("estimation")
+    estimate_group.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Print predicted AI calls, tokens, images and wall time, then exit (no --url needed)"
+    )
+    estimate_group.add_argument(
+        "--decision-sections",
+        type=int,
+        default=8,
+        help="Expected sections per decision-centric legal article (default: 8)"
+    )
+    estimate_group.add_argument(
+        "--stage3-iterations",
+        type=int,
+        default=2,
+        help="Stage 3 self-critique iteration limit (default: 2)"
+    )
+
     args = parser.parse_args()
 
+    if args.estimate:
+        if args.input:
+            with open(args.input, "r") as f:
+                num_articles = len(json.load(f).get("keywords", []))
+        elif args.keywords:
+            num_articles = len(args.keywords)
+        else:
+            parser.error("--estimate needs --keywords or --input")
+
+        from shared.cost_estimator import estimate_batch
+        estimate = estimate_batch(
+            num_articles=num_articles,
+            legal=args.enable_legal_research,
+            decision_sections=args.decision_sections,
+            stage3_iterations=args.stage3_iterations,
+            max_parallel=args.max_parallel,
+            skip_images=args.skip_images,
+        )
+        print(json.dumps(estimate, indent=2))
+        return
+
     # Get input from file or CLI args
     if args.input:
         with open(args.input, "r") as f:
@@ -979,6 +1359,12 @@ def main():
         use_mock_legal_data=args.use_mock_legal_data,
         legal_approach=args.legal_approach,
         extra_blog_urls=getattr(args, 'extra_blog_urls', None),
+        use_context_cache=args.use_context_cache,
+        refresh_context=args.refresh_context,
+        budget=_budget_from_args(args.max_tokens, args.max_ai_calls, args.max_wall_time),
+        article_budget=_budget_from_args(
+            args.article_max_tokens, args.article_max_ai_calls, args.article_max_wall_time
+        ),
     ))
 
     # Save output
@@ -5,36 +5,43 @@ Shared components for openblog-neo pipeline.
 - ArticleOutput: Structured blog article schema
 - Constants: Shared configuration
 - Field Utils: Derive field categories from ArticleOutput (DRY)
+
+Exports are resolved lazily (PEP 562) so that importing a single submodule,
+e.g. ``shared.database``, does not pull in pydantic, httpx or the exporters.
 """
 
-from .gemini_client import GeminiClient
-from .models import ArticleOutput, Source, ComparisonTable
-from .constants import GEMINI_MODEL, MAX_SITEMAP_URLS
-from .field_utils import (
-    get_content_fields,
-    get_html_content_fields,
-    get_url_extraction_fields,
-    iter_content_fields,
-    iter_html_fields,
-    iter_url_fields,
-)
-from .article_exporter import ArticleExporter
-from .html_renderer import HTMLRenderer
-
-__all__ = [
-    "GeminiClient",
-    "ArticleOutput",
-    "Source",
-    "ComparisonTable",
-    "ArticleExporter",
-    "HTMLRenderer",
-    "GEMINI_MODEL",
-    "MAX_SITEMAP_URLS",
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "GeminiClient": ".gemini_client",
+    "ArticleOutput": ".models",
+    "Source": ".models",
+    "ComparisonTable": ".models",
+    "ArticleExporter": ".article_exporter",
+    "HTMLRenderer": ".html_renderer",
+    "GEMINI_MODEL": ".constants",
+    "MAX_SITEMAP_URLS": ".constants",
     # Field utilities
-    "get_content_fields",
-    "get_html_content_fields",
-    "get_url_extraction_fields",
-    "iter_content_fields",
-    "iter_html_fields",
-    "iter_url_fields",
-]
+    "get_content_fields": ".field_utils",
+    "get_html_content_fields": ".field_utils",
+    "get_url_extraction_fields": ".field_utils",
+    "iter_content_fields": ".field_utils",
+    "iter_html_fields": ".field_utils",
+    "iter_url_fields": ".field_utils",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
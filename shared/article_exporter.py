@@ -13,6 +13,7 @@ Supports:
 import logging
 import json
 import csv
+import gzip
 import os
 import re
 import time
@@ -28,6 +29,16 @@ PDF_MAX_RETRIES = int(os.getenv("PDF_MAX_RETRIES", "3"))
 PDF_BASE_DELAY = float(os.getenv("PDF_BASE_DELAY", "1.0"))
 PDF_MAX_DELAY = float(os.getenv("PDF_MAX_DELAY", "10.0"))
 
+# Text exports get pre-compressed siblings (<file>.gz, <file>.br) so the API
+# can serve them with Content-Encoding without compressing per request
+PRECOMPRESS_FORMATS = {"html", "markdown", "json", "csv"}
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 
 class ArticleExporter:
     """Export articles in multiple formats."""
@@ -123,8 +134,23 @@ class ArticleExporter:
             except Exception as e:
                 logger.warning(f"DOCX export failed: {e}")
 
+        for fmt, path in exported_files.items():
+            if fmt in PRECOMPRESS_FORMATS:
+                ArticleExporter._write_precompressed(Path(path))
+
         return exported_files
 
+    @staticmethod
+    def _write_precompressed(path: Path) -> None:
+        """Write gzip (and brotli, if installed) variants next to an exported file."""
+        try:
+            data = path.read_bytes()
+            path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+            if BROTLI_AVAILABLE:
+                path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+        except Exception as e:
+            logger.warning(f"Pre-compression failed for {path.name}: {e}")
+
     @staticmethod
     def _html_to_markdown(html_content: str) -> str:
         """
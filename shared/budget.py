@@ -0,0 +1,177 @@
+"""
+Token, AI-call and wall-time budgets with graceful degradation.
+
+A budget is attached to a job or to a single article with budget_scope().
+The scope tracks usage (see usage_tracker) and, before an optional step runs,
+allow_optional() checks whether the step's expected cost still fits every
+active budget. If it does not, the step is skipped instead of letting the job
+fail on quota, and the skip is recorded as a degradation in all active scopes
+so that it shows up in the article report.
+
+Optional steps, in pipeline order:
+- images: Stage 2 image generation (article is written without images)
+- stage3_iteration: second and later Stage 3 self-critique iterations
+- stage4_verification: Stage 4 content-relevance check (HTTP checks still run)
+
+Budgets never abort work that is already running; a step that is not optional
+runs even when the budget is exhausted.
+
+Usage:
+    from shared.budget import Budget, budget_scope, allow_optional
+
+    with budget_scope(Budget(max_tokens=200_000), scope="job") as guard:
+        if allow_optional("images"):
+            ...
+    print(guard.degradations)
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .usage_tracker import UsageTracker, track_usage
+
+logger = logging.getLogger(__name__)
+
+# Expected cost of each optional step (per article), checked against remaining budget
+OPTIONAL_STEP_COSTS: Dict[str, Dict[str, float]] = {
+    "images": {"ai_calls": 0, "tokens": 0, "seconds": 40.0},
+    "stage3_iteration": {"ai_calls": 1, "tokens": 12000, "seconds": 25.0},
+    "stage4_verification": {"ai_calls": 1, "tokens": 4000, "seconds": 20.0},
+}
+
+
+@dataclass
+class Budget:
+    """
+    Limits for one scope. None means unlimited.
+
+    headroom is the fraction of each limit kept free for mandatory work:
+    an optional step only runs if it fits below limit * (1 - headroom).
+    """
+    max_tokens: Optional[int] = None
+    max_ai_calls: Optional[int] = None
+    max_seconds: Optional[float] = None
+    headroom: float = 0.1
+
+    @property
+    def is_limited(self) -> bool:
+        return any(v is not None for v in (self.max_tokens, self.max_ai_calls, self.max_seconds))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BudgetGuard:
+    """Budget, live usage and degradations taken for one scope."""
+    budget: Budget
+    usage: UsageTracker
+    scope: str = "job"
+    degradations: List[Dict[str, Any]] = field(default_factory=list)
+
+    def _dimensions(self) -> List[Tuple[str, Optional[float], float]]:
+        """(name, limit, used) for every dimension."""
+        return [
+            ("tokens", self.budget.max_tokens, self.usage.total_tokens),
+            ("ai_calls", self.budget.max_ai_calls, self.usage.ai_calls),
+            ("seconds", self.budget.max_seconds, self.usage.elapsed_seconds),
+        ]
+
+    @property
+    def exhausted(self) -> bool:
+        """True once any limit has been reached."""
+        return any(limit is not None and used >= limit for _, limit, used in self._dimensions())
+
+    def blocking_limit(self, step: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the first limit that the optional step would exceed.
+
+        Returns:
+            Dict describing the limit, or None if the step fits
+        """
+        costs = OPTIONAL_STEP_COSTS.get(step, {})
+        usable = 1.0 - self.budget.headroom
+        for name, limit, used in self._dimensions():
+            if limit is None:
+                continue
+            expected = costs.get(name, 0)
+            if used + expected > limit * usable:
+                return {
+                    "limit": name,
+                    "used": round(used, 1),
+                    "expected": expected,
+                    "max": limit,
+                }
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "limits": self.budget.to_dict(),
+            "usage": self.usage.to_dict(),
+            "exhausted": self.exhausted,
+            "degradations": list(self.degradations),
+        }
+
+
+_active_guards: ContextVar[Tuple[BudgetGuard, ...]] = ContextVar(
+    "openblog_budget_guards", default=()
+)
+
+
+@contextmanager
+def budget_scope(budget: Optional[Budget] = None, scope: str = "job") -> Iterator[BudgetGuard]:
+    """
+    Track usage for a scope and enforce its budget on optional steps.
+
+    A scope without budget (None or all limits unset) never blocks a step
+    but still collects degradations caused by enclosing scopes, so an article
+    report lists every step skipped for it.
+
+    Args:
+        budget: Limits for this scope (default: unlimited)
+        scope: Label used in logs and degradation records ("job", "article")
+
+    Yields:
+        The BudgetGuard for the scope
+    """
+    with track_usage() as usage:
+        guard = BudgetGuard(budget=budget or Budget(), usage=usage, scope=scope)
+        token = _active_guards.set(_active_guards.get() + (guard,))
+        try:
+            yield guard
+        finally:
+            _active_guards.reset(token)
+
+
+def allow_optional(step: str) -> bool:
+    """
+    Decide whether an optional step may run under the active budgets.
+
+    Records a degradation in every active scope when the step is skipped.
+
+    Args:
+        step: Key of OPTIONAL_STEP_COSTS
+
+    Returns:
+        True if the step fits all budgets (or no budget is active)
+    """
+    guards = _active_guards.get()
+    for guard in guards:
+        if not guard.budget.is_limited:
+            continue
+        blocking = guard.blocking_limit(step)
+        if blocking is None:
+            continue
+        degradation = {"step": step, "scope": guard.scope, **blocking}
+        logger.warning(
+            f"  Budget: skipping {step} ({guard.scope} {blocking['limit']} "
+            f"{blocking['used']}/{blocking['max']})"
+        )
+        for g in guards:
+            g.degradations.append(degradation)
+        return False
+    return True
@@ -11,9 +11,52 @@ GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-pro")
 # Sitemap crawler limit
 MAX_SITEMAP_URLS = int(os.getenv("MAX_SITEMAP_URLS", "10000"))
 
+# Sitemap crawler politeness per host (shared by all crawls in the process)
+# and how many levels of nested sitemap indexes are followed
+SITEMAP_HOST_MAX_CONCURRENT = int(os.getenv("SITEMAP_HOST_MAX_CONCURRENT", "4"))
+SITEMAP_HOST_REQUESTS_PER_MINUTE = float(os.getenv("SITEMAP_HOST_REQUESTS_PER_MINUTE", "300"))
+# Per-host limiters kept in memory (least recently used idle ones are dropped)
+SITEMAP_HOST_LIMITERS_MAX = int(os.getenv("SITEMAP_HOST_LIMITERS_MAX", "1024"))
+SITEMAP_MAX_DEPTH = int(os.getenv("SITEMAP_MAX_DEPTH", "3"))
+
+# Persistent sitemap crawl cache (shared by all processes using the database)
+SITEMAP_CACHE_MAX_MB = int(os.getenv("SITEMAP_CACHE_MAX_MB", "64"))
+
+# Stored sitemap documents (conditional re-fetch): at most this many, and
+# documents not fetched again for this many days are dropped
+SITEMAP_DOCUMENTS_MAX_ENTRIES = int(os.getenv("SITEMAP_DOCUMENTS_MAX_ENTRIES", "2000"))
+SITEMAP_DOCUMENTS_MAX_AGE_DAYS = float(os.getenv("SITEMAP_DOCUMENTS_MAX_AGE_DAYS", "30"))
+
+# How long a sitemap URL validation result (reachable or broken) is reused,
+# and how many results are stored at most
+URL_VALIDATION_CACHE_HOURS = float(os.getenv("URL_VALIDATION_CACHE_HOURS", "24"))
+URL_VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv("URL_VALIDATION_CACHE_MAX_ENTRIES", "100000"))
+
 # Gemini timeout settings (in seconds)
 # Longer timeout for operations with URL Context/Google Search (AFC can make up to 10 external calls)
 GEMINI_TIMEOUT_GROUNDING = int(os.getenv("GEMINI_TIMEOUT_GROUNDING", "300"))  # 5 minutes for grounded calls
 GEMINI_TIMEOUT_DEFAULT = int(os.getenv("GEMINI_TIMEOUT_DEFAULT", "120"))  # 2 minutes for simple calls
 # Extra long timeout for voice enhancement (fetches multiple blog URLs and does deep analysis)
 GEMINI_TIMEOUT_VOICE_ENHANCEMENT = int(os.getenv("GEMINI_TIMEOUT_VOICE_ENHANCEMENT", "420"))  # 7 minutes
+
+# Process-wide Gemini limits shared by every GeminiClient (unset = unlimited)
+GEMINI_MAX_CONCURRENT = int(os.getenv("GEMINI_MAX_CONCURRENT", "0")) or None
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "0")) or None
+
+# API job admission: pipelines run at once and jobs allowed to wait in the queue
+API_MAX_CONCURRENT_JOBS = int(os.getenv("API_MAX_CONCURRENT_JOBS", "2"))
+API_MAX_QUEUED_JOBS = int(os.getenv("API_MAX_QUEUED_JOBS", "20"))
+
+# In-memory cache for served article files (rendered HTML and other exports)
+API_ARTIFACT_CACHE_MB = int(os.getenv("API_ARTIFACT_CACHE_MB", "64"))
+
+# API duplicate submissions: Idempotency-Key replay window and identical-request dedupe window
+API_IDEMPOTENCY_WINDOW_HOURS = float(os.getenv("API_IDEMPOTENCY_WINDOW_HOURS", "24"))
+API_DEDUPE_WINDOW_MINUTES = float(os.getenv("API_DEDUPE_WINDOW_MINUTES", "10"))
+
+# Beck-Online research: parallel browser contexts, page loads per minute across
+# all of them, and the persisted login (reused while younger than the max age)
+BECK_POOL_SIZE = int(os.getenv("BECK_POOL_SIZE", "3"))
+BECK_REQUESTS_PER_MINUTE = float(os.getenv("BECK_REQUESTS_PER_MINUTE", "20")) or None
+BECK_STORAGE_STATE_PATH = os.getenv("BECK_STORAGE_STATE_PATH", "data/beck_storage_state.json")
+BECK_SESSION_MAX_AGE_HOURS = float(os.getenv("BECK_SESSION_MAX_AGE_HOURS", "12"))
@@ -0,0 +1,205 @@
+"""
+Pre-run cost and latency estimator for a pipeline batch.
+
+Predicts AI calls, tokens, image generations and wall time for a batch before
+it is launched, so concurrency and start time can be chosen to fit quota
+windows.
+
+Per-stage figures come from the stage_stats history that run_pipeline records
+after every run (see OpenBlogDB.record_stage_stats). Stages without history
+fall back to the defaults below, which follow the AI-call counts documented
+in each stage module.
+
+The call count of two stages depends on the run configuration rather than on
+history:
+- Stage 2 (legal mode): decision-centric generation makes one outline call,
+  one call per section and one supporting-content call.
+- Stage 3: QualityFixer makes one call per self-critique iteration and stops
+  early when no fixes are found, so history is capped at the iteration limit.
+
+Usage:
+    from shared.cost_estimator import estimate_batch
+    estimate = estimate_batch(num_articles=100, legal=True, max_parallel=5)
+    print(estimate["totals"]["wall_time_seconds"])
+"""
+
+import logging
+import math
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages in pipeline order. "stage1" runs once per batch, "stage0" once per
+# keyword (sequentially, before article processing), the rest once per article.
+BATCH_STAGES = ["stage1"]
+SERIAL_STAGES = ["stage0"]
+ARTICLE_STAGES = ["stage2", "stage2_5", "stage3", "stage4", "stage5"]
+
+IMAGES_PER_ARTICLE = 3
+
+# Defaults used when a stage has no recorded history (ai_calls excludes images)
+DEFAULT_STAGE_PROFILES: Dict[str, Dict[str, float]] = {
+    "stage1": {"ai_calls": 2, "prompt_tokens": 6000, "output_tokens": 3000, "images": 0, "duration_seconds": 90.0},
+    "stage0": {"ai_calls": 0, "prompt_tokens": 0, "output_tokens": 0, "images": 0, "duration_seconds": 8.0},
+    "stage2": {"ai_calls": 1, "prompt_tokens": 12000, "output_tokens": 8000, "images": IMAGES_PER_ARTICLE, "duration_seconds": 120.0},
+    "stage2_5": {"ai_calls": 2, "prompt_tokens": 15000, "output_tokens": 4000, "images": 0, "duration_seconds": 60.0},
+    "stage3": {"ai_calls": 2, "prompt_tokens": 20000, "output_tokens": 3000, "images": 0, "duration_seconds": 50.0},
+    "stage4": {"ai_calls": 1, "prompt_tokens": 3000, "output_tokens": 1000, "images": 0, "duration_seconds": 30.0},
+    "stage5": {"ai_calls": 1, "prompt_tokens": 8000, "output_tokens": 2000, "images": 0, "duration_seconds": 20.0},
+}
+
+# Legal-mode Stage 2 without history: per decision-centric call
+DEFAULT_LEGAL_SECTION_PROFILE = {"prompt_tokens": 5000, "output_tokens": 1500, "duration_seconds": 25.0}
+
+# Typical outline size (LegalArticleOutline allows 4-15 sections)
+DEFAULT_DECISION_SECTIONS = 8
+
+# Matches MAX_ITERATIONS in stage3.stage_3.QualityFixer.run
+DEFAULT_STAGE3_ITERATIONS = 2
+
+
+def _stage_profile(stage: str, history: Dict[str, Dict[str, float]], legal: bool) -> Dict[str, Any]:
+    """Per-run profile for a stage: recorded averages if available, else defaults."""
+    recorded = history.get(stage)
+    if recorded and recorded.get("samples"):
+        profile = {k: float(recorded.get(k) or 0.0) for k in DEFAULT_STAGE_PROFILES[stage]}
+        profile["samples"] = int(recorded["samples"])
+        profile["source"] = "history"
+        return profile
+
+    if stage == "stage2" and legal:
+        profile = {
+            "ai_calls": DEFAULT_DECISION_SECTIONS + 2,
+            "prompt_tokens": DEFAULT_LEGAL_SECTION_PROFILE["prompt_tokens"] * (DEFAULT_DECISION_SECTIONS + 2),
+            "output_tokens": DEFAULT_LEGAL_SECTION_PROFILE["output_tokens"] * (DEFAULT_DECISION_SECTIONS + 2),
+            "images": IMAGES_PER_ARTICLE,
+            "duration_seconds": DEFAULT_LEGAL_SECTION_PROFILE["duration_seconds"] * (DEFAULT_DECISION_SECTIONS + 2),
+        }
+    else:
+        profile = dict(DEFAULT_STAGE_PROFILES[stage])
+    profile["samples"] = 0
+    profile["source"] = "default"
+    return profile
+
+
+def _scale_calls(profile: Dict[str, Any], calls: float) -> Dict[str, Any]:
+    """
+    Rescale a profile to a different AI call count.
+
+    Tokens and AI time scale per call. Image generations are tracked
+    separately from AI calls and are left untouched.
+    """
+    recorded_calls = profile["ai_calls"]
+    if recorded_calls <= 0:
+        scaled = dict(profile)
+        scaled["ai_calls"] = calls
+        return scaled
+    factor = calls / recorded_calls
+    scaled = dict(profile)
+    scaled["ai_calls"] = calls
+    scaled["prompt_tokens"] = profile["prompt_tokens"] * factor
+    scaled["output_tokens"] = profile["output_tokens"] * factor
+    scaled["duration_seconds"] = profile["duration_seconds"] * factor
+    return scaled
+
+
+def estimate_batch(
+    num_articles: int,
+    legal: bool = False,
+    decision_sections: int = DEFAULT_DECISION_SECTIONS,
+    stage3_iterations: int = DEFAULT_STAGE3_ITERATIONS,
+    max_parallel: Optional[int] = None,
+    skip_images: bool = False,
+    history: Optional[Dict[str, Dict[str, float]]] = None,
+    db=None,
+) -> Dict[str, Any]:
+    """
+    Predict AI calls, tokens, images and wall time for a batch.
+
+    Args:
+        num_articles: Number of keywords/articles in the batch
+        legal: Legal mode (Stage 2.5 runs, Stage 2 is decision-centric)
+        decision_sections: Sections per decision-centric outline (legal mode)
+        stage3_iterations: Stage 3 self-critique iteration limit
+        max_parallel: Concurrent articles (None = all at once)
+        skip_images: Images are not generated
+        history: Pre-loaded {stage: averages}; read from db when None
+        db: OpenBlogDB to read history from (default: OpenBlogDB())
+
+    Returns:
+        Dict with "stages" (per-stage totals), "totals" and "assumptions"
+    """
+    if num_articles < 1:
+        raise ValueError(f"num_articles must be at least 1, got {num_articles}")
+
+    mode = "legal" if legal else "standard"
+    if history is None:
+        history = {}
+        try:
+            if db is None:
+                from .database import OpenBlogDB
+                db = OpenBlogDB()
+            history = db.get_stage_stats_summary(mode=mode)
+        except Exception as e:
+            logger.warning(f"Stage history unavailable, using defaults: {e}")
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    for stage in BATCH_STAGES + SERIAL_STAGES + ARTICLE_STAGES:
+        if stage == "stage2_5" and not legal:
+            continue
+        profile = _stage_profile(stage, history, legal)
+
+        if stage == "stage2" and legal:
+            profile = _scale_calls(profile, decision_sections + 2)
+        elif stage == "stage3":
+            expected = stage3_iterations if profile["source"] == "default" else min(profile["ai_calls"], stage3_iterations)
+            profile = _scale_calls(profile, expected)
+
+        if stage == "stage2":
+            profile["images"] = 0 if skip_images else IMAGES_PER_ARTICLE
+
+        runs = 1 if stage in BATCH_STAGES else num_articles
+        stages[stage] = {
+            "runs": runs,
+            "source": profile["source"],
+            "samples": profile["samples"],
+            "ai_calls": round(profile["ai_calls"] * runs, 1),
+            "prompt_tokens": int(profile["prompt_tokens"] * runs),
+            "output_tokens": int(profile["output_tokens"] * runs),
+            "images": round(profile["images"] * runs, 1),
+            "seconds_per_run": round(profile["duration_seconds"], 1),
+        }
+
+    # Wall time: Stage 1 once, Stage 0 serially per keyword, then articles in waves
+    per_article_seconds = sum(stages[s]["seconds_per_run"] for s in ARTICLE_STAGES if s in stages)
+    waves = math.ceil(num_articles / max_parallel) if max_parallel else 1
+    wall_time = (
+        stages["stage1"]["seconds_per_run"]
+        + stages["stage0"]["seconds_per_run"] * num_articles
+        + per_article_seconds * waves
+    )
+
+    totals = {
+        "ai_calls": round(sum(s["ai_calls"] for s in stages.values()), 1),
+        "prompt_tokens": sum(s["prompt_tokens"] for s in stages.values()),
+        "output_tokens": sum(s["output_tokens"] for s in stages.values()),
+        "images": round(sum(s["images"] for s in stages.values()), 1),
+        "wall_time_seconds": round(wall_time, 1),
+        "article_seconds": round(per_article_seconds, 1),
+        "waves": waves,
+    }
+    totals["total_tokens"] = totals["prompt_tokens"] + totals["output_tokens"]
+
+    return {
+        "articles": num_articles,
+        "mode": mode,
+        "stages": stages,
+        "totals": totals,
+        "assumptions": {
+            "decision_sections": decision_sections if legal else None,
+            "stage3_iterations": stage3_iterations,
+            "max_parallel": max_parallel,
+            "skip_images": skip_images,
+            "history_stages": sorted(s for s, v in stages.items() if v["source"] == "history"),
+        },
+    }
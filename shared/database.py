@@ -1,8 +1,9 @@
 """
 OpenBlog Neo - SQLite Database Layer
 
-Persistent storage for Beck-Online resources, webinar extracts, and content plan entries.
-All modules share this single database file.
+Persistent storage for Beck-Online resources, webinar extracts, content plan entries,
+per-stage run statistics, the Stage 1 context cache and API jobs. All modules
+share this single database file.
 
 Usage:
     from shared.database import OpenBlogDB
@@ -16,10 +17,12 @@ import logging
 import os
 import re
 import sqlite3
+import time
 import unicodedata
-from datetime import datetime, timezone
+import zlib
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -135,11 +138,136 @@ class OpenBlogDB:
                 CREATE INDEX IF NOT EXISTS idx_wkl_keyword
                     ON webinar_keyword_links(keyword_normalized);
 
+                CREATE TABLE IF NOT EXISTS stage_stats (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stage TEXT NOT NULL,
+                    mode TEXT NOT NULL DEFAULT 'standard',
+                    ai_calls INTEGER DEFAULT 0,
+                    prompt_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    images INTEGER DEFAULT 0,
+                    duration_seconds REAL DEFAULT 0.0,
+                    job_id TEXT DEFAULT '',
+                    recorded_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_stage_stats_stage_mode
+                    ON stage_stats(stage, mode, recorded_at);
+
+                CREATE TABLE IF NOT EXISTS stage1_cache (
+                    company_key TEXT NOT NULL,
+                    component TEXT NOT NULL,
+                    variant TEXT NOT NULL DEFAULT '',
+                    data TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (company_key, component, variant)
+                );
+
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL DEFAULT '{}',
+                    progress TEXT NOT NULL DEFAULT '{}',
+                    error TEXT,
+                    has_result INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT NOT NULL DEFAULT '',
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_jobs_created
+                    ON jobs(created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+                    ON jobs(status, created_at);
+
+                -- Results are large (all articles + context): stored out of line,
+                -- zlib-compressed, and only read when a client asks for them
+                CREATE TABLE IF NOT EXISTS job_results (
+                    job_id TEXT PRIMARY KEY REFERENCES jobs(job_id) ON DELETE CASCADE,
+                    data BLOB NOT NULL
+                );
+
+                -- Idempotency keys ("key:<Idempotency-Key>") and request
+                -- fingerprints ("fp:<sha256>") of submitted jobs
+                CREATE TABLE IF NOT EXISTS job_keys (
+                    key TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+                    fingerprint TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_job_keys_created
+                    ON job_keys(created_at);
+
+                -- Parsed sitemap documents with their HTTP validators, for
+                -- conditional re-fetch (304 reuses the stored entries)
+                CREATE TABLE IF NOT EXISTS sitemap_documents (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    data BLOB NOT NULL,
+                    truncated INTEGER NOT NULL DEFAULT 0,
+                    fetched_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_sitemap_documents_fetched
+                    ON sitemap_documents(fetched_at);
+
+                -- Finished sitemap crawls (labeled URLs) shared by all crawler
+                -- instances and processes; LRU-evicted by total size
+                CREATE TABLE IF NOT EXISTS sitemap_crawl_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_sitemap_crawl_cache_used
+                    ON sitemap_crawl_cache(last_used_at);
+
+                -- Sitemap URL validation results (reachable or not) per URL
+                CREATE TABLE IF NOT EXISTS url_checks (
+                    url TEXT PRIMARY KEY,
+                    ok INTEGER NOT NULL,
+                    status_code INTEGER,
+                    checked_at REAL NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_url_checks_checked
+                    ON url_checks(checked_at);
+
+                -- URL rules learned by the smart classifier's AI discovery, per
+                -- domain; valid while the sitemap structure fingerprint matches
+                CREATE TABLE IF NOT EXISTS url_rules (
+                    domain TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    rules TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+
+                -- Enhanced voice persona per blog (domain, plus a variant for
+                -- extra blog sources); posts maps analyzed URLs to content
+                -- hashes, known_urls digests every blog URL seen at analysis
+                CREATE TABLE IF NOT EXISTS voice_personas (
+                    domain TEXT PRIMARY KEY,
+                    persona TEXT NOT NULL,
+                    posts TEXT NOT NULL,
+                    known_urls TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+
                 CREATE TABLE IF NOT EXISTS schema_version (
                     version INTEGER NOT NULL
                 );
             """)
 
+            # Columns added after a table was first created
+            job_columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in job_columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+
             # Set schema version if not set
             row = conn.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
             if not row:
@@ -700,6 +828,639 @@ class OpenBlogDB:
         finally:
             conn.close()
 
+    # =========================================================================
+    # Stage Statistics (used by the cost estimator)
+    # =========================================================================
+
+    def record_stage_stats(self, samples: List[Dict[str, Any]], job_id: str = "") -> int:
+        """
+        Store per-stage usage samples from a pipeline run.
+
+        Args:
+            samples: Dicts with stage, mode, ai_calls, prompt_tokens,
+                     output_tokens, images, duration_seconds
+            job_id: Pipeline job the samples came from
+
+        Returns:
+            Number of samples stored
+        """
+        conn = self._get_conn()
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            conn.executemany("""
+                INSERT INTO stage_stats (
+                    stage, mode, ai_calls, prompt_tokens, output_tokens,
+                    images, duration_seconds, job_id, recorded_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    s["stage"], s.get("mode", "standard"),
+                    s.get("ai_calls", 0), s.get("prompt_tokens", 0),
+                    s.get("output_tokens", 0), s.get("images", 0),
+                    s.get("duration_seconds", 0.0), job_id, now,
+                )
+                for s in samples
+            ])
+            conn.commit()
+            logger.debug(f"Recorded {len(samples)} stage stat samples for job {job_id}")
+        finally:
+            conn.close()
+        return len(samples)
+
+    def get_stage_stats_summary(self, mode: str = "standard", window: int = 200) -> Dict[str, Dict[str, float]]:
+        """
+        Average usage per stage over the most recent samples.
+
+        Args:
+            mode: "standard" or "legal"
+            window: Number of most recent samples per stage to average
+
+        Returns:
+            {stage: {"samples", "ai_calls", "prompt_tokens", "output_tokens",
+                     "images", "duration_seconds"}}
+        """
+        conn = self._get_conn()
+        try:
+            rows = conn.execute("""
+                SELECT stage,
+                       COUNT(*) AS samples,
+                       AVG(ai_calls) AS ai_calls,
+                       AVG(prompt_tokens) AS prompt_tokens,
+                       AVG(output_tokens) AS output_tokens,
+                       AVG(images) AS images,
+                       AVG(duration_seconds) AS duration_seconds
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY stage ORDER BY recorded_at DESC, id DESC
+                    ) AS rn
+                    FROM stage_stats
+                    WHERE mode = ?
+                )
+                WHERE rn <= ?
+                GROUP BY stage
+            """, (mode, window)).fetchall()
+            return {row["stage"]: {k: row[k] for k in row.keys() if k != "stage"} for row in rows}
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # Stage 1 Context Cache
+    # =========================================================================
+
+    def get_stage1_cache(self, company_key: str) -> List[Dict[str, Any]]:
+        """
+        Load every cached Stage 1 component for a company in one query.
+
+        Args:
+            company_key: Normalized company URL
+
+        Returns:
+            List of {"component", "variant", "data", "updated_at"} dicts
+        """
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                "SELECT component, variant, data, updated_at FROM stage1_cache WHERE company_key = ?",
+                (company_key,),
+            ).fetchall()
+            return [
+                {
+                    "component": row["component"],
+                    "variant": row["variant"],
+                    "data": json.loads(row["data"]),
+                    "updated_at": row["updated_at"],
+                }
+                for row in rows
+            ]
+        finally:
+            conn.close()
+
+    def store_stage1_cache(self, company_key: str, component: str, data: Any, variant: str = ""):
+        """Insert or replace one cached Stage 1 component."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO stage1_cache (company_key, component, variant, data, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                company_key, component, variant,
+                json.dumps(data, ensure_ascii=False),
+                datetime.now(timezone.utc).isoformat(),
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def invalidate_stage1_cache(self, company_key: str, components: Optional[List[str]] = None) -> int:
+        """
+        Delete cached Stage 1 components for a company.
+
+        Args:
+            company_key: Normalized company URL
+            components: Components to delete (None = all)
+
+        Returns:
+            Number of rows deleted
+        """
+        conn = self._get_conn()
+        try:
+            if components:
+                placeholders = ",".join("?" * len(components))
+                cursor = conn.execute(
+                    f"DELETE FROM stage1_cache WHERE company_key = ? AND component IN ({placeholders})",
+                    (company_key, *components),
+                )
+            else:
+                cursor = conn.execute("DELETE FROM stage1_cache WHERE company_key = ?", (company_key,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # Sitemap Documents
+    # =========================================================================
+
+    def get_sitemap_document(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored sitemap document.
+
+        Returns:
+            {"url", "etag", "last_modified", "entries", "sitemap_urls",
+            "truncated", "fetched_at"} or None. entries are
+            [url, priority, changefreq, lastmod] lists.
+        """
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT * FROM sitemap_documents WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            data = json.loads(zlib.decompress(row["data"]).decode("utf-8"))
+            return {
+                "url": row["url"],
+                "etag": row["etag"],
+                "last_modified": row["last_modified"],
+                "entries": data.get("entries", []),
+                "sitemap_urls": data.get("sitemap_urls", []),
+                "truncated": bool(row["truncated"]),
+                "fetched_at": row["fetched_at"],
+            }
+        finally:
+            conn.close()
+
+    def store_sitemap_document(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        entries: List[List[Any]],
+        sitemap_urls: List[str],
+        truncated: bool = False,
+        max_age_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> int:
+        """
+        Insert or replace a parsed sitemap document and its validators, then
+        drop documents fetched more than max_age_seconds ago and the oldest
+        beyond max_entries.
+
+        Returns:
+            Number of dropped documents
+        """
+        blob = zlib.compress(json.dumps(
+            {"entries": entries, "sitemap_urls": sitemap_urls}, ensure_ascii=False
+        ).encode("utf-8"))
+        now = datetime.now(timezone.utc)
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO sitemap_documents
+                    (url, etag, last_modified, data, truncated, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, blob, int(truncated), now.isoformat()))
+            cutoff = (now - timedelta(seconds=max_age_seconds)).isoformat() if max_age_seconds is not None else None
+            pruned = self._prune(conn, "sitemap_documents", "url", "fetched_at", cutoff, max_entries)
+            conn.commit()
+            return pruned
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _prune(
+        conn: sqlite3.Connection,
+        table: str,
+        key: str,
+        time_column: str,
+        before: Optional[Any],
+        max_entries: Optional[int],
+    ) -> int:
+        """Delete rows older than `before` and the oldest rows beyond max_entries."""
+        pruned = 0
+        if before is not None:
+            pruned += conn.execute(f"DELETE FROM {table} WHERE {time_column} < ?", (before,)).rowcount
+        if max_entries is not None:
+            pruned += conn.execute(f"""
+                DELETE FROM {table} WHERE {key} IN (
+                    SELECT {key} FROM {table} ORDER BY {time_column} DESC LIMIT -1 OFFSET ?
+                )
+            """, (max_entries,)).rowcount
+        return pruned
+
+    def get_sitemap_crawl(self, cache_key: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached crawl result younger than max_age_seconds and mark it used.
+
+        Expired entries are deleted.
+        """
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            row = conn.execute(
+                "SELECT data, created_at FROM sitemap_crawl_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if not row:
+                return None
+            if now - row["created_at"] > max_age_seconds:
+                conn.execute("DELETE FROM sitemap_crawl_cache WHERE cache_key = ?", (cache_key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE sitemap_crawl_cache SET last_used_at = ? WHERE cache_key = ?", (now, cache_key))
+            conn.commit()
+            return json.loads(zlib.decompress(row["data"]).decode("utf-8"))
+        finally:
+            conn.close()
+
+    def store_sitemap_crawl(
+        self, cache_key: str, data: Dict[str, Any], max_bytes: int, max_entries: int
+    ) -> int:
+        """
+        Insert or replace a crawl result, then evict least recently used
+        results until the cache fits max_bytes and max_entries.
+
+        Returns:
+            Number of evicted entries
+        """
+        blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO sitemap_crawl_cache (cache_key, data, size, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (cache_key, blob, len(blob), now, now))
+            rows = conn.execute(
+                "SELECT cache_key, size FROM sitemap_crawl_cache ORDER BY last_used_at DESC"
+            ).fetchall()
+            total = 0
+            evict = []
+            for index, row in enumerate(rows):
+                total += row["size"]
+                if index >= max_entries or total > max_bytes:
+                    evict.append((row["cache_key"],))
+            conn.executemany("DELETE FROM sitemap_crawl_cache WHERE cache_key = ?", evict)
+            conn.commit()
+            return len(evict)
+        finally:
+            conn.close()
+
+    def get_url_checks(self, urls: List[str], max_age_seconds: float) -> Dict[str, bool]:
+        """Validation results checked within max_age_seconds, as {url: ok}."""
+        if not urls:
+            return {}
+        since = time.time() - max_age_seconds
+        results: Dict[str, bool] = {}
+        conn = self._get_conn()
+        try:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT url, ok FROM url_checks WHERE url IN ({placeholders}) AND checked_at >= ?",
+                    (*batch, since),
+                ).fetchall()
+                results.update((row["url"], bool(row["ok"])) for row in rows)
+            return results
+        finally:
+            conn.close()
+
+    def store_url_checks(
+        self,
+        checks: List[Tuple[str, bool, Optional[int]]],
+        max_age_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> int:
+        """
+        Insert or replace (url, ok, status_code) validation results, then
+        drop results older than max_age_seconds and the oldest beyond
+        max_entries.
+
+        Returns:
+            Number of dropped results
+        """
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO url_checks (url, ok, status_code, checked_at) VALUES (?, ?, ?, ?)",
+                [(url, int(ok), status_code, now) for url, ok, status_code in checks],
+            )
+            cutoff = now - max_age_seconds if max_age_seconds is not None else None
+            pruned = self._prune(conn, "url_checks", "url", "checked_at", cutoff, max_entries)
+            conn.commit()
+            return pruned
+        finally:
+            conn.close()
+
+    def get_url_rules(self, domain: str) -> Optional[Dict[str, Any]]:
+        """
+        Load learned URL rules for a domain.
+
+        Returns:
+            {"domain", "fingerprint", "rules", "created_at"} or None
+        """
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT * FROM url_rules WHERE domain = ?", (domain,)).fetchone()
+            if not row:
+                return None
+            return {
+                "domain": row["domain"],
+                "fingerprint": row["fingerprint"],
+                "rules": json.loads(row["rules"]),
+                "created_at": row["created_at"],
+            }
+        finally:
+            conn.close()
+
+    def store_url_rules(self, domain: str, fingerprint: str, rules: List[Dict[str, Any]]):
+        """Insert or replace the learned URL rules of a domain."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO url_rules (domain, fingerprint, rules, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (domain, fingerprint, json.dumps(rules, ensure_ascii=False),
+                  datetime.now(timezone.utc).isoformat()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_voice_persona(self, domain: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the stored voice persona of a blog.
+
+        Returns:
+            {"domain", "persona", "posts", "known_urls", "fingerprint", "updated_at"} or None
+        """
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT * FROM voice_personas WHERE domain = ?", (domain,)).fetchone()
+            if not row:
+                return None
+            return {
+                "domain": row["domain"],
+                "persona": json.loads(row["persona"]),
+                "posts": json.loads(row["posts"]),
+                "known_urls": json.loads(row["known_urls"]),
+                "fingerprint": row["fingerprint"],
+                "updated_at": row["updated_at"],
+            }
+        finally:
+            conn.close()
+
+    def store_voice_persona(
+        self,
+        domain: str,
+        persona: Dict[str, Any],
+        posts: Dict[str, str],
+        known_urls: List[str],
+        fingerprint: str,
+    ):
+        """Insert or replace the voice persona of a blog with the posts it was derived from."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO voice_personas
+                    (domain, persona, posts, known_urls, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                domain,
+                json.dumps(persona, ensure_ascii=False),
+                json.dumps(posts, ensure_ascii=False),
+                json.dumps(known_urls),
+                fingerprint,
+                datetime.now(timezone.utc).isoformat(),
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # API Jobs
+    # =========================================================================
+
+    _JOB_JSON_FIELDS = ("request", "progress")
+    _JOB_UPDATABLE = {"status", "request", "progress", "error", "updated_at"}
+
+    def create_job(self, job: Dict[str, Any]):
+        """Insert a new job (job_id, status, request, progress, owner, created_at, updated_at)."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO jobs (job_id, status, request, progress, error, owner, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                job["job_id"], job["status"],
+                json.dumps(job.get("request") or {}, ensure_ascii=False),
+                json.dumps(job.get("progress") or {}, ensure_ascii=False),
+                job.get("error"), job.get("owner", ""), job["created_at"], job["updated_at"],
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job metadata (without result)."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+        finally:
+            conn.close()
+
+    def update_job(self, job_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update job columns; a "result" field is written to job_results.
+
+        Returns:
+            True if the job exists
+        """
+        fields = dict(fields)
+        result = fields.pop("result", None)
+        unknown = set(fields) - self._JOB_UPDATABLE
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        columns = {
+            k: json.dumps(v, ensure_ascii=False) if k in self._JOB_JSON_FIELDS else v
+            for k, v in fields.items()
+        }
+        if result is not None:
+            columns["has_result"] = 1
+
+        conn = self._get_conn()
+        try:
+            if result is not None:
+                blob = zlib.compress(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+                conn.execute(
+                    "INSERT OR REPLACE INTO job_results (job_id, data) VALUES (?, ?)",
+                    (job_id, blob),
+                )
+            assignments = ", ".join(f"{k} = ?" for k in columns)
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                (*columns.values(), job_id),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def get_job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load and decompress a job's result (None if not stored)."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT data FROM job_results WHERE job_id = ?", (job_id,)).fetchone()
+            return json.loads(zlib.decompress(row["data"]).decode("utf-8")) if row else None
+        finally:
+            conn.close()
+
+    def list_jobs(self, limit: int = 50, offset: int = 0, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List jobs newest first (index-backed, without results)."""
+        conn = self._get_conn()
+        try:
+            if status:
+                rows = conn.execute("""
+                    SELECT * FROM jobs WHERE status = ?
+                    ORDER BY created_at DESC LIMIT ? OFFSET ?
+                """, (status, limit, offset)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT * FROM jobs ORDER BY created_at DESC LIMIT ? OFFSET ?
+                """, (limit, offset)).fetchall()
+            return [self._row_to_job(r) for r in rows]
+        finally:
+            conn.close()
+
+    def count_jobs(self, status: Optional[str] = None) -> int:
+        """Count jobs, optionally by status."""
+        conn = self._get_conn()
+        try:
+            if status:
+                row = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()
+            else:
+                row = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()
+            return row[0]
+        finally:
+            conn.close()
+
+    def delete_job(self, job_id: str) -> bool:
+        """Delete a job and its result."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def job_owners_with_status(self, statuses: List[str]) -> List[str]:
+        """Distinct owners of jobs in the given statuses."""
+        placeholders = ",".join("?" * len(statuses))
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                f"SELECT DISTINCT owner FROM jobs WHERE status IN ({placeholders})", statuses
+            ).fetchall()
+            return [r["owner"] for r in rows]
+        finally:
+            conn.close()
+
+    def fail_jobs_with_status(self, statuses: List[str], error: str, owners: Optional[List[str]] = None) -> int:
+        """
+        Mark jobs in the given statuses as failed (e.g. interrupted by a restart).
+
+        Args:
+            statuses: Job statuses to fail
+            error: Error message to record
+            owners: Only fail jobs of these owners (None: all owners)
+        """
+        if owners is not None and not owners:
+            return 0
+        placeholders = ",".join("?" * len(statuses))
+        where = f"status IN ({placeholders})"
+        params = [error, datetime.utcnow().isoformat(), *statuses]
+        if owners is not None:
+            where += f" AND owner IN ({','.join('?' * len(owners))})"
+            params.extend(owners)
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute(f"UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE {where}", params)
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def record_job_keys(self, job_id: str, keys: List[str], fingerprint: str, created_at: str):
+        """Map idempotency keys / fingerprints to a job (replacing expired mappings)."""
+        conn = self._get_conn()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO job_keys (key, job_id, fingerprint, created_at) VALUES (?, ?, ?, ?)",
+                [(key, job_id, fingerprint, created_at) for key in keys],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def find_jobs_by_keys(self, keys: List[str], since: str) -> List[Dict[str, Any]]:
+        """
+        Jobs mapped to any of the keys since a timestamp, newest first.
+
+        Each job dict has the matching "key" and the stored "fingerprint".
+        """
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(f"""
+                SELECT j.*, k.key AS key, k.fingerprint AS fingerprint
+                FROM job_keys k JOIN jobs j ON j.job_id = k.job_id
+                WHERE k.key IN ({placeholders}) AND k.created_at >= ?
+                ORDER BY k.created_at DESC
+            """, (*keys, since)).fetchall()
+            return [self._row_to_job(r) for r in rows]
+        finally:
+            conn.close()
+
+    def delete_job_keys_before(self, before: str) -> int:
+        """Drop key mappings older than a timestamp."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute("DELETE FROM job_keys WHERE created_at < ?", (before,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in self._JOB_JSON_FIELDS:
+            job[key] = json.loads(job[key]) if job[key] else {}
+        job["has_result"] = bool(job["has_result"])
+        return job
+
     # =========================================================================
     # Enrichment (used by pipeline)
     # =========================================================================
@@ -16,6 +16,9 @@ import logging
 import os
 import re
 import random
+import threading
+import time
+import weakref
 from typing import Dict, Any, Optional, Union, List, Tuple
 from pathlib import Path
 
@@ -23,7 +26,16 @@ import httpx
 
 from dotenv import load_dotenv
 
-from .constants import GEMINI_MODEL, GEMINI_TIMEOUT_GROUNDING, GEMINI_TIMEOUT_DEFAULT
+from .constants import (
+    GEMINI_MODEL,
+    GEMINI_TIMEOUT_GROUNDING,
+    GEMINI_TIMEOUT_DEFAULT,
+    GEMINI_MAX_CONCURRENT,
+    GEMINI_REQUESTS_PER_MINUTE,
+)
+from .rate_limiter import AsyncRateLimiter
+from .usage_tracker import record_ai_call
+from .metrics import GEMINI_REQUEST_SECONDS, GEMINI_RETRIES, GEMINI_TIMEOUTS, REGISTRY, current_stage
 
 # Default retry configuration
 DEFAULT_MAX_RETRIES = 4  # Increased for grounding operations that may take longer
@@ -35,6 +47,56 @@ load_dotenv(Path(__file__).parent.parent / ".env", override=True)
 
 logger = logging.getLogger(__name__)
 
+# Process-wide limiter: every GeminiClient (all stages, all jobs) waits here
+GEMINI_LIMITER = AsyncRateLimiter(
+    max_concurrent=GEMINI_MAX_CONCURRENT,
+    per_minute=GEMINI_REQUESTS_PER_MINUTE,
+    name="gemini",
+)
+REGISTRY.gauge("openblog_gemini_in_flight", "Gemini requests holding a limiter slot", callback=lambda: GEMINI_LIMITER.in_flight)
+REGISTRY.gauge("openblog_gemini_waiting", "Gemini requests waiting for a limiter slot", callback=lambda: GEMINI_LIMITER.waiting)
+
+# google-genai clients shared per event loop and API key (one HTTP connection
+# pool each). Async connections belong to the loop that opened them, so each
+# loop gets its own clients; they are dropped together with the loop.
+_genai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_genai_clients_lock = threading.Lock()
+
+
+def configure_gemini_limiter(
+    max_concurrent: Optional[int] = None,
+    per_minute: Optional[float] = None,
+) -> None:
+    """
+    Set process-wide Gemini limits (None = unlimited).
+
+    Args:
+        max_concurrent: Max Gemini calls in flight across all clients
+        per_minute: Max Gemini calls started per minute across all clients
+    """
+    GEMINI_LIMITER.configure(max_concurrent=max_concurrent, per_minute=per_minute)
+    logger.info(f"Gemini limiter: max_concurrent={max_concurrent}, per_minute={per_minute}")
+
+
+def get_genai_client(api_key: str):
+    """
+    Return the shared google-genai client for an API key and the running loop.
+
+    Calls go through client.aio, so cancelling the awaiting task aborts the
+    HTTP request instead of leaving it running in a worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    with _genai_clients_lock:
+        clients = _genai_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            from google import genai
+            client = genai.Client(api_key=api_key)
+            clients[api_key] = client
+        return client
+
 
 class GeminiClient:
     """
@@ -87,7 +149,6 @@ class GeminiClient:
         self.base_delay = base_delay
         self.max_delay = max_delay
 
-        self._client = None
         self._types = None
         self._initialized = False
 
@@ -101,7 +162,6 @@ class GeminiClient:
             from google.genai import types
             self._genai = genai
             self._types = types
-            self._client = genai.Client(api_key=self.api_key)
             self._initialized = True
             logger.debug(f"GeminiClient initialized with model: {GEMINI_MODEL}")
         except ImportError:
@@ -167,16 +227,10 @@ class GeminiClient:
         last_error = None
         for attempt in range(self.max_retries + 1):
             try:
-                # Run in thread pool for async
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self._client.models.generate_content,
-                        model=GEMINI_MODEL,
-                        contents=prompt,
-                        config=config,
-                    ),
-                    timeout=timeout,
-                )
+                # Waiting for a limiter slot does not count towards the timeout
+                async with GEMINI_LIMITER.acquire():
+                    response = await self._timed_request(prompt, config, timeout)
+                self._record_usage(response)
 
                 if response.text is None or response.text.strip() == "":
                     raise ValueError(
@@ -202,6 +256,8 @@ class GeminiClient:
             except asyncio.TimeoutError:
                 last_error = asyncio.TimeoutError(f"Request timed out after {timeout}s")
                 logger.warning(f"Gemini request timed out (attempt {attempt + 1}/{self.max_retries + 1})")
+                if attempt < self.max_retries:
+                    GEMINI_RETRIES.inc(stage=current_stage(), model=GEMINI_MODEL, reason="timeout")
             except Exception as e:
                 last_error = e
                 # Check if error is retryable (rate limit, server errors, transient network issues)
@@ -218,6 +274,7 @@ class GeminiClient:
                     raise
 
                 logger.warning(f"Gemini request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
+                GEMINI_RETRIES.inc(stage=current_stage(), model=GEMINI_MODEL, reason="error")
 
             # Exponential backoff with jitter
             if attempt < self.max_retries:
@@ -230,6 +287,43 @@ class GeminiClient:
         logger.error(f"Gemini request failed after {self.max_retries + 1} attempts")
         raise last_error
 
+    async def _timed_request(self, prompt: str, config, timeout: float):
+        """Send one generate_content request and record its latency and outcome."""
+        stage = current_stage()
+        start = time.monotonic()
+        outcome = "error"
+        try:
+            response = await asyncio.wait_for(
+                get_genai_client(self.api_key).aio.models.generate_content(
+                    model=GEMINI_MODEL,
+                    contents=prompt,
+                    config=config,
+                ),
+                timeout=timeout,
+            )
+            outcome = "success"
+            return response
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            GEMINI_TIMEOUTS.inc(stage=stage, model=GEMINI_MODEL)
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            GEMINI_REQUEST_SECONDS.observe(
+                time.monotonic() - start, stage=stage, model=GEMINI_MODEL, outcome=outcome
+            )
+
+    @staticmethod
+    def _record_usage(response) -> None:
+        """Record a completed call and its token counts in the active usage scopes."""
+        usage = getattr(response, "usage_metadata", None)
+        record_ai_call(
+            prompt_tokens=getattr(usage, "prompt_token_count", None) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", None) or 0,
+        )
+
     def _parse_json(self, text: str) -> Dict[str, Any]:
         """
         Parse JSON from Gemini response, handling markdown code blocks.
@@ -622,15 +716,10 @@ class GeminiClient:
         last_error = None
         for attempt in range(self.max_retries + 1):
             try:
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self._client.models.generate_content,
-                        model=GEMINI_MODEL,
-                        contents=prompt,
-                        config=config,
-                    ),
-                    timeout=timeout,
-                )
+                # Waiting for a limiter slot does not count towards the timeout
+                async with GEMINI_LIMITER.acquire():
+                    response = await self._timed_request(prompt, config, timeout)
+                self._record_usage(response)
 
                 try:
                     result = self._parse_json(response.text.strip())
@@ -657,6 +746,8 @@ class GeminiClient:
             except asyncio.TimeoutError:
                 last_error = asyncio.TimeoutError(f"Request timed out after {timeout}s")
                 logger.warning(f"Gemini schema request timed out (attempt {attempt + 1}/{self.max_retries + 1})")
+                if attempt < self.max_retries:
+                    GEMINI_RETRIES.inc(stage=current_stage(), model=GEMINI_MODEL, reason="timeout")
             except Exception as e:
                 last_error = e
                 # Check if error is retryable
@@ -673,6 +764,7 @@ class GeminiClient:
                     raise
 
                 logger.warning(f"Gemini schema request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
+                GEMINI_RETRIES.inc(stage=current_stage(), model=GEMINI_MODEL, reason="error")
 
             # Exponential backoff with jitter
             if attempt < self.max_retries:
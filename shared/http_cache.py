@@ -0,0 +1,180 @@
+"""
+HTTP caching helpers for serving exported articles.
+
+- Artifact: file content plus its pre-compressed variants and validators
+- ArtifactCache: in-memory LRU of artifacts, bounded by total bytes
+- negotiate_encoding(): pick br/gzip/identity from Accept-Encoding
+- is_not_modified(): evaluate If-None-Match / If-Modified-Since
+
+Variants are produced at export time (ArticleExporter writes <file>.gz and,
+with brotli installed, <file>.br next to text exports). Files exported before
+that get a gzip variant built once when they are first loaded.
+
+Usage:
+    cache = ArtifactCache(max_bytes=64 * 1024 * 1024)
+    artifact = cache.get(key) or cache.put(key, Artifact.load(path, "text/html"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), artifact.variants)
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Optional
+
+# Preference order when the client accepts several encodings
+ENCODING_PREFERENCE = ("br", "gzip")
+VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Below this size compression is not worth a Content-Encoding round
+MIN_COMPRESS_BYTES = 1024
+
+
+@dataclass
+class Artifact:
+    """One served file: body per content encoding plus HTTP validators."""
+    media_type: str
+    variants: Dict[str, bytes]
+    etag: str
+    last_modified: float
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return sum(len(body) for body in self.variants.values())
+
+    @property
+    def last_modified_http(self) -> str:
+        return formatdate(self.last_modified, usegmt=True)
+
+    def etag_for(self, encoding: str) -> str:
+        """Strong ETag per representation (encodings must not share one)."""
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+    @classmethod
+    def load(cls, path: Path, media_type: str, headers: Optional[Dict[str, str]] = None) -> "Artifact":
+        """
+        Read a file and its pre-compressed siblings (<file>.br, <file>.gz).
+
+        A gzip variant is built in memory when none was exported.
+        """
+        body = path.read_bytes()
+        variants = {"identity": body}
+        for encoding, suffix in VARIANT_SUFFIXES.items():
+            compressed = path.with_name(path.name + suffix)
+            if compressed.exists():
+                variants[encoding] = compressed.read_bytes()
+        if "gzip" not in variants and len(body) >= MIN_COMPRESS_BYTES:
+            variants["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+        return cls(
+            media_type=media_type,
+            variants=variants,
+            etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"',
+            last_modified=path.stat().st_mtime,
+            headers=dict(headers or {}),
+        )
+
+
+class ArtifactCache:
+    """Thread-safe LRU of artifacts, bounded by the total size of their variants."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Artifact]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Artifact]:
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return artifact
+
+    def put(self, key: Hashable, artifact: Artifact) -> Artifact:
+        """Store an artifact (evicting least recently used ones) and return it."""
+        if artifact.size > self.max_bytes:
+            return artifact
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = artifact
+            self._bytes += artifact.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return artifact
+
+    def invalidate(self, predicate) -> int:
+        """Drop every entry whose key matches predicate(key). Returns the count."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """
+    Choose the content encoding for a response.
+
+    Args:
+        accept_encoding: Request Accept-Encoding header
+        available: Encodings the artifact has (always includes "identity")
+
+    Returns:
+        "br", "gzip" or "identity"
+    """
+    if not accept_encoding:
+        return "identity"
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    available = set(available)
+    for encoding in ENCODING_PREFERENCE:
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: float,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """
+    True if the client's cached copy is current (respond 304).
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
@@ -0,0 +1,338 @@
+"""
+Process-wide metrics in Prometheus text format (no client library needed).
+
+Counters, gauges and histograms with labels are kept in one registry and
+rendered by the API's /metrics endpoint. Instrumented code only calls
+inc()/set()/observe(), which are cheap and thread-safe, so the pipeline can
+record metrics whether or not anything scrapes them (CLI, batch runner).
+
+The current pipeline stage is tracked in a ContextVar (stage_timer), so
+code that does not know which stage it runs in (GeminiClient) can still
+label its metrics by stage.
+
+Usage:
+    from shared.metrics import GEMINI_REQUEST_SECONDS, stage_timer, REGISTRY
+
+    with stage_timer("stage3"):
+        ...
+    GEMINI_REQUEST_SECONDS.observe(1.2, stage=current_stage(), model="gemini-2.5-pro", outcome="success")
+    text = REGISTRY.render()
+"""
+
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds: HTTP checks (ms range) up to long grounded Gemini calls
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+STAGE_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """Base: name, help text, label names and a lock around the samples."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines in exposition format."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Increment for the duration of the block."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                return [f"{self.name} {_format_value(self.callback())}"]
+            except Exception:
+                return []
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with _sum and _count."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [bucket counts..., sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 1)
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-1] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{self._labels(key, {'le': _format_value(bound)})} {_format_value(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics by name and renders them in Prometheus text format."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# -----------------------------------------------------------------------------
+# Pipeline metrics
+# -----------------------------------------------------------------------------
+
+GEMINI_REQUEST_SECONDS = REGISTRY.histogram(
+    "openblog_gemini_request_seconds",
+    "Gemini request latency (excluding limiter wait) by stage, model and outcome",
+    ("stage", "model", "outcome"),
+)
+GEMINI_RETRIES = REGISTRY.counter(
+    "openblog_gemini_retries_total",
+    "Gemini requests retried after a retryable error or timeout",
+    ("stage", "model", "reason"),
+)
+GEMINI_TIMEOUTS = REGISTRY.counter(
+    "openblog_gemini_timeouts_total",
+    "Gemini requests that hit their timeout",
+    ("stage", "model"),
+)
+HTTP_CHECK_SECONDS = REGISTRY.histogram(
+    "openblog_http_check_seconds",
+    "Stage 4 URL check latency by result",
+    ("result",),
+)
+HTTP_CHECKS = REGISTRY.counter(
+    "openblog_http_checks_total",
+    "Stage 4 URL checks by result (alive/dead); dead rate = dead / total",
+    ("result",),
+)
+STAGE_DURATION_SECONDS = REGISTRY.histogram(
+    "openblog_stage_duration_seconds",
+    "Wall time of successfully completed pipeline stages",
+    ("stage",),
+    buckets=STAGE_BUCKETS,
+)
+ARTICLES_IN_FLIGHT = REGISTRY.gauge(
+    "openblog_articles_in_flight",
+    "Articles currently being processed (Stages 2-5)",
+)
+ARTICLES_IN_FLIGHT.set(0)
+JOBS_TOTAL = REGISTRY.counter(
+    "openblog_jobs_total",
+    "Finished API jobs by outcome",
+    ("outcome",),
+)
+SITEMAP_CACHE_LOOKUPS = REGISTRY.counter(
+    "openblog_sitemap_cache_lookups_total",
+    "Sitemap crawl cache lookups: hit, miss, or shared (joined a crawl already in flight)",
+    ("result",),
+)
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "openblog_event_loop_lag_seconds",
+    "Delay of a periodic event loop tick beyond its scheduled time",
+    buckets=LAG_BUCKETS,
+)
+
+# -----------------------------------------------------------------------------
+# Stage context
+# -----------------------------------------------------------------------------
+
+_current_stage: ContextVar[str] = ContextVar("openblog_metrics_stage", default="other")
+
+
+def current_stage() -> str:
+    """Stage label for metrics recorded in the current context ("other" outside stages)."""
+    return _current_stage.get()
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Label metrics in the block with a stage and record its duration on success."""
+    token = _current_stage.set(stage)
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+    STAGE_DURATION_SECONDS.observe(time.monotonic() - start, stage=stage)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """
+    Record event loop lag until cancelled.
+
+    Sleeps for interval and observes how much later than scheduled it woke
+    up; long lags mean blocking work (sync I/O, CPU) on the loop.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - interval))
@@ -0,0 +1,64 @@
+"""
+Pipeline progress events.
+
+run_pipeline emits an event when the job, each article and each stage of an
+article starts or finishes. Listeners registered with progress_listener() in
+the current asyncio context receive every event; per-article tasks inherit
+the listener because asyncio tasks copy the context when they are created.
+
+Event dicts always contain "event" and "timestamp", plus whatever the emitter
+adds, e.g. article (1-based index), keyword, stage, duration_seconds, error.
+
+Events:
+    job_started, job_completed, job_cancelled
+    stage_started, stage_completed        (stage1, stage0, stage2 ... stage5, export)
+    article_started, article_completed, article_failed
+
+Usage:
+    from shared.progress import progress_listener
+
+    with progress_listener(lambda event: print(event["event"])):
+        await run_pipeline(...)
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+_listeners: ContextVar[Tuple[ProgressCallback, ...]] = ContextVar(
+    "openblog_progress_listeners", default=()
+)
+
+
+@contextmanager
+def progress_listener(callback: ProgressCallback) -> Iterator[None]:
+    """
+    Register a callback for progress events emitted in the current context.
+
+    The callback runs synchronously in the emitting task, so it must be cheap
+    and must not block (e.g. put_nowait into a queue).
+    """
+    token = _listeners.set(_listeners.get() + (callback,))
+    try:
+        yield
+    finally:
+        _listeners.reset(token)
+
+
+def emit_progress(event: str, **fields: Any) -> None:
+    """Send an event to all active listeners. Listener errors are logged, never raised."""
+    listeners = _listeners.get()
+    if not listeners:
+        return
+    payload = {"event": event, "timestamp": time.time(), **fields}
+    for callback in listeners:
+        try:
+            callback(payload)
+        except Exception as e:
+            logger.debug(f"Progress listener failed on {event}: {e}")
@@ -0,0 +1,129 @@
+"""
+Async rate limiter: concurrency cap + token bucket.
+
+One limiter instance is shared by every caller in the process (e.g. all
+GeminiClient instances of all jobs in a batch), so limits hold globally
+instead of per stage or per job.
+
+asyncio primitives are bound to the event loop they are first used in, so the
+semaphore is kept per loop; the token bucket is plain state and shared.
+
+Usage:
+    limiter = AsyncRateLimiter(max_concurrent=8, per_minute=60)
+    async with limiter.acquire():
+        await do_request()
+"""
+
+import asyncio
+import math
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+class AsyncRateLimiter:
+    """Limits concurrent and per-minute operations. None disables a limit."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        name: str = "limiter",
+    ):
+        """
+        Args:
+            max_concurrent: Max operations in flight at once
+            per_minute: Max operations started per minute (token bucket rate)
+            burst: Bucket size (default: one second worth of tokens, at least 1)
+            name: Label for logs and metrics
+        """
+        self.name = name
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.configure(max_concurrent=max_concurrent, per_minute=per_minute, burst=burst)
+
+    def configure(
+        self,
+        max_concurrent: Optional[int] = None,
+        per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> None:
+        """
+        Change limits. Operations already in flight keep their slot.
+
+        Args:
+            max_concurrent: Max operations in flight at once (None = unlimited)
+            per_minute: Max operations started per minute (None = unlimited)
+            burst: Bucket size (default: one second worth of tokens, at least 1)
+        """
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        if per_minute is not None and per_minute <= 0:
+            raise ValueError(f"per_minute must be positive, got {per_minute}")
+
+        self.max_concurrent = max_concurrent
+        self.per_minute = per_minute
+        self.burst = burst or (max(1, math.ceil(per_minute / 60)) if per_minute else 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        if self.max_concurrent is None:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _take_token(self) -> None:
+        """Wait until the bucket has a token, then take it."""
+        if not self.per_minute:
+            return
+        rate = self.per_minute / 60.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / rate)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold one slot (and one token) for the duration of the block."""
+        semaphore = self._semaphore()
+        self.waiting += 1
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncRateLimiter(name={self.name!r}, max_concurrent={self.max_concurrent}, "
+            f"per_minute={self.per_minute}, in_flight={self.in_flight}, waiting={self.waiting})"
+        )
@@ -0,0 +1,101 @@
+"""
+Usage tracking for Gemini and Imagen calls.
+
+GeminiClient and the image creator record every successful call (with token
+counts from the response's usage metadata) into the trackers active in the
+current asyncio context. Callers open a scope with track_usage() around a
+job, an article or a single stage. Scopes nest, so a call made inside a stage
+is counted for the stage, its article and the job at the same time.
+
+asyncio tasks copy the context when they are created, so per-article tasks
+started with asyncio.gather() inherit the job scope but keep their own
+article/stage scopes private.
+
+Usage:
+    from shared.usage_tracker import track_usage
+
+    with track_usage() as usage:
+        await run_stage_3(...)
+    print(usage.ai_calls, usage.total_tokens, usage.elapsed_seconds)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+@dataclass
+class UsageTracker:
+    """Counters for one tracking scope (job, article or stage)."""
+    ai_calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    images: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    # Set when the track_usage() scope exits; open scopes report time so far
+    ended_at: Optional[float] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self.ended_at if self.ended_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ai_calls": self.ai_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "images": self.images,
+            "duration_seconds": round(self.elapsed_seconds, 2),
+        }
+
+
+_active_trackers: ContextVar[Tuple[UsageTracker, ...]] = ContextVar(
+    "openblog_usage_trackers", default=()
+)
+
+
+@contextmanager
+def track_usage(tracker: Optional[UsageTracker] = None) -> Iterator[UsageTracker]:
+    """
+    Open a tracking scope for the current context.
+
+    Args:
+        tracker: Existing tracker to record into (default: a new one)
+
+    Yields:
+        The UsageTracker receiving all calls made inside the scope
+    """
+    tracker = tracker if tracker is not None else UsageTracker()
+    token = _active_trackers.set(_active_trackers.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _active_trackers.reset(token)
+        tracker.ended_at = time.monotonic()
+
+
+def active_trackers() -> Tuple[UsageTracker, ...]:
+    """Trackers open in the current context, outermost first."""
+    return _active_trackers.get()
+
+
+def record_ai_call(prompt_tokens: int = 0, output_tokens: int = 0) -> None:
+    """Record one completed AI call in every active scope."""
+    for tracker in _active_trackers.get():
+        tracker.ai_calls += 1
+        tracker.prompt_tokens += prompt_tokens
+        tracker.output_tokens += output_tokens
+
+
+def record_image() -> None:
+    """Record one generated image in every active scope."""
+    for tracker in _active_trackers.get():
+        tracker.images += 1
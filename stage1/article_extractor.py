@@ -0,0 +1,361 @@
+"""
+Article Extractor - Main article text from blog post HTML.
+
+Readability-style extraction without a browser or extra dependencies:
+1. Parse the page with html.parser, dropping scripts, navigation, headers,
+   footers, sidebars, forms and elements whose class/id tokens mark
+   boilerplate (e.g. "comments", "share-buttons")
+2. Collect text blocks (paragraphs, headings, list items, loose div text)
+3. Score the elements containing them by text length, commas and class/id
+   hints, discounted by link density
+4. Keep the blocks of the best-scoring element, in document order
+5. If that yields fewer than MIN_ARTICLE_WORDS, parse again with class/id
+   hints used for scoring only (a wrapper like "menu-open" or
+   "related-wrapper" may hold the whole page)
+
+Used by the voice enhancer to send compact article text to Gemini instead of
+having it fetch each post through URL Context.
+"""
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+
+# Subtrees that never hold article text
+SKIP_TAGS = frozenset({
+    "head", "title", "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "header", "footer", "aside", "form", "button", "select", "textarea",
+    "dialog", "menu",
+})
+
+# Elements without end tags (never pushed on the element stack)
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+
+# Elements whose text forms one block
+BLOCK_TAGS = frozenset({
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre",
+    "td", "th", "dd", "dt", "figcaption",
+})
+HEADING_TAGS = frozenset({"h2", "h3", "h4", "h5", "h6"})
+# Loose text inside these belongs to the enclosing element
+INLINE_TAGS = frozenset({
+    "a", "abbr", "b", "cite", "code", "em", "i", "label", "mark", "q", "s",
+    "small", "span", "strong", "sub", "sup", "time", "u",
+})
+
+# class/id hints (readability's lists, trimmed to what blogs actually use),
+# matched against whole class/id tokens: the token must start with the hint
+# word ("comments", "share-buttons"), so utility classes such as
+# "overflow-hidden" or "has-sidebar" are not boilerplate
+NEGATIVE_HINT_RE = re.compile(
+    r"(?:comment|sidebar|footer|footnote|masthead|menu|nav|breadcrumb|share|social|"
+    r"cookie|consent|banner|newsletter|subscribe|related|popup|modal|widget|"
+    r"sponsor|advert|promo|author-box|pagination|skip-link|hidden)[\w-]*",
+    re.IGNORECASE,
+)
+POSITIVE_HINT_RE = re.compile(
+    r"article|body|content|entry|main|page|post|text|blog|story|prose",
+    re.IGNORECASE,
+)
+# Hints on these tags are never enough to drop the subtree (e.g. <body class="page-nav">)
+UNSKIPPABLE_TAGS = frozenset({"html", "body", "main", "article"})
+
+# Extractions shorter than this are retried without hint-based skipping
+# (and not worth analyzing as an article)
+MIN_ARTICLE_WORDS = 150
+
+# Blocks shorter than this do not count towards element scores
+MIN_SCORED_BLOCK_CHARS = 25
+# Blocks where more than this share of the text is link text are dropped
+MAX_BLOCK_LINK_DENSITY = 0.5
+# The best element is widened to its parent while the parent adds at most this
+# much text (picks up headings and intros that sit next to the body container)
+MAX_PARENT_TEXT_GROWTH = 1.25
+
+
+@dataclass
+class ExtractedArticle:
+    """Main text of one article page."""
+    title: str
+    text: str
+
+    @property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+
+@dataclass
+class _Block:
+    seq: int
+    tag: str
+    node: int
+    ancestors: Tuple[int, ...]
+    parts: List[str]
+    loose: bool = False
+    link_chars: int = 0
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.parts).split())
+
+
+class ArticleParser(HTMLParser):
+    """Collects text blocks and the element tree they sit in."""
+
+    def __init__(self, skip_hinted: bool = True):
+        """
+        Args:
+            skip_hinted: Drop subtrees whose class/id marks boilerplate
+                (otherwise the hints only lower their score)
+        """
+        super().__init__(convert_charrefs=True)
+        self.skip_hinted = skip_hinted
+        self.hint_skips = 0
+        self.title = ""
+        self.h1 = ""
+        self.blocks: List[_Block] = []
+        self.node_tags: List[str] = []
+        self.node_hint: List[int] = []
+        self.node_negative: List[bool] = []
+        self.node_parent: List[Optional[int]] = []
+        # (tag, node id, skipped) for each open element
+        self._stack: List[Tuple[str, int, bool]] = []
+        self._open_blocks: List[_Block] = []
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._title_parts: Optional[List[str]] = None
+        self._seq = 0
+
+    # -- element stack ---------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br" and self._open_blocks:
+                self._open_blocks[-1].parts.append(" ")
+            return
+        if tag == "title" and self._title_parts is None and not self.title:
+            self._title_parts = []
+        elif tag == "body":
+            self.handle_endtag("head")  # Unclosed <head>
+
+        attr = {k: (v or "") for k, v in attrs}
+        tokens = f"{attr.get('class', '')} {attr.get('id', '')}".split()
+        negative = any(NEGATIVE_HINT_RE.fullmatch(token) for token in tokens)
+        positive = any(POSITIVE_HINT_RE.search(token) for token in tokens)
+        hint = (-25 if negative else 0) + (25 if positive else 0)
+
+        skipped = (
+            tag in SKIP_TAGS
+            or attr.get("aria-hidden") == "true"
+            or attr.get("role") in ("navigation", "banner", "contentinfo", "complementary")
+        )
+        if not skipped and hint < 0 and tag not in UNSKIPPABLE_TAGS and not self._skip_depth:
+            self.hint_skips += 1
+            skipped = self.skip_hinted
+        node = len(self.node_tags)
+        self.node_tags.append(tag)
+        self.node_hint.append(hint)
+        self.node_negative.append(negative)
+        self.node_parent.append(self._stack[-1][1] if self._stack else None)
+        self._stack.append((tag, node, skipped))
+        if skipped:
+            self._skip_depth += 1
+        if tag == "a":
+            self._link_depth += 1
+        if tag in BLOCK_TAGS and not self._skip_depth:
+            self._open_blocks.append(self._new_block(tag, node))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = " ".join("".join(self._title_parts).split())
+            self._title_parts = None
+        if not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return  # Stray end tag
+        while self._stack:
+            open_tag, node, skipped = self._stack.pop()
+            if skipped:
+                self._skip_depth -= 1
+            if open_tag == "a":
+                self._link_depth -= 1
+            while self._open_blocks and self._open_blocks[-1].node == node:
+                self._close_block(self._open_blocks.pop())
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._skip_depth or not self._stack:
+            return
+        block = self._open_blocks[-1] if self._open_blocks else None
+        if block is None or block.loose:
+            # Loose text (e.g. <div>text<br>text</div>) is a block of the
+            # innermost non-inline element
+            depth = len(self._stack) - 1
+            while depth > 0 and self._stack[depth][0] in INLINE_TAGS:
+                depth -= 1
+            tag, node, _ = self._stack[depth]
+            if block is None or block.node != node:
+                if not data.strip():
+                    return
+                block = self._new_block(tag, node, loose=True, depth=depth)
+                self._open_blocks.append(block)
+        block.parts.append(data)
+        if self._link_depth:
+            block.link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        while self._open_blocks:
+            self._close_block(self._open_blocks.pop())
+
+    # -- blocks ----------------------------------------------------------
+
+    def _new_block(self, tag: str, node: int, loose: bool = False,
+                   depth: Optional[int] = None) -> _Block:
+        # A loose-text block is scored on its own element, a real block on its parent
+        if depth is None:
+            depth = len(self._stack) - 1
+        ancestors = tuple(n for _, n, _ in self._stack[:depth + 1])
+        if not loose:
+            ancestors = ancestors[:-1]
+        self._seq += 1
+        return _Block(seq=self._seq, tag=tag, node=node, ancestors=ancestors, parts=[], loose=loose)
+
+    def _close_block(self, block: _Block):
+        text = block.text
+        if not text:
+            return
+        if block.tag == "h1" and not self.h1:
+            self.h1 = text
+        self.blocks.append(block)
+
+
+def _score_nodes(parser: ArticleParser) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Readability scoring: content score of the elements holding text blocks, and their text length."""
+    scores: Dict[int, float] = {}
+    text_chars: Dict[int, int] = {}
+    link_chars: Dict[int, int] = {}
+
+    def initial(node: int) -> float:
+        tag = parser.node_tags[node]
+        base = {"article": 10, "main": 10, "section": 5, "div": 5,
+                "pre": 3, "td": 3, "blockquote": 3,
+                "ol": -3, "ul": -3, "li": -3, "dl": -3, "form": -3}.get(tag, 0)
+        return base + parser.node_hint[node]
+
+    for block in parser.blocks:
+        length = len(block.text)
+        for node in block.ancestors:
+            text_chars[node] = text_chars.get(node, 0) + length
+            link_chars[node] = link_chars.get(node, 0) + block.link_chars
+        if block.tag in HEADING_TAGS or block.tag == "h1" or length < MIN_SCORED_BLOCK_CHARS:
+            continue
+        if not block.ancestors:
+            continue
+        content = 1 + block.text.count(",") + min(length // 100, 3)
+        parent = block.ancestors[-1]
+        if parent not in scores:
+            scores[parent] = initial(parent)
+        scores[parent] += content
+        if len(block.ancestors) >= 2:
+            grandparent = block.ancestors[-2]
+            if grandparent not in scores:
+                scores[grandparent] = initial(grandparent)
+            scores[grandparent] += content / 2
+
+    for node in scores:
+        if text_chars.get(node):
+            scores[node] *= 1 - link_chars.get(node, 0) / text_chars[node]
+    return scores, text_chars
+
+
+def _format_block(block: _Block) -> str:
+    text = block.text
+    if block.tag in HEADING_TAGS:
+        return f"## {text}"
+    if block.tag == "li":
+        return f"- {text}"
+    return text
+
+
+def extract_article(html: str) -> ExtractedArticle:
+    """
+    Extract title and main article text from an HTML page.
+
+    Headings are kept as "## " lines and list items as "- " lines so the
+    article structure (subheadings, lists) survives; blocks are separated
+    by blank lines. text is empty when the page has no recognizable content.
+
+    Subtrees with boilerplate class/id hints are dropped first; when that
+    leaves fewer than MIN_ARTICLE_WORDS, the page is parsed again with the
+    hints only lowering scores, and that text is used if it is long enough.
+    """
+    parser = _parse(html, skip_hinted=True)
+    article = _extract(parser)
+    if article.word_count < MIN_ARTICLE_WORDS and parser.hint_skips:
+        retry = _extract(_parse(html, skip_hinted=False))
+        if retry.word_count >= MIN_ARTICLE_WORDS:
+            return retry
+    return article
+
+
+def _parse(html: str, skip_hinted: bool) -> ArticleParser:
+    parser = ArticleParser(skip_hinted=skip_hinted)
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # html.parser is lenient; keep whatever was collected before the failure
+        pass
+    return parser
+
+
+def _extract(parser: ArticleParser) -> ExtractedArticle:
+    title = parser.h1 or parser.title
+    scores, text_chars = _score_nodes(parser)
+    if scores:
+        best = max(scores, key=scores.get)
+        # The best element and its ancestors are kept even if hinted as
+        # boilerplate; other hinted elements inside the result are dropped
+        kept = {best}
+        parent = parser.node_parent[best]
+        while parent is not None:
+            kept.add(parent)
+            parent = parser.node_parent[parent]
+        parent = parser.node_parent[best]
+        while (parent is not None
+               and text_chars.get(parent, 0) <= text_chars.get(best, 0) * MAX_PARENT_TEXT_GROWTH):
+            best, parent = parent, parser.node_parent[parent]
+        blocks = [
+            b for b in parser.blocks
+            if (b.node == best or best in b.ancestors)
+            and not any(parser.node_negative[n] and n not in kept for n in (*b.ancestors, b.node))
+        ]
+    else:
+        blocks = [b for b in parser.blocks if len(b.text) >= MIN_SCORED_BLOCK_CHARS]
+
+    parts = []
+    previous = None
+    for block in sorted(blocks, key=lambda b: b.seq):
+        if block.tag == "h1":
+            continue
+        if block.tag not in HEADING_TAGS and block.link_chars > len(block.text) * MAX_BLOCK_LINK_DENSITY:
+            continue
+        if parts:
+            # List items stay together, everything else is a paragraph
+            parts.append("\n" if block.tag == previous == "li" else "\n\n")
+        parts.append(_format_block(block))
+        previous = block.tag
+
+    return ExtractedArticle(title=title, text="".join(parts))
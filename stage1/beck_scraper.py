@@ -0,0 +1,391 @@
+"""
+Beck Scraper - Deterministic extraction of Beck-Online search results.
+
+Searches and reads court decisions directly on a logged-in BeckSession page
+instead of through the browser-use agent (one Gemini call per page step):
+1. Load the search results page for the search terms
+2. Pick the result links from the hit list (HIT_SELECTORS)
+3. Open each hit and read gericht, aktenzeichen, datum, leitsatz and normen
+   from the document (DECISION_SELECTORS, with the citation line as fallback)
+
+Pages are parsed from page.content() with html.parser, so parsing is tested
+without a browser. When the selectors do not match the page layout,
+BeckSelectorError is raised and browser_agent falls back to the agent.
+
+UNVERIFIED: SEARCH_PATH and the selectors below have not been checked
+against live Beck-Online pages (no subscription was available). They are
+assumptions based on the layout described in browser_agent's task template
+and common class names. The pages in fixtures/beck/ were hand-written to
+the same assumptions, so the tests cover the parsing logic only, not the
+real layout. Check them against saved real pages before relying on the
+direct path; until then, a mismatch only costs the agent fallback.
+"""
+
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus, urljoin, urlparse
+
+# Add stage1 to path for imports
+_stage1 = Path(__file__).parent
+if str(_stage1) not in sys.path:
+    sys.path.insert(0, str(_stage1))
+
+from legal_models import CourtDecision
+
+logger = logging.getLogger(__name__)
+
+BECK_BASE_URL = "https://beck-online.beck.de"
+# Unverified guess at the search URL (see module docstring)
+SEARCH_PATH = "/Search?pagenr=1&words={query}"
+
+# Simple selectors ("tag", ".class", "tag.class", "#id", "[attr]", "[attr=value]"),
+# tried in order; the first that matches anything wins. Unverified guesses at
+# the Beck-Online layout (see module docstring).
+HIT_SELECTORS = (".treffer", ".hit", "li.search-result", "[data-hit]")
+HIT_LINK_SELECTORS = (".treffer-titel", ".hit-title", "a.title")
+DECISION_SELECTORS = {
+    "gericht": (".gericht", "[data-field=gericht]"),
+    "aktenzeichen": (".aktenzeichen", ".az", "[data-field=aktenzeichen]"),
+    "datum": (".datum", ".entscheidungsdatum", "[data-field=datum]"),
+    "leitsatz": (".leitsatz", ".leitsaetze", "#leitsatz"),
+    "orientierungssatz": (".orientierungssatz", ".os"),
+    "normen": (".normen", ".normenkette", ".vorschriften"),
+    "gruende": (".gruende", ".entscheidungsgruende", ".dokument-text"),
+    "citation": (".dokumentkopf", ".dokumentenkopf", "h1"),
+}
+
+# "BAG, Urteil vom 12.03.2024 – 6 AZR 123/23" (Beschl. v., Urt. v., ...)
+CITATION_RE = re.compile(
+    r"(?P<gericht>[A-ZÄÖÜ][\wÄÖÜäöüß.\- ]{1,60}?),\s*"
+    r"(?:Urteil|Urt\.|Beschluss|Beschl\.|Gerichtsbescheid|Vorlagebeschluss)\s*"
+    r"(?:vom|v\.)\s*(?P<datum>\d{1,2}\.\s?\d{1,2}\.\s?\d{4})\s*[–—-]\s*"
+    r"(?P<aktenzeichen>[\w.]+(?: [\w.]+)*? \d+/\d{2,4})"
+)
+NORM_RE = re.compile(r"(?:§§?|Art\.)\s*\d+[a-z]?(?:\s+(?:Abs\.|S\.|Satz|Nr\.)\s*\d+[a-z]?)*\s+[A-ZÄÖÜ][A-Za-zÄÖÜäöü]*")
+NO_RESULTS_RE = re.compile(r"keine\s+Treffer|0\s+Treffer|ergab\s+keine", re.IGNORECASE)
+# Section label at the start of a captured section ("Leitsatz:", "Gründe", ...)
+SECTION_HEADING_RE = re.compile(
+    r"^\s*(?:Amtliche[rn]?\s+)?(?:Leits(?:atz|ätze)|Orientierungss(?:atz|ätze)|(?:Entscheidungs)?gründe)\s*:?\s*",
+    re.IGNORECASE,
+)
+
+# Hits opened per keyword beyond the wanted decisions (commentary, statutes)
+MAX_HITS_OPENED = 6
+# Words of the reasoning kept as volltext_auszug
+EXCERPT_WORDS = 400
+
+
+class BeckSelectorError(Exception):
+    """The page layout no longer matches the selectors (use the agent instead)."""
+
+
+@dataclass
+class SearchHit:
+    """One entry of the search results list."""
+    title: str
+    url: str  # canonical beck-online.beck.de URL
+    page_url: str  # link target on the host the results were loaded from
+    snippet: str = ""
+
+
+@dataclass
+class _Capture:
+    key: str
+    depth: int
+    parts: List[str] = field(default_factory=list)
+    links: List[Tuple[str, str, str]] = field(default_factory=list)  # (href, text, selector key)
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.parts).split())
+
+
+_SELECTOR_RE = re.compile(
+    r"^(?P<tag>[a-z0-9]+)?(?:\.(?P<cls>[\w-]+))?(?:#(?P<id>[\w-]+))?"
+    r"(?:\[(?P<attr>[\w-]+)(?:=(?P<value>[^\]]+))?\])?$"
+)
+
+
+def _matches(selector: str, tag: str, attrs: Dict[str, str]) -> bool:
+    m = _SELECTOR_RE.match(selector)
+    if not m:
+        raise ValueError(f"Unsupported selector: {selector}")
+    if m["tag"] and m["tag"] != tag:
+        return False
+    if m["cls"] and m["cls"] not in attrs.get("class", "").split():
+        return False
+    if m["id"] and attrs.get("id") != m["id"]:
+        return False
+    if m["attr"]:
+        if m["attr"] not in attrs:
+            return False
+        if m["value"] is not None and attrs[m["attr"]] != m["value"].strip("'\""):
+            return False
+    return True
+
+
+class SelectorParser(HTMLParser):
+    """
+    Collects text and links of every element matching a selector group.
+
+    captures maps each group key to the matching elements in document order;
+    nested matches are captured separately and also feed their ancestors.
+    """
+
+    SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "head"})
+    VOID_TAGS = frozenset({
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr",
+    })
+    # Line breaks between these keep separate paragraphs apart
+    BREAK_TAGS = frozenset({"p", "li", "div", "br", "h1", "h2", "h3", "h4", "h5", "h6", "tr"})
+
+    def __init__(self, selectors: Dict[str, Sequence[str]]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.captures: Dict[str, List[_Capture]] = {key: [] for key in selectors}
+        self.text_parts: List[str] = []
+        self._stack: List[str] = []
+        self._open: List[_Capture] = []
+        self._skip_depth = 0
+        self._link: Optional[Tuple[str, List[str], str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BREAK_TAGS:
+            self._append("\n")
+        if tag in self.VOID_TAGS:
+            return
+        if tag == "body" and "head" in self._stack:
+            self.handle_endtag("head")  # Unclosed <head>
+        attr = {k: (v or "") for k, v in attrs}
+        self._stack.append(tag)
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        for key, selectors in self.selectors.items():
+            if any(_matches(s, tag, attr) for s in selectors):
+                capture = _Capture(key=key, depth=len(self._stack))
+                self.captures[key].append(capture)
+                self._open.append(capture)
+        if tag == "a" and attr.get("href"):
+            # A link belongs to the innermost capture around it (e.g. the title in a hit)
+            self._link = (attr["href"], [], self._open[-1].key if self._open else "")
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS or tag not in self._stack:
+            return  # Stray end tag
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in self.SKIP_TAGS:
+                self._skip_depth -= 1
+            if open_tag == "a" and self._link is not None:
+                href, parts, key = self._link
+                text = " ".join("".join(parts).split())
+                for capture in self._open:
+                    capture.links.append((href, text, key))
+                self._link = None
+            if open_tag == tag:
+                break
+        self._open = [c for c in self._open if c.depth <= len(self._stack)]
+        if tag in self.BREAK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        self._append(data)
+        if self._link is not None:
+            self._link[1].append(data)
+
+    def _append(self, data: str):
+        self.text_parts.append(data)
+        for capture in self._open:
+            capture.parts.append(data)
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.text_parts).split())
+
+    def first(self, key: str) -> Optional[_Capture]:
+        """First element matching the group (document order)."""
+        captures = self.captures.get(key) or []
+        return captures[0] if captures else None
+
+
+def _parse(html: str, selectors: Dict[str, Sequence[str]]) -> SelectorParser:
+    parser = SelectorParser(selectors)
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # html.parser is lenient; keep whatever was collected before the failure
+        pass
+    return parser
+
+
+def canonical_url(href: str, page_url: str = BECK_BASE_URL) -> str:
+    """Absolute beck-online.beck.de URL of a link (keeps path and query, drops the host)."""
+    parsed = urlparse(urljoin(page_url, href))
+    return urljoin(BECK_BASE_URL, parsed.path + (f"?{parsed.query}" if parsed.query else ""))
+
+
+def search_url(search_terms: str, base_url: str = BECK_BASE_URL) -> str:
+    return base_url.rstrip("/") + SEARCH_PATH.format(query=quote_plus(search_terms))
+
+
+def parse_search_results(html: str, page_url: str = BECK_BASE_URL) -> List[SearchHit]:
+    """
+    Result links of a search results page, in list order.
+
+    Returns:
+        Hits (empty when the page reports no results)
+
+    Raises:
+        BeckSelectorError: The page has results but no hit selector matched
+    """
+    for hit_selector in HIT_SELECTORS:
+        parser = _parse(html, {"hit": (hit_selector,), "link": HIT_LINK_SELECTORS})
+        if parser.captures["hit"]:
+            break
+    else:
+        if NO_RESULTS_RE.search(parser.text):
+            return []
+        raise BeckSelectorError("no search hit matched HIT_SELECTORS")
+
+    hits = []
+    seen = set()
+    for capture in parser.captures["hit"]:
+        if not capture.links:
+            continue
+        # Prefer the title link, else the first link of the hit
+        href, title, _ = next((l for l in capture.links if l[2] == "link"), capture.links[0])
+        url = canonical_url(href, page_url)
+        if url in seen:
+            continue
+        seen.add(url)
+        snippet = capture.text.replace(title, "", 1).strip() if title else capture.text
+        hits.append(SearchHit(title=title or capture.text[:120], url=url,
+                              page_url=urljoin(page_url, href), snippet=snippet))
+    if not hits:
+        raise BeckSelectorError("search hits matched but contain no links")
+    return hits
+
+
+def _iso_date(datum: str) -> str:
+    datum = re.sub(r"\s+", "", datum)
+    try:
+        return datetime.strptime(datum, "%d.%m.%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        logger.warning(f"Could not parse date: {datum}")
+        return datum
+
+
+def parse_decision(html: str, page_url: str, rechtsgebiet: str) -> Optional[CourtDecision]:
+    """
+    Read a court decision document.
+
+    Fields come from DECISION_SELECTORS; gericht, datum and aktenzeichen fall
+    back to the citation line ("BAG, Urteil vom 12.03.2024 – 6 AZR 123/23").
+
+    Returns:
+        CourtDecision, or None when the page is not a court decision
+        (commentary, statute) or its fields cannot be found
+    """
+    parser = _parse(html, DECISION_SELECTORS)
+
+    def text(key: str) -> str:
+        capture = parser.first(key)
+        return capture.text if capture else ""
+
+    gericht, aktenzeichen, datum = text("gericht"), text("aktenzeichen"), text("datum")
+    if not (gericht and aktenzeichen and datum):
+        citation = CITATION_RE.search(text("citation")) or CITATION_RE.search(parser.text)
+        if citation:
+            gericht = gericht or citation["gericht"].strip()
+            aktenzeichen = aktenzeichen or citation["aktenzeichen"].strip()
+            datum = datum or citation["datum"]
+    if not (gericht and aktenzeichen and datum):
+        return None
+
+    leitsatz = SECTION_HEADING_RE.sub("", text("leitsatz"))
+    orientierungssatz = SECTION_HEADING_RE.sub("", text("orientierungssatz"))
+    datum = _iso_date(datum)
+    if len(leitsatz) < 20:
+        leitsatz = orientierungssatz if len(orientierungssatz) >= 20 else (
+            f"Entscheidung des {gericht} vom {datum} - {aktenzeichen}"
+        )
+
+    normen_capture = parser.first("normen")
+    if normen_capture and normen_capture.links:
+        normen = [t for _, t, _ in normen_capture.links if t]
+    else:
+        source = normen_capture.text if normen_capture else leitsatz
+        normen = NORM_RE.findall(source)
+    normen = list(dict.fromkeys(" ".join(n.split()) for n in normen))
+
+    try:
+        return CourtDecision(
+            gericht=gericht,
+            aktenzeichen=aktenzeichen,
+            datum=datum,
+            leitsatz=leitsatz,
+            relevante_normen=normen,
+            url=canonical_url(page_url),
+            rechtsgebiet=rechtsgebiet,
+            orientierungssatz=orientierungssatz,
+            volltext_auszug=" ".join(SECTION_HEADING_RE.sub("", text("gruende")).split()[:EXCERPT_WORDS]),
+        )
+    except ValueError as e:
+        logger.warning(f"Decision at {page_url} failed validation: {e}")
+        return None
+
+
+async def scrape_decisions(
+    session,
+    search_terms: str,
+    rechtsgebiet: str,
+    base_url: str = BECK_BASE_URL,
+    max_decisions: int = 3,
+) -> List[CourtDecision]:
+    """
+    Search Beck-Online on a pool session and read the first court decisions.
+
+    Args:
+        session: Logged-in BeckSession (page loads go through its rate limit)
+        search_terms: Search bar input
+        rechtsgebiet: Legal area stored on the decisions
+        base_url: Beck-Online host the session is logged in to
+        max_decisions: Decisions to collect
+
+    Returns:
+        Court decisions in result order (empty when the search has no hits)
+
+    Raises:
+        BeckSelectorError: Results or decision pages do not match the selectors
+    """
+    await session.goto(search_url(search_terms, base_url))
+    hits = parse_search_results(await session.page.content(), session.page.url)
+    if not hits:
+        logger.info(f"Beck-Online search returned no hits for '{search_terms}'")
+        return []
+
+    decisions: List[CourtDecision] = []
+    for hit in hits[:MAX_HITS_OPENED]:
+        await session.goto(hit.page_url)
+        decision = parse_decision(await session.page.content(), hit.url, rechtsgebiet)
+        if decision is None:
+            logger.debug(f"Skipping non-decision hit: {hit.title}")
+            continue
+        decisions.append(decision)
+        logger.info(f"Scraped decision: {decision.gericht} {decision.aktenzeichen} ({decision.datum})")
+        if len(decisions) >= max_decisions:
+            break
+
+    if not decisions:
+        raise BeckSelectorError(f"none of {min(len(hits), MAX_HITS_OPENED)} hits parsed as a decision")
+    return decisions
@@ -0,0 +1,419 @@
+"""
+Beck-Online Session Pool - parallel research over authenticated browser contexts.
+
+Keeps N Playwright browser contexts logged in to Beck-Online and dispatches
+keyword research jobs across them:
+- Login state (cookies, local storage) is persisted to disk
+  (BECK_STORAGE_STATE_PATH). Contexts start from it, so login is skipped
+  while the stored session is valid; one login refreshes it for all contexts.
+- Page loads of all contexts (and of agents seeded with the stored state)
+  share one AsyncRateLimiter (BECK_REQUESTS_PER_MINUTE), so the pool as a
+  whole stays below the rate that triggers Beck-Online's captcha.
+- A context is health-checked before it takes a job (page responsive, still
+  logged in). Contexts that fail the check or keep failing jobs are closed
+  and reopened from the stored state.
+
+Only work done on session.page (the selector-based extraction in
+beck_scraper) actually runs in the pooled contexts. The browser-use agent
+fallback drives its own browser over CDP and cannot use a Playwright page:
+it starts a separate BrowserSession seeded from the stored login state, and
+for it the pool is only a shared login, a concurrency slot and the shared
+rate limit (research_agent_hook).
+
+Login selectors follow the page layout described in browser_agent's task
+template and have not been verified against the live site (see
+beck_scraper); base_url can point the pool at another host (e.g. fixture
+pages routed in tests).
+
+Usage:
+    async with BeckSessionPool(size=3) as pool:
+        results = await pool.map(keywords, job)   # await job(session, keyword)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+# Add parent to path for shared imports
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+from shared.rate_limiter import AsyncRateLimiter
+
+try:
+    from shared.constants import (
+        BECK_POOL_SIZE,
+        BECK_REQUESTS_PER_MINUTE,
+        BECK_SESSION_MAX_AGE_HOURS,
+        BECK_STORAGE_STATE_PATH,
+    )
+except ImportError:
+    BECK_POOL_SIZE = 3
+    BECK_REQUESTS_PER_MINUTE = 20.0
+    BECK_SESSION_MAX_AGE_HOURS = 12.0
+    BECK_STORAGE_STATE_PATH = "data/beck_storage_state.json"
+
+logger = logging.getLogger(__name__)
+
+BECK_BASE_URL = "https://beck-online.beck.de"
+
+# Playwright selectors of the login flow (unverified against the live site)
+LOGIN_SELECTORS = {
+    # Cookie consent ("Alle akzeptieren"), shown on the home and login page
+    "cookie_accept": "button:has-text('Alle akzeptieren')",
+    # Only present when logged in
+    "logged_in": "a:has-text('Abmelden'), button:has-text('Abmelden')",
+    # "Anmelden" in the "Mein beck-online" box (not the header link)
+    "login_link": ":is(#mein-beck-online, .mein-beck-online) :is(a, button):has-text('Anmelden')",
+    "username": "input[name='Benutzerkennung'], input#Benutzerkennung, input[autocomplete='username']",
+    "password": "input[type='password']",
+    "submit": "form:has(input[type='password']) :is(button[type='submit'], input[type='submit'])",
+}
+
+# Seconds a passed health check is trusted before the login is re-verified
+HEALTH_CHECK_INTERVAL = 300
+# Consecutive failed jobs after which a context is reopened
+MAX_CONSECUTIVE_FAILURES = 2
+# Page timeout for navigation and selectors (ms)
+PAGE_TIMEOUT_MS = 30_000
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BeckLoginError(ValueError):
+    """Login to Beck-Online failed (credentials, changed login form, captcha)."""
+
+
+def resolve_storage_state_path(path: Optional[str] = None) -> Path:
+    """Storage state file (relative paths are relative to the project root)."""
+    resolved = Path(path or BECK_STORAGE_STATE_PATH)
+    return resolved if resolved.is_absolute() else _parent / resolved
+
+
+def storage_state_valid(path: Path, max_age_hours: float = BECK_SESSION_MAX_AGE_HOURS) -> bool:
+    """
+    Whether a persisted storage state can still be used to skip login.
+
+    The file must be younger than max_age_hours and hold at least one cookie
+    that has not expired (session cookies count as valid).
+    """
+    try:
+        if time.time() - path.stat().st_mtime > max_age_hours * 3600:
+            return False
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    now = time.time()
+    cookies = state.get("cookies") if isinstance(state, dict) else None
+    return any(
+        cookie.get("expires", -1) in (-1, None) or cookie["expires"] > now
+        for cookie in cookies or []
+        if isinstance(cookie, dict)
+    )
+
+
+@dataclass
+class BeckSession:
+    """One authenticated browser context of the pool."""
+    index: int
+    context: Any  # playwright BrowserContext
+    page: Any  # playwright Page
+    limiter: AsyncRateLimiter
+    opened_at: float
+    checked_at: float = 0.0
+    jobs_done: int = 0
+    consecutive_failures: int = 0
+
+    async def goto(self, url: str):
+        """Navigate under the pool's global rate limit."""
+        async with self.limiter.acquire():
+            return await self.page.goto(url, wait_until="domcontentloaded")
+
+    @asynccontextmanager
+    async def throttled(self) -> AsyncIterator[None]:
+        """Rate-limit an action that loads a page (form submit, link click)."""
+        async with self.limiter.acquire():
+            yield
+
+
+class BeckSessionPool:
+    """Pool of Playwright browser contexts sharing one persisted Beck-Online login."""
+
+    def __init__(
+        self,
+        size: int = BECK_POOL_SIZE,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        storage_state_path: Optional[str] = None,
+        base_url: str = BECK_BASE_URL,
+        requests_per_minute: Optional[float] = BECK_REQUESTS_PER_MINUTE,
+        headless: bool = True,
+        max_session_age_hours: float = BECK_SESSION_MAX_AGE_HOURS,
+        on_context: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            size: Number of browser contexts (parallel jobs)
+            username: Beck-Online username (default: BECK_USERNAME)
+            password: Beck-Online password (default: BECK_PASSWORD)
+            storage_state_path: Persisted login state (default: BECK_STORAGE_STATE_PATH)
+            base_url: Beck-Online home page
+            requests_per_minute: Page loads per minute across the pool (None = unlimited)
+            headless: Run the browser headless
+            max_session_age_hours: Age after which a stored login is not reused
+            on_context: Awaited with every new context before use (e.g. to route
+                requests to fixture pages in tests)
+        """
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.size = size
+        self.username = username if username is not None else os.getenv("BECK_USERNAME", "")
+        self.password = password if password is not None else os.getenv("BECK_PASSWORD", "")
+        self.storage_state_path = resolve_storage_state_path(storage_state_path)
+        self.base_url = base_url.rstrip("/")
+        self.headless = headless
+        self.max_session_age_hours = max_session_age_hours
+        self.on_context = on_context
+        self.limiter = AsyncRateLimiter(per_minute=requests_per_minute, burst=1, name="beck-online")
+
+        self._playwright = None
+        self._browser = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._sessions: List[BeckSession] = []
+        self._login_lock = asyncio.Lock()
+        self._state_saved_at = 0.0
+        self.logins = 0
+
+    # -- lifecycle -------------------------------------------------------
+
+    async def start(self) -> "BeckSessionPool":
+        """Launch the browser and open size logged-in contexts (logs in at most once)."""
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._idle = asyncio.Queue()
+        try:
+            first = await self._open_session(0)
+            await self._ensure_logged_in(first)
+            self._sessions.append(first)
+            rest = await asyncio.gather(*(self._open_session(i) for i in range(1, self.size)))
+            self._sessions.extend(rest)
+        except BaseException:
+            await self.close()
+            raise
+        for session in self._sessions:
+            self._idle.put_nowait(session)
+        logger.info(f"Beck-Online session pool ready: {self.size} contexts "
+                    f"({'new login' if self.logins else 'stored login'})")
+        return self
+
+    async def close(self):
+        """Close all contexts and the browser."""
+        for session in self._sessions:
+            try:
+                await session.context.close()
+            except Exception:
+                pass
+        self._sessions = []
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "BeckSessionPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # -- dispatch --------------------------------------------------------
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[BeckSession]:
+        """
+        Borrow a healthy session for one job.
+
+        A job that raises counts as a failure of its session; after
+        MAX_CONSECUTIVE_FAILURES the session is reopened.
+        """
+        if self._idle is None:
+            raise RuntimeError("BeckSessionPool is not started")
+        session = await self._idle.get()
+        try:
+            if not await self._healthy(session):
+                session = await self._reopen(session)
+                await self._ensure_logged_in(session)
+            try:
+                yield session
+            except Exception:
+                session.consecutive_failures += 1
+                if session.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    logger.warning(f"Beck session {session.index} failed "
+                                   f"{session.consecutive_failures} jobs in a row, reopening")
+                    session = await self._reopen(session)
+                raise
+            session.jobs_done += 1
+            session.consecutive_failures = 0
+        finally:
+            self._idle.put_nowait(session)
+
+    async def map(
+        self,
+        items: Sequence[T],
+        job: Callable[[BeckSession, T], Awaitable[R]],
+    ) -> List[Any]:
+        """
+        Run job(session, item) for every item, each on the next free session.
+
+        Returns:
+            Results in item order; a failed job yields its exception
+        """
+        async def run(item: T):
+            async with self.session() as session:
+                return await job(session, item)
+
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+    async def refresh_login(self, session: BeckSession):
+        """
+        Re-store the login after a browser started from it was rejected.
+
+        Saves the session's current state if it is still logged in, logs in
+        again otherwise; the other sessions re-verify on their next job.
+        """
+        for other in self._sessions:
+            other.checked_at = 0.0
+        async with self._login_lock:
+            if await self._is_logged_in(session):
+                await self._save_state(session)
+            else:
+                await self._login(session)
+        session.checked_at = time.monotonic()
+
+    # -- sessions --------------------------------------------------------
+
+    async def _open_session(self, index: int) -> BeckSession:
+        """New context from the stored login state (if still valid)."""
+        state = None
+        if storage_state_valid(self.storage_state_path, self.max_session_age_hours):
+            state = str(self.storage_state_path)
+        context = await self._browser.new_context(storage_state=state, locale="de-DE")
+        context.set_default_timeout(PAGE_TIMEOUT_MS)
+        if self.on_context is not None:
+            await self.on_context(context)
+        page = await context.new_page()
+        return BeckSession(index=index, context=context, page=page, limiter=self.limiter,
+                           opened_at=time.monotonic())
+
+    async def _reopen(self, session: BeckSession) -> BeckSession:
+        """Replace a session with a fresh context (login is checked on its next job)."""
+        try:
+            await session.context.close()
+        except Exception:
+            pass
+        fresh = await self._open_session(session.index)
+        self._sessions[self._sessions.index(session)] = fresh
+        return fresh
+
+    async def _healthy(self, session: BeckSession) -> bool:
+        """Page responsive and (re-verified every HEALTH_CHECK_INTERVAL) still logged in."""
+        try:
+            if session.page.is_closed():
+                return False
+            await asyncio.wait_for(session.page.evaluate("1"), timeout=5)
+            if time.monotonic() - session.checked_at < HEALTH_CHECK_INTERVAL:
+                return True
+            await self._ensure_logged_in(session)
+            return True
+        except BeckLoginError:
+            raise
+        except Exception as e:
+            logger.warning(f"Beck session {session.index} failed health check: {e}")
+            return False
+
+    async def _is_logged_in(self, session: BeckSession) -> bool:
+        await session.goto(self.base_url)
+        await self._accept_cookies(session)
+        return await session.page.locator(LOGIN_SELECTORS["logged_in"]).count() > 0
+
+    async def _accept_cookies(self, session: BeckSession):
+        button = session.page.locator(LOGIN_SELECTORS["cookie_accept"]).first
+        try:
+            if await button.is_visible():
+                await button.click()
+        except Exception as e:
+            logger.debug(f"Cookie banner not dismissed: {e}")
+
+    async def _ensure_logged_in(self, session: BeckSession):
+        """
+        Log the session in if needed.
+
+        Logins are serialized: a session that waited for another one's login
+        picks up the freshly stored state instead of logging in again.
+        """
+        if await self._is_logged_in(session):
+            session.checked_at = time.monotonic()
+            return
+        async with self._login_lock:
+            if self._state_saved_at > session.opened_at:
+                state = json.loads(self.storage_state_path.read_text(encoding="utf-8"))
+                await session.context.add_cookies(state.get("cookies", []))
+                if await self._is_logged_in(session):
+                    session.checked_at = time.monotonic()
+                    return
+            await self._login(session)
+        session.checked_at = time.monotonic()
+
+    async def _login(self, session: BeckSession):
+        """Fill the login form and persist the resulting storage state."""
+        if not self.username or not self.password:
+            raise BeckLoginError("Login failed - BECK_USERNAME and BECK_PASSWORD must be set")
+        page = session.page
+        logger.info(f"Logging in to Beck-Online (session {session.index})")
+        try:
+            async with session.throttled():
+                await page.locator(LOGIN_SELECTORS["login_link"]).first.click()
+                await page.wait_for_load_state("domcontentloaded")
+            await self._accept_cookies(session)
+            await page.locator(LOGIN_SELECTORS["username"]).first.fill(self.username)
+            await page.locator(LOGIN_SELECTORS["password"]).first.fill(self.password)
+            async with session.throttled():
+                await page.locator(LOGIN_SELECTORS["submit"]).first.click()
+                await page.wait_for_load_state("domcontentloaded")
+        except Exception as e:
+            raise BeckLoginError(f"Login failed - login form not usable: {e}") from e
+
+        if not await self._is_logged_in(session):
+            raise BeckLoginError("Login failed - check Beck credentials in .env file")
+
+        await self._save_state(session)
+        self.logins += 1
+        logger.info(f"Beck-Online login stored in {self.storage_state_path}")
+
+    async def _save_state(self, session: BeckSession):
+        """Persist the session's cookies and local storage (atomic replace)."""
+        self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_state_path.with_suffix(".tmp")
+        await session.context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, self.storage_state_path)
+        self._state_saved_at = time.monotonic()
+
+
+def research_agent_hook(pool: BeckSessionPool) -> Callable[[Any], Awaitable[None]]:
+    """on_step_start hook that puts a browser-use agent's steps under the pool's rate limit."""
+    async def hook(agent):
+        async with pool.limiter.acquire():
+            pass
+    return hook
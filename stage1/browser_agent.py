@@ -4,9 +4,13 @@ Beck-Online browser automation agent using browserUse.
 Navigates beck-online.beck.de, authenticates, searches for court decisions and legal commentary,
 and extracts structured data. Uses Gemini as the LLM (consistent with rest of pipeline).
 
+Known page layouts are read directly with Playwright (beck_scraper.py); the
+agent is the fallback when the selectors no longer match.
+
 This module is used when use_mock=False in legal_researcher.py.
 """
 
+import importlib.util
 import os
 import logging
 import sys
@@ -24,20 +28,20 @@ project_root = stage1_path.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from beck_scraper import BeckSelectorError, scrape_decisions
+from beck_session_pool import BeckSession, BeckSessionPool, research_agent_hook
 from legal_models import CourtDecision, LegalContext
 from shared.gemini_client import GeminiClient
 
 logger = logging.getLogger(__name__)
 
-# Import browserUse components (will be installed in requirements.txt)
-try:
-    from browser_use.agent.service import Agent
-    from browser_use.browser import BrowserSession, BrowserProfile
-    from browser_use.llm.google.chat import ChatGoogle
-    BROWSER_USE_AVAILABLE = True
-except ImportError as e:
-    BROWSER_USE_AVAILABLE = False
-    logger.warning(f"browserUse not available: {e}. Install with: pip install browser-use playwright")
+# browserUse (will be installed in requirements.txt) is heavy to import, so only
+# its presence is checked here; components are imported when an agent is built.
+BROWSER_USE_AVAILABLE = importlib.util.find_spec("browser_use") is not None
+if not BROWSER_USE_AVAILABLE:
+    logger.warning("browserUse not available. Install with: pip install browser-use playwright")
+# Direct (selector-based) research only needs Playwright
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
 
 
 # =============================================================================
@@ -307,12 +311,92 @@ URL: [beck-online URL]
 """
 
 
+# =============================================================================
+# SEARCH TASK TEMPLATE (session pool)
+# =============================================================================
+# Used when the browser starts from the session pool's stored login state:
+# the agent only verifies the session and searches, it never logs in.
+
+SEARCH_TASK_TEMPLATE = """
+TASK: Search Beck-Online for court decisions (you are ALREADY LOGGED IN)
+
+=== FORBIDDEN ACTIONS - WILL CAUSE FAILURE ===
+- NEVER try to log in or click any "Anmelden" / "Sign in" link or button
+- NEVER refresh the page
+- NEVER click any tabs in the header (Beck-Noxtua, Mein beck-online, etc.)
+- NEVER click language dropdowns or settings
+- NEVER switch browser tabs - if a new tab opens, IGNORE it and stay on current tab
+- NEVER click random links or elements with IDs like "pos_XX"
+- NEVER click on advertisements or sponsored content
+- Stay focused ONLY on: search bar → search results list → one court decision
+
+SEARCH TERMS: {search_terms}
+
+Step 1: Go to https://beck-online.beck.de
+
+Step 2: DISMISS COOKIE POPUP IF VISIBLE
+- If a cookie popup/banner is visible, click "Alle akzeptieren"
+- If no popup is visible, continue
+
+Step 3: VERIFY SESSION
+- Look for "Abmelden" text anywhere on the page (usually top-right area)
+- "Abmelden" means "Logout" - its presence confirms the session is logged in
+- If you do NOT see "Abmelden", call done with "NOT_LOGGED_IN" and stop
+
+Step 4: USE THE SEARCH BAR (this is your main goal!)
+- The search bar is a WHITE INPUT FIELD at the top of the page with a "Suche:" label
+- Click INSIDE the white input field (not on any tabs or links!)
+- Type: {search_terms}
+- Press Enter to search
+
+Step 5: LOOK AT SEARCH RESULTS
+- Wait for the search results to fully load
+- Each result has a TITLE link
+- You need to extract data from 3 DIFFERENT court decisions
+
+Step 6: EXTRACT 3 COURT DECISIONS
+For EACH of 3 different court decisions in the search results:
+1. Click on the TITLE LINK to open the full decision
+2. From the decision page, extract:
+   - GERICHT: Court name (BFH, BGH, FG München, etc.)
+   - AKTENZEICHEN: Case number (e.g., "II R 25/21")
+   - DATUM: Date in DD.MM.YYYY format
+   - LEITSATZ: The full legal principle text (look for "Leitsatz" section - copy ALL of it)
+   - RELEVANTE NORMEN: Statute references (e.g., "§ 16 ErbStG")
+   - URL: The page URL from browser address bar
+3. Click BACK to return to search results
+4. Click on a DIFFERENT result and repeat
+
+=== OUTPUT FORMAT ===
+After extracting ALL 3 decisions, call the "done" action with this format:
+
+SEARCH_SUCCESS
+
+Decision 1:
+Gericht: [court name]
+Aktenzeichen: [case number]
+Datum: [date]
+Leitsatz: [full legal principle text]
+Relevante Normen: [statutes]
+URL: [beck-online URL]
+
+(Decision 2 and Decision 3 in the same format)
+
+=== IF SOMETHING FAILS ===
+- If the session is not logged in: call done with "NOT_LOGGED_IN"
+- If no search results: call done with "NO_RESULTS_FOUND"
+- If less than 3 decisions found: report what you found and call done
+"""
+
+
 async def _execute_beck_research_single_agent(
     keywords: List[str],
     rechtsgebiet: str,
     beck_username: str,
     beck_password: str,
-    gemini_api_key: str
+    gemini_api_key: str,
+    pool: Optional[BeckSessionPool] = None,
+    preprocessed: Optional[Dict[str, Any]] = None
 ) -> LegalContext:
     """
     Execute Beck research with a single agent handling login + search.
@@ -321,12 +405,19 @@ async def _execute_beck_research_single_agent(
     that occur when creating multiple agents with the same browser session.
     The agent handles login first, then search, all in one continuous task.
 
+    With a session pool, the agent still launches its own browser-use
+    browser (it cannot drive the pool's Playwright pages), but starts it
+    from the pool's stored login, so the agent only searches; its steps
+    count against the pool's rate limit and the caller holds a pool slot.
+
     Args:
         keywords: List of article keywords
         rechtsgebiet: German legal area
         beck_username: Beck-Online username
         beck_password: Beck-Online password
         gemini_api_key: Gemini API key
+        pool: Logged-in session pool (None = agent logs in itself)
+        preprocessed: Result of _preprocess_keywords_for_search (None = run it here)
 
     Returns:
         LegalContext with court decisions from Beck-Online
@@ -335,6 +426,10 @@ async def _execute_beck_research_single_agent(
         ValueError: If login fails or search returns no results
         Exception: If browser automation fails
     """
+    from browser_use.agent.service import Agent
+    from browser_use.browser import BrowserSession, BrowserProfile
+    from browser_use.llm.google.chat import ChatGoogle
+
     # Initialize Gemini LLM for browser-use
     llm = ChatGoogle(
         model="gemini-2.5-pro",
@@ -353,12 +448,13 @@ async def _execute_beck_research_single_agent(
     # =========================================================================
     # PREPROCESSING: Extract search terms from complex keywords
     # =========================================================================
-    logger.info("Preprocessing keywords for optimal search...")
+    if preprocessed is None:
+        logger.info("Preprocessing keywords for optimal search...")
 
-    preprocessed = await _preprocess_keywords_for_search(
-        keywords=normalized_keywords,
-        provided_rechtsgebiet=rechtsgebiet
-    )
+        preprocessed = await _preprocess_keywords_for_search(
+            keywords=normalized_keywords,
+            provided_rechtsgebiet=rechtsgebiet
+        )
 
     # Use preprocessed search terms and potentially corrected rechtsgebiet
     search_terms = preprocessed.get("search_terms", normalized_keywords)
@@ -371,10 +467,16 @@ async def _execute_beck_research_single_agent(
     if effective_rechtsgebiet != rechtsgebiet:
         logger.info(f"Rechtsgebiet corrected: {rechtsgebiet} → {effective_rechtsgebiet}")
 
-    # Create browser profile and session (non-headless for debugging)
-    browser_profile = BrowserProfile(
-        headless=False,
-    )
+    # Create browser profile and session (non-headless for debugging unless pooled)
+    if pool is not None:
+        browser_profile = BrowserProfile(
+            headless=pool.headless,
+            storage_state=str(pool.storage_state_path),
+        )
+    else:
+        browser_profile = BrowserProfile(
+            headless=False,
+        )
     browser_session = BrowserSession(browser_profile=browser_profile)
 
     try:
@@ -383,15 +485,18 @@ async def _execute_beck_research_single_agent(
         logger.info("Browser session started successfully")
 
         # =====================================================================
-        # SINGLE AGENT: Combined login + search task
+        # SINGLE AGENT: Combined login + search task (search only when pooled)
         # =====================================================================
-        logger.info("Starting combined login + search agent...")
-
-        combined_task = COMBINED_TASK_TEMPLATE.format(
-            username=beck_username,
-            password=beck_password,
-            search_terms=search_terms_str
-        )
+        if pool is not None:
+            logger.info("Starting search agent with stored login...")
+            combined_task = SEARCH_TASK_TEMPLATE.format(search_terms=search_terms_str)
+        else:
+            logger.info("Starting combined login + search agent...")
+            combined_task = COMBINED_TASK_TEMPLATE.format(
+                username=beck_username,
+                password=beck_password,
+                search_terms=search_terms_str
+            )
 
         agent = Agent(
             task=combined_task,
@@ -402,7 +507,10 @@ async def _execute_beck_research_single_agent(
             max_actions_per_step=25,   # Enough for login + search + extraction
         )
 
-        result = await agent.run()
+        if pool is not None:
+            result = await agent.run(on_step_start=research_agent_hook(pool))
+        else:
+            result = await agent.run()
 
         logger.info("Combined agent completed")
 
@@ -472,7 +580,10 @@ async def _execute_beck_research_with_retry(
     beck_username: str,
     beck_password: str,
     gemini_api_key: str,
-    max_retries: int = 2
+    max_retries: int = 2,
+    pool: Optional[BeckSessionPool] = None,
+    session: Optional[BeckSession] = None,
+    preprocessed: Optional[Dict[str, Any]] = None
 ) -> LegalContext:
     """
     Execute Beck-Online research with automatic retry on quota errors.
@@ -493,6 +604,9 @@ async def _execute_beck_research_with_retry(
         beck_password: Beck-Online password
         gemini_api_key: Gemini API key
         max_retries: Max retry attempts (default: 2)
+        pool: Logged-in session pool (None = agent logs in itself)
+        session: Pool session held for this research (refreshes a rejected login)
+        preprocessed: Result of _preprocess_keywords_for_search (None = run it per attempt)
 
     Returns:
         LegalContext with court decisions
@@ -510,7 +624,9 @@ async def _execute_beck_research_with_retry(
                 rechtsgebiet=rechtsgebiet,
                 beck_username=beck_username,
                 beck_password=beck_password,
-                gemini_api_key=gemini_api_key
+                gemini_api_key=gemini_api_key,
+                pool=pool,
+                preprocessed=preprocessed
             )
         except Exception as e:
             error_str = str(e)
@@ -518,6 +634,12 @@ async def _execute_beck_research_with_retry(
             # Login failures should not retry (need credential fix)
             is_login_error = "Login failed" in error_str or "LOGIN_FAILED" in error_str
 
+            # Stored login expired under the pool: let it log in again, then retry
+            if session is not None and "NOT_LOGGED_IN" in error_str and attempt < max_retries:
+                logger.warning("Stored Beck-Online login rejected, refreshing it")
+                await pool.refresh_login(session)
+                continue
+
             is_quota_error = (
                 "429" in error_str or
                 "RESOURCE_EXHAUSTED" in error_str or
@@ -543,14 +665,109 @@ async def _execute_beck_research_with_retry(
                 raise
 
 
+async def _execute_beck_research_direct(
+    keywords: List[str],
+    preprocessed: Dict[str, Any],
+    session: BeckSession,
+    base_url: str
+) -> LegalContext:
+    """
+    Execute Beck research with selector-based Playwright extraction.
+
+    Searches on a logged-in pool session and reads the decisions straight
+    from the pages: no agent steps, so no Gemini calls after preprocessing.
+
+    Args:
+        keywords: Normalized article keywords
+        preprocessed: Result of _preprocess_keywords_for_search
+        session: Logged-in BeckSession
+        base_url: Beck-Online host of the session
+
+    Returns:
+        LegalContext with court decisions from Beck-Online
+
+    Raises:
+        BeckSelectorError: Page layout does not match the selectors
+    """
+    search_terms = " ".join(preprocessed.get("search_terms") or keywords)
+    effective_rechtsgebiet = preprocessed.get("detected_rechtsgebiet", "Allgemeines Recht")
+
+    court_decisions = await scrape_decisions(
+        session,
+        search_terms=search_terms,
+        rechtsgebiet=effective_rechtsgebiet,
+        base_url=base_url,
+    )
+    logger.info(f"Extracted {len(court_decisions)} court decisions from Beck-Online (direct)")
+
+    return LegalContext(
+        rechtsgebiet=effective_rechtsgebiet,
+        court_decisions=court_decisions,
+        statutes=[],
+        disclaimer_template=_generate_disclaimer(effective_rechtsgebiet),
+        stand_der_rechtsprechung=datetime.now().strftime("%Y-%m-%d"),
+        keywords_researched=keywords
+    )
+
+
+async def _research_on_pool(
+    keywords: List[str],
+    rechtsgebiet: str,
+    pool: BeckSessionPool,
+    beck_username: str,
+    beck_password: str,
+    gemini_api_key: str
+) -> LegalContext:
+    """Direct extraction on a pool session, the agent (same session slot) when the selectors fail."""
+    normalized_keywords = [
+        kw.get("keyword", "") if isinstance(kw, dict) else str(kw) for kw in keywords
+    ]
+    preprocessed = await _preprocess_keywords_for_search(
+        keywords=normalized_keywords,
+        provided_rechtsgebiet=rechtsgebiet
+    )
+
+    # Hold a pool slot for the whole research so at most pool.size lookups run
+    async with pool.session() as session:
+        try:
+            return await _execute_beck_research_direct(
+                keywords=normalized_keywords,
+                preprocessed=preprocessed,
+                session=session,
+                base_url=pool.base_url
+            )
+        except BeckSelectorError as e:
+            if not BROWSER_USE_AVAILABLE:
+                raise
+            logger.warning(f"Direct Beck-Online extraction failed ({e}), falling back to browser agent")
+
+        return await _execute_beck_research_with_retry(
+            keywords=keywords,
+            rechtsgebiet=rechtsgebiet,
+            beck_username=beck_username,
+            beck_password=beck_password,
+            gemini_api_key=gemini_api_key,
+            max_retries=2,
+            pool=pool,
+            session=session,
+            preprocessed=preprocessed
+        )
+
+
 async def research_via_beck_online(
     keywords: List[str],
-    rechtsgebiet: str = "Arbeitsrecht"
+    rechtsgebiet: str = "Arbeitsrecht",
+    pool: Optional[BeckSessionPool] = None
 ) -> LegalContext:
     """
     Research German court decisions on Beck-Online using browser automation.
 
-    Uses a single-agent approach for reliable CDP connection:
+    Known page layouts are read directly with Playwright (beck_scraper):
+    search results and decision pages are parsed with selectors, which takes
+    seconds and no Gemini calls beyond keyword preprocessing. The browser-use
+    agent is the fallback when the selectors no longer match.
+
+    The agent uses a single-agent approach for reliable CDP connection:
     - One agent handles login + search in a continuous flow
     - Prevents CDP connection issues from creating multiple agents
 
@@ -561,25 +778,35 @@ async def research_via_beck_online(
 
     Process:
     1. Preprocess keywords to extract optimal search terms
-    2. Single agent: Login to Beck-Online with credentials
-    3. Single agent: Search for keywords and extract 3 decisions
-    4. Return structured LegalContext
-    5. Auto-retry on quota errors (60s, 120s delays)
+    2. Log in a session pool (or reuse its stored login)
+    3. Search and extract 3 decisions with selectors
+    4. Selectors failed: agent searches and extracts 3 decisions instead
+    5. Return structured LegalContext
+    6. Auto-retry agent runs on quota errors (60s, 120s delays)
 
     API Quota Optimizations:
+    - Direct extraction needs no agent steps
     - Uses stable model (gemini-2.0-flash, 60 RPM vs 10 RPM for -exp)
     - Vision disabled (reduces API calls by ~80%)
     - Automatic retry with exponential backoff
 
+    With a BeckSessionPool, the direct extraction runs on one of the pool's
+    sessions (so concurrent calls are spread over the pool); an agent
+    fallback holds that session's slot but runs in its own browser started
+    from the pool's stored login. Without a pool, a single-session pool is
+    opened for this call. If that fails to start, the agent logs in itself
+    as before.
+
     Args:
         keywords: List of article keywords
         rechtsgebiet: German legal area (Arbeitsrecht, Mietrecht, etc.)
+        pool: Started BeckSessionPool (None = open one for this call)
 
     Returns:
         LegalContext with court decisions from Beck-Online
 
     Raises:
-        ImportError: If browserUse not installed
+        ImportError: If neither Playwright nor browserUse is installed
         ValueError: If BECK_USERNAME or BECK_PASSWORD missing from environment
         Exception: If browser automation fails (after all retries)
 
@@ -590,7 +817,7 @@ async def research_via_beck_online(
         ... )
         >>> assert all(d.url.startswith("https://beck-online.beck.de") for d in context.court_decisions)
     """
-    if not BROWSER_USE_AVAILABLE:
+    if not BROWSER_USE_AVAILABLE and not PLAYWRIGHT_AVAILABLE:
         raise ImportError(
             "browserUse not installed. Run: pip install browser-use playwright && playwright install chromium"
         )
@@ -608,16 +835,36 @@ async def research_via_beck_online(
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY must be set in .env file")
 
-    logger.info(f"Initializing browser agent for Beck-Online research: {rechtsgebiet}")
+    logger.info(f"Initializing Beck-Online research: {rechtsgebiet}")
+
+    credentials = dict(
+        beck_username=beck_username,
+        beck_password=beck_password,
+        gemini_api_key=gemini_api_key,
+    )
+    if pool is not None:
+        return await _research_on_pool(keywords, rechtsgebiet, pool, **credentials)
+
+    if PLAYWRIGHT_AVAILABLE:
+        own_pool = BeckSessionPool(size=1, username=beck_username, password=beck_password)
+        try:
+            await own_pool.start()
+        except Exception as e:
+            if not BROWSER_USE_AVAILABLE:
+                raise
+            logger.warning(f"Beck-Online session could not be opened ({e}), using browser agent login")
+        else:
+            try:
+                return await _research_on_pool(keywords, rechtsgebiet, own_pool, **credentials)
+            finally:
+                await own_pool.close()
 
     # Execute with retry
     return await _execute_beck_research_with_retry(
         keywords=keywords,
         rechtsgebiet=rechtsgebiet,
-        beck_username=beck_username,
-        beck_password=beck_password,
-        gemini_api_key=gemini_api_key,
-        max_retries=2
+        max_retries=2,
+        **credentials
     )
 
 
@@ -5,6 +5,7 @@ Re-exports from shared/ for standalone compatibility.
 When running as part of the pipeline, shared/ is the source of truth.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -14,13 +15,44 @@ if str(_parent) not in sys.path:
     sys.path.insert(0, str(_parent))
 
 try:
-    from shared.constants import GEMINI_MODEL, MAX_SITEMAP_URLS
+    from shared.constants import (
+        GEMINI_MODEL,
+        MAX_SITEMAP_URLS,
+        SITEMAP_CACHE_MAX_MB,
+        SITEMAP_DOCUMENTS_MAX_AGE_DAYS,
+        SITEMAP_DOCUMENTS_MAX_ENTRIES,
+        SITEMAP_HOST_LIMITERS_MAX,
+        SITEMAP_HOST_MAX_CONCURRENT,
+        SITEMAP_HOST_REQUESTS_PER_MINUTE,
+        SITEMAP_MAX_DEPTH,
+        URL_VALIDATION_CACHE_HOURS,
+        URL_VALIDATION_CACHE_MAX_ENTRIES,
+    )
 except ImportError:
     # Fallback for standalone execution without shared/
     GEMINI_MODEL = "gemini-3-flash-preview"
     MAX_SITEMAP_URLS = 10000
+    SITEMAP_CACHE_MAX_MB = 64
+    SITEMAP_DOCUMENTS_MAX_AGE_DAYS = 30
+    SITEMAP_DOCUMENTS_MAX_ENTRIES = 2000
+    SITEMAP_HOST_LIMITERS_MAX = 1024
+    SITEMAP_HOST_MAX_CONCURRENT = 4
+    SITEMAP_HOST_REQUESTS_PER_MINUTE = 300
+    SITEMAP_MAX_DEPTH = 3
+    URL_VALIDATION_CACHE_HOURS = 24
+    URL_VALIDATION_CACHE_MAX_ENTRIES = 100000
 
 # Voice Enhancement Constants
-# Analyze more blog posts for better voice matching
-VOICE_ENHANCEMENT_SAMPLE_SIZE = 5  # Number of blog posts to sample for voice analysis
+# Analyze more blog posts for better voice matching (article text is extracted
+# locally, so more samples no longer mean more URL Context fetches)
+VOICE_ENHANCEMENT_SAMPLE_SIZE = 8  # Number of blog posts to sample for voice analysis
 VOICE_ENHANCEMENT_MIN_BLOGS = 3   # Minimum blogs needed to trigger enhancement
+VOICE_PERSONA_MIN_NEW_POSTS = 5   # New blog posts before a stored voice persona is updated
+
+# Stage 1 Context Cache TTLs in hours (per component, overridable via env)
+STAGE1_CACHE_TTL_HOURS = {
+    "company_context": float(os.getenv("STAGE1_CACHE_TTL_COMPANY_CONTEXT", "720")),  # 30 days
+    "voice_persona": float(os.getenv("STAGE1_CACHE_TTL_VOICE_PERSONA", "720")),  # 30 days
+    "sitemap": float(os.getenv("STAGE1_CACHE_TTL_SITEMAP", "168")),  # 7 days
+    "legal_context": float(os.getenv("STAGE1_CACHE_TTL_LEGAL_CONTEXT", "168")),  # 7 days
+}
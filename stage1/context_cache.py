@@ -0,0 +1,176 @@
+"""
+Stage 1 Context Cache
+
+Persists the expensive Stage 1 components per normalized company URL so that
+repeat jobs for the same client skip OpenContext, the sitemap crawl, voice
+enhancement and legal research while the cached data is still fresh.
+
+Components and what they save:
+- company_context: OpenContext output before voice enhancement (1 grounded AI call)
+- voice_persona:   Enhanced voice persona + sample URLs (1 AI call, blog fetches)
+- sitemap:         Crawled and classified SitemapData (HTTP crawl)
+- legal_context:   Legal research result (Beck-Online browser agent)
+
+Each component has its own TTL (constants.STAGE1_CACHE_TTL_HOURS). Components
+whose result depends on more than the company carry a variant key, e.g. legal
+research is keyed by rechtsgebiet, data source and keywords.
+
+All components for a company are loaded with a single DB read (load()); if
+every needed component is fresh, Stage 1 makes no network or AI calls.
+
+Usage:
+    cache = Stage1ContextCache()
+    snapshot = cache.load("https://www.example.com/")
+    sitemap = snapshot.get("sitemap")          # None if missing or expired
+    cache.store("https://example.com", "sitemap", sitemap_data.compact_dump())
+    cache.invalidate("example.com", ["sitemap"])
+"""
+
+import hashlib
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Add parent to path for shared imports
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+try:
+    from .constants import STAGE1_CACHE_TTL_HOURS
+except ImportError:
+    from constants import STAGE1_CACHE_TTL_HOURS
+
+try:
+    from shared.database import OpenBlogDB
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CACHE_COMPONENTS = ("company_context", "voice_persona", "sitemap", "legal_context")
+
+
+def normalize_company_url(url: str) -> str:
+    """Normalize a company URL for use as a cache key (scheme, case, www., trailing slash)."""
+    url = url.strip()
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def variant_key(*parts: Any) -> str:
+    """Stable short key for component variants (order-insensitive for lists)."""
+    normalized = [
+        "\x1f".join(sorted(str(p) for p in part)) if isinstance(part, (list, tuple, set)) else str(part)
+        for part in parts
+    ]
+    return hashlib.sha1("\x1e".join(normalized).encode("utf-8")).hexdigest()[:16]
+
+
+def resolve_refresh(refresh: Iterable[str]) -> List[str]:
+    """
+    Expand refresh flags ("all" = every component) and reject unknown names.
+
+    Raises:
+        ValueError: If a flag is not a cache component
+    """
+    flags = set(refresh or [])
+    if "all" in flags:
+        return list(CACHE_COMPONENTS)
+    unknown = flags - set(CACHE_COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown cache components: {sorted(unknown)}. Valid: {list(CACHE_COMPONENTS)}")
+    return sorted(flags)
+
+
+class CacheSnapshot:
+    """Cached components of one company as loaded by a single read."""
+
+    def __init__(self, rows: List[Dict[str, Any]], ttl_hours: Dict[str, float], skip: Iterable[str] = ()):
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (row["component"], row["variant"]): row for row in rows
+        }
+        self._ttl_hours = ttl_hours
+        self._skip = set(skip)
+        self.hits: List[str] = []
+
+    def get(self, component: str, variant: str = "") -> Optional[Any]:
+        """
+        Return cached data if present and fresh, else None.
+
+        Components listed in skip (refresh flags) always miss.
+        """
+        if component in self._skip:
+            return None
+        entry = self._entries.get((component, variant))
+        if entry is None:
+            return None
+        try:
+            updated_at = datetime.fromisoformat(entry["updated_at"])
+        except ValueError:
+            return None
+        age_hours = (datetime.now(timezone.utc) - updated_at).total_seconds() / 3600
+        if age_hours > self._ttl_hours.get(component, 0):
+            logger.debug(f"Stage 1 cache expired: {component} ({age_hours:.1f}h old)")
+            return None
+        self.hits.append(component)
+        return entry["data"]
+
+
+class Stage1ContextCache:
+    """Persistent per-company cache for Stage 1 components (SQLite, shared DB)."""
+
+    def __init__(self, db: Optional["OpenBlogDB"] = None, ttl_hours: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            db: Database to use (default: OpenBlogDB())
+            ttl_hours: Per-component TTL overrides in hours
+        """
+        if db is None:
+            if not DB_AVAILABLE:
+                raise RuntimeError("shared.database not available")
+            db = OpenBlogDB()
+        self.db = db
+        self.ttl_hours = {**STAGE1_CACHE_TTL_HOURS, **(ttl_hours or {})}
+
+    def load(self, company_url: str, refresh: Iterable[str] = ()) -> CacheSnapshot:
+        """
+        Load every cached component for a company (one DB read).
+
+        Args:
+            company_url: Company URL (normalized internally)
+            refresh: Components to treat as missing (recomputed and overwritten)
+        """
+        rows = self.db.get_stage1_cache(normalize_company_url(company_url))
+        return CacheSnapshot(rows, self.ttl_hours, skip=resolve_refresh(refresh))
+
+    def store(self, company_url: str, component: str, data: Any, variant: str = "") -> None:
+        """Store one component (JSON-serializable data)."""
+        if component not in CACHE_COMPONENTS:
+            raise ValueError(f"Unknown cache component: {component}")
+        self.db.store_stage1_cache(normalize_company_url(company_url), component, data, variant)
+
+    def invalidate(self, company_url: str, components: Optional[Iterable[str]] = None) -> int:
+        """
+        Delete cached components for a company.
+
+        Args:
+            company_url: Company URL (normalized internally)
+            components: Components to delete, "all" or None for every component
+
+        Returns:
+            Number of cache entries deleted
+        """
+        names = resolve_refresh(components) if components else None
+        deleted = self.db.invalidate_stage1_cache(normalize_company_url(company_url), names)
+        logger.info(f"Stage 1 cache: invalidated {deleted} entries for {normalize_company_url(company_url)}")
+        return deleted
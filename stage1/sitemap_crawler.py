@@ -10,28 +10,64 @@ Uses hybrid smart classifier for sites without standard /blog/ patterns:
 """
 
 import asyncio
+import importlib.util
 import logging
 import re
 import time
+import zlib
 from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import httpx
 from httpx import Timeout, Limits
 
 try:
-    import defusedxml.ElementTree as ET
+    from defusedxml.ElementTree import DefusedXMLParser as XMLParser, ParseError
 except ImportError:
-    import xml.etree.ElementTree as ET
+    from xml.etree.ElementTree import XMLParser, ParseError
 
 from stage1_models import SitemapData
-from constants import MAX_SITEMAP_URLS
+from constants import (
+    MAX_SITEMAP_URLS,
+    SITEMAP_CACHE_MAX_MB,
+    SITEMAP_DOCUMENTS_MAX_AGE_DAYS,
+    SITEMAP_DOCUMENTS_MAX_ENTRIES,
+    SITEMAP_HOST_LIMITERS_MAX,
+    SITEMAP_HOST_MAX_CONCURRENT,
+    SITEMAP_HOST_REQUESTS_PER_MINUTE,
+    SITEMAP_MAX_DEPTH,
+    URL_VALIDATION_CACHE_HOURS,
+    URL_VALIDATION_CACHE_MAX_ENTRIES,
+)
+
+try:
+    from shared.rate_limiter import AsyncRateLimiter
+except ImportError:
+    AsyncRateLimiter = None
+
+try:
+    from shared.database import OpenBlogDB
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
+try:
+    from shared.metrics import SITEMAP_CACHE_LOOKUPS
+except ImportError:
+    SITEMAP_CACHE_LOOKUPS = None
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 for URL validation when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# HEAD responses that mean "server does not do HEAD here", not "page is broken"
+HEAD_UNSUPPORTED_STATUSES = {403, 405, 501}
+
 
 # =============================================================================
 # URL Entry with Metadata
@@ -46,6 +82,293 @@ class URLEntry:
     lastmod: Optional[str] = None
 
 
+# =============================================================================
+# Streaming Sitemap Parser
+# =============================================================================
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+_URL_TAG = f"{SITEMAP_NS}url"
+_SITEMAP_TAG = f"{SITEMAP_NS}sitemap"
+_FIELD_TAGS = {f"{SITEMAP_NS}{name}": name for name in ("loc", "priority", "changefreq", "lastmod")}
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Decompressed size cap per document (guards against gzip bombs; the sitemap
+# protocol itself allows 50 MB / 50k URLs, large publishers exceed that)
+MAX_SITEMAP_BYTES = 256 * 1024 * 1024
+
+# Bytes per chunk when streaming a sitemap response into the parser
+SITEMAP_CHUNK_SIZE = 64 * 1024
+
+
+class _SitemapTarget:
+    """
+    Parser target that turns <url> and <sitemap> elements into entries.
+
+    No element tree is built: only the fields of the element being read are
+    held, so memory stays flat no matter how large the document is.
+    """
+
+    def __init__(self, on_url: Callable[[Dict[str, str]], None], on_sitemap: Callable[[str], None]):
+        self._on_url = on_url
+        self._on_sitemap = on_sitemap
+        self._depth = 0
+        self._entry_depth = 0
+        self._entry_tag: Optional[str] = None
+        self._fields: Dict[str, str] = {}
+        self._field: Optional[str] = None
+        self._text: List[str] = []
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        if self._entry_tag is None:
+            if tag == _URL_TAG or tag == _SITEMAP_TAG:
+                self._entry_tag = tag
+                self._entry_depth = self._depth
+                self._fields = {}
+        elif self._depth == self._entry_depth + 1 and tag in _FIELD_TAGS:
+            # Direct children only (<image:loc> etc. live in other namespaces)
+            self._field = _FIELD_TAGS[tag]
+            self._text = []
+
+    def data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+
+    def end(self, tag):
+        if self._field is not None and self._depth == self._entry_depth + 1:
+            self._fields[self._field] = "".join(self._text).strip()
+            self._field = None
+        elif self._entry_tag is not None and self._depth == self._entry_depth:
+            if self._entry_tag == _URL_TAG:
+                self._on_url(self._fields)
+            elif self._fields.get("loc"):
+                self._on_sitemap(self._fields["loc"])
+            self._entry_tag = None
+        self._depth -= 1
+
+    def close(self):
+        return None
+
+
+class SitemapParser:
+    """
+    Incremental sitemap / sitemap index parser.
+
+    Feed it the document in chunks as they arrive (gzip is detected from the
+    magic bytes and decompressed on the fly); URL entries and sub-sitemap
+    locations are collected as soon as their element closes. Parsing stops
+    once max_entries URLs were collected, so callers can stop reading.
+
+    Usage:
+        parser = SitemapParser(max_entries=10000, url_filter=is_valid)
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+            if parser.done:
+                break
+        parser.close()
+        parser.entries, parser.sitemap_urls
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        url_filter: Optional[Callable[[str], bool]] = None,
+        max_bytes: int = MAX_SITEMAP_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.url_filter = url_filter
+        self.max_bytes = max_bytes
+        self.entries: List[URLEntry] = []
+        self.sitemap_urls: List[str] = []
+        self.done = False
+        self.truncated = False
+        self.error: Optional[str] = None
+        self._bytes = 0
+        self._started = False
+        self._decompressor = None
+        self._parser = XMLParser(target=_SitemapTarget(self._add_url, self._add_sitemap))
+
+    @classmethod
+    def from_document(cls, document: Dict, max_entries: Optional[int] = None) -> "SitemapParser":
+        """Finished parser holding a stored document (see OpenBlogDB.get_sitemap_document)."""
+        parser = cls(max_entries=max_entries)
+        rows = document["entries"]
+        if max_entries is not None and len(rows) >= max_entries:
+            rows = rows[:max_entries]
+            parser.truncated = True
+        else:
+            parser.truncated = document.get("truncated", False)
+        parser.entries = [URLEntry(*row) for row in rows]
+        parser.sitemap_urls = list(document["sitemap_urls"])
+        parser.done = True
+        return parser
+
+    def to_document(self) -> Dict:
+        """Compact form of the parsed entries for storage."""
+        return {
+            "entries": [[e.url, e.priority, e.changefreq, e.lastmod] for e in self.entries],
+            "sitemap_urls": self.sitemap_urls,
+            "truncated": self.truncated,
+        }
+
+    @property
+    def is_index(self) -> bool:
+        return bool(self.sitemap_urls)
+
+    def _add_url(self, fields: Dict[str, str]) -> None:
+        url = fields.get("loc")
+        if not url or self.done:
+            return
+        if self.url_filter is not None and not self.url_filter(url):
+            return
+
+        priority = None
+        if fields.get("priority"):
+            try:
+                priority = float(fields["priority"])
+            except ValueError:
+                pass
+
+        self.entries.append(URLEntry(
+            url=url,
+            priority=priority,
+            changefreq=fields.get("changefreq", "").lower() or None,
+            lastmod=fields.get("lastmod") or None,
+        ))
+        if self.max_entries is not None and len(self.entries) >= self.max_entries:
+            self.done = True
+            self.truncated = True
+
+    def _add_sitemap(self, url: str) -> None:
+        self.sitemap_urls.append(url)
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the (possibly gzipped) document."""
+        if self.done or not chunk:
+            return
+        if not self._started:
+            self._started = True
+            if chunk[:2] == GZIP_MAGIC:
+                self._decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        try:
+            if self._decompressor is not None:
+                chunk = self._decompressor.decompress(chunk)
+            self._bytes += len(chunk)
+            if self._bytes > self.max_bytes:
+                self._fail(f"document larger than {self.max_bytes} bytes")
+                return
+            self._parser.feed(chunk)
+        except (ParseError, zlib.error) as e:
+            self._fail(str(e))
+        except Exception as e:
+            # defusedxml raises its own errors for entity/DTD abuse
+            self._fail(f"{type(e).__name__}: {e}")
+
+    def close(self) -> None:
+        """Finish parsing. Entries collected so far are kept on errors."""
+        if self.done:
+            return
+        self.done = True
+        try:
+            if self._decompressor is not None:
+                self._parser.feed(self._decompressor.flush())
+            self._parser.close()
+        except (ParseError, zlib.error) as e:
+            self._record_error(str(e))
+        except Exception as e:
+            self._record_error(f"{type(e).__name__}: {e}")
+
+    def _fail(self, message: str) -> None:
+        self.done = True
+        self._record_error(message)
+
+    def _record_error(self, message: str) -> None:
+        self.error = message
+        logger.warning(f"Failed to parse XML: {message}")
+
+
+def parse_sitemap(
+    content: bytes,
+    max_entries: Optional[int] = None,
+    url_filter: Optional[Callable[[str], bool]] = None,
+) -> SitemapParser:
+    """Parse a complete (possibly gzipped) sitemap document held in memory."""
+    parser = SitemapParser(max_entries=max_entries, url_filter=url_filter)
+    for offset in range(0, len(content), SITEMAP_CHUNK_SIZE):
+        parser.feed(content[offset:offset + SITEMAP_CHUNK_SIZE])
+        if parser.done:
+            break
+    parser.close()
+    return parser
+
+
+# =============================================================================
+# Per-Host Politeness
+# =============================================================================
+
+# One limiter per host for the whole process, so concurrent crawls of the
+# same site (parallel jobs, API requests) share its request budget. Kept in
+# LRU order and trimmed to SITEMAP_HOST_LIMITERS_MAX on insert.
+_host_limiters: "OrderedDict[str, AsyncRateLimiter]" = OrderedDict()
+
+
+def host_limiter(host: str):
+    """
+    Concurrency cap + token bucket for requests to one host.
+
+    Returns an object with an async acquire() context manager (a no-op
+    stand-in when shared/ is not importable).
+    """
+    host = host.lower()
+    limiter = _host_limiters.get(host)
+    if limiter is not None:
+        _host_limiters.move_to_end(host)
+        return limiter
+    if AsyncRateLimiter is None:
+        return _NO_LIMIT
+    limiter = AsyncRateLimiter(
+        max_concurrent=SITEMAP_HOST_MAX_CONCURRENT,
+        per_minute=SITEMAP_HOST_REQUESTS_PER_MINUTE,
+        name=f"sitemap:{host}",
+    )
+    _host_limiters[host] = limiter
+    _trim_host_limiters()
+    return limiter
+
+
+def _trim_host_limiters() -> None:
+    """Drop least recently used limiters beyond the cap, skipping ones in use."""
+    excess = len(_host_limiters) - SITEMAP_HOST_LIMITERS_MAX
+    if excess <= 0:
+        return
+    # A limiter with requests in flight or waiting must stay, or a new
+    # limiter for the same host would not count them
+    idle = [
+        host for host, limiter in _host_limiters.items()
+        if not limiter.in_flight and not limiter.waiting
+    ]
+    for host in idle[:excess]:
+        del _host_limiters[host]
+
+
+class _NoLimit:
+    def acquire(self):
+        return nullcontext()
+
+
+_NO_LIMIT = _NoLimit()
+
+# Crawls in flight in this process by cache key: concurrent requests for the
+# same site and settings await the same crawl instead of starting their own
+_inflight_crawls: Dict[str, "asyncio.Task[SitemapData]"] = {}
+
+
+def _count_lookup(result: str) -> None:
+    if SITEMAP_CACHE_LOOKUPS is not None:
+        SITEMAP_CACHE_LOOKUPS.inc(result=result)
+
+
 # =============================================================================
 # URL Pattern Matching
 # =============================================================================
@@ -143,6 +466,12 @@ URL_PATTERNS: Dict[str, List[str]] = {
     ],
 }
 
+# Each label's patterns compiled into one alternation (checked in label order)
+URL_PATTERN_RES: List[Tuple[str, "re.Pattern[str]"]] = [
+    (label, re.compile("|".join(f"(?:{p})" for p in patterns)))
+    for label, patterns in URL_PATTERNS.items()
+]
+
 
 def classify_url(url: str) -> str:
     """
@@ -156,10 +485,9 @@ def classify_url(url: str) -> str:
     """
     path = urlparse(url).path.lower()
 
-    for label, patterns in URL_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, path):
-                return label
+    for label, pattern in URL_PATTERN_RES:
+        if pattern.search(path):
+            return label
 
     return "other"
 
@@ -173,11 +501,20 @@ class SitemapCrawler:
     Crawls company sitemap and returns labeled URLs.
 
     Features:
-    - Handles sitemap.xml and sitemap_index.xml
+    - Handles sitemap.xml and sitemap_index.xml (plain or gzipped), following
+      nested indexes up to max_sitemap_depth levels
+    - Probes candidate locations in parallel; the first sitemap found wins
+    - Per-host concurrency cap and rate limit shared across crawls
+    - Discovers sitemaps from robots.txt Sitemap: directives first
+    - Conditional re-fetch: stores ETag/Last-Modified per sitemap and reuses
+      the stored entries when the server answers 304 Not Modified
+    - Streams and parses sitemaps incrementally (flat memory on huge sitemaps)
     - Auto-labels URLs by type (blog, product, service, tool, etc.)
     - Smart classifier for sites without standard /blog/ patterns
     - Optional HTTP validation to filter broken links
-    - Caching with TTL
+    - Persistent crawl cache (SQLite, shared across instances and processes)
+      with TTL and size-bounded LRU eviction; concurrent crawls of the same
+      site share one fetch
     - Configurable URL limit
     """
 
@@ -187,7 +524,7 @@ class SitemapCrawler:
         'about:', 'chrome:', 'chrome-extension:'
     ]
 
-    # Maximum number of cache entries to prevent memory leaks in long-running processes
+    # Maximum number of cached crawl results (plus SITEMAP_CACHE_MAX_MB in total)
     MAX_CACHE_ENTRIES = 100
 
     # Threshold for triggering smart classifier (ratio of other_urls to total)
@@ -209,6 +546,9 @@ class SitemapCrawler:
         smart_classifier_sample_size: int = 20,
         enable_ai_fallback: bool = False,
         gemini_client = None,
+        max_sitemap_depth: int = SITEMAP_MAX_DEPTH,
+        conditional_fetch: bool = True,
+        db: Optional["OpenBlogDB"] = None,
     ):
         """
         Initialize crawler.
@@ -220,11 +560,15 @@ class SitemapCrawler:
             validate_urls: If True, validate URLs with HEAD requests
             validation_sample_size: Max URLs to validate (for performance)
             validation_concurrency: Max concurrent validation requests
-            max_cache_entries: Maximum cache entries (default: 100)
+            max_cache_entries: Maximum cached crawl results (default: 100)
             enable_smart_classifier: Enable smart classifier for non-standard sites
             smart_classifier_sample_size: URLs to sample for title fetching
             enable_ai_fallback: Enable AI for pattern discovery (requires gemini_client)
             gemini_client: GeminiClient for AI fallback
+            max_sitemap_depth: Levels of nested sitemap indexes to follow
+            conditional_fetch: Store sitemap validators and send conditional GETs
+            db: Database for the crawl cache and stored sitemaps
+                (default: OpenBlogDB() when available)
         """
         self.max_urls = max_urls
         self.timeout = Timeout(connect=5.0, read=timeout, write=5.0, pool=5.0)
@@ -237,7 +581,11 @@ class SitemapCrawler:
         self.smart_classifier_sample_size = smart_classifier_sample_size
         self.enable_ai_fallback = enable_ai_fallback
         self.gemini_client = gemini_client
-        self._cache: OrderedDict[str, Tuple[SitemapData, float]] = OrderedDict()
+        self.max_sitemap_depth = max_sitemap_depth
+        self.conditional_fetch = conditional_fetch
+        self.cache_max_bytes = SITEMAP_CACHE_MAX_MB * 1024 * 1024
+        self._db = db
+        self._db_unavailable = db is None and not DB_AVAILABLE
         self._url_metadata: Dict[str, URLEntry] = {}  # Store metadata for smart classifier
 
     async def crawl(self, company_url: str, validate: Optional[bool] = None) -> SitemapData:
@@ -263,12 +611,33 @@ class SitemapCrawler:
 
         # Check cache - include all parameters that affect output
         cache_key = f"{company_url}:{self.max_urls}:{should_validate}:{self.validation_sample_size}:{self.enable_smart_classifier}"
-        if cache_key in self._cache:
-            data, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                logger.info(f"Returning cached sitemap ({data.total_pages} URLs)")
-                return data
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            _count_lookup("hit")
+            logger.info(f"Returning cached sitemap ({cached.total_pages} URLs)")
+            return cached
+
+        # Join a crawl of the same site already running in this process
+        loop = asyncio.get_running_loop()
+        task = _inflight_crawls.get(cache_key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            _count_lookup("shared")
+            logger.info(f"Waiting for sitemap crawl already in progress for {company_url}")
+            return await asyncio.shield(task)
+
+        _count_lookup("miss")
+        task = loop.create_task(self._crawl_uncached(company_url, should_validate, cache_key, start_time))
+        _inflight_crawls[cache_key] = task
+        task.add_done_callback(
+            lambda done: _inflight_crawls.pop(cache_key, None) if _inflight_crawls.get(cache_key) is done else None
+        )
+        # Shielded: a cancelled caller must not cancel the crawl others are waiting on
+        return await asyncio.shield(task)
 
+    async def _crawl_uncached(
+        self, company_url: str, should_validate: bool, cache_key: str, start_time: float
+    ) -> SitemapData:
+        """Fetch, validate and classify a site's URLs, then cache the result."""
         try:
             # Fetch all URLs with metadata for smart classifier
             entries = await self._fetch_all_urls_with_metadata(company_url)
@@ -297,13 +666,8 @@ class SitemapCrawler:
             else:
                 result = self._classify_urls(urls)
 
-            # Cache result with LRU eviction
-            self._cache[cache_key] = (result, time.time())
-            # Evict oldest entries if cache exceeds max size
-            while len(self._cache) > self.max_cache_entries:
-                oldest_key = next(iter(self._cache))
-                self._cache.pop(oldest_key)
-                logger.debug(f"Cache evicted: {oldest_key[:50]}...")
+            # Cache result (LRU eviction by entry count and total size)
+            await self._cache_put(cache_key, result)
 
             duration = time.time() - start_time
             logger.info(f"Sitemap crawl complete: {result.total_pages} URLs in {duration:.2f}s")
@@ -321,6 +685,11 @@ class SitemapCrawler:
         """
         Validate URLs with HEAD requests, filter out broken ones.
 
+        All checks share one pooled client (keep-alive, HTTP/2 when h2 is
+        installed). A HEAD the server refuses falls back to a streaming GET
+        whose body is never read. Results are cached per URL for
+        URL_VALIDATION_CACHE_HOURS, so recrawls only check new URLs.
+
         Args:
             urls: List of URLs to validate
 
@@ -337,44 +706,80 @@ class SitemapCrawler:
             urls_to_check = urls
             urls_to_keep = []
 
-        valid_urls = []
+        known = await self._load_url_checks(urls_to_check)
+        pending = [url for url in dict.fromkeys(urls_to_check) if url not in known]
         semaphore = asyncio.Semaphore(self.validation_concurrency)
 
-        async def check_url(url: str) -> Optional[str]:
-            async with semaphore:
-                try:
-                    async with httpx.AsyncClient(
-                        timeout=Timeout(connect=3.0, read=5.0, write=3.0, pool=3.0),
-                        follow_redirects=True,
-                        limits=Limits(max_connections=20)
-                    ) as client:
-                        response = await client.head(url)
-                        if response.status_code < 400:
-                            return url
-                        else:
-                            logger.debug(f"Invalid URL ({response.status_code}): {url}")
-                            return None
-                except Exception as e:
-                    logger.debug(f"URL validation failed: {url} - {e}")
-                    return None
+        async with httpx.AsyncClient(
+            timeout=Timeout(connect=3.0, read=5.0, write=3.0, pool=10.0),
+            follow_redirects=True,
+            limits=Limits(
+                max_connections=self.validation_concurrency,
+                max_keepalive_connections=self.validation_concurrency,
+            ),
+            http2=HTTP2_AVAILABLE,
+        ) as client:
 
-        # Run validation in parallel
-        logger.info(f"Validating {len(urls_to_check)} URLs...")
-        tasks = [check_url(url) for url in urls_to_check]
-        results = await asyncio.gather(*tasks)
+            async def check_url(url: str) -> Tuple[str, bool, Optional[int]]:
+                async with semaphore:
+                    try:
+                        response = await client.head(url)
+                        status = response.status_code
+                        if status in HEAD_UNSUPPORTED_STATUSES:
+                            async with client.stream("GET", url) as response:
+                                status = response.status_code
+                        if status >= 400:
+                            logger.debug(f"Invalid URL ({status}): {url}")
+                        return url, status < 400, status
+                    except Exception as e:
+                        logger.debug(f"URL validation failed: {url} - {e}")
+                        return url, False, None
+
+            # Run validation in parallel
+            logger.info(f"Validating {len(pending)} URLs ({len(known)} cached)...")
+            checks = await asyncio.gather(*(check_url(url) for url in pending))
+
+        await self._store_url_checks(checks)
+        known.update((url, ok) for url, ok, _ in checks)
 
         # Collect valid URLs
-        valid_urls = [url for url in results if url is not None]
+        valid_urls = [url for url in urls_to_check if known.get(url)]
 
         # Add back the unchecked URLs (assumed valid)
         valid_urls.extend(urls_to_keep)
 
-        invalid_count = len(urls_to_check) - len([u for u in results if u])
+        invalid_count = len(urls_to_check) - (len(valid_urls) - len(urls_to_keep))
         if invalid_count > 0:
             logger.info(f"Filtered out {invalid_count} broken URLs")
 
         return valid_urls
 
+    async def _load_url_checks(self, urls: List[str]) -> Dict[str, bool]:
+        """Cached validation results for urls ({url: ok})."""
+        db = self._database()
+        if db is None or not urls or URL_VALIDATION_CACHE_HOURS <= 0:
+            return {}
+        try:
+            return await asyncio.to_thread(db.get_url_checks, urls, URL_VALIDATION_CACHE_HOURS * 3600)
+        except Exception as e:
+            logger.debug(f"URL validation cache read failed: {e}")
+            return {}
+
+    async def _store_url_checks(self, checks: List[Tuple[str, bool, Optional[int]]]) -> None:
+        db = self._database()
+        if db is None or not checks or URL_VALIDATION_CACHE_HOURS <= 0:
+            return
+        try:
+            # Transport errors (status None) are not cached: they may be transient
+            await asyncio.to_thread(
+                db.store_url_checks,
+                [c for c in checks if c[2] is not None],
+                URL_VALIDATION_CACHE_HOURS * 3600,
+                URL_VALIDATION_CACHE_MAX_ENTRIES,
+            )
+        except Exception as e:
+            logger.debug(f"URL validation cache write failed: {e}")
+
     async def _fetch_all_urls(self, company_url: str) -> List[str]:
         """
         Fetch all URLs from sitemap(s).
@@ -388,12 +793,13 @@ class SitemapCrawler:
         """
         Fetch all URLs with metadata from sitemap(s).
 
-        Tries multiple sitemap locations and handles sitemap_index.xml.
-        Returns URLEntry objects with priority, changefreq, lastmod.
+        Probes the standard locations in parallel and follows sitemap
+        indexes recursively. Returns URLEntry objects with priority,
+        changefreq, lastmod.
         """
         all_entries: List[URLEntry] = []
 
-        # Standard sitemap locations
+        # Standard sitemap locations (probed in parallel, first sitemap found is used)
         sitemap_locations = [
             f"{company_url}/sitemap.xml",
             f"{company_url}/sitemap_index.xml",
@@ -412,44 +818,31 @@ class SitemapCrawler:
         async with httpx.AsyncClient(
             timeout=self.timeout,
             follow_redirects=True,
-            limits=Limits(max_connections=5, max_keepalive_connections=2)
+            limits=Limits(
+                max_connections=2 * SITEMAP_HOST_MAX_CONCURRENT,
+                max_keepalive_connections=SITEMAP_HOST_MAX_CONCURRENT,
+            ),
         ) as client:
-            for sitemap_url in sitemap_locations:
-                try:
-                    await asyncio.sleep(0.3)  # Rate limiting
-
-                    response = await client.get(sitemap_url)
-
-                    if response.status_code != 200:
-                        continue
-
-                    root = ET.fromstring(response.content)
-                    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-
-                    # Check if this is a sitemap_index
-                    sitemaps = root.findall(".//sm:sitemap/sm:loc", ns)
-                    if sitemaps:
-                        logger.info(f"Found sitemap_index with {len(sitemaps)} sitemaps")
-                        # Fetch all sub-sitemaps concurrently
-                        tasks = [
-                            self._fetch_sub_sitemap_with_metadata(client, elem.text.strip())
-                            for elem in sitemaps if elem.text and elem.text.strip()
-                        ]
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-                        for result in results:
-                            if isinstance(result, list):
-                                all_entries.extend(result)
-                        break
-                    else:
-                        # Regular sitemap
-                        entries = self._extract_urls_with_metadata(response.content)
-                        all_entries.extend(entries)
-                        logger.info(f"Found {len(entries)} URLs in {sitemap_url}")
-                        break
-
-                except Exception as e:
-                    logger.debug(f"Failed to fetch {sitemap_url}: {e}")
-                    continue
+            robots_sitemaps = await self._robots_sitemaps(client, company_url)
+            if robots_sitemaps:
+                # Every Sitemap: directive is a sitemap of the site (not alternatives)
+                seen = set(robots_sitemaps)
+                results = await asyncio.gather(
+                    *(self._fetch_sub_sitemap_with_metadata(client, url, 0, seen) for url in robots_sitemaps),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, list):
+                        all_entries.extend(result)
+                logger.info(f"Found {len(all_entries)} URLs via {len(robots_sitemaps)} sitemaps from robots.txt")
+
+            found = None if all_entries else await self._probe_sitemaps(client, sitemap_locations)
+            if found is not None:
+                sitemap_url, parser = found
+                all_entries = await self._expand_sitemap(
+                    client, sitemap_url, parser, depth=0, seen={sitemap_url}
+                )
+                logger.info(f"Found {len(all_entries)} URLs via {sitemap_url}")
 
         # Deduplicate by URL
         seen = set()
@@ -461,89 +854,241 @@ class SitemapCrawler:
 
         return unique_entries
 
-    async def _fetch_sub_sitemap(self, client: httpx.AsyncClient, url: str) -> List[str]:
-        """Fetch URLs from a sub-sitemap."""
+    async def _fetch_sitemap(self, client: httpx.AsyncClient, url: str) -> Optional[SitemapParser]:
+        """
+        Stream a sitemap (plain or .xml.gz) through the incremental parser.
+
+        Reading stops as soon as max_urls entries were parsed; a document
+        never contributes more than max_urls URLs.
+
+        Returns:
+            The finished parser, or None if the response was not 200
+        """
+        stored = await self._load_document(url)
+        headers = {}
+        if stored:
+            if stored["etag"]:
+                headers["If-None-Match"] = stored["etag"]
+            if stored["last_modified"]:
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        parser = SitemapParser(max_entries=self.max_urls, url_filter=self._is_valid_url)
+        async with host_limiter(urlparse(url).netloc).acquire():
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and stored:
+                    logger.debug(f"Sitemap not modified, reusing stored entries: {url}")
+                    return SitemapParser.from_document(stored, max_entries=self.max_urls)
+                if response.status_code != 200:
+                    return None
+                async for chunk in response.aiter_bytes(SITEMAP_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    if parser.done:
+                        break
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+        parser.close()
+
+        if (etag or last_modified) and not parser.error:
+            await self._store_document(url, etag, last_modified, parser)
+        return parser
+
+    def _database(self) -> Optional["OpenBlogDB"]:
+        """Database for the crawl cache and stored sitemaps, opened on first use."""
+        if self._db is None and not self._db_unavailable:
+            try:
+                self._db = OpenBlogDB()
+            except Exception as e:
+                logger.warning(f"Sitemap cache database unavailable, crawling uncached: {e}")
+                self._db_unavailable = True
+        return self._db
+
+    def _document_db(self) -> Optional["OpenBlogDB"]:
+        """Database for conditional re-fetch (None = disabled)."""
+        return self._database() if self.conditional_fetch else None
+
+    async def _cache_get(self, cache_key: str) -> Optional[SitemapData]:
+        """Fresh cached crawl result, or None."""
+        db = self._database()
+        if db is None or self.cache_ttl <= 0:
+            return None
         try:
-            await asyncio.sleep(0.2)  # Rate limiting
-            response = await client.get(url)
-            if response.status_code == 200:
-                return self._extract_urls(response.content)
+            data = await asyncio.to_thread(db.get_sitemap_crawl, cache_key, self.cache_ttl)
+            return SitemapData.model_validate(data) if data is not None else None
         except Exception as e:
-            logger.debug(f"Failed to fetch sub-sitemap {url}: {e}")
-        return []
+            logger.debug(f"Sitemap cache read failed: {e}")
+            return None
+
+    async def _cache_put(self, cache_key: str, result: SitemapData) -> None:
+        db = self._database()
+        if db is None or self.cache_ttl <= 0:
+            return
+        try:
+            evicted = await asyncio.to_thread(
+                db.store_sitemap_crawl, cache_key, result.compact_dump(), self.cache_max_bytes, self.max_cache_entries
+            )
+            if evicted:
+                logger.debug(f"Sitemap cache evicted {evicted} entries")
+        except Exception as e:
+            logger.debug(f"Sitemap cache write failed: {e}")
 
-    async def _fetch_sub_sitemap_with_metadata(self, client: httpx.AsyncClient, url: str) -> List[URLEntry]:
-        """Fetch URLs with metadata from a sub-sitemap."""
+    async def _load_document(self, url: str) -> Optional[Dict]:
+        """Stored parse + validators of a sitemap, usable for a conditional GET."""
+        db = self._document_db()
+        if db is None:
+            return None
         try:
-            await asyncio.sleep(0.2)  # Rate limiting
-            response = await client.get(url)
-            if response.status_code == 200:
-                return self._extract_urls_with_metadata(response.content)
+            stored = await asyncio.to_thread(db.get_sitemap_document, url)
+        except Exception as e:
+            logger.debug(f"Failed to load stored sitemap {url}: {e}")
+            return None
+        if not stored:
+            return None
+        # A document cut off at a lower limit cannot stand in for a full fetch
+        if stored["truncated"] and len(stored["entries"]) < self.max_urls:
+            return None
+        return stored
+
+    async def _store_document(
+        self, url: str, etag: Optional[str], last_modified: Optional[str], parser: SitemapParser
+    ) -> None:
+        db = self._document_db()
+        if db is None:
+            return
+        document = parser.to_document()
+        try:
+            await asyncio.to_thread(
+                db.store_sitemap_document,
+                url, etag, last_modified,
+                document["entries"], document["sitemap_urls"], document["truncated"],
+                SITEMAP_DOCUMENTS_MAX_AGE_DAYS * 86400, SITEMAP_DOCUMENTS_MAX_ENTRIES,
+            )
+        except Exception as e:
+            logger.debug(f"Failed to store sitemap {url}: {e}")
+
+    async def _robots_sitemaps(self, client: httpx.AsyncClient, company_url: str) -> List[str]:
+        """Sitemap URLs declared in robots.txt (Sitemap: directives), in order."""
+        robots_url = f"{company_url}/robots.txt"
+        try:
+            async with host_limiter(urlparse(robots_url).netloc).acquire():
+                response = await client.get(robots_url)
+            if response.status_code != 200:
+                return []
+        except Exception as e:
+            logger.debug(f"Failed to fetch {robots_url}: {e}")
+            return []
+
+        sitemaps = []
+        for line in response.text.splitlines():
+            field, _, value = line.partition(":")
+            if field.strip().lower() != "sitemap":
+                continue
+            url = value.split("#", 1)[0].strip()
+            if self._is_valid_url(url) and url not in sitemaps:
+                sitemaps.append(url)
+        if sitemaps:
+            logger.info(f"robots.txt declares {len(sitemaps)} sitemaps")
+        return sitemaps
+
+    async def _probe_sitemaps(
+        self, client: httpx.AsyncClient, locations: List[str]
+    ) -> Optional[Tuple[str, SitemapParser]]:
+        """
+        Fetch all candidate locations concurrently; the first one that turns
+        out to be a sitemap (URLs or sub-sitemaps) wins and the rest are
+        cancelled.
+
+        Returns:
+            (sitemap_url, parser) or None if no candidate is a sitemap
+        """
+        async def probe(url: str) -> Tuple[str, Optional[SitemapParser]]:
+            try:
+                return url, await self._fetch_sitemap(client, url)
+            except Exception as e:
+                logger.debug(f"Failed to fetch {url}: {e}")
+                return url, None
+
+        tasks = [asyncio.create_task(probe(url)) for url in locations]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, parser = await next_done
+                if parser is not None and (parser.entries or parser.is_index):
+                    return url, parser
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return None
+
+    async def _expand_sitemap(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        parser: SitemapParser,
+        depth: int,
+        seen: Set[str],
+    ) -> List[URLEntry]:
+        """
+        Return a parsed sitemap's entries, following a sitemap index
+        recursively (sub-sitemaps fetched concurrently, each at most once).
+
+        Args:
+            url: Location of the parsed document (for logs)
+            parser: Finished parser for that document
+            depth: Index levels above this document (0 = the root sitemap)
+            seen: Sitemap URLs already fetched or scheduled (cycle guard)
+        """
+        if not parser.is_index:
+            return parser.entries
+
+        if depth >= self.max_sitemap_depth:
+            logger.warning(
+                f"Sitemap index {url} is nested deeper than {self.max_sitemap_depth} levels, "
+                f"skipping its {len(parser.sitemap_urls)} sitemaps"
+            )
+            return parser.entries
+
+        children = [u for u in dict.fromkeys(parser.sitemap_urls) if u not in seen]
+        seen.update(children)
+        logger.info(f"Found sitemap_index with {len(children)} sitemaps at {url} (depth {depth})")
+
+        results = await asyncio.gather(
+            *(self._fetch_sub_sitemap_with_metadata(client, child, depth + 1, seen) for child in children),
+            return_exceptions=True,
+        )
+        entries = list(parser.entries)
+        for result in results:
+            if isinstance(result, list):
+                entries.extend(result)
+        return entries
+
+    async def _fetch_sub_sitemap(self, client: httpx.AsyncClient, url: str) -> List[str]:
+        """Fetch URLs from a sub-sitemap."""
+        entries = await self._fetch_sub_sitemap_with_metadata(client, url)
+        return [e.url for e in entries]
+
+    async def _fetch_sub_sitemap_with_metadata(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        depth: int = 1,
+        seen: Optional[Set[str]] = None,
+    ) -> List[URLEntry]:
+        """Fetch URLs with metadata from a sub-sitemap (following nested indexes)."""
+        try:
+            parser = await self._fetch_sitemap(client, url)
+            if parser is not None:
+                return await self._expand_sitemap(client, url, parser, depth, seen if seen is not None else {url})
         except Exception as e:
             logger.debug(f"Failed to fetch sub-sitemap {url}: {e}")
         return []
 
     def _extract_urls(self, content: bytes) -> List[str]:
         """Extract URLs from sitemap XML content."""
-        urls = []
-        try:
-            root = ET.fromstring(content)
-            ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-            for elem in root.findall(".//sm:url/sm:loc", ns):
-                # Check both that text exists and is not just whitespace
-                if elem.text and elem.text.strip() and self._is_valid_url(elem.text.strip()):
-                    urls.append(elem.text.strip())
-        except ET.ParseError as e:
-            logger.warning(f"Failed to parse XML: {e}")
-        return urls
+        return [e.url for e in self._extract_urls_with_metadata(content)]
 
     def _extract_urls_with_metadata(self, content: bytes) -> List[URLEntry]:
-        """Extract URLs with full metadata from sitemap XML content."""
-        entries = []
-        try:
-            root = ET.fromstring(content)
-            ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-
-            for url_elem in root.findall(".//sm:url", ns):
-                loc_elem = url_elem.find("sm:loc", ns)
-                # Use 'is None' check - Element with no children evaluates to falsy
-                if loc_elem is None or not loc_elem.text or not loc_elem.text.strip():
-                    continue
-
-                url = loc_elem.text.strip()
-                if not self._is_valid_url(url):
-                    continue
-
-                # Extract optional metadata
-                priority = None
-                priority_elem = url_elem.find("sm:priority", ns)
-                if priority_elem is not None and priority_elem.text:
-                    try:
-                        priority = float(priority_elem.text.strip())
-                    except ValueError:
-                        pass
-
-                changefreq = None
-                changefreq_elem = url_elem.find("sm:changefreq", ns)
-                if changefreq_elem is not None and changefreq_elem.text:
-                    changefreq = changefreq_elem.text.strip().lower()
-
-                lastmod = None
-                lastmod_elem = url_elem.find("sm:lastmod", ns)
-                if lastmod_elem is not None and lastmod_elem.text:
-                    lastmod = lastmod_elem.text.strip()
-
-                entries.append(URLEntry(
-                    url=url,
-                    priority=priority,
-                    changefreq=changefreq,
-                    lastmod=lastmod,
-                ))
-
-        except ET.ParseError as e:
-            logger.warning(f"Failed to parse XML: {e}")
-
-        return entries
+        """Extract URLs with full metadata from sitemap XML content (plain or gzipped)."""
+        return parse_sitemap(content, url_filter=self._is_valid_url).entries
 
     def _is_valid_url(self, url: str) -> bool:
         """Validate URL - reject dangerous protocols."""
@@ -664,6 +1209,7 @@ class SitemapCrawler:
                     sample_size=self.smart_classifier_sample_size,
                     enable_ai_fallback=self.enable_ai_fallback,
                     gemini_client=self.gemini_client,
+                    db=self._db,
                 )
 
                 result = await classifier.classify(
@@ -673,7 +1219,8 @@ class SitemapCrawler:
 
                 # Update classification with smart results
                 # Keep existing blog_urls and add newly discovered ones
-                new_blogs = [u for u in result.blog_urls if u not in blog_urls]
+                known_blogs = set(blog_urls)
+                new_blogs = [u for u in result.blog_urls if u not in known_blogs]
                 blog_urls.extend(new_blogs)
                 tool_urls.extend(result.tool_urls)
                 other_urls = result.other_urls
@@ -718,6 +1265,7 @@ async def crawl_sitemap(
     smart_classifier_sample_size: int = 20,
     enable_ai_fallback: bool = False,
     gemini_client = None,
+    db: Optional["OpenBlogDB"] = None,
 ) -> SitemapData:
     """
     Crawl company sitemap and return labeled URLs.
@@ -731,6 +1279,8 @@ async def crawl_sitemap(
         smart_classifier_sample_size: URLs to sample for title fetching
         enable_ai_fallback: Enable AI for pattern discovery
         gemini_client: GeminiClient for AI fallback
+        db: Database for the crawl cache, stored sitemaps and URL checks
+            (default: OpenBlogDB() when available)
 
     Returns:
         SitemapData with categorized URLs
@@ -743,6 +1293,7 @@ async def crawl_sitemap(
         smart_classifier_sample_size=smart_classifier_sample_size,
         enable_ai_fallback=enable_ai_fallback,
         gemini_client=gemini_client,
+        db=db,
     )
     return await crawler.crawl(company_url)
 
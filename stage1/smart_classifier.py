@@ -11,16 +11,33 @@ Designed for sites without standard /blog/ URL patterns (e.g., Hypofriend).
 """
 
 import asyncio
+import hashlib
 import logging
 import re
-from collections import Counter, defaultdict
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
+import sys
+import time
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urlparse
 
 import httpx
 from httpx import Timeout, Limits
 
+# Add parent to path for shared imports
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+try:
+    from shared.database import OpenBlogDB
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,6 +142,377 @@ BLOG_PATH_PATTERNS = [
 ]
 
 
+# Categories a learned URL rule can assign
+RULE_CATEGORIES = ("blog", "tool")
+
+# Score a matching learned rule adds; enough to decide any uncertain URL
+LEARNED_RULE_WEIGHT = 0.6
+
+# Path depth (below the last segment) that defines the sitemap structure
+STRUCTURE_DEPTH = 2
+
+# Page sampling: concurrent fetches, bytes read per page at most, and how
+# long sampled metadata is reused (per URL, in this process)
+SAMPLE_CONCURRENCY = 5
+SAMPLE_MAX_BYTES = 50_000
+PAGE_META_CACHE_TTL = 3600
+PAGE_META_CACHE_MAX_ENTRIES = 5000
+
+
+# =============================================================================
+# Compiled Patterns
+# =============================================================================
+
+# Each pattern list is compiled once into a single alternation, so a URL or
+# title costs one regex scan instead of one re.search per pattern.
+
+def _combine(patterns: Iterable[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+BLOG_PATH_RE = _combine(BLOG_PATH_PATTERNS)
+LOCATION_PAGE_RE = _combine(LOCATION_PAGE_PATTERNS)
+BLOG_TITLE_RE = _combine(BLOG_TITLE_PATTERNS)
+TOOL_TITLE_RE = _combine(TOOL_TITLE_PATTERNS)
+FILE_EXTENSION_RE = re.compile(r"\.[a-z]{2,4}$", re.IGNORECASE)
+
+# Longest keywords first, so the alternation prefers "calculator" over "calculate"
+_TOOL_KEYWORD_ALTERNATION = "|".join(
+    re.escape(kw) for kw in sorted(TOOL_KEYWORDS, key=len, reverse=True)
+)
+TOOL_KEYWORD_RE = re.compile(_TOOL_KEYWORD_ALTERNATION)
+TOOL_KEYWORD_SUFFIX_RE = re.compile(f"(?:{_TOOL_KEYWORD_ALTERNATION})$")
+
+
+@lru_cache(maxsize=65536)
+def _segment_tool_signal(segment: str) -> Optional[str]:
+    """
+    Tool keyword signal for one lowercased path segment.
+
+    Segments repeat heavily across a sitemap ("de", "ratgeber", ...), so the
+    result is cached per distinct segment.
+
+    Returns:
+        "tool_keyword" (exact), "tool_keyword_suffix" (compound ending in a
+        keyword, e.g. "tilgungsrechner"), "tool_keyword_partial", or None
+    """
+    if segment in TOOL_KEYWORDS:
+        return "tool_keyword"
+    if TOOL_KEYWORD_SUFFIX_RE.search(segment):
+        return "tool_keyword_suffix"
+    if TOOL_KEYWORD_RE.search(segment):
+        return "tool_keyword_partial"
+    return None
+
+
+def url_path_segments(url: str) -> List[str]:
+    """Path segments of a URL ("" for the root path, as split() returns)."""
+    return urlparse(url).path.strip("/").split("/")
+
+
+# =============================================================================
+# Path Prefix Index
+# =============================================================================
+
+class PathPrefixIndex:
+    """
+    Trie over lowercased path segments.
+
+    Stores a value per path prefix and answers exact and longest-prefix
+    lookups in time proportional to the URL depth, independent of how many
+    prefixes are stored. Prefixes shared by many URLs ("de/ratgeber") are
+    stored once.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    _VALUE = object()  # Key under which a node stores its value
+
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, segments: Sequence[str], value: Any = True) -> None:
+        """Store value for a prefix (segments are lowercased)."""
+        node = self._root
+        for segment in segments:
+            node = node.setdefault(segment.lower(), {})
+        if self._VALUE not in node:
+            self._size += 1
+        node[self._VALUE] = value
+
+    def get(self, segments: Sequence[str], default: Any = None) -> Any:
+        """Value stored for exactly this prefix."""
+        node = self._root
+        for segment in segments:
+            node = node.get(segment.lower())
+            if node is None:
+                return default
+        return node.get(self._VALUE, default)
+
+    def __contains__(self, segments: Sequence[str]) -> bool:
+        return self.get(segments, self._VALUE) is not self._VALUE
+
+    def longest_match(self, segments: Sequence[str]) -> Optional[Tuple[int, Any]]:
+        """
+        Deepest stored prefix of segments.
+
+        Returns:
+            (prefix length, value), or None if no stored prefix matches
+        """
+        node = self._root
+        match = (0, node[self._VALUE]) if self._VALUE in node else None
+        for depth, segment in enumerate(segments, 1):
+            node = node.get(segment.lower())
+            if node is None:
+                break
+            if self._VALUE in node:
+                match = (depth, node[self._VALUE])
+        return match
+
+
+# =============================================================================
+# Learned URL Rules
+# =============================================================================
+
+@dataclass
+class PathRule:
+    """
+    URL rule learned from AI pattern discovery.
+
+    Matches either a path prefix (whole segments, e.g. "/de/ratgeber/") or a
+    regex searched in the lowercased path.
+    """
+    category: str
+    prefix: Optional[str] = None
+    regex: Optional[str] = None
+    source: str = "ai"  # "ai" (rule proposed by the model) or "samples" (from its classifications)
+
+    @property
+    def prefix_segments(self) -> List[str]:
+        return [s for s in (self.prefix or "").lower().strip("/").split("/") if s]
+
+    @property
+    def label(self) -> str:
+        """Short description, used as key in ClassificationResult.detected_patterns."""
+        return self.prefix if self.prefix else f"regex:{self.regex}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["PathRule"]:
+        """Validated rule from a dict (AI response or storage), or None if unusable."""
+        category = str(data.get("category", "")).lower()
+        if category not in RULE_CATEGORIES:
+            return None
+        source = data.get("source", "ai")
+        prefix = data.get("prefix")
+        if prefix:
+            segments = [s for s in str(prefix).lower().strip("/").split("/") if s]
+            # A root or language-only prefix would match the whole site
+            if not segments or (len(segments) == 1 and segments[0] in LANGUAGE_PREFIXES):
+                return None
+            return cls(category=category, prefix="/" + "/".join(segments) + "/", source=source)
+        regex = data.get("regex")
+        if regex and len(str(regex)) <= 200:
+            try:
+                compiled = re.compile(str(regex), re.IGNORECASE)
+            except re.error:
+                return None
+            # Patterns matching the empty path (".*") would match everything
+            if compiled.search("/") is not None:
+                return None
+            return cls(category=category, regex=str(regex), source=source)
+        return None
+
+
+class RuleMatcher:
+    """
+    Applies learned rules to paths.
+
+    Prefix rules live in a PathPrefixIndex (deepest prefix wins); regex rules
+    are tried in order afterwards.
+    """
+
+    def __init__(self, rules: List[PathRule]):
+        self.rules = rules
+        self._prefixes = PathPrefixIndex()
+        self._regexes: List[Tuple["re.Pattern[str]", PathRule]] = []
+        for rule in rules:
+            if rule.prefix:
+                self._prefixes.add(rule.prefix_segments, rule)
+            elif rule.regex:
+                self._regexes.append((re.compile(rule.regex, re.IGNORECASE), rule))
+
+    def match(self, url: str) -> Optional[PathRule]:
+        path = urlparse(url).path.lower()
+        segments = [s for s in path.strip("/").split("/") if s]
+        # Only parent segments count, so "/de/ratgeber/" does not match the section page itself
+        found = self._prefixes.longest_match(segments[:-1])
+        if found is not None:
+            return found[1]
+        for pattern, rule in self._regexes:
+            if pattern.search(path):
+                return rule
+        return None
+
+
+def rules_from_classifications(classifications: List[Dict[str, Any]], min_samples: int = 2) -> List[PathRule]:
+    """
+    Derive prefix rules from AI-classified sample paths.
+
+    A parent path becomes a rule when at least min_samples of its classified
+    pages agree on one category and none disagree.
+    """
+    by_parent: Dict[Tuple[str, ...], Counter] = defaultdict(Counter)
+    for item in classifications:
+        segments = [s for s in str(item.get("path", "")).lower().strip("/").split("/") if s]
+        if len(segments) >= 2:
+            by_parent[tuple(segments[:-1])][str(item.get("category", "")).lower()] += 1
+
+    rules = []
+    for parent, categories in sorted(by_parent.items()):
+        if len(categories) != 1:
+            continue
+        category, count = categories.most_common(1)[0]
+        if count < min_samples:
+            continue
+        rule = PathRule.from_dict({"category": category, "prefix": "/".join(parent), "source": "samples"})
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def site_domain(url: str) -> str:
+    """Domain key for learned rules (lowercased host without www.)."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def structure_fingerprint(paths: Iterable[Sequence[str]]) -> str:
+    """
+    Fingerprint of a sitemap's section structure.
+
+    Hashes the distinct parent paths (first STRUCTURE_DEPTH segments below
+    the last one) shared by at least two URLs, so new pages in existing
+    sections keep the fingerprint while new or removed sections change it.
+    """
+    sections = Counter(
+        "/".join(segment.lower() for segment in segments[:-1][:STRUCTURE_DEPTH])
+        for segments in paths
+    )
+    structure = sorted(section for section, count in sections.items() if count >= 2)
+    return hashlib.sha256("\n".join(structure).encode("utf-8")).hexdigest()[:16]
+
+
+# =============================================================================
+# Page Metadata Sampling
+# =============================================================================
+
+class PageMetaParser(HTMLParser):
+    """
+    Incremental extractor for title, meta description and first h1.
+
+    Fed decoded chunks as they arrive. Built on html.parser, so broken markup,
+    unquoted attributes and entities are handled, and tags split across
+    chunks are buffered. done turns true once the first h1 is complete, or
+    at </head> when the head provided a title; reading can stop there.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.description = ""
+        self.h1 = ""
+        self.done = False
+        self._og_description = ""
+        self._title_parts: Optional[List[str]] = None
+        self._h1_parts: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and not self.title and self._title_parts is None:
+            self._title_parts = []
+        elif tag == "meta":
+            attr = {k: (v or "") for k, v in attrs}
+            name = (attr.get("name") or attr.get("property") or "").lower()
+            if name == "description" and not self.description:
+                self.description = _clean_text(attr.get("content", ""))
+            elif name == "og:description" and not self._og_description:
+                self._og_description = _clean_text(attr.get("content", ""))
+        elif tag == "h1" and self._h1_parts is None and not self.h1:
+            self._h1_parts = []
+        elif tag == "body":
+            self._close_head()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = _clean_text("".join(self._title_parts))
+            self._title_parts = None
+        elif tag == "h1" and self._h1_parts is not None:
+            self.h1 = _clean_text("".join(self._h1_parts))
+            self._h1_parts = None
+            self.done = True
+        elif tag == "head":
+            self._close_head()
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._h1_parts is not None:
+            self._h1_parts.append(data)
+
+    def _close_head(self):
+        if self._title_parts is not None:  # Unclosed <title>
+            self.handle_endtag("title")
+        if self.title:
+            self.done = True
+
+    def result(self) -> Dict[str, str]:
+        """Extracted fields (an unclosed title/h1 keeps the text read so far)."""
+        title = self.title or _clean_text("".join(self._title_parts or []))
+        h1 = self.h1 or _clean_text("".join(self._h1_parts or []))
+        return {
+            "title": title,
+            "description": self.description or self._og_description,
+            "h1": h1,
+        }
+
+
+def _clean_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+# url -> (expires_at, metadata); shared by all classifiers in the process
+_page_meta_cache: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+
+
+def _cached_page_meta(url: str) -> Optional[Dict[str, str]]:
+    entry = _page_meta_cache.get(url)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _page_meta_cache[url]
+        return None
+    _page_meta_cache.move_to_end(url)
+    return entry[1]
+
+
+def _cache_page_meta(url: str, meta: Dict[str, str], ttl: float):
+    if ttl <= 0:
+        return
+    _page_meta_cache[url] = (time.monotonic() + ttl, meta)
+    _page_meta_cache.move_to_end(url)
+    while len(_page_meta_cache) > PAGE_META_CACHE_MAX_ENTRIES:
+        _page_meta_cache.popitem(last=False)
+
+
 # =============================================================================
 # Data Classes
 # =============================================================================
@@ -190,6 +578,10 @@ class SmartClassifier:
     3. Sitemap metadata: Priority, changefreq clustering
     4. Page sampling: Fetch titles/meta for uncertain URLs
     5. AI fallback: Pattern discovery for complex cases (optional)
+
+    With the AI fallback enabled, the rules it discovers are stored per
+    domain; later runs over the same sitemap structure apply them instead of
+    calling the AI again.
     """
 
     def __init__(
@@ -198,6 +590,8 @@ class SmartClassifier:
         fetch_timeout: float = 5.0,
         enable_ai_fallback: bool = True,
         gemini_client = None,
+        db: Optional["OpenBlogDB"] = None,
+        sample_cache_ttl: float = PAGE_META_CACHE_TTL,
     ):
         """
         Initialize smart classifier.
@@ -206,12 +600,18 @@ class SmartClassifier:
             sample_size: Number of URLs to sample for title fetching
             fetch_timeout: Timeout for HTTP requests
             enable_ai_fallback: Whether to use AI for pattern discovery
+                (and rules it learned on earlier runs)
             gemini_client: Optional GeminiClient for AI fallback
+            db: Database for learned URL rules (default: OpenBlogDB() when available)
+            sample_cache_ttl: Seconds sampled page metadata is reused (0 = no cache)
         """
         self.sample_size = sample_size
         self.fetch_timeout = fetch_timeout
         self.enable_ai_fallback = enable_ai_fallback
         self.gemini_client = gemini_client
+        self._db = db
+        self._db_unavailable = db is None and not DB_AVAILABLE
+        self.sample_cache_ttl = sample_cache_ttl
 
     async def classify(
         self,
@@ -254,18 +654,38 @@ class SmartClassifier:
         self._apply_cluster_signals(url_scores, known_blog_urls)
 
         # Preliminary classification
-        high_confidence = [s for s in url_scores.values()
-                          if abs(s.blog_score - s.tool_score) > 0.5]
-        low_confidence = [s for s in url_scores.values()
-                         if abs(s.blog_score - s.tool_score) <= 0.5]
+        high_confidence = []
+        low_confidence = []
+        for s in url_scores.values():
+            if abs(s.blog_score - s.tool_score) > 0.5:
+                high_confidence.append(s)
+            else:
+                low_confidence.append(s)
 
         logger.info(f"After URL/cluster analysis: {len(high_confidence)} high confidence, "
                    f"{len(low_confidence)} need sampling")
 
-        # Step 4: Sample uncertain URLs for title/meta
         samples_checked = 0
         ai_calls = 0
+        applied_rules: List[PathRule] = []
+        learned_rules: List[PathRule] = []
+        domain = site_domain(entries[0].url) if entries else ""
+        fingerprint = ""
+
+        # Fast path: rules learned by AI discovery on an earlier run of this domain
+        if low_confidence and self.enable_ai_fallback and domain:
+            fingerprint = structure_fingerprint(
+                [e.path_segments for e in entries] + [url_path_segments(u) for u in known_blog_urls]
+            )
+            learned_rules = await self._load_rules(domain, fingerprint)
+            if learned_rules:
+                matched = self._apply_discovered_patterns(url_scores, learned_rules)
+                applied_rules = learned_rules
+                logger.info(f"Applied {len(learned_rules)} learned rules for {domain} to {matched} URLs")
+                low_confidence = [s for s in low_confidence
+                                  if abs(s.blog_score - s.tool_score) <= 0.5]
 
+        # Step 4: Sample uncertain URLs for title/meta
         if low_confidence:
             samples = await self._sample_page_metadata(
                 [s.url for s in low_confidence[:self.sample_size]]
@@ -279,19 +699,24 @@ class SmartClassifier:
             still_uncertain = [s for s in url_scores.values()
                               if abs(s.blog_score - s.tool_score) <= 0.3]
 
-            # Step 5: AI pattern discovery (if enabled and needed)
-            if self.enable_ai_fallback and self.gemini_client and len(still_uncertain) > 10:
+            # Step 5: AI pattern discovery (if enabled, needed and no learned rules)
+            if (self.enable_ai_fallback and self.gemini_client and not learned_rules
+                    and len(still_uncertain) > 10):
                 logger.info(f"Using AI for {len(still_uncertain)} uncertain URLs")
-                patterns = await self._ai_pattern_discovery(url_scores, samples)
+                rules = await self._ai_pattern_discovery(url_scores, samples)
                 ai_calls = 1
-                self._apply_discovered_patterns(url_scores, patterns)
+                if rules:
+                    matched = self._apply_discovered_patterns(url_scores, rules)
+                    applied_rules = rules
+                    logger.info(f"Applied {len(rules)} discovered rules to {matched} URLs")
+                    await self._store_rules(domain, fingerprint, rules)
 
         # Build final result
         result = ClassificationResult(
             blog_urls=list(known_blog_urls),
             tool_urls=[],
             other_urls=[],
-            detected_patterns={},
+            detected_patterns={rule.label: rule.category for rule in applied_rules},
             samples_checked=samples_checked,
             ai_calls=ai_calls,
         )
@@ -310,7 +735,7 @@ class SmartClassifier:
         high_conf = sum(1 for s in url_scores.values()
                        if abs(s.blog_score - s.tool_score) > 0.3)
         result.confidence = high_conf / total if total > 0 else 1.0
-        result.method_used = self._determine_method(samples_checked, ai_calls)
+        result.method_used = self._determine_method(samples_checked, ai_calls, bool(learned_rules))
 
         logger.info(f"Classification complete: {len(result.blog_urls)} blog, "
                    f"{len(result.tool_urls)} tool, {len(result.other_urls)} other "
@@ -319,96 +744,78 @@ class SmartClassifier:
         return result
 
     def _analyze_url_structure(self, entries: List[SitemapEntry]) -> Dict[str, URLScore]:
-        """Analyze URL structure for classification signals."""
+        """
+        Analyze URL structure for classification signals.
+
+        Scores all entries in one pass: each path costs one scan of the
+        combined blog/location patterns, and keyword checks are cached per
+        distinct path segment.
+        """
         scores = {}
 
         for entry in entries:
             score = URLScore(url=entry.url)
-            path = "/" + "/".join(entry.path_segments) + ("/" if entry.path_segments else "")
-            path_lower = path.lower()
-
-            # Check for explicit blog path patterns FIRST - these are ALWAYS blogs
-            has_blog_pattern = False
-            for pattern in BLOG_PATH_PATTERNS:
-                if re.search(pattern, path_lower, re.IGNORECASE):
-                    score.blog_score += 2.0  # Strong override - always a blog
-                    score.signals["blog_path_pattern"] = 2.0
-                    has_blog_pattern = True
-                    break
-
-            # If has blog pattern, skip other checks - it's definitely a blog
-            if has_blog_pattern:
+            segments = entry.path_segments
+            path_lower = ("/" + "/".join(segments) + ("/" if segments else "")).lower()
+
+            # Explicit blog path patterns FIRST - these are ALWAYS blogs
+            if BLOG_PATH_RE.search(path_lower):
+                score.blog_score += 2.0  # Strong override - always a blog
+                score.signals["blog_path_pattern"] = 2.0
                 scores[entry.url] = score
                 continue
 
-            # Check for location page patterns (these are NOT blog posts)
-            is_location_page = False
-            for pattern in LOCATION_PAGE_PATTERNS:
-                if re.search(pattern, path_lower, re.IGNORECASE):
-                    score.tool_score += 0.6  # Strong signal - push to "other"
-                    score.signals["location_page"] = 0.6
-                    is_location_page = True
-                    break
-
-            # Check for legal/static page keywords (these should never be blogs)
-            is_legal = False
-            if not is_location_page:
-                for segment in entry.path_segments:
-                    segment_lower = segment.lower()
-                    if segment_lower in LEGAL_KEYWORDS:
-                        score.tool_score += 0.5  # Use tool_score to push to "other"
-                        score.signals["legal_keyword"] = 0.5
-                        is_legal = True
-                        break
+            segments_lower = [segment.lower() for segment in segments]
+
+            # Location page patterns (these are NOT blog posts)
+            is_location_page = LOCATION_PAGE_RE.search(path_lower) is not None
+            if is_location_page:
+                score.tool_score += 0.6  # Strong signal - push to "other"
+                score.signals["location_page"] = 0.6
+
+            # Legal/static page keywords (these should never be blogs)
+            is_legal = not is_location_page and not LEGAL_KEYWORDS.isdisjoint(segments_lower)
+            if is_legal:
+                score.tool_score += 0.5  # Use tool_score to push to "other"
+                score.signals["legal_keyword"] = 0.5
 
-            # Check for tool keywords in path
+            # Tool keywords in path: partial/suffix matches add up per segment,
+            # an exact keyword segment ends the scan
             if not is_legal and not is_location_page:
-                for segment in entry.path_segments:
-                    segment_lower = segment.lower()
-                    if segment_lower in TOOL_KEYWORDS:
-                        score.tool_score += 0.5
-                        score.signals["tool_keyword"] = 0.5
+                for segment_lower in segments_lower:
+                    signal = _segment_tool_signal(segment_lower)
+                    if signal is None:
+                        continue
+                    weight = 0.25 if signal == "tool_keyword_partial" else 0.5
+                    score.tool_score += weight
+                    score.signals[signal] = weight
+                    if signal == "tool_keyword":
                         break
-                    # Partial match for compound words - stronger if at end (suffix)
-                    for kw in TOOL_KEYWORDS:
-                        if kw in segment_lower:
-                            # Suffix match (e.g., "baufinanzierungsrechner" ends with "rechner")
-                            if segment_lower.endswith(kw):
-                                score.tool_score += 0.5
-                                score.signals["tool_keyword_suffix"] = 0.5
-                            else:
-                                score.tool_score += 0.25
-                                score.signals["tool_keyword_partial"] = 0.25
-                            break
 
             # Slug length analysis - HARD REQUIREMENT for blog detection (when no blog pattern)
             # Long slugs like "can-i-get-a-credit-loan-to-increase-my-affordability" are blogs
             # Short slugs like "stuttgart" or "monheim-am-rhein" are location/category pages
-            # This is a hard filter - short slugs CANNOT be blogs unless they have /blog/ etc.
-            if entry.path_segments:
-                last_segment = entry.path_segments[-1]
-                # Remove file extension if present
-                slug = re.sub(r'\.[a-z]{2,4}$', '', last_segment, flags=re.IGNORECASE)
-                slug_length = len(slug)
-
-                if slug_length >= MIN_BLOG_SLUG_LENGTH:
+            if segments:
+                last_segment = segments[-1]
+                slug = FILE_EXTENSION_RE.sub("", last_segment)  # Drop file extension
+
+                if len(slug) >= MIN_BLOG_SLUG_LENGTH:
                     # Long descriptive slug - strong blog signal
                     score.blog_score += 0.4
                     score.signals["long_slug"] = 0.4
                 else:
                     # Short slug - HARD DISQUALIFIER from being a blog
-                    # Add strong penalty to ensure it goes to "other" not "blog"
                     score.tool_score += 1.0
                     score.signals["short_slug_disqualifier"] = 1.0
 
             # Language prefix at depth 1 suggests content page (weak signal)
-            if entry.path_depth >= 2 and entry.path_segments[0].lower() in LANGUAGE_PREFIXES:
+            if entry.path_depth >= 2 and segments_lower[0] in LANGUAGE_PREFIXES:
                 score.blog_score += 0.05
                 score.signals["lang_prefix"] = 0.05
 
             # Slug-like last segment (hyphens, no numbers-only)
-            if entry.path_segments:
-                last_segment = entry.path_segments[-1]
+            if segments:
+                last_segment = segments[-1]
                 if "-" in last_segment and not last_segment.replace("-", "").isdigit():
                     score.blog_score += 0.1
                     score.signals["slug_format"] = 0.1
@@ -427,16 +834,10 @@ class SmartClassifier:
         entries: List[SitemapEntry]
     ):
         """Apply signals from sitemap metadata."""
-        # Analyze priority distribution
-        priorities = [e.priority for e in entries if e.priority is not None]
-        if not priorities:
+        # Signals only apply when the sitemap carries priorities at all
+        if not any(e.priority is not None for e in entries):
             return
 
-        avg_priority = sum(priorities) / len(priorities)
-
-        # Analyze changefreq distribution
-        changefreq_counts = Counter(e.changefreq for e in entries if e.changefreq)
-
         entry_map = {e.url: e for e in entries}
 
         for url, score in scores.items():
@@ -465,109 +866,101 @@ class SmartClassifier:
         scores: Dict[str, URLScore],
         known_blog_urls: List[str]
     ):
-        """Apply signals from URL clustering patterns."""
+        """
+        Apply signals from URL clustering patterns.
+
+        Parent paths of known blogs go into a PathPrefixIndex, so each URL is
+        matched with one trie walk regardless of how many blogs are known.
+        """
         if not known_blog_urls:
             return
 
-        # Analyze path patterns of known blogs
-        known_patterns = set()
+        # Analyze path patterns of known blogs (first N-1 segments as prefix)
+        known_prefixes = PathPrefixIndex()
         known_depths = Counter()
 
         for url in known_blog_urls:
-            parsed = urlparse(url)
-            segments = parsed.path.strip("/").split("/")
-            depth = len(segments)
-            known_depths[depth] += 1
-
-            # Extract pattern (first N-1 segments as prefix)
+            segments = url_path_segments(url)
+            known_depths[len(segments)] += 1
             if len(segments) >= 2:
-                prefix = "/".join(segments[:-1])
-                known_patterns.add(prefix.lower())
+                known_prefixes.add(segments[:-1])
 
         # Find dominant depth for blogs
-        if known_depths:
-            dominant_depth = known_depths.most_common(1)[0][0]
-
-            for url, score in scores.items():
-                parsed = urlparse(url)
-                segments = parsed.path.strip("/").split("/")
-                depth = len(segments)
-
-                # Same depth as known blogs
-                if depth == dominant_depth:
-                    score.blog_score += 0.2
-                    score.signals["matching_depth"] = 0.2
-
-                # Matching prefix pattern
-                if len(segments) >= 2:
-                    prefix = "/".join(segments[:-1]).lower()
-                    if prefix in known_patterns:
-                        score.blog_score += 0.3
-                        score.signals["matching_prefix"] = 0.3
+        dominant_depth = known_depths.most_common(1)[0][0]
+
+        for url, score in scores.items():
+            segments = url_path_segments(url)
+
+            # Same depth as known blogs
+            if len(segments) == dominant_depth:
+                score.blog_score += 0.2
+                score.signals["matching_depth"] = 0.2
+
+            # Matching prefix pattern
+            if len(segments) >= 2 and segments[:-1] in known_prefixes:
+                score.blog_score += 0.3
+                score.signals["matching_prefix"] = 0.3
 
     async def _sample_page_metadata(
         self,
         urls: List[str]
     ) -> Dict[str, Dict[str, str]]:
-        """Fetch title and meta description from sample URLs."""
+        """
+        Fetch title, meta description and h1 from sample URLs.
+
+        Pages are streamed over one pooled client and parsed as they arrive;
+        reading stops at </head> (or the first h1 when the head has no
+        title), after SAMPLE_MAX_BYTES at most. Results are cached per URL
+        for sample_cache_ttl.
+        """
         results = {}
-        semaphore = asyncio.Semaphore(5)
+        pending = []
+        for url in urls:
+            meta = _cached_page_meta(url)
+            if meta is not None:
+                results[url] = meta
+            else:
+                pending.append(url)
+        if not pending:
+            return results
+
+        semaphore = asyncio.Semaphore(SAMPLE_CONCURRENCY)
 
-        async def fetch_meta(url: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        async def fetch_meta(client: httpx.AsyncClient, url: str) -> Optional[Tuple[str, Dict[str, str]]]:
             async with semaphore:
                 try:
-                    async with httpx.AsyncClient(
-                        timeout=Timeout(connect=3.0, read=self.fetch_timeout),
-                        follow_redirects=True,
-                        limits=Limits(max_connections=10)
-                    ) as client:
-                        response = await client.get(url)
+                    async with client.stream("GET", url) as response:
                         if response.status_code != 200:
                             return None
+                        content_type = response.headers.get("content-type", "")
+                        if content_type and "html" not in content_type.lower():
+                            return None
 
-                        html = response.text[:50000]  # Limit to first 50KB
-
-                        # Extract title
-                        title_match = re.search(
-                            r'<title[^>]*>([^<]+)</title>',
-                            html, re.IGNORECASE
-                        )
-                        title = title_match.group(1).strip() if title_match else ""
-
-                        # Extract meta description
-                        desc_match = re.search(
-                            r'<meta[^>]+name=["\']description["\'][^>]+content=["\']([^"\']+)["\']',
-                            html, re.IGNORECASE
-                        )
-                        if not desc_match:
-                            desc_match = re.search(
-                                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+name=["\']description["\']',
-                                html, re.IGNORECASE
-                            )
-                        description = desc_match.group(1).strip() if desc_match else ""
-
-                        # Extract h1
-                        h1_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html, re.IGNORECASE)
-                        h1 = h1_match.group(1).strip() if h1_match else ""
-
-                        return url, {
-                            "title": title,
-                            "description": description,
-                            "h1": h1,
-                        }
+                        parser = PageMetaParser()
+                        async for text in response.aiter_text():
+                            parser.feed(text)
+                            if parser.done or response.num_bytes_downloaded >= SAMPLE_MAX_BYTES:
+                                break
+                        return url, parser.result()
 
                 except Exception as e:
                     logger.debug(f"Failed to fetch metadata for {url}: {e}")
                     return None
 
-        logger.info(f"Sampling metadata from {len(urls)} URLs...")
-        tasks = [fetch_meta(url) for url in urls]
-        fetched = await asyncio.gather(*tasks)
+        logger.info(f"Sampling metadata from {len(pending)} URLs "
+                    f"({len(results)} cached)...")
+        async with httpx.AsyncClient(
+            timeout=Timeout(connect=3.0, read=self.fetch_timeout, write=5.0, pool=self.fetch_timeout),
+            follow_redirects=True,
+            limits=Limits(max_connections=SAMPLE_CONCURRENCY, max_keepalive_connections=SAMPLE_CONCURRENCY),
+        ) as client:
+            fetched = await asyncio.gather(*(fetch_meta(client, url) for url in pending))
 
         for result in fetched:
             if result:
                 url, meta = result
                 results[url] = meta
+                _cache_page_meta(url, meta, self.sample_cache_ttl)
 
         logger.info(f"Successfully fetched metadata from {len(results)} URLs")
         return results
@@ -588,19 +981,14 @@ class SmartClassifier:
             description = meta.get("description", "").lower()
             combined = f"{title} {h1} {description}"
 
-            # Check for blog-like patterns
-            for pattern in BLOG_TITLE_PATTERNS:
-                if re.search(pattern, combined, re.IGNORECASE):
-                    score.blog_score += 0.3
-                    score.signals["blog_title_pattern"] = 0.3
-                    break
+            # Blog-like and tool-like patterns (one combined scan each)
+            if BLOG_TITLE_RE.search(combined):
+                score.blog_score += 0.3
+                score.signals["blog_title_pattern"] = 0.3
 
-            # Check for tool-like patterns
-            for pattern in TOOL_TITLE_PATTERNS:
-                if re.search(pattern, combined, re.IGNORECASE):
-                    score.tool_score += 0.4
-                    score.signals["tool_title_pattern"] = 0.4
-                    break
+            if TOOL_TITLE_RE.search(combined):
+                score.tool_score += 0.4
+                score.signals["tool_title_pattern"] = 0.4
 
             # Question-style title → likely blog
             if title.endswith("?"):
@@ -611,10 +999,16 @@ class SmartClassifier:
         self,
         scores: Dict[str, URLScore],
         samples: Dict[str, Dict[str, str]]
-    ) -> Dict[str, str]:
-        """Use AI to discover classification patterns."""
+    ) -> List[PathRule]:
+        """
+        Use AI to classify sampled pages and discover URL rules.
+
+        Returns:
+            Validated rules: those the model proposed plus prefix rules
+            derived from its classifications of the samples
+        """
         if not self.gemini_client:
-            return {}
+            return []
 
         # Prepare sample data for AI
         sample_data = []
@@ -627,7 +1021,7 @@ class SmartClassifier:
             })
 
         prompt = f"""Analyze these URLs from a website and classify each as "blog", "tool", or "other".
-Then describe the URL pattern for each category so we can classify remaining URLs.
+Then give concrete URL rules that classify the site's remaining URLs as "blog" or "tool".
 
 Sample pages:
 {sample_data}
@@ -637,12 +1031,14 @@ Respond in JSON format:
     "classifications": [
         {{"path": "/de/example", "category": "blog"}}
     ],
-    "patterns": {{
-        "blog": "Description of URL pattern for blog posts",
-        "tool": "Description of URL pattern for tools/calculators",
-        "other": "Description of other page patterns"
-    }}
+    "rules": [
+        {{"prefix": "/de/ratgeber/", "category": "blog"}},
+        {{"regex": "rechner$", "category": "tool"}}
+    ]
 }}
+
+Rules: "prefix" matches whole leading path segments, "regex" is searched in the lowercased path.
+Only give rules that hold for all pages they match; never a prefix covering the whole site.
 """
 
         try:
@@ -654,46 +1050,113 @@ Respond in JSON format:
                 temperature=0.2,
             )
 
-            patterns = result.get("patterns", {})
-            classifications = result.get("classifications", [])
+            classifications = result.get("classifications", []) or []
+
+            # Apply AI classifications to sampled URLs (first URL per path)
+            urls_by_path: Dict[str, str] = {}
+            if classifications:
+                for url in scores:
+                    urls_by_path.setdefault(urlparse(url).path, url)
 
-            # Apply AI classifications to sampled URLs
             for item in classifications:
-                path = item.get("path", "")
+                url = urls_by_path.get(item.get("path", ""))
+                if url is None:
+                    continue
+                score = scores[url]
                 category = item.get("category", "")
+                if category == "blog":
+                    score.blog_score += 0.4
+                    score.signals["ai_classification"] = 0.4
+                elif category == "tool":
+                    score.tool_score += 0.4
+                    score.signals["ai_classification"] = 0.4
 
-                # Find matching URL
-                for url, score in scores.items():
-                    if urlparse(url).path == path:
-                        if category == "blog":
-                            score.blog_score += 0.4
-                            score.signals["ai_classification"] = 0.4
-                        elif category == "tool":
-                            score.tool_score += 0.4
-                            score.signals["ai_classification"] = 0.4
-                        break
-
-            return patterns
+            rules = [rule for rule in (PathRule.from_dict({**item, "source": "ai"})
+                                       for item in result.get("rules", []) or []
+                                       if isinstance(item, dict))
+                     if rule is not None]
+            known = {(rule.prefix, rule.regex) for rule in rules}
+            rules += [rule for rule in rules_from_classifications(classifications)
+                      if (rule.prefix, rule.regex) not in known]
+            return rules
 
         except Exception as e:
             logger.warning(f"AI pattern discovery failed: {e}")
-            return {}
+            return []
 
     def _apply_discovered_patterns(
         self,
         scores: Dict[str, URLScore],
-        patterns: Dict[str, str]
-    ):
-        """Apply AI-discovered patterns to remaining URLs."""
-        # This is a placeholder for pattern-based extrapolation
-        # The actual implementation would parse the pattern descriptions
-        # and apply them to remaining URLs
-        pass
+        rules: List[PathRule]
+    ) -> int:
+        """
+        Apply learned/discovered rules to the URLs that are still uncertain.
+
+        Returns:
+            Number of URLs a rule matched
+        """
+        if not rules:
+            return 0
+
+        matcher = RuleMatcher(rules)
+        matched = 0
+        for url, score in scores.items():
+            if abs(score.blog_score - score.tool_score) > 0.3:
+                continue
+            rule = matcher.match(url)
+            if rule is None:
+                continue
+            if rule.category == "blog":
+                score.blog_score += LEARNED_RULE_WEIGHT
+            else:
+                score.tool_score += LEARNED_RULE_WEIGHT
+            score.signals["learned_rule"] = LEARNED_RULE_WEIGHT
+            matched += 1
+        return matched
+
+    def _database(self) -> Optional["OpenBlogDB"]:
+        """Database for learned rules, opened on first use."""
+        if self._db is None and not self._db_unavailable:
+            try:
+                self._db = OpenBlogDB()
+            except Exception as e:
+                logger.warning(f"Learned URL rules unavailable: {e}")
+                self._db_unavailable = True
+        return self._db
+
+    async def _load_rules(self, domain: str, fingerprint: str) -> List[PathRule]:
+        """Stored rules of a domain, if learned for the same sitemap structure."""
+        db = self._database()
+        if db is None:
+            return []
+        try:
+            stored = await asyncio.to_thread(db.get_url_rules, domain)
+        except Exception as e:
+            logger.warning(f"Failed to load learned URL rules for {domain}: {e}")
+            return []
+        if not stored:
+            return []
+        if stored["fingerprint"] != fingerprint:
+            logger.info(f"Sitemap structure of {domain} changed, ignoring learned URL rules")
+            return []
+        return [rule for rule in map(PathRule.from_dict, stored["rules"]) if rule is not None]
+
+    async def _store_rules(self, domain: str, fingerprint: str, rules: List[PathRule]):
+        """Persist discovered rules for later runs (errors are logged, not raised)."""
+        db = self._database()
+        if db is None or not domain or not fingerprint:
+            return
+        try:
+            await asyncio.to_thread(db.store_url_rules, domain, fingerprint, [r.to_dict() for r in rules])
+        except Exception as e:
+            logger.warning(f"Failed to store learned URL rules for {domain}: {e}")
 
-    def _determine_method(self, samples_checked: int, ai_calls: int) -> str:
+    def _determine_method(self, samples_checked: int, ai_calls: int, learned_rules: bool = False) -> str:
         """Determine which method was primarily used."""
         if ai_calls > 0:
             return "ai_assisted"
+        elif learned_rules:
+            return "learned_rules"
         elif samples_checked > 0:
             return "title_sampling"
         else:
@@ -5,9 +5,18 @@ Pydantic models for input/output JSON schemas.
 Clean, no dependencies on other stages.
 """
 
+import base64
 import logging
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from functools import cached_property
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from pydantic import (
+    BaseModel, Field, SerializationInfo, SerializerFunctionWrapHandler,
+    field_serializer, field_validator, model_serializer, model_validator,
+)
 from datetime import datetime
 import uuid
 import re
@@ -218,22 +227,328 @@ class CompanyContext(BaseModel):
 # Sitemap Data
 # =============================================================================
 
+# URL categories of SitemapData, in storage order (the index is the label byte)
+URL_CATEGORIES = ("blog", "product", "service", "resource", "docs", "tool", "other")
+
+_ABSOLUTE_FLAG = 0x80  # Label bit: the entry is a full URL, not a path under url_origin
+_STRIP_FLAG = bytes(i & 0x7F for i in range(256))  # bytes.translate table removing that bit
+_RESTART_INTERVAL = 32  # Every Nth entry is stored whole, so decoding can start there
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _shared_prefix(a: bytes, b: bytes) -> int:
+    """Length of the common prefix (binary search over C-level slice compares)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _url_origin(url: str) -> str:
+    """scheme://host[:port] of a URL, or "" if it has none."""
+    scheme_end = url.find("://")
+    if scheme_end < 0:
+        return ""
+    path_start = url.find("/", scheme_end + 3)
+    return url if path_start < 0 else url[:path_start]
+
+
+def encode_url_groups(groups: Dict[str, List[str]]) -> Tuple[str, bytes, bytes]:
+    """
+    Encode categorized URLs compactly.
+
+    URLs are stored category by category (URL_CATEGORIES order) as paths
+    relative to the most common origin; URLs on other origins are kept whole
+    and flagged in their label. Each entry is front-coded against the
+    previous one: varint shared byte count, varint suffix length, suffix.
+
+    Args:
+        groups: {category: [url, ...]}
+
+    Returns:
+        (origin, front-coded entries, one label byte per entry)
+    """
+    origins = Counter(_url_origin(url) for urls in groups.values() for url in urls or ())
+    origin = sys.intern(origins.most_common(1)[0][0]) if origins else ""
+    origin_length = len(origin)
+
+    blob = bytearray()
+    labels = bytearray()
+    previous = b""
+    for code, category in enumerate(URL_CATEGORIES):
+        for url in groups.get(category) or ():
+            if origin and url.startswith(origin) and url[origin_length:origin_length + 1] in ("", "/", "?", "#"):
+                key = url[origin_length:].encode("utf-8")
+                labels.append(code)
+            else:
+                key = url.encode("utf-8")
+                labels.append(code | _ABSOLUTE_FLAG)
+            shared = _shared_prefix(key, previous) if len(labels) % _RESTART_INTERVAL != 1 else 0
+            _write_varint(blob, shared)
+            _write_varint(blob, len(key) - shared)
+            blob += key[shared:]
+            previous = key
+    return origin, bytes(blob), bytes(labels)
+
+
+class CompactURLStore:
+    """Decoder for encode_url_groups() output with random access via restart entries."""
+
+    __slots__ = ("origin", "blob", "labels", "_offsets", "_ranges")
+
+    def __init__(self, origin: str, blob: bytes, labels: bytes):
+        self.origin = origin
+        self.blob = blob
+        self.labels = labels
+        self._offsets: Optional[array] = None
+        self._ranges: Optional[Dict[int, range]] = None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _restart_offsets(self) -> array:
+        """Byte offset of every _RESTART_INTERVAL-th entry (one scan, on first use)."""
+        if self._offsets is None:
+            offsets = array("Q")
+            blob, pos = self.blob, 0
+            for index in range(len(self.labels)):
+                if index % _RESTART_INTERVAL == 0:
+                    offsets.append(pos)
+                _, pos = _read_varint(blob, pos)
+                length, pos = _read_varint(blob, pos)
+                pos += length
+            self._offsets = offsets
+        return self._offsets
+
+    def iter_range(self, start: int, stop: int) -> Iterator[str]:
+        """Decode entries start..stop-1 in order."""
+        stop = min(stop, len(self.labels))
+        if start >= stop:
+            return
+        blob, labels, origin = self.blob, self.labels, self.origin
+        index = start - start % _RESTART_INTERVAL
+        pos = self._restart_offsets()[index // _RESTART_INTERVAL]
+        previous = b""
+        while index < stop:
+            shared, pos = _read_varint(blob, pos)
+            length, pos = _read_varint(blob, pos)
+            key = previous[:shared] + blob[pos:pos + length]
+            pos += length
+            if index >= start:
+                text = key.decode("utf-8")
+                yield text if labels[index] & _ABSOLUTE_FLAG else origin + text
+            previous = key
+            index += 1
+
+    def category_range(self, category: str) -> range:
+        """Entry indices of a category (contiguous, as encode_url_groups stores them)."""
+        if self._ranges is None:
+            codes = self.labels.translate(_STRIP_FLAG)
+            ranges = {}
+            for code in range(len(URL_CATEGORIES)):
+                marker = bytes([code])
+                count = codes.count(marker)
+                first = codes.find(marker)
+                if count and codes.rfind(marker) != first + count - 1:
+                    raise ValueError(f"URLs of category {URL_CATEGORIES[code]!r} are not stored contiguously")
+                ranges[code] = range(first, first + count) if count else range(0)
+            self._ranges = ranges
+        return self._ranges[URL_CATEGORIES.index(category)]
+
+
+class URLView(Sequence):
+    """
+    Read-only list of one category's URLs, decoded on access.
+
+    Supports len(), iteration, indexing, slicing (returns a list), `in` and
+    comparison with lists; copy with list(view) where a real list is needed.
+    """
+
+    __slots__ = ("_store", "_range")
+
+    def __init__(self, store: CompactURLStore, entries: range):
+        self._store = store
+        self._range = entries
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._store.iter_range(self._range.start, self._range.stop)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            base = self._range.start
+            return list(self._store.iter_range(base + start, base + max(start, stop)))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("URL index out of range")
+        position = self._range.start + index
+        return next(self._store.iter_range(position, position + 1))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, URLView)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        preview = ", ".join(repr(url) for url in self[:3])
+        more = ", ..." if len(self) > 3 else ""
+        return f"URLView([{preview}{more}], {len(self)} URLs)"
+
+
+# Serialization context key selecting SitemapData's compact form (see compact_dump)
+COMPACT_URLS_CONTEXT = "compact_urls"
+_COMPACT_URL_FIELDS = ("url_origin", "url_paths", "url_labels")
+
+
 class SitemapData(BaseModel):
-    """Crawled sitemap data with labeled URLs."""
+    """
+    Crawled sitemap data with labeled URLs.
+
+    URLs are held compactly (see encode_url_groups): the shared origin once,
+    front-coded paths and one category byte per URL. blog_urls, tool_urls,
+    etc. are read-only URLView lists decoded on access.
+
+    model_dump()/model_dump_json() (and the JSON schema) give plain *_urls
+    lists, as before the compact layout. compact_dump() keeps the compact
+    fields (bytes as base64) for internal storage such as the Stage 1 and
+    sitemap caches. Both forms (and older dumps) load back.
+    """
     total_pages: int = Field(default=0, description="Total URLs found in sitemap")
-    blog_urls: List[str] = Field(default_factory=list, description="URLs labeled as blog posts")
-    product_urls: List[str] = Field(default_factory=list, description="URLs labeled as product pages")
-    service_urls: List[str] = Field(default_factory=list, description="URLs labeled as service pages")
-    resource_urls: List[str] = Field(default_factory=list, description="URLs labeled as resources (whitepapers, case studies)")
-    docs_urls: List[str] = Field(default_factory=list, description="URLs labeled as documentation")
-    tool_urls: List[str] = Field(default_factory=list, description="URLs labeled as tools/calculators")
-    other_urls: List[str] = Field(default_factory=list, description="URLs with other/unknown labels")
+    url_origin: str = Field(default="", description="Origin shared by most URLs (e.g. https://example.com)")
+    url_paths: bytes = Field(default=b"", description="Front-coded URL paths, grouped by category (base64 when dumped)")
+    url_labels: bytes = Field(default=b"", description="Category per URL, index into URL_CATEGORIES (base64 when dumped)")
 
     # Smart classification metadata
-    classification_method: str = Field(default="pattern", description="Method used: pattern, url_analysis, title_sampling, ai_assisted")
+    classification_method: str = Field(default="pattern", description="Method used: pattern, url_analysis, title_sampling, learned_rules, ai_assisted")
     classification_confidence: float = Field(default=1.0, description="Classification confidence (0-1)")
     smart_classifier_used: bool = Field(default=False, description="Whether smart classifier was triggered")
 
+    @model_validator(mode="before")
+    @classmethod
+    def _encode_url_lists(cls, data: Any) -> Any:
+        if isinstance(data, dict) and any(f"{c}_urls" in data for c in URL_CATEGORIES):
+            data = dict(data)
+            groups = {c: list(data.pop(f"{c}_urls", None) or []) for c in URL_CATEGORIES}
+            data["url_origin"], data["url_paths"], data["url_labels"] = encode_url_groups(groups)
+        return data
+
+    @field_validator("url_origin")
+    @classmethod
+    def _intern_origin(cls, value: str) -> str:
+        return sys.intern(value)
+
+    @field_validator("url_paths", "url_labels", mode="before")
+    @classmethod
+    def _decode_base64(cls, value: Any) -> Any:
+        return base64.b64decode(value) if isinstance(value, str) else value
+
+    @field_serializer("url_paths", "url_labels")
+    def _encode_base64(self, value: bytes) -> str:
+        return base64.b64encode(value).decode("ascii")
+
+    @model_serializer(mode="wrap")
+    def _serialize_url_lists(self, handler: SerializerFunctionWrapHandler, info: SerializationInfo):
+        data = handler(self)
+        if (info.context or {}).get(COMPACT_URLS_CONTEXT) or not isinstance(data, dict):
+            return data
+        public = {k: v for k, v in data.items() if k not in _COMPACT_URL_FIELDS}
+        total_pages = {"total_pages": public.pop("total_pages")} if "total_pages" in public else {}
+        return {**total_pages, **self.url_lists(), **public}
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, core_schema, handler):
+        schema = handler(core_schema)
+        if handler.mode == "serialization":
+            schema = handler.resolve_ref_schema(schema)
+            properties = schema.get("properties", {})
+            for name in _COMPACT_URL_FIELDS:
+                properties.pop(name, None)
+            for category in URL_CATEGORIES:
+                properties[f"{category}_urls"] = {
+                    "type": "array", "items": {"type": "string"}, "title": f"{category.title()} Urls",
+                }
+        return schema
+
+    def compact_dump(self) -> Dict[str, Any]:
+        """Dump with the compact URL fields instead of *_urls lists (for caches)."""
+        return self.model_dump(context={COMPACT_URLS_CONTEXT: True})
+
+    @cached_property
+    def _store(self) -> CompactURLStore:
+        return CompactURLStore(self.url_origin, self.url_paths, self.url_labels)
+
+    def urls(self, category: str) -> URLView:
+        """URLs of one category (see URL_CATEGORIES)."""
+        return URLView(self._store, self._store.category_range(category))
+
+    def url_lists(self) -> Dict[str, List[str]]:
+        """All categories as plain lists ({"blog_urls": [...], ...})."""
+        return {f"{c}_urls": list(self.urls(c)) for c in URL_CATEGORIES}
+
+    @property
+    def blog_urls(self) -> URLView:
+        """URLs labeled as blog posts"""
+        return self.urls("blog")
+
+    @property
+    def product_urls(self) -> URLView:
+        """URLs labeled as product pages"""
+        return self.urls("product")
+
+    @property
+    def service_urls(self) -> URLView:
+        """URLs labeled as service pages"""
+        return self.urls("service")
+
+    @property
+    def resource_urls(self) -> URLView:
+        """URLs labeled as resources (whitepapers, case studies)"""
+        return self.urls("resource")
+
+    @property
+    def docs_urls(self) -> URLView:
+        """URLs labeled as documentation"""
+        return self.urls("docs")
+
+    @property
+    def tool_urls(self) -> URLView:
+        """URLs labeled as tools/calculators"""
+        return self.urls("tool")
+
+    @property
+    def other_urls(self) -> URLView:
+        """URLs with other/unknown labels"""
+        return self.urls("other")
+
 
 # =============================================================================
 # Stage 1 Input/Output
@@ -295,6 +610,16 @@ class Stage1Input(BaseModel):
         description="Additional blog URLs for voice analysis (e.g. from related domains)"
     )
 
+    # Persistent context cache (see context_cache.py)
+    use_context_cache: bool = Field(
+        default=True,
+        description="Reuse fresh cached company_context, voice_persona, sitemap and legal_context"
+    )
+    refresh_context: List[str] = Field(
+        default_factory=list,
+        description="Cache components to recompute even if fresh (or 'all')"
+    )
+
     def get_keyword_configs(self) -> List[KeywordConfig]:
         """
         Parse keywords into KeywordConfig objects with resolved values.
@@ -380,3 +705,13 @@ class Stage1Output(BaseModel):
         default=False,
         description="Whether legal research was performed"
     )
+
+    # Context cache
+    cached_components: List[str] = Field(
+        default_factory=list,
+        description="Components served from the Stage 1 context cache"
+    )
+
+    def compact_dump(self) -> Dict[str, Any]:
+        """Dump with the sitemap in its compact form (see SitemapData.compact_dump), for job results."""
+        return self.model_dump(context={COMPACT_URLS_CONTEXT: True})
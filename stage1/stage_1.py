@@ -14,9 +14,15 @@ Micro-API Design:
 - Can run as CLI or be imported as a module
 
 AI Calls: 0-2 (3 with legal research via Beck-Online)
-- OpenContext: 0-1 (only if company_context not provided)
-- Voice Enhancement: 0-1 (only if 3+ blog URLs available)
+- OpenContext: 0-1 (only if company_context not provided or cached)
+- Voice Enhancement: 0-1 (only if 3+ blog URLs available, not cached and the
+  stored persona has seen too few new posts)
 - Legal Research: 0 (mock data) or 1 (Beck-Online browser agent)
+
+Context Cache:
+company_context, voice_persona, sitemap and legal_context are cached per
+company URL with per-component TTLs (context_cache.py). With everything
+fresh, Stage 1 is a single DB read.
 """
 
 import asyncio
@@ -31,12 +37,15 @@ from dotenv import load_dotenv
 # Load .env from parent directory (openblog-neo/)
 load_dotenv(Path(__file__).parent.parent / ".env")
 
-from stage1_models import Stage1Input, Stage1Output, ArticleJob, generate_slug
+from stage1_models import (
+    Stage1Input, Stage1Output, ArticleJob, CompanyContext, SitemapData, VoicePersona, generate_slug,
+)
 from opencontext import get_company_context
 from sitemap_crawler import crawl_sitemap
-from voice_enhancer import sample_and_enhance
-from constants import VOICE_ENHANCEMENT_SAMPLE_SIZE, VOICE_ENHANCEMENT_MIN_BLOGS
+from voice_enhancer import enhance_for_domain
+from constants import VOICE_ENHANCEMENT_SAMPLE_SIZE, VOICE_ENHANCEMENT_MIN_BLOGS, VOICE_PERSONA_MIN_NEW_POSTS
 from legal_researcher import conduct_legal_research
+from context_cache import Stage1ContextCache, normalize_company_url, resolve_refresh, variant_key
 
 # Configure logging
 logging.basicConfig(
@@ -69,6 +78,11 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
     ai_calls = 0
     opencontext_called = False
 
+    # -----------------------------------------
+    # Step 0: Load Context Cache (single DB read)
+    # -----------------------------------------
+    cache, cached = _load_context_cache(input_data)
+
     # -----------------------------------------
     # Step 1: Get Company Context
     # -----------------------------------------
@@ -76,6 +90,9 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
         # Use provided company context (0 AI calls)
         logger.info("  Using provided company_context (0 AI calls)")
         company_context = input_data.company_context
+    elif cached and (data := cached.get("company_context")):
+        logger.info("  Using cached company_context (0 AI calls)")
+        company_context = CompanyContext(**data)
     else:
         # Run OpenContext (1 AI call)
         logger.info("  Running OpenContext (1 AI call)")
@@ -86,13 +103,21 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
         if ai_called:
             ai_calls += 1
             opencontext_called = True
+            # Fallback detections are not cached so the next run retries OpenContext
+            _store(cache, input_data.company_url, "company_context", company_context.model_dump())
         logger.info(f"  Company: {company_context.company_name}")
 
     # -----------------------------------------
     # Step 2: Crawl Sitemap (no AI)
     # -----------------------------------------
-    logger.info("  Crawling sitemap...")
-    sitemap_data = await crawl_sitemap(company_url=input_data.company_url)
+    if cached and (data := cached.get("sitemap")):
+        sitemap_data = SitemapData(**data)
+        logger.info("  Using cached sitemap")
+    else:
+        logger.info("  Crawling sitemap...")
+        sitemap_data = await crawl_sitemap(company_url=input_data.company_url)
+        if sitemap_data.total_pages:
+            _store(cache, input_data.company_url, "sitemap", sitemap_data.compact_dump())
     logger.info(f"  Sitemap: {sitemap_data.total_pages} pages, {len(sitemap_data.blog_urls)} blog URLs")
 
     # -----------------------------------------
@@ -114,18 +139,45 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
         if added:
             logger.info(f"  Added {added} extra blog URLs for voice analysis (total: {len(all_blog_urls)})")
 
-    if all_blog_urls and len(all_blog_urls) >= VOICE_ENHANCEMENT_MIN_BLOGS:
+    voice_variant = variant_key(input_data.extra_blog_urls) if input_data.extra_blog_urls else ""
+    cached_voice = cached.get("voice_persona", voice_variant) if cached else None
+
+    if cached_voice:
+        company_context.voice_persona = VoicePersona(**cached_voice["voice_persona"])
+        voice_enhancement_urls = cached_voice["urls"]
+        voice_enhanced = True
+        logger.info(f"  Using cached voice persona ({len(voice_enhancement_urls)} blog URLs)")
+    elif all_blog_urls and len(all_blog_urls) >= VOICE_ENHANCEMENT_MIN_BLOGS:
         logger.info(f"  Enhancing voice persona from {VOICE_ENHANCEMENT_SAMPLE_SIZE} blog samples...")
-        enhanced_persona, voice_enhancement_urls, voice_enhanced = await sample_and_enhance(
+        # Persona store (per blog, reused until enough new posts appear) is
+        # part of the context cache: off without it, bypassed by its refresh flag
+        persona_key = ""
+        if cache is not None:
+            persona_key = normalize_company_url(input_data.company_url)
+            if voice_variant:
+                persona_key += f"#{voice_variant}"
+        enhancement = await enhance_for_domain(
             initial_persona=company_context.voice_persona,
             blog_urls=all_blog_urls,
+            domain=persona_key,
+            db=cache.db if cache is not None else None,
             sample_size=VOICE_ENHANCEMENT_SAMPLE_SIZE,
             min_blogs_required=VOICE_ENHANCEMENT_MIN_BLOGS,
+            min_new_posts=VOICE_PERSONA_MIN_NEW_POSTS,
+            refresh="voice_persona" in resolve_refresh(input_data.refresh_context),
         )
-        if voice_enhanced:
-            company_context.voice_persona = enhanced_persona
+        if enhancement.ai_called:
             ai_calls += 1
-            logger.info(f"  Voice persona enhanced using {len(voice_enhancement_urls)} blog URLs")
+        voice_enhancement_urls = enhancement.urls
+        voice_enhanced = enhancement.enhanced
+        if voice_enhanced:
+            company_context.voice_persona = enhancement.persona
+            logger.info(f"  Voice persona enhanced using {len(voice_enhancement_urls)} blog URLs "
+                        f"({enhancement.mode})")
+            _store(cache, input_data.company_url, "voice_persona", {
+                "voice_persona": company_context.voice_persona.model_dump(),
+                "urls": voice_enhancement_urls,
+            }, variant=voice_variant)
         else:
             logger.info("  Voice enhancement skipped or failed, using initial persona")
     else:
@@ -137,16 +189,33 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
     legal_context = None
     legal_research_enabled = False
 
-    if input_data.enable_legal_research:
+    legal_variant = variant_key(
+        input_data.rechtsgebiet,
+        "mock" if input_data.use_mock_legal_data else "beck",
+        [config.keyword for config in input_data.get_keyword_configs()],
+    )
+    cached_legal = (
+        cached.get("legal_context", legal_variant)
+        if cached and input_data.enable_legal_research else None
+    )
+
+    if cached_legal:
+        legal_context = cached_legal
+        legal_research_enabled = True
+        logger.info(f"  Using cached legal research ({len(legal_context.get('court_decisions', []))} court decisions)")
+    elif input_data.enable_legal_research:
         logger.info(f"  Conducting legal research: rechtsgebiet={input_data.rechtsgebiet}, use_mock={input_data.use_mock_legal_data}")
         try:
-            legal_context = await conduct_legal_research(
+            legal_research = await conduct_legal_research(
                 keywords=input_data.keywords,
                 rechtsgebiet=input_data.rechtsgebiet,
                 use_mock=input_data.use_mock_legal_data
             )
+            legal_context = legal_research.model_dump()
             legal_research_enabled = True
-            logger.info(f"  Legal research complete: {len(legal_context.court_decisions)} court decisions found")
+            logger.info(f"  Legal research complete: {len(legal_research.court_decisions)} court decisions found")
+            if legal_research.court_decisions:
+                _store(cache, input_data.company_url, "legal_context", legal_context, variant=legal_variant)
         except Exception as e:
             logger.error(f"  Legal research failed: {e}")
             logger.warning("  Continuing without legal context")
@@ -183,15 +252,47 @@ async def run_stage_1(input_data: Stage1Input) -> Stage1Output:
         ai_calls=ai_calls,
         voice_enhanced=voice_enhanced,
         voice_enhancement_urls=voice_enhancement_urls,
-        legal_context=legal_context.model_dump() if legal_context else None,
+        legal_context=legal_context,
         legal_research_enabled=legal_research_enabled,
+        cached_components=cached.hits if cached else [],
     )
 
+    if output.cached_components:
+        logger.info(f"  Context cache hits: {', '.join(output.cached_components)}")
     logger.info(f"Stage 1 complete. Job ID: {output.job_id}")
 
     return output
 
 
+def _load_context_cache(input_data: Stage1Input):
+    """
+    Open the context cache and load this company's components (one DB read).
+
+    Returns:
+        (cache, snapshot), both None if caching is disabled or unavailable
+    """
+    if not input_data.use_context_cache:
+        return None, None
+    try:
+        cache = Stage1ContextCache()
+        return cache, cache.load(input_data.company_url, refresh=input_data.refresh_context)
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.warning(f"  Context cache unavailable (non-fatal): {e}")
+        return None, None
+
+
+def _store(cache: Optional[Stage1ContextCache], company_url: str, component: str, data, variant: str = ""):
+    """Write a component to the context cache; failures are logged, not raised."""
+    if cache is None:
+        return
+    try:
+        cache.store(company_url, component, data, variant=variant)
+    except Exception as e:
+        logger.warning(f"  Could not cache {component} (non-fatal): {e}")
+
+
 # =============================================================================
 # JSON Interface (Micro-API)
 # =============================================================================
@@ -284,6 +385,19 @@ def main():
         default="US",
         help="Market code (default: US)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the context cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        type=str,
+        nargs="+",
+        default=[],
+        choices=["company_context", "voice_persona", "sitemap", "legal_context", "all"],
+        help="Cache components to recompute even if fresh"
+    )
 
     args = parser.parse_args()
 
@@ -298,6 +412,8 @@ def main():
                 company_url=args.url,
                 language=args.language,
                 market=args.market,
+                use_context_cache=not args.no_cache,
+                refresh_context=args.refresh,
             )
             output = await run_stage_1(input_data)
             result = output.model_dump()
@@ -0,0 +1,101 @@
+"""
+Tests for the selector-based Beck-Online extraction.
+
+Parses the pages in fixtures/beck/; no browser or Beck-Online access
+needed. The fixtures are hand-written to the same unverified layout
+assumptions as beck_scraper's selectors (see fixtures/beck/README.md), so
+these tests check the parsing logic, not that Beck-Online still matches.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from beck_scraper import (
+    BeckSelectorError,
+    SelectorParser,
+    canonical_url,
+    parse_decision,
+    parse_search_results,
+    search_url,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "beck"
+PAGE_URL = "https://beck-online.beck.de/Dokument?vpath=bibdata%2Fents%2Fbeckrs%2F2024%2Fcont%2Fbeckrs.2024.10001.htm"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class TestSearchResults:
+    def test_hits_in_order_without_duplicates(self):
+        hits = parse_search_results(_fixture("search_results.html"), "https://beck-online.beck.de/Search?words=x")
+        assert [h.title for h in hits] == [
+            "BAG, Urteil v. 12.03.2024 – 6 AZR 123/23",
+            "ErfK/Müller-Glöge, 24. Aufl. 2024, BGB § 623",
+            "LAG Düsseldorf, Beschluss v. 2.7.2023 – 4 Ta 200/23",
+        ]
+        assert hits[0].url == PAGE_URL
+        assert "Schriftform des § 623 BGB" in hits[0].snippet
+
+    def test_hit_urls_are_canonical_but_open_on_page_host(self):
+        hits = parse_search_results(_fixture("search_results.html"), "https://beck-online.test/Search?words=x")
+        assert hits[0].url == PAGE_URL
+        assert hits[0].page_url.startswith("https://beck-online.test/Dokument?vpath=")
+
+    def test_no_results_page_is_empty(self):
+        assert parse_search_results(_fixture("search_no_results.html")) == []
+
+    def test_changed_layout_raises_selector_error(self):
+        with pytest.raises(BeckSelectorError):
+            parse_search_results(_fixture("search_changed_layout.html"))
+
+
+class TestDecision:
+    def test_fields_from_selectors(self):
+        decision = parse_decision(_fixture("decision_bag.html"), PAGE_URL, "Arbeitsrecht")
+        assert decision.gericht == "BAG"
+        assert decision.aktenzeichen == "6 AZR 123/23"
+        assert decision.datum == "2024-03-12"
+        assert decision.leitsatz.startswith("Die Kündigung eines Arbeitsverhältnisses durch E-Mail")
+        assert "Leitsatz" not in decision.leitsatz
+        assert decision.relevante_normen == ["§ 623 BGB", "§ 126 Abs. 1 BGB"]
+        assert decision.url == PAGE_URL
+        assert decision.volltext_auszug.startswith("Die Revision ist unbegründet.")
+
+    def test_citation_line_fallback(self):
+        decision = parse_decision(_fixture("decision_citation_only.html"), PAGE_URL, "Arbeitsrecht")
+        assert decision.gericht == "LAG Düsseldorf"
+        assert decision.aktenzeichen == "4 Ta 200/23"
+        assert decision.datum == "2023-07-02"
+        # No Leitsatz on the page: the Orientierungssatz stands in
+        assert decision.leitsatz == decision.orientierungssatz
+        assert decision.relevante_normen == ["§ 130 Abs. 1 BGB"]
+
+    def test_non_decision_page_is_none(self):
+        assert parse_decision(_fixture("commentary.html"), PAGE_URL, "Arbeitsrecht") is None
+
+    def test_url_is_rewritten_to_beck_online(self):
+        decision = parse_decision(
+            _fixture("decision_bag.html"), "https://beck-online.test/Dokument?vpath=a", "Arbeitsrecht"
+        )
+        assert decision.url == "https://beck-online.beck.de/Dokument?vpath=a"
+
+
+class TestSelectorParser:
+    def test_nested_captures_and_unclosed_tags(self):
+        parser = SelectorParser({"box": (".box",), "title": ("h2",)})
+        parser.feed('<div class="box"><h2>Eins</h2><p>offen<div class="box"><h2>Zwei</h2></div></div><p>raus')
+        parser.close()
+        assert [c.text for c in parser.captures["title"]] == ["Eins", "Zwei"]
+        assert parser.captures["box"][0].text == "Eins offen Zwei"
+        assert parser.captures["box"][1].text == "Zwei"
+
+    def test_search_url_and_canonical_url(self):
+        assert search_url("Kündigung Schriftform") == (
+            "https://beck-online.beck.de/Search?pagenr=1&words=K%C3%BCndigung+Schriftform"
+        )
+        assert canonical_url("/Dokument?vpath=a", "https://beck-online.test/Search") == (
+            "https://beck-online.beck.de/Dokument?vpath=a"
+        )
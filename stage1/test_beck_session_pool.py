@@ -0,0 +1,240 @@
+"""
+Tests for the Beck-Online session pool.
+
+Browser tests run the pool (and the direct extraction on its sessions)
+against the hand-written pages in fixtures/beck/ (see its README.md),
+routed in place of beck-online.beck.de, and are skipped when no Playwright
+chromium is installed. Storage state checks need no browser.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+from beck_scraper import scrape_decisions
+from beck_session_pool import (
+    BeckLoginError,
+    BeckSessionPool,
+    resolve_storage_state_path,
+    storage_state_valid,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "beck"
+BASE_URL = "https://beck-online.test"
+# vpath marker -> fixture document page
+DOCUMENTS = {
+    "beckrs.2024.10001": "decision_bag.html",
+    "beckrs.2023.20002": "decision_citation_only.html",
+}
+
+
+def _write_state(path: Path, cookies) -> Path:
+    path.write_text(json.dumps({"cookies": cookies, "origins": []}), encoding="utf-8")
+    return path
+
+
+def _chromium_available() -> bool:
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        return False
+
+    async def launch():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            await browser.close()
+
+    try:
+        asyncio.run(launch())
+        return True
+    except Exception:
+        return False
+
+
+requires_chromium = pytest.mark.skipif(
+    not _chromium_available(), reason="Playwright chromium not installed"
+)
+
+
+class FakeBeckOnline:
+    """Routes a context's requests to the fixture pages; login sets a session cookie."""
+
+    def __init__(self, password: str = "secret"):
+        self.password = password
+        self.login_posts = 0
+        self.pages_served = 0
+
+    async def attach(self, context):
+        async def handle(route, request):
+            path = urlparse(request.url).path
+            if path == "/Login" and request.method == "POST":
+                self.login_posts += 1
+                if f"Passwort={self.password}" in (request.post_data or ""):
+                    await context.add_cookies([{
+                        "name": "beck_session", "value": "valid", "url": BASE_URL,
+                        "expires": time.time() + 3600,
+                    }])
+                await route.fulfill(status=302, headers={"location": f"{BASE_URL}/Home"})
+                return
+            cookies = await context.cookies(BASE_URL)
+            logged_in = any(c["name"] == "beck_session" for c in cookies)
+            if path == "/Login":
+                name = "login.html"
+            elif not logged_in:
+                name = "home.html"
+            elif path == "/Search":
+                name = "search_no_results.html" if "Xyzzy" in request.url else "search_results.html"
+            elif path == "/Dokument":
+                name = next(
+                    (page for marker, page in DOCUMENTS.items() if marker in request.url),
+                    "commentary.html",
+                )
+            else:
+                name = "home_logged_in.html"
+            self.pages_served += 1
+            await route.fulfill(
+                status=200, content_type="text/html",
+                body=(FIXTURES / name).read_text(encoding="utf-8"),
+            )
+
+        await context.route(f"{BASE_URL}/**", handle)
+
+
+def _pool(site: FakeBeckOnline, state_path: Path, size: int = 2, password: str = "secret"):
+    return BeckSessionPool(
+        size=size, username="kanzlei", password=password,
+        storage_state_path=str(state_path), base_url=BASE_URL,
+        requests_per_minute=None, on_context=site.attach,
+    )
+
+
+# =============================================================================
+# Storage state
+# =============================================================================
+
+class TestStorageState:
+    def test_missing_or_corrupt_file_is_invalid(self, tmp_path):
+        assert not storage_state_valid(tmp_path / "missing.json")
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json", encoding="utf-8")
+        assert not storage_state_valid(corrupt)
+
+    def test_unexpired_or_session_cookie_is_valid(self, tmp_path):
+        future = _write_state(tmp_path / "a.json", [{"name": "s", "expires": time.time() + 600}])
+        session = _write_state(tmp_path / "b.json", [{"name": "s", "expires": -1}])
+        assert storage_state_valid(future)
+        assert storage_state_valid(session)
+
+    def test_expired_cookies_or_old_file_is_invalid(self, tmp_path):
+        expired = _write_state(tmp_path / "a.json", [{"name": "s", "expires": time.time() - 1}])
+        empty = _write_state(tmp_path / "b.json", [])
+        old = _write_state(tmp_path / "c.json", [{"name": "s", "expires": -1}])
+        stale = time.time() - 13 * 3600
+        os.utime(old, (stale, stale))
+        assert not storage_state_valid(expired)
+        assert not storage_state_valid(empty)
+        assert not storage_state_valid(old, max_age_hours=12)
+        assert storage_state_valid(old, max_age_hours=24)
+
+    def test_relative_path_resolves_to_project_root(self, tmp_path):
+        assert resolve_storage_state_path("data/state.json") == Path(__file__).parent.parent / "data" / "state.json"
+        assert resolve_storage_state_path(str(tmp_path / "s.json")) == tmp_path / "s.json"
+
+    def test_pool_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            BeckSessionPool(size=0)
+
+
+# =============================================================================
+# Pool against fixture pages
+# =============================================================================
+
+@requires_chromium
+class TestSessionPool:
+    @pytest.mark.asyncio
+    async def test_logs_in_once_and_persists_state(self, tmp_path):
+        site = FakeBeckOnline()
+        state_path = tmp_path / "state.json"
+        async with _pool(site, state_path, size=3) as pool:
+            assert pool.logins == 1
+        assert site.login_posts == 1
+        assert storage_state_valid(state_path)
+
+    @pytest.mark.asyncio
+    async def test_stored_state_skips_login(self, tmp_path):
+        site = FakeBeckOnline()
+        state_path = tmp_path / "state.json"
+        async with _pool(site, state_path):
+            pass
+        async with _pool(site, state_path) as pool:
+            assert pool.logins == 0
+        assert site.login_posts == 1
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_raises_login_error(self, tmp_path):
+        site = FakeBeckOnline()
+        with pytest.raises(BeckLoginError, match="Login failed"):
+            async with _pool(site, tmp_path / "state.json", password="wrong"):
+                pass
+        assert not (tmp_path / "state.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_map_runs_jobs_across_sessions_in_order(self, tmp_path):
+        site = FakeBeckOnline()
+        used = set()
+        running = 0
+        peak = 0
+
+        async def job(session, keyword):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            used.add(session.index)
+            await session.goto(f"{BASE_URL}/Home")
+            await asyncio.sleep(0.05)
+            running -= 1
+            if keyword == "fail":
+                raise RuntimeError("job failed")
+            return keyword.upper()
+
+        async with _pool(site, tmp_path / "state.json", size=2) as pool:
+            results = await pool.map(["a", "b", "fail", "c"], job)
+
+        assert results[:2] == ["A", "B"] and results[3] == "C"
+        assert isinstance(results[2], RuntimeError)
+        assert used == {0, 1}
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_session_is_reopened_logged_in(self, tmp_path):
+        site = FakeBeckOnline()
+
+        async def fail(session, _):
+            raise RuntimeError("broken page")
+
+        async with _pool(site, tmp_path / "state.json", size=1) as pool:
+            first = pool._sessions[0]
+            await pool.map([1, 2], fail)
+            assert pool._sessions[0] is not first
+            async with pool.session() as session:
+                assert await session.page.locator("text=Abmelden").count() == 1
+            assert pool.logins == 1
+
+    @pytest.mark.asyncio
+    async def test_direct_extraction_on_pool_session(self, tmp_path):
+        site = FakeBeckOnline()
+        async with _pool(site, tmp_path / "state.json", size=1) as pool:
+            async with pool.session() as session:
+                decisions = await scrape_decisions(
+                    session, "Kündigung Schriftform", "Arbeitsrecht", base_url=BASE_URL
+                )
+                empty = await scrape_decisions(session, "Xyzzy", "Arbeitsrecht", base_url=BASE_URL)
+
+        assert [d.aktenzeichen for d in decisions] == ["6 AZR 123/23", "4 Ta 200/23"]
+        assert all(d.url.startswith("https://beck-online.beck.de/Dokument") for d in decisions)
+        assert empty == []
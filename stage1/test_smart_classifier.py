@@ -14,6 +14,8 @@ from smart_classifier import (
     ClassificationResult,
     URLScore,
     smart_classify,
+    PathRule,
+    RuleMatcher,
     TOOL_KEYWORDS,
     BLOG_TITLE_PATTERNS,
 )
@@ -493,6 +495,161 @@ class TestEdgeCases:
         assert isinstance(result, ClassificationResult)
 
 
+# =============================================================================
+# Learned URL Rules
+# =============================================================================
+
+class TestLearnedRules:
+    """Tests for rules from AI pattern discovery and their persistence."""
+
+    def test_rule_validation(self):
+        """Unusable or site-wide rules are rejected."""
+        assert PathRule.from_dict({"prefix": "/de/ratgeber", "category": "blog"}).prefix == "/de/ratgeber/"
+        assert PathRule.from_dict({"regex": "rechner$", "category": "tool"}) is not None
+        assert PathRule.from_dict({"prefix": "/de/", "category": "blog"}) is None
+        assert PathRule.from_dict({"regex": ".*", "category": "tool"}) is None
+        assert PathRule.from_dict({"regex": "(", "category": "tool"}) is None
+        assert PathRule.from_dict({"prefix": "/x/", "category": "other"}) is None
+
+    def test_rule_matcher(self):
+        """Deepest prefix wins, regex rules apply after prefixes."""
+        matcher = RuleMatcher([
+            PathRule(category="blog", prefix="/de/ratgeber/"),
+            PathRule(category="tool", prefix="/de/ratgeber/tools/"),
+            PathRule(category="tool", regex="rechner$"),
+        ])
+        assert matcher.match("https://example.com/de/ratgeber/was-kostet-ein-haus").category == "blog"
+        assert matcher.match("https://example.com/de/ratgeber/tools/budget").category == "tool"
+        assert matcher.match("https://example.com/de/zinsrechner").category == "tool"
+        assert matcher.match("https://example.com/de/ratgeber") is None
+
+    @pytest.mark.asyncio
+    async def test_rules_persisted_and_reused(self, tmp_path):
+        """Discovered rules are stored and replace the AI call on the next run."""
+        from shared.database import OpenBlogDB
+
+        db = OpenBlogDB(str(tmp_path / "rules.db"))
+        gemini = MagicMock()
+        gemini.generate = AsyncMock(return_value={
+            "classifications": [],
+            "rules": [
+                {"prefix": "/de/appwissen/", "category": "blog"},
+                {"regex": "appwerkzeug", "category": "tool"},
+            ],
+        })
+        # Long slugs with partial tool keywords: uncertain after URL analysis
+        entries = (
+            [SitemapEntry(url=f"https://www.example.com/de/appwissen/wie-viel-haus-demokratie-{i}")
+             for i in range(15)]
+            + [SitemapEntry(url=f"https://www.example.com/de/appwerkzeug/demokratie-rechenweg-{i}")
+               for i in range(15)]
+        )
+
+        async def no_samples(urls):
+            return {}
+
+        first = SmartClassifier(sample_size=0, gemini_client=gemini, db=db)
+        first._sample_page_metadata = no_samples
+        result = await first.classify(entries)
+        assert result.method_used == "ai_assisted"
+        assert len(result.blog_urls) == 15 and len(result.tool_urls) == 15
+        assert db.get_url_rules("example.com") is not None
+
+        second = SmartClassifier(sample_size=0, gemini_client=gemini, db=db)
+        second._sample_page_metadata = no_samples
+        result = await second.classify(entries)
+        assert result.method_used == "learned_rules"
+        assert len(result.blog_urls) == 15
+        assert gemini.generate.await_count == 1
+
+
+# =============================================================================
+# Page Metadata Sampling Tests
+# =============================================================================
+
+class TestPageMetaParser:
+    """Tests for the incremental title/description/h1 parser."""
+
+    HEAD = (
+        "<html><head><meta charset=utf-8>"
+        "<title>Baufinanzierung &amp; Zinsen\n  2024</title>"
+        "<meta property=og:description content='OG Beschreibung'>"
+        '<meta name="Description" content="Alles  über Zinsen">'
+        "</head><body><h1>Zinsen</h1>"
+    )
+
+    @staticmethod
+    def _parse(chunks):
+        from smart_classifier import PageMetaParser
+
+        parser = PageMetaParser()
+        fed = 0
+        for chunk in chunks:
+            parser.feed(chunk)
+            fed += 1
+            if parser.done:
+                break
+        return parser, fed
+
+    def test_fields_from_chunks_split_anywhere(self):
+        """Tags and entities split across chunks parse the same; done at </head>."""
+        parser, fed = self._parse(list(self.HEAD))
+        assert parser.result() == {"title": "Baufinanzierung & Zinsen 2024", "description": "Alles über Zinsen", "h1": ""}
+        assert fed == self.HEAD.index("</head>") + len("</head>")
+
+    def test_without_title_waits_for_first_h1(self):
+        """Without a title in the head, reading continues to the first h1."""
+        html = "<head><meta property='og:description' content='OG'></head><body><h1>Erste <b>Frage</b></h1><h1>Zweite</h1>"
+        parser, _ = self._parse([html[:40], html[40:70], html[70:]])
+        assert parser.done
+        assert parser.result() == {"title": "", "description": "OG", "h1": "Erste Frage"}
+
+    def test_broken_markup_keeps_text_read_so_far(self):
+        """An unclosed title ends at <body>; an unclosed h1 keeps its partial text."""
+        parser, _ = self._parse(["<title>Ratgeber Hauskauf<body><p>Text"])
+        assert parser.done and parser.result()["title"] == "Ratgeber Hauskauf"
+
+        parser, _ = self._parse(["<body><h1>Wie viel Haus kann ich mir"])
+        assert not parser.done and parser.result()["h1"] == "Wie viel Haus kann ich mir"
+
+    @pytest.mark.asyncio
+    async def test_sampling_stops_reading_after_head_and_caches(self, monkeypatch):
+        """Sampling stops streaming once the head is parsed and reuses cached results."""
+        import httpx
+        import smart_classifier
+
+        sent = {}
+
+        async def body(url):
+            sent[url] = 0
+            for chunk in [self.HEAD[:60], self.HEAD[60:]] + ["<p>" + "x" * 1000 + "</p>"] * 50:
+                sent[url] += 1
+                yield chunk.encode("utf-8")
+
+        def handler(request):
+            if request.url.path == "/bild.png":
+                return httpx.Response(200, headers={"content-type": "image/png"}, content=b"png")
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=body(str(request.url)))
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            smart_classifier.httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+        monkeypatch.setattr(smart_classifier, "_page_meta_cache", smart_classifier.OrderedDict())
+        classifier = SmartClassifier(sample_size=2)
+        urls = ["https://example.test/ratgeber", "https://example.test/bild.png"]
+
+        samples = await classifier._sample_page_metadata(urls)
+        assert list(samples) == ["https://example.test/ratgeber"]
+        assert samples[urls[0]]["title"] == "Baufinanzierung & Zinsen 2024"
+        assert sent[urls[0]] < 5
+
+        sent.clear()
+        assert await classifier._sample_page_metadata(urls[:1]) == {urls[0]: samples[urls[0]]}
+        assert sent == {}
+
+
 # =============================================================================
 # Run Tests
 # =============================================================================
@@ -5,7 +5,8 @@ Tests cover:
 1. stage1_models.py - Data models, slug generation, input/output validation
 2. sitemap_crawler.py - URL classification patterns
 3. opencontext.py - Basic detection fallback (no API key)
-4. Integration test - Full Stage 1 run with real company (hypofriend.de)
+4. article_extractor.py - Main article text extraction
+5. Integration test - Full Stage 1 run with real company (hypofriend.de)
 
 Run: python test_stage1.py
 Run integration only: python test_stage1.py --integration
@@ -13,7 +14,9 @@ Run integration only: python test_stage1.py --integration
 
 import asyncio
 import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add parent to path for shared imports
@@ -21,6 +24,10 @@ _parent = Path(__file__).parent.parent
 if str(_parent) not in sys.path:
     sys.path.insert(0, str(_parent))
 
+# Caches (sitemap crawls, URL checks, Stage 1 context) go to a scratch
+# database, not data/openblog.db
+os.environ.setdefault("OPENBLOG_DB_PATH", str(Path(tempfile.mkdtemp()) / "test_stage1.db"))
+
 from dotenv import load_dotenv
 
 load_dotenv(_parent / ".env")
@@ -515,6 +522,65 @@ if not RUN_INTEGRATION_ONLY:
 
     test_sitemap_data_values()
 
+    from stage1_models import URL_CATEGORIES, CompactURLStore, encode_url_groups
+
+    SITEMAP_GROUPS = {
+        "blog": [f"https://example.com/blog/post-{i:03d}" for i in range(70)],
+        "product": ["https://example.com/products/a?ref=x", "https://example.com"],
+        "other": ["https://cdn.example.net/blog/post-001", "https://example.com.evil.io/x", "/relative"],
+    }
+
+    @test("SitemapData: encoder round-trips every category in order")
+    def test_sitemap_encoder_round_trip():
+        origin, blob, labels = encode_url_groups(SITEMAP_GROUPS)
+        assert origin == "https://example.com"
+        assert len(labels) == 75
+        store = CompactURLStore(origin, blob, labels)
+        for category in URL_CATEGORIES:
+            decoded = list(store.iter_range(store.category_range(category).start, store.category_range(category).stop))
+            assert decoded == SITEMAP_GROUPS.get(category, []), category
+
+    test_sitemap_encoder_round_trip()
+
+    @test("SitemapData: random access across restart entries")
+    def test_sitemap_restart_offsets():
+        data = SitemapData(**{f"{c}_urls": urls for c, urls in SITEMAP_GROUPS.items()})
+        blog = SITEMAP_GROUPS["blog"]
+        assert len(data._store._restart_offsets()) == 3  # Entries 0, 32, 64
+        for index in (0, 31, 32, 33, 63, 64, 69, -1):
+            assert data.blog_urls[index] == blog[index], index
+        assert data.blog_urls[30:35] == blog[30:35]
+        assert data.blog_urls[::20] == blog[::20]
+        assert "https://example.com/blog/post-064" in data.blog_urls
+
+    test_sitemap_restart_offsets()
+
+    @test("SitemapData: URLs off the shared origin are stored whole")
+    def test_sitemap_cross_origin():
+        data = SitemapData(**{f"{c}_urls": urls for c, urls in SITEMAP_GROUPS.items()})
+        assert data.url_origin == "https://example.com"
+        assert data.other_urls == SITEMAP_GROUPS["other"]
+        assert data.product_urls == SITEMAP_GROUPS["product"]
+        assert data.product_urls[1] == "https://example.com"
+
+    test_sitemap_cross_origin()
+
+    @test("SitemapData: public dumps have *_urls lists, compact dumps and legacy dumps load back")
+    def test_sitemap_dumps():
+        legacy = {"total_pages": 75, "smart_classifier_used": True,
+                  **{f"{c}_urls": SITEMAP_GROUPS.get(c, []) for c in URL_CATEGORIES}}
+        data = SitemapData(**legacy)
+        assert data.model_dump() == {**legacy, "classification_method": "pattern", "classification_confidence": 1.0}
+        assert json.loads(data.model_dump_json())["blog_urls"] == SITEMAP_GROUPS["blog"]
+        compact = data.compact_dump()
+        assert "blog_urls" not in compact and isinstance(compact["url_paths"], str)
+        for dump in (compact, json.loads(json.dumps(compact)), data.model_dump()):
+            assert SitemapData(**dump).url_lists() == data.url_lists()
+        schema = SitemapData.model_json_schema(mode="serialization")["properties"]
+        assert "blog_urls" in schema and "url_paths" not in schema
+
+    test_sitemap_dumps()
+
     # =============================================================================
     # OpenContext Basic Detection Tests
     # =============================================================================
@@ -610,6 +676,366 @@ if not RUN_INTEGRATION_ONLY:
 
     test_crawler_reject_no_host()
 
+    import time
+
+    from shared.database import OpenBlogDB
+
+    @test("Crawler: crawl cache and URL checks use the injected database")
+    def test_crawler_injected_db():
+        db = OpenBlogDB(str(Path(tempfile.mkdtemp()) / "crawler.db"))
+        crawler = SitemapCrawler(db=db)
+        data = SitemapData(total_pages=1, blog_urls=["https://example.com/blog/a"])
+
+        async def run():
+            await crawler._cache_put("example.com", data)
+            await crawler._store_url_checks([("https://example.com/blog/a", True, 200)])
+            return await crawler._cache_get("example.com"), await crawler._load_url_checks(["https://example.com/blog/a"])
+
+        cached, checks = asyncio.run(run())
+        assert cached.blog_urls == ["https://example.com/blog/a"]
+        assert checks == {"https://example.com/blog/a": True}
+
+    test_crawler_injected_db()
+
+    @test("Database: URL checks are pruned by age and count")
+    def test_url_checks_pruned():
+        db = OpenBlogDB(str(Path(tempfile.mkdtemp()) / "checks.db"))
+        db.store_url_checks([(f"https://example.com/{i}", True, 200) for i in range(5)])
+        conn = db._get_conn()
+        conn.execute("UPDATE url_checks SET checked_at = ? WHERE url = 'https://example.com/0'", (time.time() - 7200,))
+        conn.commit()
+        conn.close()
+        pruned = db.store_url_checks([("https://example.com/new", False, 404)], max_age_seconds=3600, max_entries=3)
+        assert pruned == 3  # One expired, two beyond max_entries
+        kept = db.get_url_checks([f"https://example.com/{i}" for i in range(5)] + ["https://example.com/new"], 3600)
+        assert len(kept) == 3 and kept["https://example.com/new"] is False
+
+    test_url_checks_pruned()
+
+    @test("Database: stored sitemap documents are pruned by age and count")
+    def test_sitemap_documents_pruned():
+        db = OpenBlogDB(str(Path(tempfile.mkdtemp()) / "docs.db"))
+        for i in range(4):
+            db.store_sitemap_document(f"https://example.com/sitemap-{i}.xml", f'"e{i}"', None, [], [])
+        conn = db._get_conn()
+        conn.execute("UPDATE sitemap_documents SET fetched_at = '2020-01-01T00:00:00+00:00' WHERE url LIKE '%-0.xml'")
+        conn.commit()
+        conn.close()
+        pruned = db.store_sitemap_document(
+            "https://example.com/sitemap.xml", '"x"', None, [["https://example.com/a", None, None, None]], [],
+            max_age_seconds=86400, max_entries=3,
+        )
+        assert pruned == 2
+        assert db.get_sitemap_document("https://example.com/sitemap-0.xml") is None
+        assert db.get_sitemap_document("https://example.com/sitemap.xml")["entries"][0][0] == "https://example.com/a"
+
+    test_sitemap_documents_pruned()
+
+    # =============================================================================
+    # Sitemap Parser Tests (sitemap_crawler.py)
+    # =============================================================================
+
+    print("\n=== Testing Sitemap Parser ===")
+
+    import gzip
+
+    from sitemap_crawler import SitemapParser, parse_sitemap
+
+    def _urlset(count: int) -> bytes:
+        entries = "".join(
+            f"<url><loc>https://example.com/blog/post-{i}</loc><priority>0.{i % 10}</priority>"
+            f"<changefreq>Weekly</changefreq><image:image><image:loc>https://example.com/{i}.png</image:loc>"
+            f"</image:image></url>"
+            for i in range(count)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+            f"{entries}</urlset>"
+        ).encode("utf-8")
+
+    def _feed(content: bytes, chunk_size: int, **kwargs) -> SitemapParser:
+        parser = SitemapParser(**kwargs)
+        for offset in range(0, len(content), chunk_size):
+            parser.feed(content[offset:offset + chunk_size])
+        parser.close()
+        return parser
+
+    @test("Sitemap parser: plain and gzipped documents parse the same in small chunks")
+    def test_sitemap_parser_gzip_chunks():
+        plain = _urlset(25)
+        parsers = [_feed(plain, 7), _feed(gzip.compress(plain), 7), parse_sitemap(gzip.compress(plain))]
+        for parser in parsers:
+            assert parser.error is None, parser.error
+            assert [e.url for e in parser.entries] == [f"https://example.com/blog/post-{i}" for i in range(25)]
+        entry = parsers[1].entries[3]
+        assert (entry.priority, entry.changefreq, entry.lastmod) == (0.3, "weekly", None)
+
+    test_sitemap_parser_gzip_chunks()
+
+    @test("Sitemap parser: sitemap index lists sub-sitemaps")
+    def test_sitemap_parser_index():
+        index = (
+            b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b"<sitemap><loc>https://example.com/post-sitemap.xml.gz</loc></sitemap>"
+            b"<sitemap><lastmod>2024-01-01</lastmod></sitemap>"
+            b"<sitemap><loc>https://example.com/page-sitemap.xml</loc></sitemap></sitemapindex>"
+        )
+        parser = parse_sitemap(index)
+        assert parser.is_index and parser.entries == []
+        assert parser.sitemap_urls == ["https://example.com/post-sitemap.xml.gz", "https://example.com/page-sitemap.xml"]
+
+    test_sitemap_parser_index()
+
+    @test("Sitemap parser: stops at max_entries and marks the result truncated")
+    def test_sitemap_parser_truncated():
+        parser = SitemapParser(max_entries=10, url_filter=lambda url: not url.endswith(("-0", "-1")))
+        content = _urlset(50)
+        fed = 0
+        for offset in range(0, len(content), 64):
+            parser.feed(content[offset:offset + 64])
+            fed += 1
+            if parser.done:
+                break
+        parser.close()
+        assert parser.truncated and parser.error is None
+        assert len(parser.entries) == 10 and parser.entries[0].url.endswith("post-2")
+        assert fed * 64 < len(content)  # Reading stopped early
+
+        stored = SitemapParser.from_document(parser.to_document(), max_entries=5)
+        assert stored.truncated and [e.url for e in stored.entries] == [e.url for e in parser.entries[:5]]
+        assert not parse_sitemap(_urlset(3), max_entries=10).truncated
+
+    test_sitemap_parser_truncated()
+
+    @test("Sitemap parser: size cap and broken XML keep the entries parsed so far")
+    def test_sitemap_parser_limits():
+        bomb = gzip.compress(_urlset(400))
+        capped = _feed(bomb, 64, max_bytes=8 * 1024)
+        assert capped.error and "larger than 8192 bytes" in capped.error
+        assert 0 < len(capped.entries) < 400
+
+        broken = _urlset(5).replace(b"</urlset>", b"<url><loc>https://example.com/x</url></urlset>")
+        parser = parse_sitemap(broken)
+        assert parser.error is not None
+        assert len(parser.entries) == 5
+
+    test_sitemap_parser_limits()
+
+    @test("Sitemap host limiters: LRU-bounded, limiters in use are kept")
+    def test_host_limiters_bounded():
+        import sitemap_crawler
+
+        saved_max, saved = sitemap_crawler.SITEMAP_HOST_LIMITERS_MAX, sitemap_crawler._host_limiters.copy()
+        sitemap_crawler.SITEMAP_HOST_LIMITERS_MAX = 2
+        sitemap_crawler._host_limiters.clear()
+        try:
+            host_limiter = sitemap_crawler.host_limiter
+            busy = host_limiter("Busy.example")
+            busy.in_flight = 1
+            idle = host_limiter("idle.example")
+            assert host_limiter("busy.example") is busy
+            host_limiter("new.example")
+            assert list(sitemap_crawler._host_limiters) == ["busy.example", "new.example"]
+            assert host_limiter("idle.example") is not idle
+            assert host_limiter("busy.example") is busy
+            assert len(sitemap_crawler._host_limiters) == 2
+        finally:
+            sitemap_crawler.SITEMAP_HOST_LIMITERS_MAX = saved_max
+            sitemap_crawler._host_limiters.clear()
+            sitemap_crawler._host_limiters.update(saved)
+
+    test_host_limiters_bounded()
+
+    # =============================================================================
+    # Article Extraction Tests (article_extractor.py)
+    # =============================================================================
+
+    print("\n=== Testing Article Extraction ===")
+
+    from article_extractor import extract_article
+
+    ARTICLE_HTML = """<html><head><title>Zinsen | Example</title><script>var a = "<p>x</p>";</script></head>
+    <body><header><nav><a href="/">Home</a> <a href="/blog">Blog</a></nav></header>
+    <div class="cookie-banner">Wir verwenden Cookies, um Ihnen das beste Erlebnis zu bieten.</div>
+    <article class="post"><h1>Wie entwickeln sich die Zinsen?</h1>
+    <div class="entry-content">
+    <p>Die Bauzinsen sind gestiegen, doch es gibt gute Nachrichten für Käufer.</p>
+    <h2>Was bedeutet das?</h2>
+    <ul><li>Höhere Raten bei gleicher Summe</li><li>Mehr Eigenkapital hilft</li></ul>
+    <p>Vergleichen Sie Angebote, bevor Sie unterschreiben, und <a href="/rechner">rechnen</a> Sie nach.</p>
+    <div class="share-buttons"><a href="#">Teilen auf Facebook und Twitter und LinkedIn</a></div>
+    </div></article>
+    <aside><p>Ähnliche Artikel: Kredit, Tilgung, Notar, Grundbuch und vieles mehr.</p></aside>
+    <footer><p>© Example GmbH, Impressum, Datenschutz, alle Rechte vorbehalten.</p></footer>
+    </body></html>"""
+
+    @test("Article: keeps title, paragraphs, headings and lists")
+    def test_article_main_text():
+        article = extract_article(ARTICLE_HTML)
+        assert article.title == "Wie entwickeln sich die Zinsen?"
+        assert article.text.startswith("Die Bauzinsen sind gestiegen")
+        assert "## Was bedeutet das?" in article.text
+        assert "- Höhere Raten bei gleicher Summe\n- Mehr Eigenkapital hilft" in article.text
+        assert "und rechnen Sie nach." in article.text
+
+    test_article_main_text()
+
+    @test("Article: drops navigation, scripts, sidebars and footers")
+    def test_article_boilerplate():
+        text = extract_article(ARTICLE_HTML).text
+        for boilerplate in ("Home", "var a", "Cookies", "Facebook", "Ähnliche", "Impressum", "Zinsen | Example"):
+            assert boilerplate not in text, boilerplate
+
+    test_article_boilerplate()
+
+    @test("Article: empty or text-less pages give empty text")
+    def test_article_empty():
+        assert extract_article("").text == ""
+        assert extract_article("<html><body><nav><p>Menu entry one, two, three and four</p></nav></body></html>").text == ""
+
+    test_article_empty()
+
+    @test("Article: layout wrappers with boilerplate-like classes keep their text")
+    def test_article_hinted_wrappers():
+        body = " ".join(f"Satz {i} über Zinsen, Raten und Eigenkapital beim Hauskauf." for i in range(30))
+        for wrapper in ("overflow-hidden", "menu-open", "related-wrapper"):
+            html = (f'<html><body><div class="{wrapper}"><div class="container">'
+                    f"<h1>Zinsen</h1><p>{body}</p></div></div>"
+                    '<div class="comments"><p>Toller Artikel, danke, sehr hilfreich für uns alle!</p></div>'
+                    "</body></html>")
+            article = extract_article(html)
+            assert article.word_count >= 150, (wrapper, article.word_count)
+            assert "Toller Artikel" not in article.text, wrapper
+
+    test_article_hinted_wrappers()
+
+    # =============================================================================
+    # Voice Persona Store Tests (voice_enhancer.py)
+    # =============================================================================
+
+    print("\n=== Testing Voice Persona Store ===")
+
+    import tempfile
+    from unittest.mock import AsyncMock
+
+    import voice_enhancer
+    from article_extractor import ExtractedArticle
+    from shared.database import OpenBlogDB
+
+    @test("Voice store: reused until enough new posts, then updated incrementally")
+    def test_voice_persona_store():
+        db = OpenBlogDB(str(Path(tempfile.mkdtemp()) / "voice.db"))
+        urls = [f"https://example.com/blog/post-{i}" for i in range(12)]
+        new_urls = [f"https://example.com/blog/new-{i}" for i in range(3)]
+        for url in urls + new_urls:  # Pre-extracted, so no HTTP fetches
+            voice_enhancer._cache_article(url, ExtractedArticle(title=url, text=f"{url} " * 200), ttl=60)
+        gemini = AsyncMock()
+        gemini.generate.side_effect = [{"voice_style": "first"}, {"voice_style": "updated"}]
+
+        def run(blog_urls):
+            return asyncio.run(voice_enhancer.enhance_for_domain(
+                VoicePersona(), blog_urls, "example.com", db=db, gemini_client=gemini,
+                sample_size=3, min_new_posts=3, verbose=False,
+            ))
+
+        first = run(urls)
+        assert (first.mode, first.persona.voice_style, first.ai_called) == ("full", "first", True)
+        assert run(urls).urls == first.urls  # Deterministic sample
+
+        reused = run(urls + new_urls[:2])
+        assert (reused.mode, reused.persona.voice_style, reused.ai_called) == ("stored", "first", False)
+
+        updated = run(urls + new_urls)
+        assert (updated.mode, updated.persona.voice_style) == ("incremental", "updated")
+        prompt = gemini.generate.call_args.kwargs["prompt"]
+        assert "Incremental Update" in prompt and "new-0" in prompt and "post-" not in prompt
+        assert set(updated.urls) == set(first.urls) | set(new_urls)
+        assert gemini.generate.call_count == 2
+
+    test_voice_persona_store()
+
+    @test("Voice enhancer: URL Context analyzes the caller's sampled URLs")
+    def test_voice_sampled_urls_passthrough():
+        sampled = ["https://example.com/blog/z", "https://example.com/blog/a"]
+        gemini = AsyncMock()
+        gemini.generate.return_value = {"voice_style": "x"}
+        asyncio.run(voice_enhancer.enhance_voice_persona(
+            VoicePersona(), sampled, gemini_client=gemini, sample_size=1, verbose=False, articles={},
+        ))
+        kwargs = gemini.generate.call_args.kwargs
+        assert kwargs["use_url_context"] is True
+        assert all(url in kwargs["prompt"] for url in sampled)
+
+    test_voice_sampled_urls_passthrough()
+
+    # =============================================================================
+    # Stage 1 Context Cache Tests (context_cache.py)
+    # =============================================================================
+
+    print("\n=== Testing Stage 1 Context Cache ===")
+
+    from context_cache import Stage1ContextCache, normalize_company_url, variant_key
+
+    def _context_cache(**ttl_hours):
+        return Stage1ContextCache(db=OpenBlogDB(str(Path(tempfile.mkdtemp()) / "cache.db")), ttl_hours=ttl_hours)
+
+    @test("Context cache: company URLs normalize to one key")
+    def test_context_cache_key():
+        keys = {normalize_company_url(u) for u in (
+            "https://www.Example.com/", "http://example.com", "example.com/", " www.example.com ",
+        )}
+        assert keys == {"example.com"}, keys
+        assert variant_key("Arbeitsrecht", ["b", "a"]) == variant_key("Arbeitsrecht", ["a", "b"])
+        assert variant_key("Arbeitsrecht", ["a"]) != variant_key("Mietrecht", ["a"])
+
+    test_context_cache_key()
+
+    @test("Context cache: fresh hits, expired, other-variant and refreshed components miss")
+    def test_context_cache_ttl():
+        cache = _context_cache(sitemap=0)
+        cache.store("https://www.example.com/", "company_context", {"company_name": "Example"})
+        cache.store("example.com", "sitemap", {"total_pages": 3})
+        cache.store("example.com", "legal_context", {"rechtsgebiet": "Arbeitsrecht"}, variant="arbeit")
+
+        snapshot = cache.load("http://example.com")
+        assert snapshot.get("company_context") == {"company_name": "Example"}
+        assert snapshot.get("sitemap") is None  # TTL 0 hours: expired on load
+        assert snapshot.get("legal_context", variant="arbeit") == {"rechtsgebiet": "Arbeitsrecht"}
+        assert snapshot.get("legal_context") is None
+        assert snapshot.hits == ["company_context", "legal_context"]
+
+        refreshed = cache.load("example.com", refresh=["company_context"])
+        assert refreshed.get("company_context") is None
+        assert cache.load("example.com", refresh=["all"]).get("legal_context", variant="arbeit") is None
+
+    test_context_cache_ttl()
+
+    @test("Context cache: invalidate selected or all components; unknown names raise")
+    def test_context_cache_invalidate():
+        cache = _context_cache()
+        for component in ("company_context", "voice_persona", "sitemap"):
+            cache.store("example.com", component, {"name": component})
+        cache.store("other.com", "sitemap", {"name": "other"})
+
+        assert cache.invalidate("www.example.com", ["sitemap"]) == 1
+        snapshot = cache.load("example.com")
+        assert snapshot.get("sitemap") is None and snapshot.get("voice_persona") == {"name": "voice_persona"}
+        assert cache.invalidate("example.com") == 2
+        assert cache.load("example.com").get("company_context") is None
+        assert cache.load("other.com").get("sitemap") == {"name": "other"}
+
+        for bad in (lambda: cache.store("example.com", "articles", {}),
+                    lambda: cache.load("example.com", refresh=["articles"])):
+            try:
+                bad()
+            except ValueError:
+                continue
+            raise AssertionError("unknown component accepted")
+
+    test_context_cache_invalidate()
+
 
 # =============================================================================
 # Integration Test - Full Stage 1 with hypofriend.de
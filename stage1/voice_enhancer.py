@@ -4,16 +4,29 @@ Voice Enhancer - Refine Voice Persona from Real Blog Content
 Analyzes actual blog content to enhance the initial voice_persona
 extracted by OpenContext, grounding it in real writing examples.
 
-Uses Gemini's URL Context tool to fetch blog content directly.
+Sampled posts are fetched concurrently over one pooled client and reduced
+to their main article text locally (article_extractor), so Gemini gets
+compact text in an ungrounded call. Falls back to Gemini's URL Context tool
+when no post could be extracted.
+
+enhance_for_domain() persists the enhanced persona per blog together with
+the posts it was derived from, reuses it until enough new posts appear, and
+then analyzes only the new posts against the stored persona.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
-import random
 import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+
+import httpx
+from httpx import Timeout, Limits
 
 # Fix Windows console encoding for Unicode characters
 if sys.platform == "win32":
@@ -29,6 +42,7 @@ if str(_parent) not in sys.path:
     sys.path.insert(0, str(_parent))
 
 from stage1_models import VoicePersona, LanguageStyle
+from article_extractor import MIN_ARTICLE_WORDS, ExtractedArticle, extract_article
 
 try:
     from shared.gemini_client import GeminiClient
@@ -39,19 +53,198 @@ except ImportError:
     load_prompt = None
     GEMINI_TIMEOUT_VOICE_ENHANCEMENT = 420  # 7 minutes fallback
 
+try:
+    from shared.database import OpenBlogDB
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Article fetching: concurrent requests, bytes read per post at most, and
+# how long extracted articles are reused (per URL, in this process)
+FETCH_CONCURRENCY = 8
+FETCH_MAX_BYTES = 2_000_000
+FETCH_TIMEOUT = 15.0
+ARTICLE_CACHE_TTL = 6 * 3600
+ARTICLE_CACHE_MAX_ENTRIES = 1000
+
+# Article text sent per post; longer posts keep their opening and closing
+MAX_ARTICLE_CHARS = 6000
+# Candidates tried per requested sample before giving up on extraction
+MAX_CANDIDATES_PER_SAMPLE = 3
+
+
+# =============================================================================
+# Article Fetching
+# =============================================================================
+
+# url -> (expires_at, article); shared by all jobs in the process
+_article_cache: "OrderedDict[str, Tuple[float, ExtractedArticle]]" = OrderedDict()
+
+
+def _cached_article(url: str) -> Optional[ExtractedArticle]:
+    entry = _article_cache.get(url)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _article_cache[url]
+        return None
+    _article_cache.move_to_end(url)
+    return entry[1]
+
+
+def _cache_article(url: str, article: ExtractedArticle, ttl: float):
+    if ttl <= 0:
+        return
+    _article_cache[url] = (time.monotonic() + ttl, article)
+    _article_cache.move_to_end(url)
+    while len(_article_cache) > ARTICLE_CACHE_MAX_ENTRIES:
+        _article_cache.popitem(last=False)
+
+
+async def fetch_blog_articles(
+    urls: List[str],
+    cache_ttl: float = ARTICLE_CACHE_TTL,
+) -> Dict[str, ExtractedArticle]:
+    """
+    Fetch blog posts and extract their main article text.
+
+    Posts are fetched concurrently over one pooled client (at most
+    FETCH_MAX_BYTES each) and extracted off the event loop. Only posts with
+    at least MIN_ARTICLE_WORDS of text are returned; those are cached per
+    URL for cache_ttl.
+
+    Args:
+        urls: Blog post URLs
+        cache_ttl: Seconds to reuse an extracted article (0 disables caching)
+
+    Returns:
+        Dict of url -> ExtractedArticle, for the posts that could be extracted
+    """
+    results = {}
+    pending = []
+    for url in urls:
+        article = _cached_article(url)
+        if article is not None:
+            results[url] = article
+        elif url not in pending:
+            pending.append(url)
+    if not pending:
+        return results
+
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch_article(client: httpx.AsyncClient, url: str) -> Optional[Tuple[str, ExtractedArticle]]:
+        async with semaphore:
+            try:
+                async with client.stream("GET", url) as response:
+                    if response.status_code != 200:
+                        return None
+                    content_type = response.headers.get("content-type", "")
+                    if content_type and "html" not in content_type.lower():
+                        return None
+
+                    chunks = []
+                    async for text in response.aiter_text():
+                        chunks.append(text)
+                        if response.num_bytes_downloaded >= FETCH_MAX_BYTES:
+                            break
+            except Exception as e:
+                logger.debug(f"Failed to fetch blog post {url}: {e}")
+                return None
+
+        article = await asyncio.to_thread(extract_article, "".join(chunks))
+        if article.word_count < MIN_ARTICLE_WORDS:
+            logger.debug(f"Too little article text in {url} ({article.word_count} words)")
+            return None
+        return url, article
+
+    async with httpx.AsyncClient(
+        timeout=Timeout(connect=5.0, read=FETCH_TIMEOUT, write=5.0, pool=FETCH_TIMEOUT),
+        follow_redirects=True,
+        limits=Limits(max_connections=FETCH_CONCURRENCY, max_keepalive_connections=FETCH_CONCURRENCY),
+    ) as client:
+        fetched = await asyncio.gather(*(fetch_article(client, url) for url in pending))
+
+    for result in fetched:
+        if result:
+            url, article = result
+            results[url] = article
+            _cache_article(url, article, cache_ttl)
+
+    logger.info(f"Extracted {len(results)}/{len(urls)} blog posts "
+                f"({len(urls) - len(pending)} cached)")
+    return results
+
+
+async def _sample_articles(
+    blog_urls: List[str],
+    sample_count: int,
+) -> Tuple[List[str], Dict[str, ExtractedArticle]]:
+    """
+    Sample blog posts that yield article text.
+
+    The sample is deterministic: posts are taken in URL hash order, so the
+    same blog gives the same sample (spread across its sections) and new
+    posts change it only where they sort in. Posts that cannot be fetched or
+    extracted are replaced by the next ones, trying up to
+    MAX_CANDIDATES_PER_SAMPLE candidates per sample.
+
+    Returns:
+        Tuple of (sampled_urls, articles). articles is empty when no post
+        could be extracted; sampled_urls then are the first candidates.
+    """
+    ordered = sorted(set(blog_urls), key=_url_digest)
+    candidates = ordered[:sample_count * MAX_CANDIDATES_PER_SAMPLE]
+    articles: Dict[str, ExtractedArticle] = {}
+    tried = 0
+    while len(articles) < sample_count and tried < len(candidates):
+        batch = candidates[tried:tried + sample_count - len(articles)]
+        tried += len(batch)
+        articles.update(await fetch_blog_articles(batch))
+
+    if not articles:
+        return candidates[:sample_count], {}
+    sampled_urls = [url for url in candidates if url in articles]
+    return sampled_urls, articles
+
+
+def _url_digest(url: str) -> str:
+    """Short stable digest of a URL (sample order, known-post sets)."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+
+
+def _content_hash(article: ExtractedArticle) -> str:
+    return hashlib.sha256(article.text.encode("utf-8")).hexdigest()[:16]
+
+
+def _format_article(index: int, url: str, article: ExtractedArticle) -> str:
+    """One article for the prompt, shortened to MAX_ARTICLE_CHARS (opening and closing kept)."""
+    text = article.text
+    if len(text) > MAX_ARTICLE_CHARS:
+        head = MAX_ARTICLE_CHARS * 3 // 4
+        tail = MAX_ARTICLE_CHARS - head
+        text = f"{text[:head].rstrip()}\n\n[...]\n\n{text[-tail:].lstrip()}"
+    return f"### Article {index}: {article.title or 'Untitled'}\nURL: {url}\n\n{text}"
+
 
 def _get_voice_enhancement_prompt(
     initial_persona: VoicePersona,
     blog_urls: List[str],
+    articles: Optional[Dict[str, ExtractedArticle]] = None,
+    incremental: bool = False,
 ) -> str:
     """
     Build the voice enhancement prompt.
 
     Args:
         initial_persona: Initial VoicePersona from OpenContext
-        blog_urls: List of blog URLs to analyze (1-3 URLs)
+        blog_urls: List of blog URLs to analyze
+        articles: Extracted article per URL; without it Gemini is asked to
+            fetch the URLs with URL Context
+        incremental: initial_persona is a stored enhanced persona and the
+            articles are new posts to fold into it
 
     Returns:
         Formatted prompt string
@@ -62,28 +255,60 @@ def _get_voice_enhancement_prompt(
     # Format blog URLs as numbered list
     urls_list = "\n".join(f"{i+1}. {url}" for i, url in enumerate(blog_urls))
 
+    if articles:
+        blog_articles = (
+            "The main text of each article, extracted from the page "
+            "(headings as \"## \" lines, list items as \"- \" lines; "
+            "\"[...]\" marks an omitted middle part):\n\n"
+            + "\n\n".join(
+                _format_article(i, url, articles[url])
+                for i, url in enumerate(blog_urls, 1) if url in articles
+            )
+        )
+    else:
+        blog_articles = (
+            "Use the URL Context tool to fetch and analyze each of these blog articles:\n\n"
+            + urls_list
+        )
+
+    prompt = None
     if load_prompt is not None:
         try:
-            return load_prompt(
+            prompt = load_prompt(
                 "stage1",
                 "voice_enhancement",
                 initial_voice_persona=persona_json,
                 blog_urls=urls_list,
+                blog_articles=blog_articles,
             )
         except FileNotFoundError:
             logger.warning("voice_enhancement.txt not found, using fallback prompt")
 
-    # Fallback prompt
-    return f"""Analyze these blog articles to refine the voice persona.
+    if prompt is None:
+        # Fallback prompt
+        prompt = f"""Analyze these blog articles to refine the voice persona.
 
 Initial Voice Persona:
 {persona_json}
 
-Blog Articles to Analyze (use URL Context tool to fetch each):
-{urls_list}
+Blog Articles to Analyze:
+{blog_articles}
 
 Return an enhanced voice_persona JSON with concrete examples from real content."""
 
+    if incremental:
+        prompt += """
+
+## Incremental Update
+
+The initial voice persona above was already refined from earlier articles of
+this blog; the articles to analyze are new posts. Keep everything they do not
+contradict, add real phrases and patterns they show, and change existing
+fields only where the new posts consistently differ. Return the complete
+persona, not only the changes."""
+
+    return prompt
+
 
 def _print_article_analysis(article_analysis: List[Dict[str, Any]]) -> None:
     """
@@ -250,12 +475,16 @@ async def enhance_voice_persona(
     api_key: Optional[str] = None,
     sample_size: int = 3,
     verbose: bool = True,
+    articles: Optional[Dict[str, ExtractedArticle]] = None,
+    incremental: bool = False,
 ) -> VoicePersona:
     """
     Enhance voice persona by analyzing real blog content.
 
-    Uses Gemini's URL Context tool to fetch and analyze blog articles,
-    then refines the initial voice_persona with concrete examples.
+    Fetches the sampled articles and extracts their main text locally, then
+    refines the initial voice_persona with concrete examples in an
+    ungrounded Gemini call. If no article text could be extracted, Gemini's
+    URL Context tool fetches the articles instead.
 
     Args:
         initial_persona: Initial VoicePersona from OpenContext
@@ -264,6 +493,12 @@ async def enhance_voice_persona(
         api_key: Gemini API key (only used if gemini_client not provided)
         sample_size: Number of blog posts to sample (default: 3)
         verbose: Print detailed extraction results to console (default: True)
+        articles: Already extracted articles of a sample the caller took;
+            blog_urls are then the sampled posts and are analyzed as given
+            (no sampling or fetching; an empty dict analyzes them through
+            URL Context)
+        incremental: initial_persona is a stored enhanced persona to update
+            with new posts (see enhance_for_domain)
 
     Returns:
         Enhanced VoicePersona with real examples
@@ -275,20 +510,29 @@ async def enhance_voice_persona(
         logger.warning("No blog URLs provided for voice enhancement")
         return initial_persona
 
-    # Sample URLs - prefer random selection
-    sample_count = min(sample_size, len(blog_urls))
-    sampled_urls = random.sample(blog_urls, sample_count)
+    if articles is None:
+        # Sample URLs - deterministic, replacing posts without article text
+        sampled_urls, articles = await _sample_articles(blog_urls, min(sample_size, len(blog_urls)))
+    else:
+        # Caller's sample: the posts with text, or all of them for URL Context
+        sampled_urls = [url for url in blog_urls if url in articles] or list(blog_urls)
+    use_url_context = not articles
 
-    logger.info(f"Enhancing voice persona using {sample_count} blog URLs")
+    logger.info(f"Enhancing voice persona using {len(sampled_urls)} blog URLs "
+                f"({'URL Context' if use_url_context else 'extracted text'})")
 
     if verbose:
         print("\n" + "=" * 80)
         print("[VOICE ENHANCEMENT] Analyzing blog content")
         print("=" * 80)
-        print(f"\nAnalyzing {sample_count} blog articles:")
+        print(f"\nAnalyzing {len(sampled_urls)} blog articles:")
         for i, url in enumerate(sampled_urls, 1):
-            print(f"   {i}. {url}")
-        print("\nFetching and analyzing content with Gemini...")
+            words = f" ({articles[url].word_count} words)" if url in articles else ""
+            print(f"   {i}. {url}{words}")
+        if use_url_context:
+            print("\nNo article text extracted, fetching and analyzing content with Gemini URL Context...")
+        else:
+            print("\nAnalyzing extracted article text with Gemini...")
 
     # Create client if not provided
     if gemini_client is None:
@@ -297,14 +541,15 @@ async def enhance_voice_persona(
         gemini_client = GeminiClient(api_key=api_key)
 
     # Build prompt
-    prompt = _get_voice_enhancement_prompt(initial_persona, sampled_urls)
+    prompt = _get_voice_enhancement_prompt(initial_persona, sampled_urls, articles, incremental=incremental)
 
-    # Call Gemini with URL Context (to fetch blog content)
-    # Voice enhancement needs extra time - it fetches multiple blog URLs and does deep analysis
+    # Article text is in the prompt, so the call is ungrounded; URL Context
+    # (Gemini fetches the posts itself) only when nothing could be extracted.
+    # Voice enhancement needs extra time - it analyzes multiple articles in depth
     result = await gemini_client.generate(
         prompt=prompt,
-        use_url_context=True,
-        use_google_search=False,  # Don't need search, just URL Context
+        use_url_context=use_url_context,
+        use_google_search=False,  # Don't need search
         json_output=True,
         temperature=0.3,
         max_tokens=16384,  # Need more tokens for detailed analysis
@@ -364,7 +609,7 @@ async def sample_and_enhance(
 
     Convenience function that handles the full flow:
     1. Check if enough blog URLs are available
-    2. Sample URLs
+    2. Sample URLs and extract their article text
     3. Enhance voice persona
     4. Return results with metadata
 
@@ -388,9 +633,9 @@ async def sample_and_enhance(
         )
         return initial_persona, [], False
 
-    # Sample URLs
+    # Sample URLs (posts without extractable text are replaced by others)
     sample_count = min(sample_size, len(blog_urls))
-    sampled_urls = random.sample(blog_urls, sample_count)
+    sampled_urls, articles = await _sample_articles(blog_urls, sample_count)
 
     try:
         enhanced = await enhance_voice_persona(
@@ -400,6 +645,7 @@ async def sample_and_enhance(
             api_key=api_key,
             sample_size=sample_size,
             verbose=verbose,
+            articles=articles,
         )
         return enhanced, sampled_urls, True
 
@@ -414,6 +660,199 @@ async def sample_and_enhance(
         return initial_persona, sampled_urls, False
 
 
+# =============================================================================
+# Persona Store
+# =============================================================================
+
+@dataclass
+class VoiceEnhancement:
+    """Outcome of enhance_for_domain."""
+    persona: VoicePersona
+    urls: List[str] = field(default_factory=list)  # Posts the persona is grounded in
+    enhanced: bool = False  # persona is grounded in blog content
+    ai_called: bool = False
+    mode: str = "skipped"  # skipped, stored, incremental or full
+
+
+def post_fingerprint(posts: Dict[str, str]) -> str:
+    """Fingerprint of analyzed posts ({url: content_hash}, order-insensitive)."""
+    lines = sorted(f"{url} {content_hash}" for url, content_hash in posts.items())
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+def _open_db() -> Optional["OpenBlogDB"]:
+    if not DB_AVAILABLE:
+        return None
+    try:
+        return OpenBlogDB()
+    except Exception as e:
+        logger.warning(f"Voice persona store unavailable: {e}")
+        return None
+
+
+async def _load_persona(db: Optional["OpenBlogDB"], domain: str) -> Optional[Dict[str, Any]]:
+    """Stored persona record of a blog (errors are logged, not raised)."""
+    if db is None or not domain:
+        return None
+    try:
+        stored = await asyncio.to_thread(db.get_voice_persona, domain)
+        if stored:
+            stored["persona"] = VoicePersona(**stored["persona"])
+        return stored
+    except Exception as e:
+        logger.warning(f"Failed to load stored voice persona for {domain}: {e}")
+        return None
+
+
+async def _store_persona(
+    db: Optional["OpenBlogDB"],
+    domain: str,
+    persona: VoicePersona,
+    posts: Dict[str, str],
+    blog_urls: List[str],
+):
+    """Persist a persona with its analyzed posts and the blog URLs seen now."""
+    if db is None or not domain:
+        return
+    known_urls = sorted({_url_digest(url) for url in blog_urls})
+    try:
+        await asyncio.to_thread(
+            db.store_voice_persona, domain, persona.model_dump(), posts, known_urls, post_fingerprint(posts),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store voice persona for {domain}: {e}")
+
+
+async def enhance_for_domain(
+    initial_persona: VoicePersona,
+    blog_urls: List[str],
+    domain: str,
+    db: Optional["OpenBlogDB"] = None,
+    gemini_client: Optional[GeminiClient] = None,
+    api_key: Optional[str] = None,
+    sample_size: int = 3,
+    min_blogs_required: int = 3,
+    min_new_posts: int = 5,
+    incremental: bool = True,
+    refresh: bool = False,
+    verbose: bool = True,
+) -> VoiceEnhancement:
+    """
+    Enhance the voice persona of a blog, reusing the stored one while current.
+
+    - No stored persona (or refresh): full analysis of a deterministic sample
+    - Fewer than min_new_posts blog URLs unseen at the last analysis: the
+      stored persona is reused (no fetches, no AI call)
+    - Otherwise with incremental: only new posts are sampled and analyzed
+      against the stored persona; without: full analysis
+
+    A full analysis whose sample has the stored fingerprint (same posts and
+    content) reuses the stored persona as well. Enhanced personas are stored
+    with {url: content_hash} of their posts and the digests of all blog URLs.
+
+    Args:
+        initial_persona: Initial VoicePersona from OpenContext
+        blog_urls: List of all available blog URLs
+        domain: Store key of the blog (e.g. "example.com"; empty disables the store)
+        db: Database for the persona store (default: OpenBlogDB())
+        gemini_client: Optional existing GeminiClient instance
+        api_key: Gemini API key (only used if gemini_client not provided)
+        sample_size: Number of blog posts to sample (default: 3)
+        min_blogs_required: Minimum blogs needed to trigger enhancement (default: 3)
+        min_new_posts: New blog URLs needed before the stored persona is updated (default: 5)
+        incremental: Update with new posts only instead of a full re-analysis (default: True)
+        refresh: Ignore the stored persona (default: False)
+        verbose: Print detailed extraction results to console (default: True)
+
+    Returns:
+        VoiceEnhancement (persona, grounding URLs, whether enhanced, whether
+        Gemini was called, mode)
+    """
+    if len(blog_urls) < min_blogs_required:
+        logger.info(
+            f"Not enough blog URLs for voice enhancement "
+            f"({len(blog_urls)} < {min_blogs_required}), skipping"
+        )
+        return VoiceEnhancement(persona=initial_persona)
+
+    if db is None and domain:
+        db = _open_db()
+    stored = None if refresh else await _load_persona(db, domain)
+
+    if stored:
+        stored_persona = stored["persona"]
+        stored_posts = stored["posts"]
+        known = set(stored["known_urls"])
+        new_urls = [url for url in blog_urls if _url_digest(url) not in known]
+        reuse = VoiceEnhancement(persona=stored_persona, urls=list(stored_posts), enhanced=True, mode="stored")
+
+        if len(new_urls) < min_new_posts:
+            logger.info(f"Using stored voice persona for {domain} ({len(new_urls)} new posts)")
+            return reuse
+
+        if incremental:
+            sampled_urls, articles = await _sample_articles(new_urls, min(sample_size, len(new_urls)))
+            if not articles:
+                # Nothing readable among the new posts; don't retry them on every run
+                logger.info(f"No article text in {len(new_urls)} new posts of {domain}, keeping stored persona")
+                await _store_persona(db, domain, stored_persona, stored_posts, blog_urls)
+                return reuse
+
+            logger.info(f"Updating stored voice persona for {domain} with {len(sampled_urls)} "
+                        f"of {len(new_urls)} new posts")
+            try:
+                enhanced = await enhance_voice_persona(
+                    initial_persona=stored_persona,
+                    blog_urls=sampled_urls,
+                    gemini_client=gemini_client,
+                    api_key=api_key,
+                    sample_size=sample_size,
+                    verbose=verbose,
+                    articles=articles,
+                    incremental=True,
+                )
+            except Exception as e:
+                logger.warning(f"Incremental voice enhancement failed, keeping stored persona: {e}")
+                return reuse
+            if enhanced is stored_persona:  # Unparseable response
+                return reuse
+
+            posts = {**stored_posts, **{url: _content_hash(articles[url]) for url in sampled_urls}}
+            await _store_persona(db, domain, enhanced, posts, blog_urls)
+            return VoiceEnhancement(persona=enhanced, urls=list(posts), enhanced=True,
+                                    ai_called=True, mode="incremental")
+
+    # Full analysis
+    sampled_urls, articles = await _sample_articles(blog_urls, min(sample_size, len(blog_urls)))
+    # URL Context analyses (nothing extracted) are recorded without content hashes
+    posts = {url: _content_hash(articles[url]) if url in articles else "" for url in sampled_urls}
+    if stored and post_fingerprint(posts) == stored["fingerprint"]:
+        logger.info(f"Blog posts of {domain} unchanged since the stored voice persona, reusing it")
+        await _store_persona(db, domain, stored["persona"], stored["posts"], blog_urls)
+        return VoiceEnhancement(persona=stored["persona"], urls=list(stored["posts"]), enhanced=True, mode="stored")
+
+    try:
+        enhanced = await enhance_voice_persona(
+            initial_persona=initial_persona,
+            blog_urls=sampled_urls,
+            gemini_client=gemini_client,
+            api_key=api_key,
+            sample_size=sample_size,
+            verbose=verbose,
+            articles=articles,
+        )
+    except Exception as e:
+        logger.warning(f"Voice enhancement failed: {e}")
+        logger.warning("Continuing with initial voice persona")
+        return VoiceEnhancement(persona=initial_persona, urls=sampled_urls, mode="full")
+
+    was_enhanced = enhanced is not initial_persona  # Unparseable responses return the initial persona
+    if was_enhanced:
+        await _store_persona(db, domain, enhanced, posts, blog_urls)
+    return VoiceEnhancement(persona=enhanced, urls=sampled_urls, enhanced=was_enhanced,
+                            ai_called=True, mode="full")
+
+
 # =============================================================================
 # CLI for standalone testing
 # =============================================================================
@@ -6,6 +6,8 @@ Uses the dedicated Imagen API for image generation.
 
 import asyncio
 import hashlib
+import importlib.util
+import io
 import logging
 import os
 from pathlib import Path
@@ -13,14 +15,19 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-# Try to import PIL for image processing
+# PIL is optional (WebP conversion) and only imported when an image is saved
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+try:
+    from shared.usage_tracker import record_image
+except ImportError:
+    def record_image() -> None:
+        pass
+
 try:
-    from PIL import Image as PILImage
-    import io
-    PIL_AVAILABLE = True
+    from shared.gemini_client import get_genai_client
 except ImportError:
-    PIL_AVAILABLE = False
-    PILImage = None
+    get_genai_client = None
 
 # Image generation model
 MODEL = "imagen-4.0-generate-001"
@@ -58,10 +65,10 @@ async def generate_image(
         from google import genai
         from google.genai import types
 
-        client = genai.Client(api_key=api_key)
+        # Shared client when available; async call so job cancellation aborts it
+        client = get_genai_client(api_key) if get_genai_client else genai.Client(api_key=api_key)
 
-        response = await asyncio.to_thread(
-            client.models.generate_images,
+        response = await client.aio.models.generate_images(
             model=MODEL,
             prompt=prompt,
             config=types.GenerateImagesConfig(number_of_images=1),
@@ -87,6 +94,7 @@ async def generate_image(
             logger.error("No image_bytes in image data")
             return None
 
+        record_image()
         return _save_image(image_bytes, prompt, output_dir)
 
     except Exception as e:
@@ -135,6 +143,7 @@ def _save_image(image_bytes: bytes, prompt: str, output_dir: Optional[str]) -> O
         if PIL_AVAILABLE:
             webp_path = out_path / f"image_{prompt_hash}.webp"
             try:
+                from PIL import Image as PILImage
                 # Use context manager for proper resource cleanup
                 with PILImage.open(io.BytesIO(image_bytes)) as img:
                     img.save(str(webp_path), format='WEBP', quality=85)
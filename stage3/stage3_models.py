@@ -65,3 +65,4 @@ class Stage3Output(BaseModel):
     fixes: List[QualityFix] = Field(default_factory=list, description="List of fixes made")
     ai_calls: int = Field(default=0, description="Number of AI calls made")
     skipped: bool = Field(default=False, description="True if stage was skipped")
+    budget_limited: bool = Field(default=False, description="True if iterations were cut short by the budget")
@@ -45,6 +45,11 @@ except ImportError as e:
     GeminiClient = None
     iter_content_fields = None
 
+try:
+    from shared.budget import allow_optional
+except ImportError:
+    allow_optional = None
+
 # Get logger (configuration done in main() for CLI usage)
 logger = logging.getLogger(__name__)
 
@@ -210,10 +215,16 @@ class QualityFixer:
         fixes_applied_total = 0
         all_fixes = []
         ai_calls = 0
+        budget_limited = False
 
         # Loop up to 3 times for iterative self-critique (Anti-AI bypass)
         MAX_ITERATIONS = 2
         for iteration in range(MAX_ITERATIONS):
+            # Later iterations are optional: skip them when the job/article budget runs low
+            if iteration > 0 and allow_optional is not None and not allow_optional("stage3_iteration"):
+                budget_limited = True
+                break
+
             logger.info(f"  Stage 3 Iteration {iteration + 1}/{MAX_ITERATIONS} (Anti-AI Self-Critique)")
             
             # Build content for Gemini review
@@ -252,6 +263,7 @@ class QualityFixer:
             fixes_applied=fixes_applied_total,
             fixes=all_fixes,
             ai_calls=ai_calls,
+            budget_limited=budget_limited,
         )
 
     def _extract_content(self, article: Dict[str, Any]) -> str:
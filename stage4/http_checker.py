@@ -14,6 +14,11 @@ from dataclasses import dataclass
 
 import httpx
 
+try:
+    from shared.metrics import HTTP_CHECK_SECONDS, HTTP_CHECKS
+except ImportError:
+    HTTP_CHECK_SECONDS = HTTP_CHECKS = None
+
 logger = logging.getLogger(__name__)
 
 # Default timeout can be overridden via environment variable
@@ -99,7 +104,13 @@ class HTTPChecker:
     async def _check_single(self, url: str) -> HTTPCheckResult:
         """Check a single URL with semaphore for rate limiting."""
         async with self._semaphore:
-            return await self._do_check(url)
+            result = await self._do_check(url)
+        if HTTP_CHECKS is not None:
+            outcome = "alive" if result.is_alive else "dead"
+            HTTP_CHECKS.inc(result=outcome)
+            if result.response_time_ms is not None:
+                HTTP_CHECK_SECONDS.observe(result.response_time_ms / 1000, result=outcome)
+        return result
 
     async def _do_check(self, url: str) -> HTTPCheckResult:
         """
@@ -0,0 +1,320 @@
+"""
+Tests for the API's in-process job machinery and article file serving.
+
+Jobs are stand-in coroutines and stores; no pipeline, network or Gemini access needed.
+
+Run: python -m pytest -q test_api.py
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Job records go to a scratch database, not data/openblog.db
+os.environ.setdefault("OPENBLOG_DB_PATH", str(Path(tempfile.mkdtemp()) / "test_api.db"))
+
+import api
+from api import JobEventBroker
+
+
+async def _collect(iterator, limit: int = 100) -> list:
+    items = []
+    async for item in iterator:
+        items.append(item)
+        if len(items) >= limit:
+            break
+    return items
+
+
+# =============================================================================
+# Job progress events
+# =============================================================================
+
+class TestJobEventBroker:
+    @pytest.mark.asyncio
+    async def test_replays_history_after_last_event_id(self):
+        broker = JobEventBroker()
+        broker.open("job")
+        for name in ("job_started", "article_started", "article_completed"):
+            broker.publish("job", {"event": name})
+        broker.close("job")
+
+        events = await _collect(broker.subscribe("job", after=1))
+        assert [(e["id"], e["event"]) for e in events] == [(2, "article_started"), (3, "article_completed")]
+
+    @pytest.mark.asyncio
+    async def test_live_subscriber_gets_each_event_once_then_ends(self):
+        broker = JobEventBroker()
+        broker.open("job")
+        broker.publish("job", {"event": "job_started"})
+        subscriber = asyncio.create_task(_collect(broker.subscribe("job")))
+        await asyncio.sleep(0)
+        broker.publish("job", {"event": "article_started"})
+        broker.close("job")
+        broker.publish("job", {"event": "ignored_after_close"})
+
+        events = await asyncio.wait_for(subscriber, timeout=1)
+        assert [e["id"] for e in events] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_idle_subscriber_gets_keepalives(self):
+        broker = JobEventBroker()
+        broker.open("job")
+        items = await _collect(broker.subscribe("job", keepalive=0.01), limit=2)
+        assert items == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_unknown_and_evicted_jobs_have_no_events(self):
+        broker = JobEventBroker(history=2, keep_finished=1)
+        for job_id in ("old", "new"):
+            broker.open(job_id)
+            for i in range(3):
+                broker.publish(job_id, {"event": f"e{i}"})
+            broker.close(job_id)
+
+        assert not broker.knows("old")
+        assert await _collect(broker.subscribe("old")) == []
+        assert await _collect(broker.subscribe("missing")) == []
+        assert [e["id"] for e in await _collect(broker.subscribe("new"))] == [2, 3]
+
+
+class RecordingJobStore:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, job_id, **kwargs):
+        self.updates.append(kwargs["progress"].copy())
+
+
+class TestProgressListener:
+    def test_coalesces_start_events_but_stores_completions(self, monkeypatch):
+        store = RecordingJobStore()
+        monkeypatch.setattr(api, "job_store", store)
+        monkeypatch.setattr(api, "job_events", JobEventBroker())
+        on_event = api._job_progress_listener("job", articles_total=2)
+
+        on_event({"event": "stage_completed", "stage": "stage1", "articles_total": 3, "timestamp": 0.0})
+        for article in (1, 2, 3):
+            on_event({"event": "article_started", "article": article, "timestamp": 1.0})
+            on_event({"event": "stage_started", "article": article, "stage": "stage2", "timestamp": 1.0})
+        assert len(store.updates) == 1  # Starts within PROGRESS_WRITE_INTERVAL are not written
+
+        on_event({"event": "article_completed", "article": 1, "timestamp": 11.0})
+        on_event({"event": "article_failed", "article": 2, "timestamp": 21.0})
+        progress = store.updates[-1]
+        assert len(store.updates) == 3
+        assert (progress["articles_total"], progress["articles_completed"], progress["articles_failed"]) == (3, 1, 1)
+        assert progress["current_stages"] == {"3": "stage2"}
+        assert progress["eta_seconds"] == 10.0
+
+
+# =============================================================================
+# Job worker pool
+# =============================================================================
+
+class GatedRunner:
+    """Stand-in job runner: each job runs until its gate is opened."""
+
+    def __init__(self):
+        self.gates = {}
+        self.started = []
+        self.finished = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, job_id, request):
+        self.started.append(job_id)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.gates.setdefault(job_id, asyncio.Event()).wait()
+            self.finished.append(job_id)
+        finally:
+            self.running -= 1
+
+    def release(self, job_id):
+        self.gates.setdefault(job_id, asyncio.Event()).set()
+
+
+async def _settle():
+    """Let workers pick up and finish jobs (several task hand-offs each)."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestJobWorkerPool:
+    @pytest.mark.asyncio
+    async def test_runs_max_workers_jobs_in_submission_order(self):
+        runner = GatedRunner()
+        pool = api.JobWorkerPool(runner, max_workers=2, max_queued=5)
+        positions = [pool.submit(job_id, None) for job_id in ("a", "b", "c", "d")]
+        assert positions == [1, 2, 3, 4]
+
+        await _settle()
+        assert runner.started == ["a", "b"]
+        assert (pool.running, pool.queued, pool.position("d")) == (2, 2, 2)
+
+        runner.release("a")
+        await _settle()
+        assert runner.started == ["a", "b", "c"]
+        for job_id in ("b", "c", "d"):
+            runner.release(job_id)
+        await _settle()
+        assert runner.finished == ["a", "b", "c", "d"]
+        assert runner.peak == 2 and pool.running == 0 and pool.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_retry_after(self):
+        runner = GatedRunner()
+        pool = api.JobWorkerPool(runner, max_workers=2, max_queued=1)
+        pool.submit("a", None)
+        await _settle()
+        pool.submit("b", None)
+        await _settle()
+        pool.submit("c", None)
+        assert pool.is_full
+
+        with pytest.raises(api.QueueFullError) as rejected:
+            pool.submit("d", None)
+        assert rejected.value.retry_after == 150  # 300 s default job duration / 2 workers
+
+        pool._durations.extend([10.0, 30.0])
+        assert pool.retry_after() == 10
+        for job_id in ("a", "b", "c"):
+            runner.release(job_id)
+        await _settle()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job_never_starts(self):
+        runner = GatedRunner()
+        pool = api.JobWorkerPool(runner, max_workers=1, max_queued=5)
+        for job_id in ("a", "b", "c"):
+            pool.submit(job_id, None)
+        await _settle()
+
+        assert await pool.cancel("b") == "queued"
+        assert pool.position("c") == 1
+        runner.release("a")
+        runner.release("c")
+        await _settle()
+        assert runner.started == ["a", "c"]
+        assert await pool.cancel("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job_frees_its_worker(self):
+        runner = GatedRunner()
+        pool = api.JobWorkerPool(runner, max_workers=1, max_queued=5)
+        pool.submit("a", None)
+        pool.submit("b", None)
+        await _settle()
+
+        assert await pool.cancel("a", timeout=1) == "running"
+        await _settle()
+        assert runner.started == ["a", "b"] and "a" not in runner.finished
+        assert pool.running == 1 and pool.queued == 0
+        runner.release("b")
+        await _settle()
+        assert runner.finished == ["b"] and pool.running == 0
+
+    def test_limits_must_be_positive(self):
+        with pytest.raises(ValueError):
+            api.JobWorkerPool(GatedRunner(), max_workers=0)
+        with pytest.raises(ValueError):
+            api.JobWorkerPool(GatedRunner(), max_queued=0)
+
+
+# =============================================================================
+# Article file serving
+# =============================================================================
+
+class CompletedJobStore:
+    """Stand-in job store holding one completed job with exported files."""
+
+    def __init__(self, job_id, exported_files):
+        self.job_id = job_id
+        self.result = {"results": [{"keyword": "zinsen", "slug": "zinsen", "exported_files": exported_files,
+                                    "article": {"Headline": "Zinsen"}}]}
+
+    def get(self, job_id):
+        if job_id == self.job_id:
+            return {"job_id": job_id, "status": api.JobStatus.COMPLETED.value, "has_result": True,
+                    "created_at": "now", "updated_at": "now"}
+        return None
+
+    def get_result(self, job_id):
+        return self.result if job_id == self.job_id else None
+
+
+class TestArticleFiles:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        monkeypatch.chdir(tmp_path)
+        folder = tmp_path / "output" / "001"
+        folder.mkdir(parents=True)
+        (folder / "zinsen.html").write_text("<p>Die Bauzinsen sind gestiegen.</p>" * 100, encoding="utf-8")
+        (folder / "zinsen.pdf").write_bytes(bytes(range(256)) * 8)
+        job_id = "3f2c1e9a-8d41-4b7a-9c55-0e6f1a2b3c4d"
+        monkeypatch.setattr(api, "job_store", CompletedJobStore(job_id, {
+            "html": str(folder / "zinsen.html"), "pdf": str(folder / "zinsen.pdf"),
+        }))
+        monkeypatch.setattr(api, "artifact_cache", api.ArtifactCache(max_bytes=1024 * 1024))
+        monkeypatch.setattr(api, "_article_indexes", api.OrderedDict())
+        return TestClient(api.app), f"/api/v1/jobs/{job_id}/articles/zinsen"
+
+    def test_html_is_compressed_and_revalidates(self, client):
+        client, base = client
+        response = client.get(f"{base}/html", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.text.startswith("<p>Die Bauzinsen")
+
+        etag = response.headers["etag"]
+        cached = client.get(f"{base}/html", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert cached.status_code == 304
+        identity = client.get(f"{base}/html", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+        assert identity.status_code == 200 and "content-encoding" not in identity.headers
+
+    def test_pdf_serves_byte_ranges(self, client):
+        client, base = client
+        response = client.get(f"{base}/files/pdf", headers={"Range": "bytes=256-511"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 256-511/2048"
+        assert response.content == bytes(range(256))
+
+        etag = client.get(f"{base}/files/pdf").headers["etag"]
+        assert client.get(f"{base}/files/pdf", headers={"If-None-Match": etag}).status_code == 304
+
+
+# =============================================================================
+# Job results
+# =============================================================================
+
+class TestJobResultSitemap:
+    def test_sitemap_is_compact_unless_expanded(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        monkeypatch.syspath_prepend(str(Path(__file__).parent / "stage1"))
+        from stage1_models import SitemapData
+
+        sitemap = SitemapData(
+            total_pages=2, blog_urls=["https://example.com/blog/a"], tool_urls=["https://example.com/rechner"],
+        )
+        job_id = "3f2c1e9a-8d41-4b7a-9c55-0e6f1a2b3c4d"
+        store = CompletedJobStore(job_id, {})
+        store.result = {"job_id": job_id, "context": {"job_id": job_id, "sitemap": sitemap.compact_dump()}}
+        monkeypatch.setattr(api, "job_store", store)
+        client = TestClient(api.app)
+
+        compact = client.get(f"/api/v1/jobs/{job_id}").json()["result"]["context"]["sitemap"]
+        assert "blog_urls" not in compact and compact["url_origin"] == "https://example.com"
+
+        expanded = client.get(f"/api/v1/jobs/{job_id}", params={"expand_urls": "true"}).json()["result"]
+        assert expanded["context"]["sitemap"]["blog_urls"] == ["https://example.com/blog/a"]
+        assert expanded["context"]["sitemap"]["tool_urls"] == ["https://example.com/rechner"]
+        assert "url_paths" not in expanded["context"]["sitemap"]
@@ -0,0 +1,177 @@
+"""
+Tests for the multi-company batch runner.
+
+run_pipeline is replaced by a stand-in coroutine; no network or Gemini
+access needed.
+
+Run: python -m pytest -q test_run_batch.py
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+import run_batch
+from run_batch import BatchRunner, build_pipeline_kwargs, iter_jobs
+from shared.budget import Budget
+
+
+def _write_jobs(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+# =============================================================================
+# Job parsing
+# =============================================================================
+
+class TestIterJobs:
+    def test_skips_blank_and_comment_lines_and_flags_bad_json(self, tmp_path):
+        path = _write_jobs(tmp_path / "jobs.jsonl", [
+            '{"company_url": "https://a.example", "keywords": ["eins"]}',
+            "",
+            "# Kommentar",
+            "{not json",
+            '["https://b.example"]',
+            '  {"company_url": "https://c.example", "keywords": ["drei"], "id": "c"}  ',
+        ])
+        jobs = list(iter_jobs(path))
+        assert [number for number, _ in jobs] == [1, 4, 5, 6]
+        assert jobs[0][1]["company_url"] == "https://a.example"
+        assert jobs[1][1]["_error"].startswith("Invalid JSON")
+        assert "JSON object" in jobs[2][1]["_error"]
+        assert jobs[3][1]["id"] == "c"
+
+
+class TestBuildPipelineKwargs:
+    def test_maps_options_to_run_pipeline_arguments(self):
+        kwargs = build_pipeline_kwargs({
+            "company_url": "https://example.com",
+            "keywords": ["Kündigung Schriftform"],
+            "options": {
+                "language": "de", "max_parallel": 2, "refresh_context": ["sitemap"],
+                "budget": {"max_tokens": 50000}, "article_budget": {"max_ai_calls": 8},
+            },
+        })
+        assert kwargs["company_url"] == "https://example.com"
+        assert kwargs["keywords"] == ["Kündigung Schriftform"]
+        assert (kwargs["language"], kwargs["max_parallel"], kwargs["refresh_context"]) == ("de", 2, ["sitemap"])
+        assert kwargs["budget"] == Budget(max_tokens=50000)
+        assert kwargs["article_budget"] == Budget(max_ai_calls=8)
+        assert set(kwargs) - {"company_url", "keywords"} <= run_batch.JOB_OPTIONS
+
+    def test_legal_research_detects_rechtsgebiet(self):
+        kwargs = build_pipeline_kwargs({
+            "company_url": "https://kanzlei.example",
+            "keywords": ["Kündigungsschutzklage Frist"],
+            "options": {"enable_legal_research": True},
+        })
+        assert kwargs["rechtsgebiet"] == run_batch._detect_rechtsgebiet(["Kündigungsschutzklage Frist"])
+        explicit = build_pipeline_kwargs({
+            "company_url": "https://kanzlei.example", "keywords": ["x"],
+            "options": {"enable_legal_research": True, "rechtsgebiet": "Mietrecht"},
+        })
+        assert explicit["rechtsgebiet"] == "Mietrecht"
+
+    @pytest.mark.parametrize("job, message", [
+        ({"keywords": ["x"]}, "company_url is required"),
+        ({"company_url": 42, "keywords": ["x"]}, "company_url is required"),
+        ({"company_url": "https://example.com"}, "keywords must be a non-empty list"),
+        ({"company_url": "https://example.com", "keywords": "x"}, "keywords must be a non-empty list"),
+        ({"company_url": "https://example.com", "keywords": ["x"], "options": {"output_dir": "/tmp"}},
+         "Unknown options: ['output_dir']"),
+    ])
+    def test_invalid_jobs_raise(self, job, message):
+        with pytest.raises(ValueError, match=re.escape(message)):
+            build_pipeline_kwargs(job)
+
+
+# =============================================================================
+# Batch runner
+# =============================================================================
+
+class StubPipeline:
+    """Stand-in for run_pipeline(): records calls and concurrency, fails on request."""
+
+    def __init__(self):
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, keywords, company_url, output_dir=None, article_slots=None, **options):
+        self.calls.append({"company_url": company_url, "output_dir": output_dir,
+                           "article_slots": article_slots, **options})
+        job_id = f"job-{len(self.calls)}"
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            if "fail" in company_url:
+                raise RuntimeError("Stage 1 failed")
+            return {
+                "job_id": job_id,
+                "company": company_url,
+                "articles_total": len(keywords),
+                "articles_successful": len(keywords),
+                "articles_failed": 0,
+                "budget": {"job": {"usage": {"ai_calls": 3}}, "degradations": 0},
+            }
+        finally:
+            self.running -= 1
+
+
+class TestBatchRunner:
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        stub = StubPipeline()
+        monkeypatch.setattr(run_batch, "run_pipeline", stub)
+        return stub
+
+    def _run(self, tmp_path, lines, **limits):
+        jobs = _write_jobs(tmp_path / "jobs.jsonl", lines)
+        results = tmp_path / "out" / "batch_results.jsonl"
+        runner = BatchRunner(output_dir=tmp_path / "out", **limits)
+        counts = asyncio.run(runner.run(jobs, results))
+        return counts, [json.loads(line) for line in results.read_text(encoding="utf-8").splitlines()]
+
+    def test_one_result_line_per_job_including_failures(self, tmp_path, pipeline):
+        counts, lines = self._run(tmp_path, [
+            '{"company_url": "https://www.a.example/", "keywords": ["eins", "zwei"], "id": "a"}',
+            "{broken",
+            '{"company_url": "https://fail.example", "keywords": ["x"]}',
+            '{"company_url": "https://c.example", "keywords": ["x"], "options": {"colour": "blue"}}',
+            '{"keywords": ["x"]}',
+        ])
+        assert counts == {"completed": 1, "failed": 4}
+        by_line = {line["line"]: line for line in lines}
+        assert sorted(by_line) == [1, 2, 3, 4, 5]
+
+        done = by_line[1]
+        assert (done["status"], done["id"], done["articles_successful"], done["usage"]) == (
+            "completed", "a", 2, {"ai_calls": 3})
+        results_file = tmp_path / "out" / "00001_a.example" / "pipeline_results.json"
+        assert done["results_file"] == str(results_file)
+        assert json.loads(results_file.read_text(encoding="utf-8"))["job_id"] == "job-1"
+
+        assert by_line[2]["error"].startswith("Invalid JSON")
+        assert by_line[3]["error"] == "Stage 1 failed" and by_line[3]["company_url"] == "https://fail.example"
+        assert "Unknown options" in by_line[4]["error"]
+        assert by_line[5]["error"] == "company_url is required"
+        assert all(line["status"] == "failed" for number, line in by_line.items() if number != 1)
+        assert [call["company_url"] for call in pipeline.calls] == ["https://www.a.example/", "https://fail.example"]
+
+    def test_global_limits_are_shared_by_all_jobs(self, tmp_path, pipeline):
+        lines = [f'{{"company_url": "https://c{i}.example", "keywords": ["x"]}}' for i in range(7)]
+        counts, results = self._run(tmp_path, lines, max_companies=2, max_articles=4)
+        assert counts == {"completed": 7, "failed": 0} and len(results) == 7
+        assert pipeline.peak == 2
+        slots = {id(call["article_slots"]) for call in pipeline.calls}
+        assert len(slots) == 1 and pipeline.calls[0]["article_slots"]._value == 4
+
+    def test_results_file_is_appended(self, tmp_path, pipeline):
+        job = ['{"company_url": "https://a.example", "keywords": ["x"]}']
+        self._run(tmp_path, job)
+        _, lines = self._run(tmp_path, job)
+        assert len(lines) == 2
@@ -0,0 +1,181 @@
+"""
+Tests for the shared helpers used across stages and the API.
+
+No network or Gemini access needed.
+
+Run: python -m pytest -q test_shared.py
+"""
+
+import asyncio
+import gzip
+import time
+from email.utils import formatdate
+
+import pytest
+
+from shared.http_cache import Artifact, ArtifactCache, is_not_modified, negotiate_encoding
+from shared.rate_limiter import AsyncRateLimiter
+from shared.usage_tracker import record_ai_call, track_usage
+
+
+# =============================================================================
+# AsyncRateLimiter
+# =============================================================================
+
+class TestAsyncRateLimiter:
+    @pytest.mark.asyncio
+    async def test_caps_operations_in_flight(self):
+        limiter = AsyncRateLimiter(max_concurrent=2)
+        peak = 0
+
+        async def op():
+            nonlocal peak
+            async with limiter.acquire():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(*(op() for _ in range(5)))
+        assert peak == 2
+        assert limiter.in_flight == 0 and limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_spaces_starts(self):
+        limiter = AsyncRateLimiter(per_minute=1200, burst=1)  # one start per 50 ms
+        started = time.monotonic()
+        for _ in range(3):
+            async with limiter.acquire():
+                pass
+        assert time.monotonic() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_gives_back_its_slot(self):
+        limiter = AsyncRateLimiter(max_concurrent=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.acquire():
+                await release.wait()
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(limiter.acquire().__aenter__())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await held
+        assert limiter.waiting == 0 and limiter.in_flight == 0
+        async with limiter.acquire():
+            assert limiter.in_flight == 1
+
+    def test_shared_across_event_loops(self):
+        limiter = AsyncRateLimiter(max_concurrent=1, per_minute=6000)
+
+        async def op():
+            async with limiter.acquire():
+                return limiter.in_flight
+
+        assert asyncio.run(op()) == 1
+        assert asyncio.run(op()) == 1
+
+    def test_invalid_limits_raise(self):
+        with pytest.raises(ValueError):
+            AsyncRateLimiter(max_concurrent=0)
+        with pytest.raises(ValueError):
+            AsyncRateLimiter(per_minute=0)
+        limiter = AsyncRateLimiter()
+        limiter.configure(max_concurrent=3, per_minute=120)
+        assert limiter.max_concurrent == 3 and limiter.burst == 2
+
+
+# =============================================================================
+# HTTP caching helpers
+# =============================================================================
+
+def _artifact(size: int) -> Artifact:
+    return Artifact(media_type="text/plain", variants={"identity": b"x" * size}, etag='"e"', last_modified=0)
+
+
+class TestNegotiateEncoding:
+    def test_prefers_brotli_then_gzip_among_available(self):
+        assert negotiate_encoding("gzip, deflate, br", {"identity", "gzip", "br"}) == "br"
+        assert negotiate_encoding("gzip, deflate, br", {"identity", "gzip"}) == "gzip"
+        assert negotiate_encoding("*", {"identity", "gzip"}) == "gzip"
+
+    def test_identity_when_not_accepted_or_refused(self):
+        assert negotiate_encoding(None, {"identity", "gzip"}) == "identity"
+        assert negotiate_encoding("deflate", {"identity", "gzip"}) == "identity"
+        assert negotiate_encoding("br;q=0, gzip;q=0.0", {"identity", "gzip", "br"}) == "identity"
+        assert negotiate_encoding("br;q=0, gzip;q=0.5", {"identity", "gzip", "br"}) == "gzip"
+
+
+class TestIsNotModified:
+    def test_if_none_match(self):
+        assert is_not_modified('"a"', 0, '"b", W/"a"', None)
+        assert is_not_modified('"a"', 0, "*", None)
+        assert not is_not_modified('"a"', 0, '"b"', None)
+
+    def test_if_none_match_takes_precedence_over_date(self):
+        assert not is_not_modified('"a"', 0, '"b"', formatdate(1000, usegmt=True))
+
+    def test_if_modified_since(self):
+        assert is_not_modified('"a"', 1000.5, None, formatdate(1000, usegmt=True))
+        assert not is_not_modified('"a"', 1001, None, formatdate(1000, usegmt=True))
+        assert not is_not_modified('"a"', 0, None, "not a date")
+        assert not is_not_modified('"a"', 0, None, None)
+
+
+class TestArtifact:
+    def test_load_reads_exported_variants_or_builds_gzip(self, tmp_path):
+        body = b"<p>Artikel</p>" * 200
+        exported = tmp_path / "a.html"
+        exported.write_bytes(body)
+        (tmp_path / "a.html.br").write_bytes(b"brotli")
+        (tmp_path / "a.html.gz").write_bytes(b"gzip")
+        legacy = tmp_path / "b.html"
+        legacy.write_bytes(body)
+        small = tmp_path / "c.html"
+        small.write_bytes(b"<p>kurz</p>")
+
+        assert Artifact.load(exported, "text/html").variants == {"identity": body, "br": b"brotli", "gzip": b"gzip"}
+        assert gzip.decompress(Artifact.load(legacy, "text/html").variants["gzip"]) == body
+        assert set(Artifact.load(small, "text/html").variants) == {"identity"}
+
+    def test_etag_differs_per_encoding(self, tmp_path):
+        path = tmp_path / "a.html"
+        path.write_bytes(b"x" * 2000)
+        artifact = Artifact.load(path, "text/html")
+        assert artifact.etag_for("identity") == artifact.etag
+        assert artifact.etag_for("gzip") == artifact.etag[:-1] + '-gzip"'
+
+    def test_cache_evicts_least_recently_used_by_bytes(self):
+        cache = ArtifactCache(max_bytes=250)
+        cache.put("a", _artifact(100))
+        cache.put("b", _artifact(100))
+        assert cache.get("a") is not None
+        cache.put("c", _artifact(100))
+        assert cache.get("b") is None and cache.get("a") is not None
+        cache.put("huge", _artifact(300))
+        assert cache.get("huge") is None
+        assert cache.invalidate(lambda key: key in ("a", "c")) == 2
+        assert cache.stats()["bytes"] == 0
+
+
+# =============================================================================
+# Usage tracking
+# =============================================================================
+
+class TestUsageTracker:
+    def test_duration_stops_when_scope_exits(self):
+        with track_usage() as job:
+            with track_usage() as stage:
+                record_ai_call(prompt_tokens=10, output_tokens=5)
+                time.sleep(0.02)
+            time.sleep(0.05)
+        stage_seconds = stage.to_dict()["duration_seconds"]
+        time.sleep(0.02)
+        assert stage.to_dict()["duration_seconds"] == stage_seconds < 0.05
+        assert job.elapsed_seconds >= 0.07
+        assert (job.ai_calls, stage.total_tokens) == (1, 15)